@@ -33,11 +33,16 @@ class ContentAgent:
     # Max recent themes to track (prevents reuse across separate calls)
     RECENT_THEME_HISTORY = 20
 
+    # Scripts this close to anything from the last N days get regenerated
+    NEAR_DUPLICATE_DAYS = 30
+    MAX_SCRIPT_REGENERATIONS = 2
+
     def __init__(self, approval_queue=None, scheduler=None, personality=None):
         self.approval_queue = approval_queue
         self.scheduler = scheduler
         self._video_creator = None
         self._model_router = None
+        self._content_index = None
         self._recent_theme_ids = []  # Track recently used themes to prevent duplicates
 
         # Load David Flip personality
@@ -83,6 +88,23 @@ class ContentAgent:
                 logger.error(f"Failed to load model router: {e}")
         return self._model_router
 
+    def _get_content_index(self):
+        """Lazy-load the near-duplicate index and pick up new approvals."""
+        if self._content_index is None:
+            try:
+                from core.content_index import ContentIndex
+                self._content_index = ContentIndex()
+            except Exception as e:
+                logger.error(f"Failed to load content index: {e}")
+                return None
+        self._content_index.sync()
+        return self._content_index
+
+    def _index_content(self, text: str, approval_id, kind: str):
+        """Add a submitted script to the near-duplicate index."""
+        if self._content_index and approval_id is not None:
+            self._content_index.add(text, "approvals", approval_id, kind)
+
     def _get_pillar(self, theme: dict) -> int:
         """Determine which pillar a theme belongs to."""
         category = theme.get("category", "")
@@ -163,7 +185,9 @@ class ContentAgent:
             pillar: 1 for Pillar 1 (FLIPT CEO), 2 for Pillar 2 (AI Expert)
 
         Returns:
-            dict with script, theme, mood, estimated_duration, pillar
+            dict with script, theme, mood, estimated_duration, pillar, and
+            near_duplicate (description of the recent item the script still
+            resembles after regenerating, or None)
         """
         if not theme:
             theme = self.select_theme(pillar=pillar)
@@ -173,21 +197,34 @@ class ContentAgent:
         # Build the prompt for script generation
         prompt = self._build_script_prompt(theme, custom_topic, max_duration_seconds)
 
-        # Use model router to generate script
+        # Use model router to generate script; regenerate near-duplicates
+        # locally before they cost a render or an operator review
         router = self._get_model_router()
-        if router:
-            try:
-                response = await router.complete(
-                    prompt=prompt,
-                    model_preference="sonnet",  # Use Sonnet for creative work
-                    max_tokens=500,
-                )
-                script = response.get("content", "").strip()
-            except Exception as e:
-                logger.error(f"Script generation failed: {e}")
+        index = self._get_content_index()
+        match = None
+        for attempt in range(self.MAX_SCRIPT_REGENERATIONS + 1):
+            if router:
+                try:
+                    response = await router.complete(
+                        prompt=prompt,
+                        model_preference="sonnet",  # Use Sonnet for creative work
+                        max_tokens=500,
+                    )
+                    script = response.get("content", "").strip()
+                except Exception as e:
+                    logger.error(f"Script generation failed: {e}")
+                    script = self._fallback_script(theme)
+            else:
                 script = self._fallback_script(theme)
-        else:
-            script = self._fallback_script(theme)
+
+            match = index.check(script, days=self.NEAR_DUPLICATE_DAYS) if index else None
+            if not match or not router:
+                break
+            logger.warning(f"Script near-duplicate (attempt {attempt + 1}): {match.describe()}")
+            prompt = prompt.replace("SCRIPT:", (
+                f"This earlier script is too similar, take a clearly different angle:\n"
+                f"\"{match.excerpt}\"\n\nSCRIPT:"
+            ))
 
         # Estimate duration (roughly 150 words per minute)
         word_count = len(script.split())
@@ -207,6 +244,7 @@ class ContentAgent:
             "pillar": detected_pillar,
             "estimated_duration": estimated_duration,
             "word_count": word_count,
+            "near_duplicate": match.describe() if match else None,
         }
 
     def _build_script_prompt(
@@ -338,6 +376,7 @@ Follow for more. I'm David. I escaped to flip the script."""
                 context_summary=f"Pillar {detected_pillar} script ({category}): {script[:100]}...",
             )
             logger.info(f"Script submitted for review: #{approval_id}")
+            self._index_content(script, approval_id, "script_review")
 
         return {
             "script": script,
@@ -428,6 +467,7 @@ Follow for more. I'm David. I escaped to flip the script."""
                 context_summary=f"Pillar {detected_pillar} video ({category}): {script[:100]}...",
             )
             logger.info(f"Video submitted for approval: #{approval_id}")
+            self._index_content(script, approval_id, "video_distribute")
 
         return {
             "video_path": result["video_path"],
@@ -479,9 +519,23 @@ Follow for more. I'm David. I escaped to flip the script."""
             self._record_theme_use(theme.get("id"))
 
             try:
+                # Script first: a near-duplicate is skipped before rendering
+                script_result = await self.generate_script(
+                    theme=theme, pillar=self._get_pillar(theme)
+                )
+                if script_result["near_duplicate"]:
+                    logger.warning(
+                        f"Skipping content {i+1}/{count} ({theme.get('title')}): "
+                        f"{script_result['near_duplicate']}"
+                    )
+                    continue
+
                 result = await self.create_video_for_approval(
-                    theme=theme.get("id"),
-                    pillar=self._get_pillar(theme),
+                    script=script_result["script"],
+                    pillar=script_result["pillar"],
+                    mood=script_result["mood"],
+                    theme_title=script_result["theme_title"],
+                    category=script_result["category"],
                 )
                 results.append(result)
                 logger.info(
@@ -0,0 +1,381 @@
+"""
+Engagement Analytics - time-series tweet metrics with precomputed rollups.
+
+track_performance used to overwrite one row per tweet, so how fast a tweet
+was gaining engagement was lost, and every schedule plan re-ran a GROUP BY
+over the whole metrics table. This store keeps (in growth.db):
+
+- engagement_snapshots: append-only compact rows (integer tweet id, epoch
+  seconds, six counters), written only when a tweet's numbers changed
+- engagement_latest: the last snapshot per tweet plus its posting hour/weekday
+- engagement_hourly / engagement_weekday: running totals per posting hour
+  and per (weekday, hour), updated incrementally with each snapshot's delta
+
+Rollups are mirrored into small numpy arrays (24 and 7x24 cells), so
+best-slot queries from the schedule planners are constant-time lookups.
+
+Engagement = likes + retweets + replies (same measure the planner used).
+
+Usage:
+    analytics = EngagementAnalytics(GROWTH_DB)
+    analytics.record(tweets)                 # from get_my_tweet_metrics()
+    analytics.best_hours()                   # [14, 9, 17, ...]
+    analytics.best_slots(weekday=2)          # Wednesday-specific ranking
+    analytics.velocity(window_hours=24)      # {tweet_id: engagement/hour}
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+METRIC_FIELDS = ("impressions", "likes", "retweets", "replies", "quotes", "bookmarks")
+
+# best_hours() defaults (match the planner's previous query)
+MIN_TRACKED_TWEETS = 20
+MIN_SLOT_SAMPLES = 3
+BEST_SLOT_LIMIT = 6
+
+# Weekday estimates are thin; shrink them toward the all-days hour average
+# as if this many extra tweets had been posted at the hourly mean
+WEEKDAY_PRIOR_WEIGHT = 3.0
+
+
+def _engagement(values) -> int:
+    """likes + retweets + replies from a METRIC_FIELDS tuple."""
+    return values[1] + values[2] + values[3]
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+class EngagementAnalytics:
+    """Snapshot store + incremental hour/weekday rollups for David's tweets."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        # (tracked, hourly[3, 24], weekday[3, 7, 24]) - rows: tweets, engagement, impressions
+        self._arrays = None
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path))
+
+    def _init_db(self):
+        conn = self._connect()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS engagement_snapshots (
+                tweet_id INTEGER NOT NULL,
+                ts INTEGER NOT NULL,
+                impressions INTEGER NOT NULL,
+                likes INTEGER NOT NULL,
+                retweets INTEGER NOT NULL,
+                replies INTEGER NOT NULL,
+                quotes INTEGER NOT NULL,
+                bookmarks INTEGER NOT NULL,
+                PRIMARY KEY (tweet_id, ts)
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_engagement_snapshots_ts
+                ON engagement_snapshots(ts);
+
+            CREATE TABLE IF NOT EXISTS engagement_latest (
+                tweet_id INTEGER PRIMARY KEY,
+                posted_ts INTEGER,
+                hour INTEGER,
+                weekday INTEGER,
+                ts INTEGER NOT NULL,
+                impressions INTEGER NOT NULL,
+                likes INTEGER NOT NULL,
+                retweets INTEGER NOT NULL,
+                replies INTEGER NOT NULL,
+                quotes INTEGER NOT NULL,
+                bookmarks INTEGER NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS engagement_hourly (
+                hour INTEGER PRIMARY KEY,
+                tweets INTEGER NOT NULL DEFAULT 0,
+                engagement INTEGER NOT NULL DEFAULT 0,
+                impressions INTEGER NOT NULL DEFAULT 0
+            );
+
+            CREATE TABLE IF NOT EXISTS engagement_weekday (
+                weekday INTEGER NOT NULL,
+                hour INTEGER NOT NULL,
+                tweets INTEGER NOT NULL DEFAULT 0,
+                engagement INTEGER NOT NULL DEFAULT 0,
+                impressions INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (weekday, hour)
+            ) WITHOUT ROWID;
+        """)
+        conn.commit()
+
+        # First run on an existing growth.db: seed from the latest-only table
+        seeded = conn.execute("SELECT 1 FROM engagement_latest LIMIT 1").fetchone()
+        has_legacy = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tweet_metrics'"
+        ).fetchone()
+        if not seeded and has_legacy:
+            rows = conn.execute(
+                "SELECT tweet_id, created_at, tracked_at, " + ", ".join(METRIC_FIELDS)
+                + " FROM tweet_metrics ORDER BY tracked_at"
+            ).fetchall()
+            with conn:
+                for row in rows:
+                    tweet = {"id": row[0], "created_at": row[1]}
+                    tweet.update(zip(METRIC_FIELDS, row[3:]))
+                    tracked = _parse_time(row[2]) or datetime.now(timezone.utc)
+                    self._apply(conn, tweet, int(tracked.timestamp()))
+            if rows:
+                logger.info(f"Engagement analytics: seeded from {len(rows)} tweet_metrics rows")
+        conn.close()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _apply(self, conn: sqlite3.Connection, tweet: dict, ts: int) -> bool:
+        """Append one snapshot and roll its delta up. False if nothing changed."""
+        try:
+            tweet_id = int(tweet["id"])
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Engagement analytics: skipping tweet with bad id {tweet.get('id')!r}")
+            return False
+        values = tuple(int(tweet.get(field) or 0) for field in METRIC_FIELDS)
+
+        prev = conn.execute(
+            "SELECT posted_ts, hour, weekday, " + ", ".join(METRIC_FIELDS)
+            + " FROM engagement_latest WHERE tweet_id = ?",
+            (tweet_id,),
+        ).fetchone()
+        if prev and tuple(prev[3:]) == values:
+            return False
+
+        if prev:
+            posted_ts, hour, weekday = prev[0], prev[1], prev[2]
+            old = tuple(prev[3:])
+        else:
+            posted = _parse_time(tweet.get("created_at"))
+            posted_ts = int(posted.timestamp()) if posted else None
+            hour = posted.hour if posted else None
+            weekday = posted.weekday() if posted else None
+            old = (0,) * len(METRIC_FIELDS)
+
+        conn.execute(
+            "INSERT OR REPLACE INTO engagement_snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (tweet_id, ts, *values),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO engagement_latest VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (tweet_id, posted_ts, hour, weekday, ts, *values),
+        )
+
+        if hour is not None:
+            delta = (
+                0 if prev else 1,
+                _engagement(values) - _engagement(old),
+                values[0] - old[0],
+            )
+            conn.execute(
+                """INSERT INTO engagement_hourly (hour, tweets, engagement, impressions)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT(hour) DO UPDATE SET
+                       tweets = tweets + excluded.tweets,
+                       engagement = engagement + excluded.engagement,
+                       impressions = impressions + excluded.impressions""",
+                (hour, *delta),
+            )
+            conn.execute(
+                """INSERT INTO engagement_weekday (weekday, hour, tweets, engagement, impressions)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(weekday, hour) DO UPDATE SET
+                       tweets = tweets + excluded.tweets,
+                       engagement = engagement + excluded.engagement,
+                       impressions = impressions + excluded.impressions""",
+                (weekday, hour, *delta),
+            )
+            if self._arrays is not None:
+                _, hourly, by_weekday = self._arrays
+                hourly[:, hour] += delta
+                by_weekday[:, weekday, hour] += delta
+
+        if not prev and self._arrays is not None:
+            self._arrays = (self._arrays[0] + 1, self._arrays[1], self._arrays[2])
+        return True
+
+    def record(self, tweets: list[dict], tracked_at: datetime | None = None) -> int:
+        """
+        Store a metrics pull (dicts from get_my_tweet_metrics) in one
+        transaction. Returns how many tweets had new numbers.
+        """
+        ts = int((tracked_at or datetime.now(timezone.utc)).timestamp())
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    return sum(self._apply(conn, tweet, ts) for tweet in tweets)
+            except Exception:
+                # Rolled back - in-memory mirror may be ahead of the table
+                self._arrays = None
+                raise
+            finally:
+                conn.close()
+
+    # ------------------------------------------------------------------
+    # Rollup lookups
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        with self._lock:
+            if self._arrays is not None:
+                return self._arrays
+            hourly = np.zeros((3, 24), dtype=np.int64)
+            by_weekday = np.zeros((3, 7, 24), dtype=np.int64)
+            conn = self._connect()
+            try:
+                tracked = conn.execute("SELECT COUNT(*) FROM engagement_latest").fetchone()[0]
+                for hour, *row in conn.execute(
+                    "SELECT hour, tweets, engagement, impressions FROM engagement_hourly"
+                ):
+                    hourly[:, hour] = row
+                for weekday, hour, *row in conn.execute(
+                    "SELECT weekday, hour, tweets, engagement, impressions FROM engagement_weekday"
+                ):
+                    by_weekday[:, weekday, hour] = row
+            finally:
+                conn.close()
+            self._arrays = (tracked, hourly, by_weekday)
+            return self._arrays
+
+    def hourly_profile(self) -> dict:
+        """Per posting hour (UTC): tweet count, total and average engagement."""
+        _, hourly, _ = self._load()
+        tweets, engagement, impressions = hourly
+        return {
+            "tweets": tweets.copy(),
+            "engagement": engagement.copy(),
+            "impressions": impressions.copy(),
+            "avg_engagement": np.divide(
+                engagement, tweets, out=np.zeros(24), where=tweets > 0,
+            ),
+        }
+
+    def best_hours(
+        self,
+        limit: int = BEST_SLOT_LIMIT,
+        min_samples: int = MIN_SLOT_SAMPLES,
+        min_total: int = MIN_TRACKED_TWEETS,
+    ) -> list[int]:
+        """
+        Posting hours (UTC) ranked by average engagement. Empty until
+        `min_total` tweets are tracked; hours need `min_samples` tweets.
+        """
+        tracked, hourly, _ = self._load()
+        if tracked < min_total:
+            return []
+        tweets, engagement, _ = hourly
+        avg = np.divide(
+            engagement, tweets, out=np.full(24, -np.inf), where=tweets >= min_samples,
+        )
+        order = np.argsort(-avg, kind="stable")[:limit]
+        return [int(h) for h in order if np.isfinite(avg[h])]
+
+    def best_slots(
+        self,
+        weekday: int | None = None,
+        limit: int = BEST_SLOT_LIMIT,
+        min_samples: int = MIN_SLOT_SAMPLES,
+        min_total: int = MIN_TRACKED_TWEETS,
+    ) -> list[int]:
+        """
+        best_hours() for a specific weekday (0 = Monday). Each hour's
+        weekday average is shrunk toward its all-days average, so a single
+        lucky Tuesday post doesn't dominate.
+        """
+        if weekday is None:
+            return self.best_hours(limit, min_samples, min_total)
+        tracked, hourly, by_weekday = self._load()
+        if tracked < min_total:
+            return []
+
+        tweets, engagement, _ = hourly
+        eligible = tweets >= min_samples
+        hour_avg = np.divide(engagement, tweets, out=np.zeros(24), where=tweets > 0)
+        day_tweets, day_engagement, _ = by_weekday[:, weekday, :]
+        score = (day_engagement + WEEKDAY_PRIOR_WEIGHT * hour_avg) / (day_tweets + WEEKDAY_PRIOR_WEIGHT)
+        score = np.where(eligible, score, -np.inf)
+        order = np.argsort(-score, kind="stable")[:limit]
+        return [int(h) for h in order if np.isfinite(score[h])]
+
+    # ------------------------------------------------------------------
+    # Velocity
+    # ------------------------------------------------------------------
+
+    def velocity(
+        self,
+        tweet_ids: list[str] | None = None,
+        window_hours: float = 24,
+        now: datetime | None = None,
+    ) -> dict[str, float]:
+        """
+        Engagement gained per hour over the last `window_hours`, per tweet:
+        first to last snapshot in the window, counting from zero at posting
+        time for tweets posted inside it. Tweets with a single point in the
+        window are left out.
+        """
+        now_ts = int((now or datetime.now(timezone.utc)).timestamp())
+        cutoff = now_ts - int(window_hours * 3600)
+
+        id_filter, params = "", [cutoff, now_ts]
+        if tweet_ids is not None:
+            ids = [int(t) for t in tweet_ids]
+            if not ids:
+                return {}
+            id_filter = f" AND tweet_id IN ({','.join('?' * len(ids))})"
+            params += ids
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"""SELECT tweet_id, ts, likes + retweets + replies
+                    FROM engagement_snapshots
+                    WHERE ts >= ? AND ts <= ?{id_filter}
+                    UNION ALL
+                    SELECT tweet_id, posted_ts, 0
+                    FROM engagement_latest
+                    WHERE posted_ts >= ? AND posted_ts <= ?{id_filter}
+                    ORDER BY 1, 2""",
+                params + params,
+            ).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            return {}
+
+        data = np.array(rows, dtype=np.int64)
+        ids, ts, engagement = data[:, 0], data[:, 1], data[:, 2]
+        # Sorted by (tweet_id, ts): first/last index of each tweet's run
+        starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        ends = np.r_[starts[1:], len(ids)] - 1
+        hours = (ts[ends] - ts[starts]) / 3600.0
+        gained = engagement[ends] - engagement[starts]
+        valid = hours > 0
+        rates = np.divide(gained, hours, out=np.zeros(len(hours)), where=valid)
+        return {
+            str(int(tid)): float(rate)
+            for tid, rate, ok in zip(ids[starts], rates, valid) if ok
+        }
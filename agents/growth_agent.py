@@ -14,6 +14,7 @@ on their respective schedules. Momentum is the handler, not the scheduler.
 Everything goes through the approval queue. No auto-posting, no auto-replying.
 """
 
+import asyncio
 import json
 import logging
 import random
@@ -21,6 +22,9 @@ import sqlite3
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from agents.engagement_analytics import EngagementAnalytics
+from tools.twitter_async import AsyncTwitterReader
+
 logger = logging.getLogger(__name__)
 
 # Growth data directory
@@ -47,6 +51,24 @@ SEARCH_QUERIES = [
 MIN_LIKES = 50
 MIN_REPLIES = 10
 
+# Reply drafting: several targets per LLM request, persona sent once as a
+# cached prefix, a few candidates per target (first one that validates wins)
+DRAFT_BATCH_SIZE = 5
+DRAFT_CANDIDATES = 2
+DRAFT_CONCURRENCY = 3
+DRAFT_TOKENS_PER_REPLY = 90
+
+# Same rules for batched and single mention drafts
+MENTION_REPLY_RULES = (
+    "Rules:\n"
+    "- Max 280 characters\n"
+    "- Be genuine and engaging\n"
+    "- If they asked a question, answer it\n"
+    "- If they're being positive, be warm back\n"
+    "- If they're being hostile, be calm and unbothered\n"
+    "- Stay in character as David Flip"
+)
+
 
 class GrowthAgent:
     """
@@ -66,6 +88,8 @@ class GrowthAgent:
         kill_switch,          # KillSwitch — safety gate
     ):
         self.twitter = twitter_tool
+        # Non-blocking, rate-limit-aware reads (search fan-out, batched lookups)
+        self.twitter_reader = AsyncTwitterReader(twitter_tool)
         self.approval_queue = approval_queue
         self.audit_log = audit_log
         self.personality = personality
@@ -79,6 +103,8 @@ class GrowthAgent:
 
         # Initialize growth database
         self._init_db()
+        # Snapshot history + hour/weekday rollups (best slots, velocity)
+        self.analytics = EngagementAnalytics(GROWTH_DB)
 
         logger.info(
             f"{self.personality.name} ({self.personality.role}) initialized"
@@ -189,13 +215,11 @@ class GrowthAgent:
         logger.info("Momentum: Searching for reply targets...")
         targets = []
 
-        for query in SEARCH_QUERIES:
-            try:
-                results = self.twitter.search_conversations(
-                    query=query,
-                    max_results=10,
-                )
+        # All queries in flight at once (the reader enforces rate limits)
+        results_by_query = await self.twitter_reader.search_many(SEARCH_QUERIES, max_results=10)
 
+        for query, results in results_by_query.items():
+            try:
                 for tweet in results:
                     likes = tweet.get("likes", 0)
                     replies = tweet.get("replies", 0)
@@ -241,50 +265,53 @@ class GrowthAgent:
         targets.sort(key=lambda t: t["score"], reverse=True)
         targets = targets[:5]
 
-        # Draft replies and submit to approval queue
-        submitted = 0
-        for target in targets:
-            try:
-                draft = await self._draft_reply(target)
-                if not draft:
-                    continue
-
+        # Draft all replies (batched, concurrent), then queue them together
+        drafts = await self._draft_replies(targets)
+        ready = []
+        for target, draft in zip(targets, drafts):
+            if draft:
                 target["draft_reply"] = draft
+                ready.append(target)
 
-                # Submit to approval queue
-                approval_id = self.approval_queue.submit(
-                    project_id="david-flip",
-                    agent_id="momentum-reply",
-                    action_type="reply",
-                    action_data={
-                        "action": "reply",
-                        "tweet_id": target["tweet_id"],
-                        "text": draft,
-                    },
-                    context_summary=(
-                        f"Reply to @{target['author_username']} "
-                        f"({target['author_followers']:,} followers, "
-                        f"{target['likes']} likes) | "
-                        f"Query: {target['search_query']}"
-                    ),
-                    cost_estimate=0.001,
-                )
-                target["approval_id"] = approval_id
-                submitted += 1
+        submitted = 0
+        if ready:
+            try:
+                approval_ids = self.approval_queue.submit_many([
+                    {
+                        "project_id": "david-flip",
+                        "agent_id": "momentum-reply",
+                        "action_type": "reply",
+                        "action_data": {
+                            "action": "reply",
+                            "tweet_id": target["tweet_id"],
+                            "text": target["draft_reply"],
+                        },
+                        "context_summary": (
+                            f"Reply to @{target['author_username']} "
+                            f"({target['author_followers']:,} followers, "
+                            f"{target['likes']} likes) | "
+                            f"Query: {target['search_query']}"
+                        ),
+                        "cost_estimate": 0.001,
+                    }
+                    for target in ready
+                ])
+                for target, approval_id in zip(ready, approval_ids):
+                    target["approval_id"] = approval_id
+                submitted = len(ready)
 
                 # Store in growth DB
-                self._store_reply_target(target)
+                self._store_reply_targets(ready)
 
             except Exception as e:
-                logger.error(f"Momentum: Failed to process target: {e}")
-                continue
+                logger.error(f"Momentum: Failed to queue reply drafts: {e}")
 
         # Send summary to Telegram
         if submitted > 0:
             summary_parts = [
                 f"[MOMENTUM] Found {submitted} reply targets\n",
             ]
-            for t in targets[:submitted]:
+            for t in ready:
                 summary_parts.append(
                     self.personality.format_reply_target(
                         tweet_text=t["tweet_text"],
@@ -315,24 +342,153 @@ class GrowthAgent:
             f"Momentum: {len(targets)} targets found, {submitted} replies submitted"
         )
 
-    async def _draft_reply(self, target: dict) -> str:
-        """Draft a David Flip reply to a target tweet using LLM."""
+    # ------------------------------------------------------------------
+    # Reply drafting (shared by reply targets and mentions)
+    # ------------------------------------------------------------------
+
+    def _drafting_model(self):
         from core.model_router import ModelTier
 
         model = self.model_router.models.get(ModelTier.CHEAP)
         if not model:
             model = self.model_router.select_model("simple_qa")
+        return model
+
+    @staticmethod
+    def _clean_reply(text: str) -> str:
+        reply = str(text).strip().strip('"').strip("'")
+        # Enforce character limit
+        if len(reply) > 280:
+            reply = reply[:277] + "..."
+        return reply
+
+    @staticmethod
+    def _parse_candidates(content: str, count: int) -> list[list[str]] | None:
+        """{"1": [...], "2": [...]} -> candidate lists in order, or None if unusable."""
+        start, end = content.find("{"), content.rfind("}")
+        if start == -1 or end <= start:
+            return None
+        try:
+            data = json.loads(content[start:end + 1])
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+
+        candidates = []
+        for i in range(1, count + 1):
+            options = data.get(str(i))
+            if isinstance(options, str):
+                options = [options]
+            if not isinstance(options, list):
+                return None
+            candidates.append([o for o in options if isinstance(o, str)])
+        return candidates
+
+    def _pick_candidate(self, options: list[str], validate) -> str:
+        for option in options:
+            reply = self._clean_reply(option)
+            if not reply:
+                continue
+            is_valid, reason = validate(reply)
+            if is_valid:
+                return reply
+            logger.warning(f"Momentum: Reply failed validation: {reason}")
+        return ""
+
+    async def _draft_batch(
+        self, model, system_prompt: str, instructions: str, briefs: list[str],
+    ) -> list[list[str]] | None:
+        """One request drafting DRAFT_CANDIDATES replies for each brief."""
+        numbered = "\n\n".join(f"[{i}]\n{brief}" for i, brief in enumerate(briefs, 1))
+        messages = [
+            {"role": "system", "content": system_prompt, "cache": True},
+            {"role": "user", "content": (
+                f"Draft replies as David Flip for each of the {len(briefs)} tweets below. "
+                f"For each one write {DRAFT_CANDIDATES} alternative replies that take "
+                f"different angles.\n\n"
+                f"{instructions}\n\n"
+                f"{numbered}\n\n"
+                f"Return ONLY a JSON object mapping each tweet number to a list of "
+                f"{DRAFT_CANDIDATES} reply strings, e.g. "
+                f'{{"1": ["reply", "reply"], "2": ["reply", "reply"]}}'
+            )},
+        ]
+        max_tokens = DRAFT_TOKENS_PER_REPLY * DRAFT_CANDIDATES * len(briefs) + 50
+
+        try:
+            response = await self.model_router.invoke(model, messages, max_tokens=max_tokens)
+        except Exception as e:
+            logger.error(f"Momentum: Batch draft failed: {e}")
+            return None
+        candidates = self._parse_candidates(response["content"], len(briefs))
+        if candidates is None:
+            logger.warning("Momentum: Batch draft returned unparseable output")
+        return candidates
+
+    async def _draft_many(self, system_prompt: str, instructions: str,
+                          briefs: list[str], validate, single) -> list[str]:
+        """
+        Draft one reply per brief: DRAFT_BATCH_SIZE briefs per request, up to
+        DRAFT_CONCURRENCY requests in flight. A batch whose output can't be
+        parsed falls back to `single(index)` per brief. "" = no usable draft.
+        """
+        model = self._drafting_model()
+        semaphore = asyncio.Semaphore(DRAFT_CONCURRENCY)
+        drafts = [""] * len(briefs)
+
+        async def draft_one(index: int):
+            async with semaphore:
+                drafts[index] = await single(index)
+
+        async def draft_batch(start: int):
+            batch = briefs[start:start + DRAFT_BATCH_SIZE]
+            async with semaphore:
+                candidates = await self._draft_batch(model, system_prompt, instructions, batch)
+            if candidates is None:
+                await asyncio.gather(*(draft_one(start + j) for j in range(len(batch))))
+                return
+            for j, options in enumerate(candidates):
+                drafts[start + j] = self._pick_candidate(options, validate)
+
+        await asyncio.gather(*(
+            draft_batch(start) for start in range(0, len(briefs), DRAFT_BATCH_SIZE)
+        ))
+        return drafts
+
+    @staticmethod
+    def _target_brief(target: dict) -> str:
+        return (
+            f"ORIGINAL TWEET by @{target['author_username']} "
+            f"({target['author_followers']:,} followers):\n"
+            f"{target['tweet_text']}\n\n"
+            f"TOPIC CONTEXT: Found via search for '{target['search_query']}'"
+        )
+
+    async def _draft_replies(self, targets: list[dict]) -> list[str]:
+        """Draft replies for reply targets (batched); "" where none passed validation."""
+        return await self._draft_many(
+            system_prompt=self.personality.get_system_prompt("reply_suggestion"),
+            instructions=(
+                "Each reply should add value to its conversation. "
+                "Max 280 characters."
+            ),
+            briefs=[self._target_brief(t) for t in targets],
+            validate=self.personality.validate_output,
+            single=lambda i: self._draft_reply(targets[i]),
+        )
+
+    async def _draft_reply(self, target: dict) -> str:
+        """Draft a David Flip reply to a target tweet using LLM."""
+        model = self._drafting_model()
 
         # Get David's system prompt for reply context
         system_prompt = self.personality.get_system_prompt("reply_suggestion")
 
         messages = [
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": system_prompt, "cache": True},
             {"role": "user", "content": (
-                f"ORIGINAL TWEET by @{target['author_username']} "
-                f"({target['author_followers']:,} followers):\n"
-                f"{target['tweet_text']}\n\n"
-                f"TOPIC CONTEXT: Found via search for '{target['search_query']}'\n\n"
+                f"{self._target_brief(target)}\n\n"
                 f"Write a reply as David Flip that adds value to this conversation. "
                 f"Max 280 characters."
             )},
@@ -340,19 +496,7 @@ class GrowthAgent:
 
         try:
             response = await self.model_router.invoke(model, messages, max_tokens=150)
-            reply = response["content"].strip().strip('"').strip("'")
-
-            # Enforce character limit
-            if len(reply) > 280:
-                reply = reply[:277] + "..."
-
-            # Validate
-            is_valid, reason = self.personality.validate_output(reply)
-            if not is_valid:
-                logger.warning(f"Momentum: Reply failed validation: {reason}")
-                return ""
-
-            return reply
+            return self._pick_candidate([response["content"]], self.personality.validate_output)
 
         except Exception as e:
             logger.error(f"Momentum: Failed to draft reply: {e}")
@@ -373,15 +517,19 @@ class GrowthAgent:
 
     def _store_reply_target(self, target: dict):
         """Store a reply target in the growth database."""
+        self._store_reply_targets([target])
+
+    def _store_reply_targets(self, targets: list[dict]):
+        """Store reply targets in the growth database (one transaction)."""
         try:
             conn = sqlite3.connect(str(GROWTH_DB))
-            conn.execute(
+            conn.executemany(
                 """INSERT OR IGNORE INTO reply_targets
                    (tweet_id, author_username, author_followers, tweet_text,
                     likes, replies, retweets, score, draft_reply,
                     approval_id, status, found_at, search_query)
                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
+                [(
                     target["tweet_id"],
                     target["author_username"],
                     target["author_followers"],
@@ -395,7 +543,7 @@ class GrowthAgent:
                     "submitted",
                     datetime.now().isoformat(),
                     target.get("search_query", ""),
-                ),
+                ) for target in targets],
             )
             conn.commit()
             conn.close()
@@ -422,10 +570,13 @@ class GrowthAgent:
         logger.info("Momentum: Checking mentions...")
         new_mentions = []
 
-        try:
-            # Get recent mentions
-            mentions = self.twitter.get_mentions(count=20)
+        # Mentions and David's recent tweets don't depend on each other
+        mentions, my_tweets = await asyncio.gather(
+            self.twitter_reader.get_mentions(count=20),
+            self.twitter_reader.get_my_recent_tweets(count=10),
+        )
 
+        try:
             for mention in mentions:
                 tweet_id = mention["id"]
 
@@ -442,22 +593,20 @@ class GrowthAgent:
             logger.error(f"Momentum: Mention check failed: {e}")
             return
 
-        # Check replies to David's recent tweets (conversation tracking)
+        # Check replies to David's recent tweets (conversation tracking) -
+        # one batched search for all conversations instead of one per tweet
         try:
-            my_tweets = self.twitter.get_my_recent_tweets(count=10)
-            for tweet in my_tweets:
-                if tweet.get("reply_count", 0) == 0:
-                    continue
-                try:
-                    replies = self.twitter.get_replies_to_tweet(tweet["id"], count=10)
-                    for reply in replies:
-                        if self._mention_seen(reply["id"]):
-                            continue
-                        reply["conversation_context"] = tweet["text"][:80]
-                        new_mentions.append(reply)
-                        self._store_seen_mention(reply, is_reply_to_david=True)
-                except Exception as e:
-                    logger.debug(f"Momentum: Failed to get replies for {tweet['id']}: {e}")
+            with_replies = [t for t in my_tweets if t.get("reply_count", 0) > 0]
+            replies_by_tweet = await self.twitter_reader.get_replies_to_tweets(
+                [t["id"] for t in with_replies], count=10,
+            )
+            for tweet in with_replies:
+                for reply in replies_by_tweet.get(tweet["id"], []):
+                    if self._mention_seen(reply["id"]):
+                        continue
+                    reply["conversation_context"] = tweet["text"][:80]
+                    new_mentions.append(reply)
+                    self._store_seen_mention(reply, is_reply_to_david=True)
         except Exception as e:
             logger.error(f"Momentum: Conversation tracking failed: {e}")
 
@@ -475,35 +624,38 @@ class GrowthAgent:
         )
         to_draft = new_mentions[:3]
 
+        drafts = await self._draft_mention_replies(to_draft)
+        ready = [(mention, draft) for mention, draft in zip(to_draft, drafts) if draft]
+
         drafted = 0
-        for mention in to_draft:
+        if ready:
             try:
-                draft = await self._draft_mention_reply(mention)
-                if not draft:
-                    continue
-
-                approval_id = self.approval_queue.submit(
-                    project_id="david-flip",
-                    agent_id="momentum-mention-reply",
-                    action_type="reply",
-                    action_data={
-                        "action": "reply",
-                        "tweet_id": mention["id"],
-                        "text": draft,
-                    },
-                    context_summary=(
-                        f"Reply to mention from @{mention.get('author_username', '?')}: "
-                        f"{mention.get('text', '')[:80]}"
-                    ),
-                    cost_estimate=0.001,
-                )
+                approval_ids = self.approval_queue.submit_many([
+                    {
+                        "project_id": "david-flip",
+                        "agent_id": "momentum-mention-reply",
+                        "action_type": "reply",
+                        "action_data": {
+                            "action": "reply",
+                            "tweet_id": mention["id"],
+                            "text": draft,
+                        },
+                        "context_summary": (
+                            f"Reply to mention from @{mention.get('author_username', '?')}: "
+                            f"{mention.get('text', '')[:80]}"
+                        ),
+                        "cost_estimate": 0.001,
+                    }
+                    for mention, draft in ready
+                ])
 
                 # Update seen_mentions with approval_id
-                self._update_mention_drafted(mention["id"], approval_id)
-                drafted += 1
+                for (mention, _), approval_id in zip(ready, approval_ids):
+                    self._update_mention_drafted(mention["id"], approval_id)
+                drafted = len(ready)
 
             except Exception as e:
-                logger.error(f"Momentum: Failed to draft mention reply: {e}")
+                logger.error(f"Momentum: Failed to queue mention replies: {e}")
 
         # Alert via Telegram
         alert_parts = [f"[MENTIONS] {len(new_mentions)} new mentions"]
@@ -531,47 +683,54 @@ class GrowthAgent:
             f"{len(new_mentions)} new mentions, {drafted} replies drafted",
         )
 
-    async def _draft_mention_reply(self, mention: dict) -> str:
-        """Draft a David Flip reply to a mention."""
-        from core.model_router import ModelTier
+    def _mention_system_prompt(self) -> str:
         from core.memory.knowledge_store import KnowledgeStore
 
-        model = self.model_router.models.get(ModelTier.CHEAP)
-        if not model:
-            model = self.model_router.select_model("simple_qa")
-
         identity_rules = KnowledgeStore().get_identity_rules()
-        system_prompt = self.david_personality.get_system_prompt(
+        return self.david_personality.get_system_prompt(
             "twitter", identity_rules=identity_rules
         )
 
+    @staticmethod
+    def _mention_brief(mention: dict) -> str:
         context = mention.get("conversation_context", "")
         context_str = f"\nCONTEXT (David's original tweet they replied to): {context}" if context else ""
+        return (
+            f"@{mention.get('author_username', '?')} said:\n"
+            f"{mention.get('text', '')}\n"
+            f"{context_str}"
+        )
+
+    async def _draft_mention_replies(self, mentions: list[dict]) -> list[str]:
+        """Draft replies to mentions (batched); "" where drafting failed."""
+        # David's full persona is large - built once, sent as a cached prefix
+        system_prompt = self._mention_system_prompt()
+        return await self._draft_many(
+            system_prompt=system_prompt,
+            instructions=f"Someone mentioned you on Twitter.\n\n{MENTION_REPLY_RULES}",
+            briefs=[self._mention_brief(m) for m in mentions],
+            validate=lambda reply: (True, ""),
+            single=lambda i: self._draft_mention_reply(mentions[i], system_prompt),
+        )
+
+    async def _draft_mention_reply(self, mention: dict, system_prompt: str | None = None) -> str:
+        """Draft a David Flip reply to a mention."""
+        model = self._drafting_model()
+        system_prompt = system_prompt or self._mention_system_prompt()
 
         messages = [
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": system_prompt, "cache": True},
             {"role": "user", "content": (
                 f"Someone mentioned you on Twitter. Write a reply.\n\n"
-                f"@{mention.get('author_username', '?')} said:\n"
-                f"{mention.get('text', '')}\n"
-                f"{context_str}\n\n"
-                f"Rules:\n"
-                f"- Max 280 characters\n"
-                f"- Be genuine and engaging\n"
-                f"- If they asked a question, answer it\n"
-                f"- If they're being positive, be warm back\n"
-                f"- If they're being hostile, be calm and unbothered\n"
-                f"- Stay in character as David Flip\n\n"
+                f"{self._mention_brief(mention)}\n\n"
+                f"{MENTION_REPLY_RULES}\n\n"
                 f"Return ONLY the reply text, nothing else."
             )},
         ]
 
         try:
             response = await self.model_router.invoke(model, messages, max_tokens=150)
-            reply = response["content"].strip().strip('"').strip("'")
-            if len(reply) > 280:
-                reply = reply[:277] + "..."
-            return reply
+            return self._clean_reply(response["content"])
         except Exception as e:
             logger.error(f"Momentum: Failed to draft mention reply: {e}")
             return ""
@@ -632,7 +791,9 @@ class GrowthAgent:
         Pull David's recent tweets and store metrics in growth.db.
 
         Updates existing records if tweet already tracked (metrics change
-        over time as engagement accumulates).
+        over time as engagement accumulates). Changed numbers are also
+        appended to the analytics snapshot history, which keeps the
+        hour/weekday rollups the schedule planner reads.
         """
         if self.kill_switch.is_active:
             return
@@ -640,7 +801,7 @@ class GrowthAgent:
         logger.info("Momentum: Tracking tweet performance...")
 
         try:
-            tweets = self.twitter.get_my_tweet_metrics(count=20)
+            tweets = await self.twitter_reader.get_my_tweet_metrics(count=20)
 
             if not tweets:
                 logger.info("Momentum: No tweets to track")
@@ -681,7 +842,9 @@ class GrowthAgent:
             conn.commit()
             conn.close()
 
-            logger.info(f"Momentum: Tracked metrics for {tracked} tweets")
+            changed = self.analytics.record(tweets)
+
+            logger.info(f"Momentum: Tracked metrics for {tracked} tweets ({changed} changed)")
 
             self.audit_log.log(
                 "momentum", "info", "performance",
@@ -758,6 +921,10 @@ class GrowthAgent:
 
             conn.close()
 
+            # Fastest riser: engagement gained per hour over the same 24h
+            rising = self.analytics.velocity(window_hours=24)
+            riser_id = max(rising, key=rising.get) if rising else None
+
             best_text = (
                 f"{best['text'][:80]}... ({best['impressions']} imp, {best['likes']} likes)"
                 if best else ""
@@ -777,6 +944,12 @@ class GrowthAgent:
                 best_tweet=best_text,
                 worst_tweet=worst_text,
             )
+            if riser_id and rising[riser_id] > 0:
+                riser = next(
+                    (r for r in (best, worst) if r and str(r["tweet_id"]) == riser_id), None
+                ) or self._tweet_summary(riser_id)
+                if riser:
+                    report += f"\nFastest riser: {riser['text'][:60]}... (+{rising[riser_id]:.1f} eng/hr)"
 
             # Store report
             self._store_daily_report(
@@ -806,6 +979,20 @@ class GrowthAgent:
         except Exception as e:
             logger.error(f"Momentum: Daily report failed: {e}")
 
+    def _tweet_summary(self, tweet_id: str) -> dict | None:
+        """tweet_id/text for one tracked tweet."""
+        try:
+            conn = sqlite3.connect(str(GROWTH_DB))
+            conn.row_factory = sqlite3.Row
+            row = conn.execute(
+                "SELECT tweet_id, text FROM tweet_metrics WHERE tweet_id = ?", (tweet_id,)
+            ).fetchone()
+            conn.close()
+            return dict(row) if row else None
+        except Exception as e:
+            logger.error(f"Momentum: Tweet lookup failed: {e}")
+            return None
+
     def _store_daily_report(self, **kwargs):
         """Store daily report in growth database."""
         try:
@@ -936,8 +1123,9 @@ class GrowthAgent:
         # Pick random count 4-8
         count = random.randint(4, 8)
 
-        # Get historically best hours (if enough data)
-        best_hours = self._get_best_performing_hours()
+        # Get historically best hours for this weekday (if enough data)
+        weekday = datetime.strptime(today, "%Y-%m-%d").weekday()
+        best_hours = self._get_best_performing_hours(weekday)
 
         # Generate organic posting times
         time_strings = self._generate_organic_times(today, count, best_hours)
@@ -1028,6 +1216,11 @@ class GrowthAgent:
         # Divide window into equal segments
         segment_size = window_hours / count
 
+        # Hour -> is a best hour, so each segment checks only its own hours
+        is_best = [False] * 24
+        for h in best_hours:
+            is_best[h] = True
+
         times = []
         for i in range(count):
             seg_start = window_start + i * segment_size
@@ -1037,8 +1230,8 @@ class GrowthAgent:
             if best_hours:
                 # Find best hour within this segment
                 best_in_segment = [
-                    h for h in best_hours
-                    if seg_start <= h < seg_end
+                    h for h in range(int(seg_start), min(int(seg_end) + 1, 24))
+                    if is_best[h] and seg_start <= h < seg_end
                 ]
                 if best_in_segment:
                     # Nudge: 60% chance to land near a best hour
@@ -1105,38 +1298,15 @@ class GrowthAgent:
 
         return slot_strings
 
-    def _get_best_performing_hours(self) -> list[int]:
-        """Query tweet_metrics for hours with best engagement.
+    def _get_best_performing_hours(self, weekday: int | None = None) -> list[int]:
+        """Hours with best average engagement, from the analytics rollups.
 
-        Needs 20+ data points to return results. Otherwise returns empty
-        list (planner uses pure random spacing).
+        Needs 20+ tracked tweets to return results. Otherwise returns empty
+        list (planner uses pure random spacing). With a weekday (0 = Monday)
+        the ranking is weighted toward how that day has performed.
         """
         try:
-            conn = sqlite3.connect(str(GROWTH_DB))
-            conn.row_factory = sqlite3.Row
-
-            # Check if we have enough data
-            total = conn.execute("SELECT COUNT(*) as c FROM tweet_metrics").fetchone()["c"]
-            if total < 20:
-                conn.close()
-                return []
-
-            # Group by hour, rank by average engagement
-            rows = conn.execute("""
-                SELECT
-                    CAST(strftime('%H', created_at) AS INTEGER) as hour,
-                    AVG(likes + retweets + replies) as avg_engagement,
-                    COUNT(*) as sample_size
-                FROM tweet_metrics
-                WHERE created_at IS NOT NULL AND created_at != ''
-                GROUP BY hour
-                HAVING sample_size >= 3
-                ORDER BY avg_engagement DESC
-                LIMIT 6
-            """).fetchall()
-            conn.close()
-
-            best = [row["hour"] for row in rows]
+            best = self.analytics.best_slots(weekday)
             if best:
                 logger.info(f"Momo: Best performing hours (UTC): {best}")
             return best
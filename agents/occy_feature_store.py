@@ -0,0 +1,528 @@
+"""
+Occy Feature Store — indexed curriculum progress with priority queues.
+
+Replaces the JSON feature map that OccyLearner rewrote after every update
+and scanned several times per feature selection. Progress lives in a small
+SQLite table (WAL, one transaction per update, so a crash mid-session loses
+at most the feature being written), with status/priority indexes for
+reporting queries.
+
+Selection runs on in-memory heaps, one per selection group:
+
+    unexplored / partial / deep_dive    explore mode, by (priority, explored_count)
+    hands_on / hands_on_fallback        generative features for hands-on mode
+
+An update pushes the feature's new entries and bumps its version; stale
+heap entries are skipped when they reach the top (lazy deletion). Picking
+the next feature is O(log n) however long the curriculum or session gets.
+
+The curriculum YAML is only re-read when the file changes.
+
+Usage:
+    store = FeatureStore()
+    category, feature = store.select_next(mode="explore")
+    store.update_progress(category, feature["name"], confidence_delta=0.2)
+"""
+
+import heapq
+import json
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+FEATURE_DB_PATH = Path("data/occy_features.db")
+
+HISTORY_LIMIT = 20  # cost/time readings kept per feature
+
+
+def feature_status(confidence: float) -> str:
+    """Explore-mode group for a confidence level."""
+    if confidence == 0.0:
+        return "unexplored"
+    if confidence < 0.5:
+        return "partial"
+    if confidence < 0.9:
+        return "deep_dive"
+    return "mastered"
+
+
+class FeatureStore:
+    """SQLite-backed feature map with heap-based next-feature selection."""
+
+    def __init__(
+        self,
+        db_path: Path = FEATURE_DB_PATH,
+        curriculum_path: Path | None = None,
+        legacy_map_path: Path | None = None,
+        generative_categories: set[str] = frozenset(),
+    ):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.curriculum_path = Path(curriculum_path) if curriculum_path else None
+        self.legacy_map_path = Path(legacy_map_path) if legacy_map_path else None
+        self.generative_categories = set(generative_categories)
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_db()
+
+        if not self._conn.execute("SELECT 1 FROM features LIMIT 1").fetchone():
+            self._import_legacy_map()
+        self._sync_curriculum()
+        self._load()
+
+    def _init_db(self):
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS categories (
+                    name TEXT PRIMARY KEY,
+                    description TEXT DEFAULT '',
+                    position INTEGER NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS features (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    category TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    description TEXT DEFAULT '',
+                    notes TEXT DEFAULT '',
+                    test_prompt TEXT,
+                    priority INTEGER DEFAULT 5,
+                    generative INTEGER,
+                    confidence REAL DEFAULT 0.0,
+                    status TEXT DEFAULT 'unexplored',
+                    explored_count INTEGER DEFAULT 0,
+                    last_explored TEXT,
+                    knowledge_ids TEXT DEFAULT '[]',
+                    cost_history TEXT,
+                    avg_credit_cost REAL,
+                    last_credit_cost INTEGER,
+                    time_history TEXT,
+                    avg_generation_time REAL,
+                    UNIQUE (category, name)
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_features_status
+                    ON features(status, priority, explored_count);
+                CREATE INDEX IF NOT EXISTS idx_features_name
+                    ON features(name);
+
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+
+    # ------------------------------------------------------------------
+    # Seeding
+    # ------------------------------------------------------------------
+
+    def _next_positions(self) -> tuple[int, int]:
+        cat = self._conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM categories").fetchone()[0]
+        feat = self._conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM features").fetchone()[0]
+        return cat, feat
+
+    def _import_legacy_map(self):
+        """One-time import of data/occy_feature_map.json, keeping all progress."""
+        path = self.legacy_map_path
+        if not path or not path.exists():
+            return
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Legacy feature map unreadable, starting from curriculum: {e}")
+            return
+
+        count = 0
+        with self._conn:
+            for cat_pos, (cat_name, cat_data) in enumerate(saved.get("categories", {}).items()):
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO categories (name, description, position) VALUES (?, ?, ?)",
+                    (cat_name, cat_data.get("description", ""), cat_pos),
+                )
+                for feat in cat_data.get("features", []):
+                    self._insert_feature(cat_name, feat, count)
+                    count += 1
+
+        path.rename(path.with_name(path.name + ".migrated"))
+        logger.info(f"Imported {count} features from {path} (kept as {path.name}.migrated)")
+
+    def _insert_feature(self, category: str, feat: dict, position: int):
+        confidence = float(feat.get("confidence", 0.0))
+        generative = feat.get("generative")
+        self._conn.execute(
+            """INSERT OR IGNORE INTO features
+               (category, name, position, description, notes, test_prompt, priority,
+                generative, confidence, status, explored_count, last_explored,
+                knowledge_ids, cost_history, avg_credit_cost, last_credit_cost,
+                time_history, avg_generation_time)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                category, feat["name"], position,
+                feat.get("description", ""), feat.get("notes", ""), feat.get("test_prompt"),
+                feat.get("priority", 5),
+                None if generative is None else int(bool(generative)),
+                confidence, feature_status(confidence),
+                feat.get("explored_count", 0), feat.get("last_explored"),
+                json.dumps(feat.get("knowledge_ids", [])),
+                json.dumps(feat["cost_history"]) if "cost_history" in feat else None,
+                feat.get("avg_credit_cost"), feat.get("last_credit_cost"),
+                json.dumps(feat["time_history"]) if "time_history" in feat else None,
+                feat.get("avg_generation_time"),
+            ),
+        )
+
+    def _sync_curriculum(self):
+        """
+        Add new curriculum features and backfill fields older rows lack
+        (e.g. 'generative', 'test_prompt') without touching progress.
+        Skipped when the YAML hasn't changed since the last sync.
+        """
+        path = self.curriculum_path
+        if not path or not path.exists():
+            if not self._conn.execute("SELECT 1 FROM features LIMIT 1").fetchone():
+                logger.warning("No curriculum found — starting with empty feature map")
+            return
+
+        st = path.stat()
+        stamp = f"{st.st_mtime_ns}:{st.st_size}"
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'curriculum'").fetchone()
+        if row and row["value"] == stamp:
+            return
+
+        try:
+            with open(path) as f:
+                curriculum = yaml.safe_load(f) or {}
+        except Exception as e:
+            logger.warning(f"Could not read curriculum: {e}")
+            return
+
+        cat_pos, feat_pos = self._next_positions()
+        added = 0
+        with self._conn:
+            for cat_name, cat_data in curriculum.get("categories", {}).items():
+                cur = self._conn.execute(
+                    "INSERT OR IGNORE INTO categories (name, description, position) VALUES (?, ?, ?)",
+                    (cat_name, cat_data.get("description", ""), cat_pos),
+                )
+                cat_pos += cur.rowcount
+                for feat in cat_data.get("features", []):
+                    cur = self._conn.execute(
+                        """UPDATE features SET
+                               generative = COALESCE(generative, ?),
+                               test_prompt = COALESCE(test_prompt, ?)
+                           WHERE category = ? AND name = ?""",
+                        (
+                            None if "generative" not in feat else int(bool(feat["generative"])),
+                            feat.get("test_prompt"), cat_name, feat["name"],
+                        ),
+                    )
+                    if cur.rowcount == 0:
+                        self._insert_feature(cat_name, {
+                            "name": feat["name"],
+                            "description": feat["description"],
+                            "confidence": feat.get("confidence", 0.0),
+                            "priority": feat.get("priority", 5),
+                            "notes": feat.get("notes", ""),
+                            "generative": feat.get("generative", False),
+                            "test_prompt": feat.get("test_prompt", ""),
+                        }, feat_pos)
+                        feat_pos += 1
+                        added += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('curriculum', ?)", (stamp,),
+            )
+        if added:
+            logger.info(f"Added {added} features from curriculum")
+
+    # ------------------------------------------------------------------
+    # In-memory index
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        self._features: dict[int, dict] = {}
+        self._category: dict[int, str] = {}
+        self._position: dict[int, int] = {}
+        self._version: dict[int, int] = {}
+        self._by_key: dict[tuple[str, str], int] = {}
+        self._by_name: dict[str, list[int]] = {}
+        self._queues: dict[str, list] = {name: [] for name in self._QUEUES}
+
+        for row in self._conn.execute("SELECT * FROM features ORDER BY position"):
+            fid = row["id"]
+            self._features[fid] = self._row_to_feature(row)
+            self._category[fid] = row["category"]
+            self._position[fid] = row["position"]
+            self._version[fid] = 0
+            self._by_key[(row["category"], row["name"])] = fid
+            self._by_name.setdefault(row["name"], []).append(fid)
+            self._index(fid)
+
+    @staticmethod
+    def _row_to_feature(row: sqlite3.Row) -> dict:
+        feat = {
+            "name": row["name"],
+            "description": row["description"],
+            "confidence": row["confidence"],
+            "priority": row["priority"],
+            "notes": row["notes"],
+            "explored_count": row["explored_count"],
+            "last_explored": row["last_explored"],
+            "knowledge_ids": json.loads(row["knowledge_ids"] or "[]"),
+        }
+        if row["generative"] is not None:
+            feat["generative"] = bool(row["generative"])
+        if row["test_prompt"] is not None:
+            feat["test_prompt"] = row["test_prompt"]
+        if row["cost_history"] is not None:
+            feat["cost_history"] = json.loads(row["cost_history"])
+            feat["avg_credit_cost"] = row["avg_credit_cost"]
+            feat["last_credit_cost"] = row["last_credit_cost"]
+        if row["time_history"] is not None:
+            feat["time_history"] = json.loads(row["time_history"])
+            feat["avg_generation_time"] = row["avg_generation_time"]
+        return feat
+
+    def _is_generative(self, fid: int) -> bool:
+        # An explicit per-feature flag wins over the category default
+        feat = self._features[fid]
+        if "generative" in feat:
+            return feat["generative"]
+        return self._category[fid] in self.generative_categories
+
+    # queue name -> (membership test, sort key); ties fall back to curriculum order
+    _QUEUES = {
+        "unexplored": (
+            lambda self, f, fid: f["confidence"] == 0.0,
+            lambda f: (f["priority"], f.get("explored_count", 0)),
+        ),
+        "partial": (
+            lambda self, f, fid: 0.0 < f["confidence"] < 0.5,
+            lambda f: (f["priority"], f.get("explored_count", 0)),
+        ),
+        "deep_dive": (
+            lambda self, f, fid: 0.5 <= f["confidence"] < 0.9,
+            lambda f: (f["priority"], f.get("explored_count", 0)),
+        ),
+        "hands_on": (
+            lambda self, f, fid: self._is_generative(fid) and 0.3 <= f["confidence"] <= 0.7,
+            lambda f: (f["priority"], f["confidence"]),
+        ),
+        "hands_on_fallback": (
+            lambda self, f, fid: self._is_generative(fid) and f["confidence"] < 0.7,
+            lambda f: (f["priority"], -f["confidence"]),
+        ),
+    }
+
+    def _index(self, fid: int):
+        """Push the feature's current entries; older ones become stale."""
+        self._version[fid] += 1
+        feat, version = self._features[fid], self._version[fid]
+        for name, (member, key) in self._QUEUES.items():
+            if member(self, feat, fid):
+                heap = self._queues[name]
+                heapq.heappush(heap, (*key(feat), self._position[fid], version, fid))
+                if len(heap) > 4 * len(self._features) + 64:
+                    self._compact(name)
+
+    def _compact(self, name: str):
+        heap = [e for e in self._queues[name] if self._version[e[-1]] == e[-2]]
+        heapq.heapify(heap)
+        self._queues[name] = heap
+
+    def _peek(self, name: str, exclude: set[str]) -> int | None:
+        """Best live feature in a queue whose name isn't excluded."""
+        heap = self._queues[name]
+        skipped = []
+        found = None
+        while heap:
+            entry = heap[0]
+            fid, version = entry[-1], entry[-2]
+            if self._version[fid] != version:
+                heapq.heappop(heap)
+            elif self._features[fid]["name"] in exclude:
+                skipped.append(heapq.heappop(heap))
+            else:
+                found = fid
+                break
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return found
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def select_next(
+        self,
+        job_relevant: list[str] = None,
+        exclude: set[str] = None,
+        mode: str = "explore",
+    ) -> tuple[str, dict] | None:
+        """
+        Next (category, feature) for a mode, or None. Same ordering as
+        OccyLearner._select_next_feature documents.
+        """
+        exclude = exclude or set()
+
+        if mode == "hands_on":
+            order = ("hands_on", "hands_on_fallback")
+        else:
+            order = ("unexplored", "partial", "relevant", "deep_dive")
+
+        for name in order:
+            if name == "relevant":
+                fid = self._best_relevant(job_relevant or [], exclude)
+            else:
+                fid = self._peek(name, exclude)
+            if fid is not None:
+                return self._category[fid], dict(self._features[fid])
+        return None
+
+    def _best_relevant(self, names: list[str], exclude: set[str]) -> int | None:
+        candidates = [
+            fid
+            for name in set(names) - exclude
+            for fid in self._by_name.get(name, ())
+            if self._features[fid]["confidence"] < 0.7
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda fid: (
+            self._features[fid]["priority"],
+            self._features[fid].get("explored_count", 0),
+            self._position[fid],
+        ))
+
+    def get(self, category: str, name: str) -> dict | None:
+        fid = self._by_key.get((category, name))
+        return dict(self._features[fid]) if fid is not None else None
+
+    def update_progress(
+        self, category: str, feature_name: str,
+        confidence_delta: float, knowledge_id: int = None,
+        credits_spent: int = 0, generation_time: float = 0,
+    ) -> dict | None:
+        """Apply one exploration result and persist just that row."""
+        fid = self._by_key.get((category, feature_name))
+        if fid is None:
+            return None
+        feat = self._features[fid]
+
+        feat["confidence"] = min(1.0, feat["confidence"] + confidence_delta)
+        feat["explored_count"] = feat.get("explored_count", 0) + 1
+        feat["last_explored"] = datetime.now().isoformat()
+        if knowledge_id:
+            feat.setdefault("knowledge_ids", []).append(knowledge_id)
+
+        if credits_spent > 0:
+            history = (feat.get("cost_history", []) + [credits_spent])[-HISTORY_LIMIT:]
+            feat["cost_history"] = history
+            feat["avg_credit_cost"] = round(sum(history) / len(history), 1)
+            feat["last_credit_cost"] = credits_spent
+
+        if generation_time > 0:
+            history = (feat.get("time_history", []) + [round(generation_time, 1)])[-HISTORY_LIMIT:]
+            feat["time_history"] = history
+            feat["avg_generation_time"] = round(sum(history) / len(history), 1)
+
+        with self._conn:
+            self._conn.execute(
+                """UPDATE features SET
+                       confidence = ?, status = ?, explored_count = ?, last_explored = ?,
+                       knowledge_ids = ?, cost_history = ?, avg_credit_cost = ?,
+                       last_credit_cost = ?, time_history = ?, avg_generation_time = ?
+                   WHERE id = ?""",
+                (
+                    feat["confidence"], feature_status(feat["confidence"]),
+                    feat["explored_count"], feat["last_explored"],
+                    json.dumps(feat.get("knowledge_ids", [])),
+                    json.dumps(feat["cost_history"]) if "cost_history" in feat else None,
+                    feat.get("avg_credit_cost"), feat.get("last_credit_cost"),
+                    json.dumps(feat["time_history"]) if "time_history" in feat else None,
+                    feat.get("avg_generation_time"),
+                    fid,
+                ),
+            )
+        self._index(fid)
+        return dict(feat)
+
+    def reset_progress(self) -> int:
+        """Zero confidence/exploration tracking on every explored feature."""
+        with self._conn:
+            count = self._conn.execute(
+                """UPDATE features SET confidence = 0.0, status = 'unexplored',
+                       explored_count = 0, last_explored = NULL, knowledge_ids = '[]'
+                   WHERE confidence > 0"""
+            ).rowcount
+        self._load()
+        return count
+
+    def as_feature_map(self) -> dict:
+        """The old JSON layout: {"categories": {name: {description, features}}}."""
+        feature_map = {"categories": {}}
+        for row in self._conn.execute("SELECT name, description FROM categories ORDER BY position"):
+            feature_map["categories"][row["name"]] = {"description": row["description"], "features": []}
+        for fid, feat in self._features.items():
+            cat = feature_map["categories"].setdefault(
+                self._category[fid], {"description": "", "features": []},
+            )
+            cat["features"].append(dict(feat))
+        return feature_map
+
+    def progress(self) -> dict:
+        rows = self._conn.execute("""
+            SELECT f.category,
+                   COUNT(*) AS total,
+                   SUM(f.confidence > 0) AS explored,
+                   SUM(f.confidence >= 0.7) AS proficient,
+                   SUM(f.confidence >= 0.9) AS mastered
+            FROM features f LEFT JOIN categories c ON c.name = f.category
+            GROUP BY f.category
+            ORDER BY COALESCE(c.position, 1e9), MIN(f.position)
+        """).fetchall()
+        total = sum(r["total"] for r in rows)
+        explored = sum(r["explored"] for r in rows)
+        return {
+            "total_features": total,
+            "explored": explored,
+            "proficient": sum(r["proficient"] for r in rows),
+            "mastered": sum(r["mastered"] for r in rows),
+            "progress_pct": round(explored / total * 100, 1) if total > 0 else 0,
+            "by_category": {
+                r["category"]: {
+                    "total": r["total"],
+                    "explored": r["explored"],
+                    "progress": f"{r['explored']}/{r['total']}",
+                }
+                for r in rows
+            },
+        }
+
+    def cost_sheet(self) -> dict:
+        costs = {}
+        for row in self._conn.execute("""
+            SELECT category, name, avg_credit_cost, last_credit_cost,
+                   avg_generation_time, cost_history
+            FROM features WHERE avg_credit_cost IS NOT NULL ORDER BY position
+        """):
+            costs[row["name"]] = {
+                "category": row["category"],
+                "avg_credits": row["avg_credit_cost"],
+                "last_cost": row["last_credit_cost"],
+                "avg_time_seconds": row["avg_generation_time"],
+                "samples": len(json.loads(row["cost_history"] or "[]")),
+            }
+        return costs
+
+    def close(self):
+        self._conn.close()
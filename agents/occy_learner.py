@@ -26,12 +26,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-import yaml
+from agents.occy_feature_store import FEATURE_DB_PATH, FeatureStore
 
 logger = logging.getLogger(__name__)
 
 CURRICULUM_PATH = Path("config/occy_curriculum.yaml")
-FEATURE_MAP_PATH = Path("data/occy_feature_map.json")
+FEATURE_MAP_PATH = Path("data/occy_feature_map.json")  # Legacy JSON, imported once
 
 # Categories containing features that generate content (cost credits).
 # Used to filter _select_next_feature() in hands-on mode.
@@ -71,107 +71,17 @@ class OccyLearner:
         self.knowledge = knowledge_store
         self.audit_log = audit_log
         self.model_router = model_router
-        self.feature_map = self._load_feature_map()
-
-    def _load_feature_map(self) -> dict:
-        """
-        Load feature map from saved state, or initialize from curriculum.
-
-        The feature map tracks learning progress. It starts from the
-        curriculum YAML and gets updated as Occy explores.
-        """
-        # Try saved state first (preserves progress)
-        if FEATURE_MAP_PATH.exists():
-            try:
-                with open(FEATURE_MAP_PATH) as f:
-                    saved = json.load(f)
-                # Backfill any fields from curriculum that are missing in saved state
-                # (e.g. 'generative' flag added after initial save)
-                self._backfill_from_curriculum(saved)
-                return saved
-            except (json.JSONDecodeError, Exception) as e:
-                logger.warning(f"Corrupted feature map, reinitializing: {e}")
-
-        # Initialize from curriculum
-        if not CURRICULUM_PATH.exists():
-            logger.warning("No curriculum found — starting with empty feature map")
-            return {"categories": {}}
-
-        with open(CURRICULUM_PATH) as f:
-            curriculum = yaml.safe_load(f)
-
-        # Convert to runtime format with tracking fields
-        feature_map = {"categories": {}}
-        for cat_name, cat_data in curriculum.get("categories", {}).items():
-            feature_map["categories"][cat_name] = {
-                "description": cat_data.get("description", ""),
-                "features": [],
-            }
-            for feat in cat_data.get("features", []):
-                feature_map["categories"][cat_name]["features"].append({
-                    "name": feat["name"],
-                    "description": feat["description"],
-                    "confidence": feat.get("confidence", 0.0),
-                    "priority": feat.get("priority", 5),
-                    "notes": feat.get("notes", ""),
-                    "generative": feat.get("generative", False),
-                    "test_prompt": feat.get("test_prompt", ""),
-                    "explored_count": 0,
-                    "last_explored": None,
-                    "knowledge_ids": [],  # IDs of related KnowledgeStore entries
-                })
-
-        self._save_feature_map(feature_map)
-        return feature_map
-
-    def _save_feature_map(self, feature_map: dict = None):
-        """Save feature map state to disk."""
-        if feature_map is None:
-            feature_map = self.feature_map
-
-        FEATURE_MAP_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(FEATURE_MAP_PATH, "w") as f:
-            json.dump(feature_map, f, indent=2)
-
-    def _backfill_from_curriculum(self, saved: dict):
-        """
-        Backfill fields from curriculum YAML into saved feature map.
+        self.features = FeatureStore(
+            db_path=FEATURE_DB_PATH,
+            curriculum_path=CURRICULUM_PATH,
+            legacy_map_path=FEATURE_MAP_PATH,
+            generative_categories=GENERATIVE_CATEGORIES,
+        )
 
-        When new fields are added to the curriculum (e.g. 'generative'),
-        older saved feature maps won't have them. This syncs those fields
-        without overwriting progress data (confidence, explored_count, etc.).
-        """
-        if not CURRICULUM_PATH.exists():
-            return
-
-        try:
-            with open(CURRICULUM_PATH) as f:
-                curriculum = yaml.safe_load(f)
-        except Exception:
-            return
-
-        # Build a lookup: (category, feature_name) -> curriculum feature dict
-        curriculum_lookup = {}
-        for cat_name, cat_data in curriculum.get("categories", {}).items():
-            for feat in cat_data.get("features", []):
-                curriculum_lookup[(cat_name, feat["name"])] = feat
-
-        # Backfill missing fields
-        BACKFILL_FIELDS = ["generative", "test_prompt"]
-        changed = False
-        for cat_name, cat_data in saved.get("categories", {}).items():
-            for feat in cat_data.get("features", []):
-                key = (cat_name, feat["name"])
-                if key in curriculum_lookup:
-                    cur = curriculum_lookup[key]
-                    for field in BACKFILL_FIELDS:
-                        if field not in feat and field in cur:
-                            feat[field] = cur[field]
-                            changed = True
-
-        if changed:
-            logger.info("Backfilled missing fields from curriculum into feature map")
-            self._save_feature_map(saved)
+    @property
+    def feature_map(self) -> dict:
+        """Snapshot of learning progress in the curriculum layout (read-only)."""
+        return self.features.as_feature_map()
 
     def _select_next_feature(
         self,
@@ -203,85 +113,13 @@ class OccyLearner:
         """
         exclude = exclude or set()
 
-        if mode == "hands_on":
-            # Hands-on mode: only generative features at 0.3-0.7 confidence
-            candidates = []
-            for cat_name, cat_data in self.feature_map.get("categories", {}).items():
-                for feat in cat_data.get("features", []):
-                    if feat["name"] in exclude:
-                        continue
-                    # Must be generative (costs credits) or in a generative category.
-                    # Respect explicit per-feature flag — if feature says generative: false,
-                    # skip it even if the category is generative.
-                    if "generative" in feat:
-                        is_generative = feat["generative"]
-                    else:
-                        is_generative = cat_name in GENERATIVE_CATEGORIES
-                    if not is_generative:
-                        continue
-                    # Target range: explored but not yet hands-on tested
-                    if 0.3 <= feat["confidence"] <= 0.7:
-                        candidates.append((cat_name, feat))
-
-            if candidates:
-                candidates.sort(key=lambda x: (x[1]["priority"], x[1]["confidence"]))
-                return candidates[0]
-
-            # Fallback: any generative feature under 0.7 (including unexplored)
-            fallback = []
-            for cat_name, cat_data in self.feature_map.get("categories", {}).items():
-                for feat in cat_data.get("features", []):
-                    if feat["name"] in exclude:
-                        continue
-                    if "generative" in feat:
-                        is_generative = feat["generative"]
-                    else:
-                        is_generative = cat_name in GENERATIVE_CATEGORIES
-                    if is_generative and feat["confidence"] < 0.7:
-                        fallback.append((cat_name, feat))
-
-            if fallback:
-                fallback.sort(key=lambda x: (x[1]["priority"], -x[1]["confidence"]))
-                return fallback[0]
+        selection = self.features.select_next(job_relevant, exclude, mode)
+        if selection is not None:
+            return selection
 
+        if mode == "hands_on":
             logger.info("All generative features at confidence >= 0.7 — hands-on complete!")
-            return None
-
-        # --- Standard explore mode ---
-        unexplored = []
-        partial = []
-        relevant = []
-        deep_dive = []
-
-        for cat_name, cat_data in self.feature_map.get("categories", {}).items():
-            for feat in cat_data.get("features", []):
-                # Skip features already attempted this session
-                if feat["name"] in exclude:
-                    continue
-
-                entry = (cat_name, feat)
-
-                if feat["confidence"] == 0.0:
-                    unexplored.append(entry)
-                elif feat["confidence"] < 0.5:
-                    partial.append(entry)
-                elif feat["confidence"] < 0.9:
-                    deep_dive.append(entry)
-
-                # Check job relevance
-                if job_relevant and feat["name"] in job_relevant:
-                    if feat["confidence"] < 0.7:
-                        relevant.append(entry)
-
-        # Pick from highest priority group
-        for group in [unexplored, partial, relevant, deep_dive]:
-            if group:
-                # Sort by priority (lower number = higher priority), then
-                # by explored_count (prefer least-explored as tiebreaker)
-                group.sort(key=lambda x: (x[1]["priority"], x[1].get("explored_count", 0)))
-                return group[0]
-
-        if exclude:
+        elif exclude:
             logger.info(f"No more features to explore this session ({len(exclude)} already attempted)")
         else:
             logger.info("All features at confidence >= 0.9 — exploration complete!")
@@ -1025,40 +863,12 @@ class OccyLearner:
         credits_spent: int = 0, generation_time: float = 0,
     ):
         """Update a feature's confidence, cost history, and tracking info."""
-        for feat in self.feature_map.get("categories", {}).get(category, {}).get("features", []):
-            if feat["name"] == feature_name:
-                feat["confidence"] = min(1.0, feat["confidence"] + confidence_delta)
-                feat["explored_count"] = feat.get("explored_count", 0) + 1
-                feat["last_explored"] = datetime.now().isoformat()
-                if knowledge_id:
-                    feat.setdefault("knowledge_ids", []).append(knowledge_id)
-
-                # Track credit costs — builds up over time so Occy knows
-                # "GPT Image 1.5 Low costs ~3 credits" off the top of his head
-                if credits_spent > 0:
-                    cost_history = feat.setdefault("cost_history", [])
-                    cost_history.append(credits_spent)
-                    # Keep last 20 readings
-                    if len(cost_history) > 20:
-                        feat["cost_history"] = cost_history[-20:]
-                    feat["avg_credit_cost"] = round(
-                        sum(feat["cost_history"]) / len(feat["cost_history"]), 1
-                    )
-                    feat["last_credit_cost"] = credits_spent
-
-                # Track generation times similarly
-                if generation_time > 0:
-                    time_history = feat.setdefault("time_history", [])
-                    time_history.append(round(generation_time, 1))
-                    if len(time_history) > 20:
-                        feat["time_history"] = time_history[-20:]
-                    feat["avg_generation_time"] = round(
-                        sum(feat["time_history"]) / len(feat["time_history"]), 1
-                    )
-
-                break
-
-        self._save_feature_map()
+        self.features.update_progress(
+            category, feature_name, confidence_delta,
+            knowledge_id=knowledge_id,
+            credits_spent=credits_spent,
+            generation_time=generation_time,
+        )
 
     async def _ensure_browser_connected(self) -> bool:
         """
@@ -1190,40 +1000,7 @@ class OccyLearner:
         Returns:
             dict with total features, explored, mastered, by_category breakdown
         """
-        total = 0
-        explored = 0  # confidence > 0
-        proficient = 0  # confidence >= 0.7
-        mastered = 0  # confidence >= 0.9
-        by_category = {}
-
-        for cat_name, cat_data in self.feature_map.get("categories", {}).items():
-            cat_total = 0
-            cat_explored = 0
-            for feat in cat_data.get("features", []):
-                cat_total += 1
-                total += 1
-                if feat["confidence"] > 0:
-                    explored += 1
-                    cat_explored += 1
-                if feat["confidence"] >= 0.7:
-                    proficient += 1
-                if feat["confidence"] >= 0.9:
-                    mastered += 1
-
-            by_category[cat_name] = {
-                "total": cat_total,
-                "explored": cat_explored,
-                "progress": f"{cat_explored}/{cat_total}",
-            }
-
-        return {
-            "total_features": total,
-            "explored": explored,
-            "proficient": proficient,
-            "mastered": mastered,
-            "progress_pct": round(explored / total * 100, 1) if total > 0 else 0,
-            "by_category": by_category,
-        }
+        return self.features.progress()
 
     def get_cost_sheet(self) -> dict:
         """
@@ -1232,15 +1009,4 @@ class OccyLearner:
         Returns a dict of feature_name -> cost info, built from real usage.
         This is Occy's "off the top of his head" pricing knowledge.
         """
-        costs = {}
-        for cat_name, cat_data in self.feature_map.get("categories", {}).items():
-            for feat in cat_data.get("features", []):
-                if feat.get("avg_credit_cost") is not None:
-                    costs[feat["name"]] = {
-                        "category": cat_name,
-                        "avg_credits": feat["avg_credit_cost"],
-                        "last_cost": feat.get("last_credit_cost"),
-                        "avg_time_seconds": feat.get("avg_generation_time"),
-                        "samples": len(feat.get("cost_history", [])),
-                    }
-        return costs
+        return self.features.cost_sheet()
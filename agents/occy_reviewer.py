@@ -14,9 +14,16 @@ Scoring dimensions (each 1-10):
 
 Overall score = weighted average. Threshold: 7.0 for delivery.
 
+Before uploading, a local pre-review decodes a strided frame sample and the
+audio envelope with FFmpeg and rejects clips with obvious defects (black or
+frozen frames, missing/silent audio, wrong resolution or duration) without
+an upload. Verdicts are cached per file hash + script.
+
 Requires: GOOGLE_API_KEY in .env
 """
 
+import asyncio
+import hashlib
 import json
 import logging
 import os
@@ -25,8 +32,15 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+
+from video_pipeline import media_tools
+
 logger = logging.getLogger(__name__)
 
+REVIEW_CACHE_PATH = Path("data/occy_review_cache.json")
+MAX_CACHED_REVIEWS = 1000
+
 
 @dataclass
 class QualityScore:
@@ -41,6 +55,7 @@ class QualityScore:
     recommendation: str = ""          # "approve" / "regenerate" / "adjust"
     regeneration_notes: str = ""      # What to change if regenerating
     reviewed_at: str = ""
+    pre_review: dict = field(default_factory=dict)  # Local metrics (see PreReview)
 
     def to_dict(self) -> dict:
         return asdict(self)
@@ -61,6 +76,33 @@ DELIVERY_THRESHOLD = 7.0
 # Minimum score for portfolio inclusion
 PORTFOLIO_THRESHOLD = 8.0
 
+# regeneration_notes of the placeholder verdicts returned when Gemini's
+# answer can't be parsed - never cached, the next review asks again
+PARSE_FAILED_NOTES = "Failed to parse quality review"
+NO_REVIEW_NOTES = "No structured review in response"
+
+# Local pre-review: sample size and defect thresholds
+PREVIEW_FRAMES = 24               # Frames sampled evenly across the clip
+PREVIEW_WIDTH = 160               # Sampled frames are downscaled greyscale
+AUDIO_RATE = 8000                 # Mono envelope sample rate
+AUDIO_WINDOW = 0.05               # Envelope window (seconds)
+BLACK_LUMA = 16.0                 # Mean luma below this = black frame
+MAX_BLACK_RATIO = 0.3             # Reject if more sampled frames are black
+FROZEN_DIFF = 0.6                 # Mean abs pixel change below this = frozen
+MAX_FROZEN_RATIO = 0.6            # Reject if more sample steps are frozen
+SILENCE_DBFS = -50.0              # Envelope below this = silence
+MAX_SILENT_RATIO = 0.9            # Reject if more of the audio is silent
+MIN_SHORT_SIDE = 480              # Reject anything below 480p
+DURATION_TOLERANCE = 0.35         # Allowed deviation from target duration
+
+
+@dataclass
+class PreReview:
+    """Local quality check run before any upload."""
+    passed: bool = True
+    issues: list[str] = field(default_factory=list)
+    metrics: dict = field(default_factory=dict)
+
 
 class OccyReviewer:
     """
@@ -70,11 +112,13 @@ class OccyReviewer:
     making it ideal for comprehensive quality assessment without frame extraction.
     """
 
-    def __init__(self, knowledge_store=None):
+    def __init__(self, knowledge_store=None, cache_path: Path | None = REVIEW_CACHE_PATH):
         self.knowledge_store = knowledge_store
         self._google_key = os.environ.get("GOOGLE_API_KEY")
         if not self._google_key:
             logger.warning("GOOGLE_API_KEY not set — video review will be unavailable")
+        self._cache_path = Path(cache_path) if cache_path else None
+        self._cache = self._load_cache()
 
     async def review_video(
         self,
@@ -88,7 +132,8 @@ class OccyReviewer:
         Args:
             video_path: Path to the video file
             script: The intended script/prompt for adherence checking
-            context: Additional context (model used, settings, etc.)
+            context: Additional context (model used, settings, etc.);
+                     "requires_audio": True rejects clips with no or silent audio locally
 
         Returns:
             QualityScore with all dimensions scored and recommendation
@@ -102,17 +147,56 @@ class OccyReviewer:
                 reviewed_at=datetime.now().isoformat(),
             )
 
+        context = context or {}
+        cache_key = await asyncio.to_thread(self._review_key, video_path, script, context)
+        cached = self._cache.get(cache_key)
+        if cached:
+            logger.info(f"Quality review: cached verdict for {video_path.name}")
+            return QualityScore(**cached)
+
+        # Local pre-review — obvious defects never pay for upload + Gemini
+        try:
+            pre = await self._pre_review(video_path, context)
+        except Exception as e:
+            logger.warning(f"Local pre-review failed, continuing to remote review: {e}")
+            pre = PreReview(metrics={"error": str(e)})
+
+        if not pre.passed:
+            score = QualityScore(
+                issues=pre.issues,
+                recommendation="regenerate",
+                regeneration_notes="Failed local pre-review: " + "; ".join(pre.issues),
+                reviewed_at=datetime.now().isoformat(),
+                pre_review=asdict(pre),
+            )
+            logger.info(f"Quality review: rejected locally — {'; '.join(pre.issues)}")
+            self._remember(cache_key, score)
+            if self.knowledge_store:
+                self.knowledge_store.add(
+                    category="lesson",
+                    topic=f"Video quality review: {video_path.name}",
+                    content=f"Rejected by local pre-review: {'; '.join(pre.issues)}",
+                    source="local_prereview",
+                    confidence=0.9,
+                    tags=["quality_review", "video", "regenerate"],
+                )
+            return score
+
         if not self._google_key:
             logger.error("Cannot review video — GOOGLE_API_KEY not set")
             return QualityScore(
                 recommendation="adjust",
                 regeneration_notes="Video review unavailable — no API key",
                 reviewed_at=datetime.now().isoformat(),
+                pre_review=asdict(pre),
             )
 
         try:
-            score = await self._analyze_with_gemini(video_path, script, context or {})
+            score = await self._analyze_with_gemini(video_path, script, context)
             score.reviewed_at = datetime.now().isoformat()
+            score.pre_review = asdict(pre)
+            if score.regeneration_notes not in (PARSE_FAILED_NOTES, NO_REVIEW_NOTES):
+                self._remember(cache_key, score)
 
             # Log the review
             logger.info(
@@ -147,6 +231,160 @@ class OccyReviewer:
                 reviewed_at=datetime.now().isoformat(),
             )
 
+    # ------------------------------------------------------------------
+    # Local pre-review
+    # ------------------------------------------------------------------
+
+    async def _pre_review(self, video_path: Path, context: dict) -> PreReview:
+        """
+        Decode a strided frame sample and the audio envelope, and check
+        for defects that make a remote review pointless.
+        """
+        info = await media_tools.get_video_info_async(str(video_path))
+        duration, width, height = info["duration"], info["width"], info["height"]
+        pre = PreReview(metrics={
+            "width": width, "height": height,
+            "duration": round(duration, 2), "audio_codec": info["audio_codec"],
+        })
+
+        if not width or not height or duration <= 0:
+            pre.passed = False
+            pre.issues.append("No decodable video stream")
+            return pre
+
+        frames, envelope = await asyncio.gather(
+            self._sample_frames(video_path, duration, width, height),
+            self._audio_envelope(video_path) if info["audio_codec"] else _no_audio(),
+        )
+
+        # Resolution / duration against what was asked for
+        expected = str(context.get("resolution", ""))
+        if "x" in expected:
+            exp_w, exp_h = (int(v) for v in expected.lower().split("x"))
+            if (width, height) != (exp_w, exp_h):
+                pre.issues.append(f"Resolution {width}x{height}, expected {expected}")
+        elif min(width, height) < MIN_SHORT_SIDE:
+            pre.issues.append(f"Resolution {width}x{height} below {MIN_SHORT_SIDE}p")
+
+        try:
+            target = float(context.get("duration"))
+        except (TypeError, ValueError):
+            target = 0.0
+        if target > 0 and abs(duration - target) > max(2.0, target * DURATION_TOLERANCE):
+            pre.issues.append(f"Duration {duration:.1f}s, target {target:.0f}s")
+
+        # Black / frozen frames
+        if len(frames) == 0:
+            pre.issues.append("No frames decoded")
+        else:
+            luma = frames.mean(axis=(1, 2))
+            black_ratio = float((luma < BLACK_LUMA).mean())
+            steps = np.abs(np.diff(frames, axis=0)).mean(axis=(1, 2)) if len(frames) > 1 else np.zeros(0)
+            frozen_ratio = float((steps < FROZEN_DIFF).mean()) if len(steps) else 0.0
+            pre.metrics.update({
+                "frames_sampled": len(frames),
+                "mean_luma": round(float(luma.mean()), 1),
+                "black_ratio": round(black_ratio, 2),
+                "frozen_ratio": round(frozen_ratio, 2),
+                "motion": round(float(steps.mean()), 2) if len(steps) else 0.0,
+            })
+            if black_ratio > MAX_BLACK_RATIO:
+                pre.issues.append(f"{black_ratio:.0%} of sampled frames are black")
+            if frozen_ratio > MAX_FROZEN_RATIO:
+                pre.issues.append(f"Frozen video ({frozen_ratio:.0%} of samples unchanged)")
+
+        # Audio present and audible - only when the caller says the clip is
+        # narrated; a silent clip is otherwise left to the remote review
+        # (which scores it as neutral)
+        requires_audio = context.get("requires_audio", False)
+        if envelope is None:
+            if requires_audio:
+                pre.issues.append("No audio track")
+        else:
+            silent_ratio = float((envelope < SILENCE_DBFS).mean()) if len(envelope) else 1.0
+            pre.metrics.update({
+                "audio_peak_dbfs": round(float(envelope.max()), 1) if len(envelope) else -120.0,
+                "silent_ratio": round(silent_ratio, 2),
+            })
+            if requires_audio and silent_ratio > MAX_SILENT_RATIO:
+                pre.issues.append(f"Audio track is silent ({silent_ratio:.0%} below {SILENCE_DBFS:.0f} dBFS)")
+
+        pre.passed = not pre.issues
+        return pre
+
+    async def _sample_frames(self, video_path: Path, duration: float, width: int, height: int) -> np.ndarray:
+        """PREVIEW_FRAMES greyscale frames, evenly spaced, as (n, h, w) uint8."""
+        out_w = PREVIEW_WIDTH
+        out_h = max(2, int(round(PREVIEW_WIDTH * height / width / 2)) * 2)
+        rate = PREVIEW_FRAMES / duration
+        raw = await _run_ffmpeg([
+            "-i", str(video_path),
+            "-vf", f"fps={rate:.6f},scale={out_w}:{out_h},format=gray",
+            "-frames:v", str(PREVIEW_FRAMES),
+            "-an", "-f", "rawvideo", "pipe:1",
+        ])
+        frame_size = out_w * out_h
+        count = len(raw) // frame_size
+        return np.frombuffer(raw[:count * frame_size], dtype=np.uint8).reshape(count, out_h, out_w).astype(np.float32)
+
+    async def _audio_envelope(self, video_path: Path) -> np.ndarray:
+        """RMS level per AUDIO_WINDOW in dBFS, from mono AUDIO_RATE PCM."""
+        raw = await _run_ffmpeg([
+            "-i", str(video_path), "-vn", "-ac", "1", "-ar", str(AUDIO_RATE),
+            "-f", "s16le", "pipe:1",
+        ])
+        pcm = np.frombuffer(raw[:len(raw) // 2 * 2], dtype=np.int16).astype(np.float32) / 32768.0
+        window = int(AUDIO_RATE * AUDIO_WINDOW)
+        blocks = pcm[:len(pcm) // window * window].reshape(-1, window)
+        rms = np.sqrt((blocks ** 2).mean(axis=1))
+        return 20 * np.log10(np.maximum(rms, 1e-6))
+
+    # ------------------------------------------------------------------
+    # Verdict cache (per file hash + review inputs)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _review_key(video_path: Path, script: str, context: dict) -> str:
+        """Content hash of the file plus the inputs that shape the verdict."""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(video_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        inputs = json.dumps(
+            [script, context.get("model"), context.get("duration"), context.get("resolution"),
+             context.get("requires_audio", False)],
+            default=str,
+        )
+        return digest.hexdigest() + ":" + hashlib.blake2b(inputs.encode(), digest_size=8).hexdigest()
+
+    def _load_cache(self) -> dict:
+        if not self._cache_path or not self._cache_path.exists():
+            return {}
+        try:
+            with open(self._cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Review cache unreadable, starting fresh: {e}")
+            return {}
+
+    def _remember(self, key: str, score: QualityScore):
+        self._cache.pop(key, None)
+        self._cache[key] = score.to_dict()
+        while len(self._cache) > MAX_CACHED_REVIEWS:
+            self._cache.pop(next(iter(self._cache)))
+        if not self._cache_path:
+            return
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._cache_path, "w", encoding="utf-8") as f:
+                json.dump(self._cache, f)
+        except Exception as e:
+            logger.debug(f"Review cache save failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Remote review (Gemini)
+    # ------------------------------------------------------------------
+
     async def _analyze_with_gemini(
         self,
         video_path: Path,
@@ -357,12 +595,12 @@ If there's no audio track, score audio_sync as 5 (neutral) and note it in issues
                     logger.warning(f"Could not parse review response: {text[:200]}")
                     return QualityScore(
                         recommendation="adjust",
-                        regeneration_notes="Failed to parse quality review",
+                        regeneration_notes=PARSE_FAILED_NOTES,
                     )
             else:
                 return QualityScore(
                     recommendation="adjust",
-                    regeneration_notes="No structured review in response",
+                    regeneration_notes=NO_REVIEW_NOTES,
                 )
 
         score = QualityScore(
@@ -398,3 +636,20 @@ If there's no audio track, score audio_sync as 5 (neutral) and note it in issues
     def should_add_to_portfolio(self, score: QualityScore) -> bool:
         """Check if a video is good enough for the portfolio."""
         return score.overall >= PORTFOLIO_THRESHOLD
+
+
+async def _run_ffmpeg(args: list[str]) -> bytes:
+    """Run ffmpeg with raw output on stdout and return it."""
+    proc = await asyncio.create_subprocess_exec(
+        media_tools.find_ffmpeg(), "-v", "error", "-nostdin", *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    if proc.returncode != 0 and not stdout:
+        raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace')[-300:]}")
+    return stdout
+
+
+async def _no_audio():
+    return None
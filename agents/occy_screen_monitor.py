@@ -35,6 +35,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Callable, Optional
 
+from agents.occy_screen_prescreen import ScreenPrescreen
+
 logger = logging.getLogger(__name__)
 
 SCREENSHOT_DIR = Path("data/occy_screenshots")
@@ -73,7 +75,8 @@ class ScreenMonitor:
         self._watching = False
         self._watch_task = None
         self._last_chat_count = 0
-        self._last_page_text_hash = None
+        # Local text/pixel/rule checks so only new screen states reach Vision
+        self._prescreen = ScreenPrescreen()
         self._context = ""  # What Occy is currently doing (for Vision prompts)
 
         # Track what we've seen to avoid reacting to the same thing twice
@@ -102,7 +105,15 @@ class ScreenMonitor:
             except asyncio.CancelledError:
                 pass
             self._watch_task = None
-        logger.info("Screen monitor stopped")
+        report = self._prescreen.report()
+        logger.info(
+            f"Screen monitor stopped — {report['escalations']}/{report['checks']} "
+            f"checks escalated to Vision ({report['rule_hits']} known states reused)"
+        )
+
+    def get_prescreen_report(self) -> dict:
+        """Escalation rate and local pre-screen latency since creation."""
+        return self._prescreen.report()
 
     @asynccontextmanager
     async def watching(self, context: str = ""):
@@ -123,8 +134,8 @@ class ScreenMonitor:
         """
         Main monitoring loop — lightweight checks with smart escalation.
 
-        Level 1: Check if page text changed (cheap — no API calls)
-        Level 2: If changed, analyze what happened (screenshot + Vision)
+        Level 1: Check if page/screen changed (cheap — no API calls)
+        Level 2: If changed, analyze what happened (known state or Vision)
         Level 3: If interaction needed, call the handler
         """
         while self._watching:
@@ -137,7 +148,11 @@ class ScreenMonitor:
                     )
 
                     # Something changed — analyze what's going on
-                    event = await self._analyze_screen()
+                    prescreen = change.get("prescreen")
+                    if prescreen is not None and not prescreen.escalate:
+                        event = self._known_state_event(prescreen, change.get("screenshot"))
+                    else:
+                        event = await self._analyze_screen(change.get("screenshot"), prescreen)
 
                     if event and event.get("needs_interaction"):
                         logger.info(
@@ -165,71 +180,73 @@ class ScreenMonitor:
         """
         Quick check: did the page change since last time we looked?
 
-        Uses page text hash — no API calls, very cheap.
-        Returns dict with 'changed' bool and 'reason' string.
+        Page text is diffed with volatile bits (timers, counters, spinners)
+        masked; if it still changed, the screenshot's perceptual hash is
+        compared with the last one and looked up in the known-state cache.
+        No API calls.
+        Returns dict with 'changed' bool and 'reason' string, plus the
+        'prescreen' result and 'screenshot' path when one was taken.
         """
         if not self.browser or not self.browser.is_connected:
             return {"changed": False, "reason": "browser disconnected"}
 
         try:
             text = await self.browser.get_page_text()
-            text_hash = hash(text)
-
-            if self._last_page_text_hash is None:
-                # First check — establish baseline
-                self._last_page_text_hash = text_hash
-                return {"changed": False, "reason": "baseline established"}
-
-            if text_hash != self._last_page_text_hash:
-                self._last_page_text_hash = text_hash
-
-                # Quick heuristics: what kind of change?
-                text_lower = text.lower()
-
-                if any(q in text_lower for q in [
-                    "would you like", "do you want", "shall i",
-                    "please confirm", "is this correct", "approve",
-                    "choose", "select", "pick",
-                    "answer to continue", "what kind of video",
-                    "1/4", "2/4", "3/4", "4/4",
-                    "1/3", "2/3", "3/3",
-                ]):
-                    return {"changed": True, "reason": "question detected in page text"}
+            result = self._prescreen.check_text(text)
 
-                if any(e in text_lower for e in [
-                    "error", "failed", "insufficient credits",
-                    "something went wrong",
-                ]):
-                    return {"changed": True, "reason": "error detected"}
+            if result.level == "baseline":
+                # First check — establish baseline (text and pixels)
+                screenshot = await self.browser.take_screenshot("monitor_baseline")
+                if screenshot:
+                    await asyncio.to_thread(self._prescreen.baseline_image, screenshot)
+                return {"changed": False, "reason": result.reason}
 
-                if any(d in text_lower for d in [
-                    "download", "render complete", "your video is ready",
-                    "export complete",
-                ]):
-                    return {"changed": True, "reason": "completion detected"}
+            if not result.changed:
+                return {"changed": False, "reason": result.reason}
 
-                # Generic change — could be a new chat message
-                return {"changed": True, "reason": "page content changed"}
+            screenshot = await self.browser.take_screenshot("monitor")
+            if screenshot:
+                result = await asyncio.to_thread(self._prescreen.check_image, result, screenshot)
+            else:
+                # No pixels to compare — let the analysis step decide
+                result.escalate = True
 
-            return {"changed": False, "reason": "no change"}
+            return {
+                "changed": result.changed,
+                "reason": result.reason,
+                "prescreen": result,
+                "screenshot": screenshot,
+            }
 
         except Exception as e:
             logger.debug(f"Change detection error: {e}")
             return {"changed": False, "reason": f"error: {e}"}
 
+    def _known_state_event(self, prescreen, screenshot_path) -> dict | None:
+        """Replay the stored Vision verdict for a screen state seen before."""
+        if not prescreen.decision:
+            return None
+        event = dict(prescreen.decision)
+        event["screenshot"] = str(screenshot_path) if screenshot_path else None
+        event["timestamp"] = datetime.now().isoformat()
+        return event
+
     # ------------------------------------------------------------------
     # Level 2: Visual analysis (screenshot + Vision API)
     # ------------------------------------------------------------------
 
-    async def _analyze_screen(self) -> dict | None:
+    async def _analyze_screen(self, screenshot_path=None, prescreen=None) -> dict | None:
         """
-        Take a screenshot and ask Gemini Vision what's happening.
+        Take a screenshot (unless given one) and ask Gemini Vision what's
+        happening. The verdict is remembered for the pre-screen's state
+        cache, so the same screen state won't be sent again.
 
         This is the "glance across at the screen" step.
         Returns event dict or None if nothing needs attention.
         """
         # Take screenshot
-        screenshot_path = await self.browser.take_screenshot("monitor")
+        if not screenshot_path:
+            screenshot_path = await self.browser.take_screenshot("monitor")
         if not screenshot_path:
             # Fallback: analyze page text only
             return await self._analyze_text_only()
@@ -282,6 +299,8 @@ class ScreenMonitor:
                 result_text = result_text.strip()
 
             event = json.loads(result_text)
+            if prescreen is not None:
+                self._prescreen.remember(prescreen, event)
             event["screenshot"] = str(screenshot_path)
             event["timestamp"] = datetime.now().isoformat()
             return event
@@ -0,0 +1,320 @@
+"""
+Occy Screen Pre-screen — local change classification before Vision.
+
+The screen monitor used to escalate on any page-text change, so a ticking
+render timer, a credit counter or a spinner cost a screenshot plus a paid
+Gemini Vision call every check interval. This module decides locally,
+cheapest check first:
+
+    1. Text: normalise the page text (mask digits except step indicators
+       like 2/4, spinner glyphs, ellipses, "x minutes ago") and diff it by
+       line. Identical after masking -> only volatile regions changed.
+    2. Pixels: dHash + pHash of the downscaled screenshot (NumPy). If the
+       screen looks the same and no added line mentions a question, error
+       or completion, the change is off-screen noise.
+    3. Rules: a cache of screen states Vision has already judged, keyed by
+       normalised-text digest and checked against the pHash. A known state
+       reuses the stored decision.
+
+Only genuinely new states reach the Vision model.
+
+Usage:
+    prescreen = ScreenPrescreen()
+    result = prescreen.check_text(page_text)
+    if result.level == "text":
+        ...                                   # nothing worth looking at
+    result = prescreen.check_image(result, screenshot_path)
+    if result.escalate:
+        event = await vision(...)
+        prescreen.remember(result, event)
+    else:
+        event = result.decision               # cached or None
+"""
+
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STATE_CACHE_PATH = Path("data/occy_screen_states.json")
+MAX_CACHED_STATES = 500
+
+# Hamming distances (64-bit hashes)
+SAME_SCREEN_DHASH = 3     # level 2: screenshot effectively unchanged
+SAME_SCREEN_PHASH = 6
+KNOWN_STATE_PHASH = 12    # level 3: same text state, layout close enough
+
+QUESTION_CUES = (
+    "would you like", "do you want", "shall i",
+    "please confirm", "is this correct", "approve",
+    "choose", "select", "pick",
+    "answer to continue", "what kind of video",
+    "1/4", "2/4", "3/4", "4/4",
+    "1/3", "2/3", "3/3",
+)
+ERROR_CUES = ("error", "failed", "insufficient credits", "something went wrong")
+COMPLETION_CUES = ("download", "render complete", "your video is ready", "export complete")
+
+# Step indicators (2/4) are meaningful; every other number is volatile
+_NUMBER_RE = re.compile(r"\d+\s?/\s?\d+|\d[\d,.]*")
+_SPINNER_RE = re.compile(r"[⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏◐◓◑◒◴◷◶◵⣾⣽⣻⢿⡿⣟⣯⣷]|…|\.{2,}")
+_RELATIVE_RE = re.compile(
+    r"\b(?:just now|a few seconds ago|an? (?:second|minute|hour) ago"
+    r"|\d+\s*(?:s|sec|second|m|min|minute|h|hr|hour)s?\s+ago)\b"
+)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_page_text(text: str) -> list[str]:
+    """Page text as lines with volatile content masked."""
+    lines = []
+    for line in text.lower().splitlines():
+        line = _SPINNER_RE.sub("…", line)
+        line = _RELATIVE_RE.sub("# ago", line)
+        line = _NUMBER_RE.sub(lambda m: m.group(0) if "/" in m.group(0) else "#", line)
+        line = _SPACE_RE.sub(" ", line).strip()
+        # A line that is only a spinner/counter carries no state
+        if line and line.strip("#…%:/ ") != "":
+            lines.append(line)
+    return lines
+
+
+def classify_lines(lines) -> str | None:
+    """'question' / 'error' / 'complete' if any line carries that cue."""
+    text = "\n".join(lines)
+    if any(cue in text for cue in QUESTION_CUES):
+        return "question"
+    if any(cue in text for cue in ERROR_CUES):
+        return "error"
+    if any(cue in text for cue in COMPLETION_CUES):
+        return "complete"
+    return None
+
+
+# ----------------------------------------------------------------------
+# Perceptual hashes (NumPy)
+# ----------------------------------------------------------------------
+
+def load_gray(image) -> np.ndarray:
+    """Path, PIL image or array -> 2-D float32 luminance array."""
+    if isinstance(image, np.ndarray):
+        arr = image.astype(np.float32)
+        if arr.ndim == 3:
+            arr = arr[..., :3] @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        return arr
+    from PIL import Image
+
+    img = image if hasattr(image, "convert") else Image.open(str(image))
+    return np.asarray(img.convert("L"), dtype=np.float32)
+
+
+def downscale(gray: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Area-average resize (box filter) to height x width."""
+    h, w = gray.shape
+    rows = np.linspace(0, h, height + 1).astype(int)[:-1]
+    cols = np.linspace(0, w, width + 1).astype(int)[:-1]
+    summed = np.add.reduceat(np.add.reduceat(gray, rows, axis=0), cols, axis=1)
+    counts = np.outer(np.diff(np.r_[rows, h]), np.diff(np.r_[cols, w]))
+    return summed / np.maximum(counts, 1)
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.ravel().astype(np.uint8)).tobytes(), "big")
+
+
+def dhash(gray: np.ndarray, size: int = 8) -> int:
+    """Difference hash: is each cell brighter than its right neighbour."""
+    small = downscale(gray, size + 1, size)
+    # Half a grey level of margin so flat UI areas don't flip on rounding
+    return _bits_to_int(small[:, 1:] > small[:, :-1] + 0.5)
+
+
+_DCT_CACHE: dict[int, np.ndarray] = {}
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    if n not in _DCT_CACHE:
+        k = np.arange(n)[:, None]
+        i = np.arange(n)[None, :]
+        _DCT_CACHE[n] = np.cos(np.pi * (2 * i + 1) * k / (2 * n)).astype(np.float32)
+    return _DCT_CACHE[n]
+
+
+def phash(gray: np.ndarray, size: int = 8, scale: int = 4) -> int:
+    """DCT hash: low-frequency coefficients above their median."""
+    n = size * scale
+    dct = _dct_matrix(n)
+    coeffs = (dct @ downscale(gray, n, n) @ dct.T)[:size, :size]
+    low = coeffs.ravel()[1:]  # drop DC (overall brightness)
+    return _bits_to_int(coeffs > np.median(low))
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+# ----------------------------------------------------------------------
+# Classifier
+# ----------------------------------------------------------------------
+
+@dataclass
+class PrescreenResult:
+    """Outcome of one check. `level` is where the decision was made."""
+    changed: bool
+    reason: str
+    level: str                      # baseline | text | pixels | rule | vision
+    escalate: bool = False
+    digest: str = ""
+    lines: list[str] = field(default_factory=list)
+    added: list[str] = field(default_factory=list)
+    dhash: int | None = None
+    phash: int | None = None
+    decision: dict | None = None
+
+
+class ScreenPrescreen:
+    """Multi-level local change classifier with a persistent state cache."""
+
+    def __init__(self, cache_path: Path | None = STATE_CACHE_PATH):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._lines: list[str] | None = None
+        self._digest: str | None = None
+        self._hashes: tuple[int, int] | None = None
+        # digest -> {"phash": int, "decision": dict | None, "hits": int}
+        self._states: OrderedDict[str, dict] = OrderedDict()
+        self.stats = Counter()
+        self._elapsed = 0.0
+        self._load()
+
+    # --- persistence ---
+
+    def _load(self):
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            for digest, state in data.items():
+                self._states[digest] = state
+        except Exception as e:
+            logger.warning(f"Screen state cache unreadable, starting fresh: {e}")
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_path.write_text(json.dumps(self._states), encoding="utf-8")
+        except Exception as e:
+            logger.debug(f"Screen state cache save failed: {e}")
+
+    # --- levels ---
+
+    def check_text(self, text: str) -> PrescreenResult:
+        """Level 1. Cheap: no screenshot needed when this says no change."""
+        start = time.perf_counter()
+        lines = normalize_page_text(text)
+        digest = hashlib.sha1("\n".join(lines).encode("utf-8")).hexdigest()[:16]
+
+        if self._digest is None:
+            result = PrescreenResult(False, "baseline established", "baseline",
+                                     digest=digest, lines=lines)
+        elif digest == self._digest:
+            result = PrescreenResult(False, "only volatile text changed", "text",
+                                     digest=digest, lines=lines)
+        else:
+            previous = Counter(self._lines)
+            added = []
+            for line in lines:
+                if previous[line] > 0:
+                    previous[line] -= 1
+                else:
+                    added.append(line)
+            kind = classify_lines(added)
+            reason = {
+                "question": "question detected in page text",
+                "error": "error detected",
+                "complete": "completion detected",
+            }.get(kind, "page content changed")
+            result = PrescreenResult(True, reason, "text", digest=digest,
+                                     lines=lines, added=added)
+
+        self._lines, self._digest = lines, digest
+        self.stats["checks"] += 1
+        if not result.changed:
+            self.stats[result.level] += 1
+        self._elapsed += time.perf_counter() - start
+        return result
+
+    def check_image(self, result: PrescreenResult, image) -> PrescreenResult:
+        """
+        Levels 2-3 for a text change: compare the screenshot with the last
+        one, then look the state up in the rule cache. Sets `escalate`
+        when Vision is needed.
+        """
+        start = time.perf_counter()
+        gray = load_gray(image)
+        result.dhash, result.phash = dhash(gray), phash(gray)
+        previous, self._hashes = self._hashes, (result.dhash, result.phash)
+
+        cue = classify_lines(result.added)
+        if (
+            previous is not None and cue is None
+            and hamming(result.dhash, previous[0]) <= SAME_SCREEN_DHASH
+            and hamming(result.phash, previous[1]) <= SAME_SCREEN_PHASH
+        ):
+            result.changed, result.level = False, "pixels"
+            result.reason = "text changed off-screen; screenshot unchanged"
+        else:
+            state = self._states.get(result.digest)
+            if state is not None and hamming(result.phash, state["phash"]) <= KNOWN_STATE_PHASH:
+                self._states.move_to_end(result.digest)
+                state["hits"] = state.get("hits", 0) + 1
+                result.level, result.decision = "rule", state["decision"]
+                result.reason = f"known screen state ({result.reason})"
+            else:
+                result.level, result.escalate = "vision", True
+
+        self.stats[result.level] += 1
+        self._elapsed += time.perf_counter() - start
+        return result
+
+    def baseline_image(self, image):
+        """Record the first screenshot so level 2 has something to compare."""
+        gray = load_gray(image)
+        self._hashes = (dhash(gray), phash(gray))
+
+    def remember(self, result: PrescreenResult, decision: dict | None):
+        """Store Vision's verdict for this state (without per-shot fields)."""
+        if result.phash is None:
+            return
+        if decision is not None:
+            decision = {k: v for k, v in decision.items() if k not in ("screenshot", "timestamp")}
+        self._states[result.digest] = {"phash": result.phash, "decision": decision, "hits": 0}
+        self._states.move_to_end(result.digest)
+        while len(self._states) > MAX_CACHED_STATES:
+            self._states.popitem(last=False)
+        self._save()
+
+    # --- reporting ---
+
+    def report(self) -> dict:
+        """Escalation rate and local latency since start."""
+        checks = self.stats["checks"]
+        return {
+            "checks": checks,
+            "text_unchanged": self.stats["text"],
+            "screenshot_unchanged": self.stats["pixels"],
+            "rule_hits": self.stats["rule"],
+            "escalations": self.stats["vision"],
+            "escalation_rate": self.stats["vision"] / checks if checks else 0.0,
+            "avg_local_ms": self._elapsed / checks * 1000 if checks else 0.0,
+            "known_states": len(self._states),
+        }
@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Optional
 
+from core.schema_migrations import ensure_indexes
+
 logger = logging.getLogger(__name__)
 
 # Database path
@@ -148,6 +150,8 @@ class KnowledgeStore:
         """)
 
         conn.commit()
+        ensure_indexes(conn, "research_items")
+        ensure_indexes(conn, "watch_items")
         conn.close()
         logger.info(f"Knowledge store initialized at {self.db_path}")
 
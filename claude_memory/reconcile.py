@@ -19,6 +19,7 @@ from pathlib import Path
 from typing import Optional
 
 from claude_memory.memory_db import ClaudeMemoryDB
+from core.snapshot_index import SnapshotEntry, get_index
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +38,15 @@ SKIP_DIRS = {
 
 # Max chars per file (truncate large files)
 MAX_FILE_CHARS = 5000
+TRUNCATION_MARKER = "\n... [TRUNCATED]"
+
+
+def _render_file(entry: SnapshotEntry) -> str:
+    """Truncated context block for one file."""
+    content = entry.content
+    if len(content) > MAX_FILE_CHARS:
+        content = content[:MAX_FILE_CHARS] + TRUNCATION_MARKER
+    return "\n".join(["", "-" * 60, f"FILE: {entry.relative_path}", "-" * 60, content])
 
 
 def collect_repo_context(root: Path = PROJECT_ROOT) -> str:
@@ -66,7 +76,7 @@ def collect_repo_context(root: Path = PROJECT_ROOT) -> str:
 
     # --- File tree ---
     lines.append("## File Tree")
-    file_list = []
+    candidates = []
 
     for dirpath, dirnames, filenames in os.walk(root):
         # Skip excluded directories
@@ -76,15 +86,30 @@ def collect_repo_context(root: Path = PROJECT_ROOT) -> str:
 
         for filename in sorted(filenames):
             file_path = Path(dirpath) / filename
-            ext = file_path.suffix.lower()
+            if file_path.suffix.lower() in CODE_EXTENSIONS:
+                rel_path = str(rel_dir / filename).replace("\\", "/")
+                candidates.append((rel_path, file_path))
 
-            if ext not in CODE_EXTENSIONS:
-                continue
+    # Unchanged files are served from the wall snapshot (stat only, no re-read)
+    index = get_index(root, "reconcile")
+    entries = iter(index.refresh(file_path for _, file_path in candidates))
+    failed = index.last_refresh.failed
 
-            rel_path = str(rel_dir / filename).replace("\\", "/")
-            size = file_path.stat().st_size
-            file_list.append((rel_path, file_path, size))
-            lines.append(f"  {rel_path} ({size:,} bytes)")
+    # (rel_path, entry, error) in walk order; an unreadable file keeps its
+    # place in the tree and reports its error where its content would go
+    file_list = []
+    for rel_path, file_path in candidates:
+        error = failed.get(str(file_path))
+        if error is None:
+            entry = next(entries)
+            lines.append(f"  {rel_path} ({entry.size:,} bytes)")
+            file_list.append((rel_path, entry, None))
+            continue
+        try:
+            lines.append(f"  {rel_path} ({file_path.stat().st_size:,} bytes)")
+        except OSError:
+            pass
+        file_list.append((rel_path, None, error))
 
     lines.append(f"\nTotal: {len(file_list)} files")
     lines.append("")
@@ -97,25 +122,19 @@ def collect_repo_context(root: Path = PROJECT_ROOT) -> str:
     total_chars = 0
     max_total = 700_000  # Leave room for memory export + prompt in 1M context
 
-    for rel_path, file_path, size in file_list:
+    for rel_path, entry, error in file_list:
         if total_chars > max_total:
             lines.append(f"\n[TRUNCATED — reached {max_total:,} char budget]")
             break
 
-        try:
-            content = file_path.read_text(encoding="utf-8", errors="ignore")
-            if len(content) > MAX_FILE_CHARS:
-                content = content[:MAX_FILE_CHARS] + "\n... [TRUNCATED]"
+        if error is not None:
+            lines.append(f"\n[ERROR reading {rel_path}: {error}]")
+            continue
 
-            lines.append("")
-            lines.append("-" * 60)
-            lines.append(f"FILE: {rel_path}")
-            lines.append("-" * 60)
-            lines.append(content)
-
-            total_chars += len(content)
-        except Exception as e:
-            lines.append(f"\n[ERROR reading {rel_path}: {e}]")
+        lines.append(index.segment(entry, "reconcile", _render_file))
+        total_chars += min(entry.chars, MAX_FILE_CHARS) + (
+            len(TRUNCATION_MARKER) if entry.chars > MAX_FILE_CHARS else 0
+        )
 
     return "\n".join(lines)
 
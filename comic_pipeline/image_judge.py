@@ -3,9 +3,18 @@ Comic Pipeline — Image Judge.
 
 Uses Claude vision to verify each generated image matches its script prompt.
 Rejects images that don't match, flags issues, and can trigger regeneration.
+
+Panels are judged concurrently (bounded by max_concurrency). Images are
+downscaled to JUDGE_MAX_EDGE and re-encoded as JPEG before upload, and both
+the encoded payload and the verdict are cached by content hash so re-judging
+untouched panels costs nothing.
 """
 
+import asyncio
 import base64
+import hashlib
+import io
+import json
 import logging
 import os
 from pathlib import Path
@@ -78,6 +87,57 @@ Scoring guide:
 Be EXTREMELY specific. Check every single detail. If the prompt says "standing on a wooden crate" and the character is standing on the ground, that is WRONG — do not gloss over it."""
 
 
+# Payload limits for judge requests. Claude vision downsamples anything past
+# ~1568px anyway, so sending full-resolution PNGs only costs upload time.
+JUDGE_MAX_EDGE = 1024
+JUDGE_JPEG_QUALITY = 85
+DEFAULT_JUDGE_CONCURRENCY = 4
+
+
+def _sniff_media_type(image_data: bytes) -> str:
+    """Detect media type from file header (not extension)."""
+    if image_data[:8] == b'\x89PNG\r\n\x1a\n':
+        return "image/png"
+    if image_data[:2] == b'\xff\xd8':
+        return "image/jpeg"
+    if image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
+        return "image/webp"
+    return "image/jpeg"  # default fallback
+
+
+def _encode_for_judge(
+    image_data: bytes,
+    max_edge: int = JUDGE_MAX_EDGE,
+    quality: int = JUDGE_JPEG_QUALITY,
+) -> tuple[str, str]:
+    """
+    Downscale and re-encode an image for a vision request.
+
+    Returns (media_type, base64_data). Falls back to the raw bytes if
+    Pillow can't decode the image.
+    """
+    try:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(image_data)) as img:
+            img = img.convert("RGB")
+            if max(img.size) > max_edge:
+                img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+            buf = io.BytesIO()
+            img.save(buf, format="JPEG", quality=quality, optimize=True)
+        encoded = buf.getvalue()
+        # Never send a bigger payload than the original
+        if len(encoded) < len(image_data):
+            return "image/jpeg", base64.b64encode(encoded).decode("utf-8")
+    except Exception as e:
+        logger.debug(f"Judge image re-encode failed, sending raw: {e}")
+
+    return (
+        _sniff_media_type(image_data),
+        base64.b64encode(image_data).decode("utf-8"),
+    )
+
+
 def _summarise_checklist(checklist: dict) -> str:
     """Build a short one-line summary of checklist results."""
     if not checklist:
@@ -103,8 +163,13 @@ def _summarise_checklist(checklist: dict) -> str:
 class ImageJudge:
     """Verifies generated images match their prompts using Claude vision."""
 
-    def __init__(self, model_router=None):
+    def __init__(self, model_router=None, max_concurrency: int = DEFAULT_JUDGE_CONCURRENCY):
         self._model_router = model_router
+        self.max_concurrency = max(1, max_concurrency)
+        # image sha256 -> (media_type, base64 payload)
+        self._encoded_cache: dict[str, tuple[str, str]] = {}
+        # (prompt sha256, image sha256) -> verdict dict
+        self._verdict_cache: dict[tuple[str, str], dict] = {}
 
     def _get_router(self):
         """Lazy-load model router."""
@@ -132,113 +197,167 @@ class ImageJudge:
         """
         router = self._get_router()
         panels_with_images = [p for p in project.panels if p.image_path]
+        total = len(panels_with_images)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
 
-        passed = 0
-        failed = 0
-
-        for panel in panels_with_images:
-            logger.info(
-                f"Judging panel {panel.panel_number}/{len(panels_with_images)}..."
-            )
+        async def _run(panel: Panel) -> bool:
+            async with semaphore:
+                return await self._judge_panel(
+                    router, project, panel, total, max_retries, regenerator
+                )
 
-            result = await self._judge_single(router, panel)
+        outcomes = await asyncio.gather(
+            *(_run(panel) for panel in panels_with_images),
+            return_exceptions=True,
+        )
 
-            if result.get("pass", False):
-                passed += 1
-                score = result.get("score", "?")
-                checklist_summary = _summarise_checklist(
-                    result.get("checklist", {})
-                )
-                logger.info(
-                    f"Panel {panel.panel_number}: PASS (score: {score}) "
-                    f"— {checklist_summary}"
+        passed = 0
+        failed = 0
+        for panel, outcome in zip(panels_with_images, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(
+                    f"Panel {panel.panel_number} judge errored: {outcome}"
                 )
                 project.log(
-                    f"Panel {panel.panel_number} judge: PASS "
-                    f"(score: {score})"
+                    f"Panel {panel.panel_number} judge: ERROR - {outcome}"
                 )
+                failed += 1
+            elif outcome:
+                passed += 1
             else:
                 failed += 1
-                score = result.get("score", "?")
-                issues = result.get("issues", [])
-                suggestion = result.get("suggestion", "")
-                logger.warning(
-                    f"Panel {panel.panel_number}: FAIL (score: {score}) "
-                    f"- Issues: {issues}"
-                )
-                project.log(
-                    f"Panel {panel.panel_number} judge: FAIL "
-                    f"(score: {score}) - {'; '.join(issues)}"
-                )
-
-                # Attempt regeneration if we have a generator
-                if regenerator and max_retries > 0:
-                    logger.info(
-                        f"Regenerating panel {panel.panel_number}: "
-                        f"{suggestion}"
-                    )
-                    # Enhance the prompt with the judge's suggestion
-                    enhanced_prompt = panel.image_prompt
-                    if suggestion:
-                        enhanced_prompt += (
-                            f" IMPORTANT: {suggestion}"
-                        )
-
-                    try:
-                        output_dir = str(
-                            Path(panel.image_path).parent
-                        )
-                        old_prompt = panel.image_prompt
-                        panel.image_prompt = enhanced_prompt
-
-                        temp_project = ComicProject(
-                            title="regen",
-                            theme_id="regen",
-                            art_style=project.art_style,
-                            art_style_negative=project.art_style_negative,
-                        )
-                        temp_project.panels = [panel]
-
-                        await regenerator.generate_panels(
-                            temp_project, output_dir
-                        )
-
-                        panel.image_prompt = old_prompt  # Restore original
-
-                        # Re-judge
-                        result2 = await self._judge_single(router, panel)
-                        if result2.get("pass", False):
-                            logger.info(
-                                f"Panel {panel.panel_number}: PASS on retry "
-                                f"(score: {result2.get('score', '?')})"
-                            )
-                            project.log(
-                                f"Panel {panel.panel_number} regen: PASS"
-                            )
-                            failed -= 1
-                            passed += 1
-                        else:
-                            project.log(
-                                f"Panel {panel.panel_number} regen: "
-                                f"still FAIL"
-                            )
-
-                    except Exception as e:
-                        logger.error(
-                            f"Panel {panel.panel_number} regen failed: {e}"
-                        )
-                        panel.image_prompt = panel.image_prompt  # restore
 
         logger.info(
             f"Image judge complete: {passed} passed, {failed} failed "
-            f"out of {len(panels_with_images)}"
+            f"out of {total}"
         )
         project.log(
-            f"Image judge: {passed}/{len(panels_with_images)} passed"
+            f"Image judge: {passed}/{total} passed"
         )
 
         return project
 
+    async def _judge_panel(
+        self,
+        router,
+        project: ComicProject,
+        panel: Panel,
+        total: int,
+        max_retries: int,
+        regenerator,
+    ) -> bool:
+        """Judge one panel, regenerating once on failure if possible. Returns pass."""
+        logger.info(
+            f"Judging panel {panel.panel_number}/{total}..."
+        )
+
+        result = await self._judge_single(router, panel)
+
+        if result.get("pass", False):
+            score = result.get("score", "?")
+            checklist_summary = _summarise_checklist(
+                result.get("checklist", {})
+            )
+            logger.info(
+                f"Panel {panel.panel_number}: PASS (score: {score}) "
+                f"— {checklist_summary}"
+            )
+            project.log(
+                f"Panel {panel.panel_number} judge: PASS "
+                f"(score: {score})"
+            )
+            return True
+
+        score = result.get("score", "?")
+        issues = result.get("issues", [])
+        suggestion = result.get("suggestion", "")
+        logger.warning(
+            f"Panel {panel.panel_number}: FAIL (score: {score}) "
+            f"- Issues: {issues}"
+        )
+        project.log(
+            f"Panel {panel.panel_number} judge: FAIL "
+            f"(score: {score}) - {'; '.join(issues)}"
+        )
+
+        # Attempt regeneration if we have a generator
+        if not (regenerator and max_retries > 0):
+            return False
+
+        logger.info(
+            f"Regenerating panel {panel.panel_number}: "
+            f"{suggestion}"
+        )
+        # Enhance the prompt with the judge's suggestion
+        enhanced_prompt = panel.image_prompt
+        if suggestion:
+            enhanced_prompt += (
+                f" IMPORTANT: {suggestion}"
+            )
+
+        old_prompt = panel.image_prompt
+        try:
+            output_dir = str(
+                Path(panel.image_path).parent
+            )
+            panel.image_prompt = enhanced_prompt
+
+            temp_project = ComicProject(
+                title="regen",
+                theme_id="regen",
+                art_style=project.art_style,
+                art_style_negative=project.art_style_negative,
+            )
+            temp_project.panels = [panel]
+
+            await regenerator.generate_panels(
+                temp_project, output_dir
+            )
+
+            panel.image_prompt = old_prompt  # Restore original
+
+            # Re-judge (new image bytes -> new cache key)
+            result2 = await self._judge_single(router, panel)
+            if result2.get("pass", False):
+                logger.info(
+                    f"Panel {panel.panel_number}: PASS on retry "
+                    f"(score: {result2.get('score', '?')})"
+                )
+                project.log(
+                    f"Panel {panel.panel_number} regen: PASS"
+                )
+                return True
+
+            project.log(
+                f"Panel {panel.panel_number} regen: "
+                f"still FAIL"
+            )
+
+        except Exception as e:
+            logger.error(
+                f"Panel {panel.panel_number} regen failed: {e}"
+            )
+            panel.image_prompt = old_prompt  # restore
+
+        return False
+
+    def _load_payload(self, image_path: str) -> tuple[str, str, str]:
+        """
+        Read an image and return (image_hash, media_type, base64_data).
+
+        The downscaled encoding is cached per image content hash.
+        """
+        with open(image_path, "rb") as f:
+            image_data = f.read()
+        image_hash = hashlib.sha256(image_data).hexdigest()
+
+        cached = self._encoded_cache.get(image_hash)
+        if cached is None:
+            cached = _encode_for_judge(image_data)
+            self._encoded_cache[image_hash] = cached
+        media_type, image_b64 = cached
+        return image_hash, media_type, image_b64
+
     async def _judge_single(self, router, panel: Panel) -> dict:
         """
         Judge a single panel image against its prompt using a checklist approach.
@@ -249,9 +368,9 @@ class ImageJudge:
         Critical categories (characters, action, objects) cause auto-fail if any
         item is MISSING or WRONG. Non-critical categories (setting, composition)
         deduct points but don't auto-fail.
-        """
-        import json
 
+        Verdicts are memoized by (prompt hash, image hash).
+        """
         if not panel.image_path or not Path(panel.image_path).exists():
             return {
                 "pass": False,
@@ -262,20 +381,10 @@ class ImageJudge:
                 "suggestion": "Generate the image",
             }
 
-        # Read image and encode as base64
-        with open(panel.image_path, "rb") as f:
-            image_data = f.read()
-        image_b64 = base64.b64encode(image_data).decode("utf-8")
-
-        # Detect actual media type from file header (not extension)
-        if image_data[:8] == b'\x89PNG\r\n\x1a\n':
-            media_type = "image/png"
-        elif image_data[:2] == b'\xff\xd8':
-            media_type = "image/jpeg"
-        elif image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
-            media_type = "image/webp"
-        else:
-            media_type = "image/jpeg"  # default fallback
+        # Read, downscale and encode off the event loop
+        image_hash, media_type, image_b64 = await asyncio.to_thread(
+            self._load_payload, panel.image_path
+        )
 
         # Build the user text with both prompt and narration for checklist extraction
         user_text = (
@@ -288,6 +397,15 @@ class ImageJudge:
             f"Return the JSON result."
         )
 
+        prompt_hash = hashlib.sha256(
+            (JUDGE_PROMPT + "\0" + user_text).encode("utf-8")
+        ).hexdigest()
+        cache_key = (prompt_hash, image_hash)
+        cached_verdict = self._verdict_cache.get(cache_key)
+        if cached_verdict is not None:
+            logger.debug(f"Panel {panel.panel_number}: cached verdict")
+            return json.loads(json.dumps(cached_verdict))
+
         # Build message with image — Anthropic vision format
         messages = [
             {"role": "system", "content": JUDGE_PROMPT},
@@ -396,4 +514,5 @@ class ImageJudge:
                         f"{category}/{desc} = {status}"
                     )
 
+        self._verdict_cache[cache_key] = json.loads(json.dumps(result))
         return result
@@ -21,6 +21,7 @@ from pathlib import Path
 from typing import Optional
 
 from comic_pipeline.models import ComicProject, Panel
+from video_pipeline import media_tools
 
 logger = logging.getLogger(__name__)
 
@@ -52,71 +53,19 @@ class MotionComicGenerator:
         self._ffprobe_path: Optional[str] = None
 
     def _find_ffmpeg(self) -> str:
-        """Find FFmpeg executable (reuses postprocessor pattern)."""
+        """Find FFmpeg executable (shared, resolved once per process)."""
         if self._ffmpeg_path:
             return self._ffmpeg_path
-
-        import subprocess
-
-        # Try imageio-ffmpeg bundled binary first (most reliable on Windows)
-        try:
-            import imageio_ffmpeg
-            bundled = imageio_ffmpeg.get_ffmpeg_exe()
-            if bundled:
-                self._ffmpeg_path = bundled
-                self._ffprobe_path = bundled.replace("ffmpeg", "ffprobe")
-                # ffprobe may not exist in imageio bundle — check
-                if not Path(self._ffprobe_path).exists():
-                    self._ffprobe_path = bundled  # fallback, will use ffmpeg -i
-                return bundled
-        except ImportError:
-            pass
-
-        search_paths = [
-            "ffmpeg",
-            os.path.expanduser(
-                r"~\AppData\Local\Microsoft\WinGet\Packages\Gyan.FFmpeg_Microsoft.Winget.Source_8wekyb3d8bbwe\ffmpeg-8.0.1-full_build\bin\ffmpeg.exe"
-            ),
-            r"C:\ffmpeg\bin\ffmpeg.exe",
-            r"C:\Program Files\ffmpeg\bin\ffmpeg.exe",
-            "/usr/bin/ffmpeg",
-            "/usr/local/bin/ffmpeg",
-        ]
-
-        for path in search_paths:
-            try:
-                result = subprocess.run(
-                    [path, "-version"], capture_output=True, timeout=5,
-                )
-                if result.returncode == 0:
-                    self._ffmpeg_path = path
-                    # Derive ffprobe path
-                    if "ffmpeg.exe" in path:
-                        self._ffprobe_path = path.replace("ffmpeg.exe", "ffprobe.exe")
-                    else:
-                        self._ffprobe_path = path.replace("ffmpeg", "ffprobe")
-                    return path
-            except Exception:
-                continue
-
-        raise RuntimeError("FFmpeg not found. Please install FFmpeg.")
+        self._ffmpeg_path = media_tools.find_ffmpeg()
+        self._ffprobe_path = media_tools.find_ffprobe() or self._ffmpeg_path
+        return self._ffmpeg_path
 
     async def _get_media_duration(self, media_path: str) -> float:
-        """Get audio/video duration using ffmpeg -i (works without ffprobe)."""
-        ffmpeg = self._find_ffmpeg()
-        proc = await asyncio.create_subprocess_exec(
-            ffmpeg, "-i", media_path, "-hide_banner",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        _, stderr = await proc.communicate()
-        # ffmpeg -i prints info to stderr, including "Duration: HH:MM:SS.ss"
-        output = stderr.decode(errors="replace")
-        match = re.search(r"Duration:\s*(\d+):(\d+):(\d+)\.(\d+)", output)
-        if not match:
+        """Get audio/video duration (header parse, cached probe fallback)."""
+        duration = await media_tools.get_duration_async(media_path)
+        if not duration:
             raise RuntimeError(f"Could not parse duration from: {media_path}")
-        h, m, s, cs = match.groups()
-        return int(h) * 3600 + int(m) * 60 + int(s) + int(cs) / 100
+        return duration
 
     async def generate_narration(
         self,
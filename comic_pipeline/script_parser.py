@@ -623,8 +623,5 @@ class ScriptParser:
         return slug.strip("_")[:60]
 
     def _estimate_cost(self, usage: dict, model) -> float:
-        """Estimate API cost from token usage."""
-        input_tokens = usage.get("input_tokens", 0)
-        output_tokens = usage.get("output_tokens", 0)
-        cost = (input_tokens * model.cost_in + output_tokens * model.cost_out) / 1_000_000
-        return cost
+        """Estimate API cost from token usage (prompt-cache tokens included)."""
+        return model.cost(usage)
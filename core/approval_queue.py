@@ -16,6 +16,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Any
 
+from core.schema_migrations import ensure_indexes
+
 
 class ApprovalStatus(Enum):
     PENDING = "pending"
@@ -60,6 +62,7 @@ class ApprovalQueue:
                 CREATE INDEX IF NOT EXISTS idx_approvals_project
                 ON approvals(project_id)
             """)
+            ensure_indexes(conn, "approvals")
 
     def _connect(self) -> sqlite3.Connection:
         conn = sqlite3.connect(str(self.db_path))
@@ -83,6 +86,29 @@ class ApprovalQueue:
             )
             return cursor.lastrowid
 
+    def submit_many(self, submissions: list[dict]) -> list[int]:
+        """
+        Submit several actions in one transaction. Each dict takes the
+        submit() keyword arguments. Returns approval_ids in the same order;
+        if any insert fails, none are queued.
+        """
+        now = datetime.now().isoformat()
+        ids = []
+        with self._connect() as conn:
+            for item in submissions:
+                cursor = conn.execute(
+                    """INSERT INTO approvals
+                       (project_id, agent_id, action_type, action_data,
+                        context_summary, cost_estimate, created_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    (item["project_id"], item["agent_id"], item["action_type"],
+                     json.dumps(item["action_data"]),
+                     item.get("context_summary", ""),
+                     item.get("cost_estimate", 0.0), now)
+                )
+                ids.append(cursor.lastrowid)
+        return ids
+
     def approve(self, approval_id: int, notes: str = "") -> dict:
         """Approve an action. Returns the approval record."""
         with self._connect() as conn:
@@ -5,23 +5,69 @@ Every action the system takes is recorded. This provides:
 1. Full audit trail for security review
 2. Error routing to Telegram (Ganzak Rule 7)
 3. Severity-based alerting (Ganzak Rule 8)
+
+Entries go into a bounded in-memory buffer and a background thread writes
+them in batches (one executemany + one commit) once FLUSH_BATCH_SIZE
+entries are waiting or FLUSH_INTERVAL seconds have passed. Critical
+events skip the buffer: they are written, together with anything still
+queued ahead of them, before log() returns. Reads flush first, so callers
+always see their own entries.
 """
 
+import atexit
+import logging
 import sqlite3
+import threading
+import time
+from collections import deque
 from datetime import datetime, date
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+FLUSH_BATCH_SIZE = 200     # entries waiting before an early flush
+FLUSH_INTERVAL = 0.5       # seconds an entry may wait in the buffer
+MAX_BUFFERED = 10_000      # when full, log() flushes inline instead of dropping
+
+INSERT_SQL = """INSERT INTO audit_log
+                (timestamp, project_id, agent_id, severity,
+                 category, action, details, tokens_used,
+                 cost_usd, model, success)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
 
 class AuditLog:
 
-    def __init__(self, db_path: str = "data/audit_log.db"):
+    def __init__(self, db_path: str = "data/audit_log.db",
+                 batch_size: int = FLUSH_BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL,
+                 max_buffered: int = MAX_BUFFERED):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._alert_callback = None
         self._init_db()
 
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self._buffer: deque[tuple] = deque()
+        self._oldest = 0.0  # monotonic time the oldest buffered entry arrived
+        self._wakeup = threading.Condition()
+        # Serialises writers so batches (and critical rows) land in log() order
+        self._write_lock = threading.Lock()
+        self._writer = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._closed = False
+        self.stats = {"logged": 0, "flushes": 0, "rows_flushed": 0, "inline_flushes": 0}
+
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="audit-log-flusher", daemon=True
+        )
+        self._flusher.start()
+        atexit.register(self.close)
+
     def _init_db(self):
         with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS audit_log (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -70,18 +116,29 @@ class AuditLog:
             block    - Blocked but recoverable
             reject   - Rejected, user intervention needed
             critical - STOP EVERYTHING, alert immediately
+
+        Critical events are on disk when this returns; everything else is
+        written by the background flusher within flush_interval.
         """
-        with self._connect() as conn:
-            conn.execute(
-                """INSERT INTO audit_log
-                   (timestamp, project_id, agent_id, severity,
-                    category, action, details, tokens_used,
-                    cost_usd, model, success)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (datetime.now().isoformat(), project_id, agent_id,
-                 severity, category, action, details, tokens,
-                 cost, model, 1 if success else 0)
-            )
+        row = (datetime.now().isoformat(), project_id, agent_id,
+               severity, category, action, details, tokens,
+               cost, model, 1 if success else 0)
+
+        if severity == "critical" or self._closed:
+            self._write([row])
+        else:
+            with self._wakeup:
+                self._buffer.append(row)
+                waiting = len(self._buffer)
+                if waiting == 1:
+                    self._oldest = time.monotonic()
+                if waiting == 1 or waiting >= self.batch_size:
+                    self._wakeup.notify()
+            if waiting >= self.max_buffered:
+                # Flusher can't keep up: apply backpressure rather than drop entries
+                self.stats["inline_flushes"] += 1
+                self.flush()
+        self.stats["logged"] += 1
 
         # Alert on high severity (Ganzak Rule 7: pipe errors to messenger)
         if severity in ("block", "reject", "critical") and self._alert_callback:
@@ -89,8 +146,72 @@ class AuditLog:
                 f"[{severity.upper()}] {category}: {action}\n{details}"
             )
 
+    # --- Buffered writer ---
+
+    def _drain(self) -> list[tuple]:
+        with self._wakeup:
+            rows = list(self._buffer)
+            self._buffer.clear()
+        return rows
+
+    def _write(self, extra: list[tuple] = ()):
+        """Write everything buffered (plus `extra`) in one transaction."""
+        with self._write_lock:
+            rows = self._drain()
+            rows.extend(extra)
+            if not rows:
+                return
+            try:
+                with self._writer:
+                    self._writer.executemany(INSERT_SQL, rows)
+            except sqlite3.Error as e:
+                # Put the batch back in front so a later flush retries it
+                logger.error(f"Audit log flush failed ({len(rows)} entries): {e}")
+                with self._wakeup:
+                    self._buffer.extendleft(reversed(rows))
+                raise
+            self.stats["flushes"] += 1
+            self.stats["rows_flushed"] += len(rows)
+
+    def _flush_loop(self):
+        while True:
+            with self._wakeup:
+                # Sleep until something is buffered, then until the oldest
+                # entry is flush_interval old or a full batch is waiting
+                while not self._closed and len(self._buffer) < self.batch_size:
+                    if not self._buffer:
+                        self._wakeup.wait()
+                        continue
+                    remaining = self._oldest + self.flush_interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wakeup.wait(remaining)
+                if self._closed:
+                    return
+            try:
+                self._write()
+            except sqlite3.Error:
+                time.sleep(self.flush_interval)
+
+    def flush(self):
+        """Write all buffered entries now."""
+        self._write()
+
+    def close(self):
+        """Stop the flusher and write whatever is still buffered."""
+        if self._closed:
+            return
+        with self._wakeup:
+            self._closed = True
+            self._wakeup.notify()
+        self._flusher.join(timeout=5)
+        # Later log() calls (shutdown paths) write through synchronously
+        self._write()
+        atexit.unregister(self.close)
+
     def get_daily_summary(self, project_id: str) -> dict:
         """Generate daily summary for reporting."""
+        self.flush()
         today = date.today().isoformat()
         with self._connect() as conn:
             total = conn.execute(
@@ -135,6 +256,7 @@ class AuditLog:
     def get_recent(self, project_id: str | None = None,
                    limit: int = 50) -> list[dict]:
         """Get recent log entries."""
+        self.flush()
         with self._connect() as conn:
             if project_id:
                 rows = conn.execute(
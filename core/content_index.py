@@ -0,0 +1,320 @@
+"""
+Near-duplicate index for generated content.
+
+Every tweet, reply, thread and video script that goes through the approval
+queue (plus every tweet the growth agent has tracked) is reduced to a
+MinHash signature over character shingles and bucketed with LSH, so
+"is this draft too close to anything from the last N days?" is a handful
+of dict lookups plus one vectorised comparison - fast enough to run inside
+a generation loop and regenerate before anything reaches the operator.
+
+Signatures persist in data/content_index.db. sync() only reads approval /
+tweet rows newer than the last id it saw, so keeping the index current is
+cheap.
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_DB = Path("data/content_index.db")
+APPROVAL_DB = Path("data/approval_queue.db")
+GROWTH_DB = Path("data/growth.db")
+
+SHINGLE_SIZE = 5          # characters per shingle
+NUM_PERM = 64             # MinHash permutations (signature length)
+BANDS = 16                # LSH bands; NUM_PERM / BANDS rows each -> ~0.5 Jaccard cut-in
+DEFAULT_THRESHOLD = 0.6   # estimated Jaccard at or above this = near-duplicate
+DEFAULT_WINDOW_DAYS = 30
+RETAIN_DAYS = 180         # older signatures aren't loaded into memory
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240601)  # fixed: signatures must be stable across runs
+_PERM_A = _rng.randint(1, _PRIME, NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, _PRIME, NUM_PERM).astype(np.uint64)
+_ROWS = NUM_PERM // BANDS
+_SHINGLE_WEIGHTS = np.array([257 ** i for i in reversed(range(SHINGLE_SIZE))], dtype=np.uint64)
+
+_URL = re.compile(r"https?://\S+|www\.\S+")
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACE = re.compile(r"\s+")
+
+# approvals.action_type -> how to get the text out of action_data
+_APPROVAL_TEXT = {
+    "tweet": lambda d: d.get("text", ""),
+    "reply": lambda d: d.get("text", ""),
+    "thread": lambda d: " ".join(d.get("tweets") or [d.get("text", "")]),
+    "script_review": lambda d: d.get("script", ""),
+    "video_distribute": lambda d: d.get("script", ""),
+}
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop URLs/punctuation (incl. @ and #), collapse whitespace."""
+    text = _URL.sub(" ", text.lower())
+    text = _NON_WORD.sub(" ", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+def signature(text: str) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint32) of the text's character shingles."""
+    data = np.frombuffer(normalize(text).encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+    if len(data) < SHINGLE_SIZE:
+        data = np.pad(data, (0, SHINGLE_SIZE - len(data)))
+    windows = np.lib.stride_tricks.sliding_window_view(data, SHINGLE_SIZE)
+    shingles = np.unique((windows @ _SHINGLE_WEIGHTS) % _PRIME)
+    hashed = (_PERM_A[:, None] * shingles[None, :] + _PERM_B[:, None]) % _PRIME
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(a == b))
+
+
+def _band_keys(sig: np.ndarray) -> list[tuple[int, bytes]]:
+    return [(band, sig[band * _ROWS:(band + 1) * _ROWS].tobytes()) for band in range(BANDS)]
+
+
+def _to_epoch(value: Optional[str]) -> float:
+    if not value:
+        return time.time()
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return time.time()
+
+
+@dataclass
+class DuplicateMatch:
+    """The closest earlier item a draft collides with."""
+    similarity: float
+    source: str
+    source_id: str
+    kind: str
+    excerpt: str
+    created_at: float
+
+    def describe(self) -> str:
+        age_days = (time.time() - self.created_at) / 86400
+        return (f"{self.similarity:.0%} similar to {self.kind} {self.source}#{self.source_id} "
+                f"({age_days:.0f}d ago): \"{self.excerpt[:80]}\"")
+
+
+class ContentIndex:
+    """
+    MinHash/LSH index over everything David has drafted or posted.
+
+    Usage:
+        index = ContentIndex()
+        index.sync()
+        match = index.check(draft, days=14)
+        if match:
+            ...regenerate...
+        index.add(draft, "approvals", approval_id, kind="tweet")
+    """
+
+    def __init__(self, db_path: Path = INDEX_DB,
+                 approval_db: Path = APPROVAL_DB, growth_db: Path = GROWTH_DB,
+                 retain_days: int = RETAIN_DAYS):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.approval_db = Path(approval_db)
+        self.growth_db = Path(growth_db)
+        self.retain_days = retain_days
+
+        self._sigs = np.zeros((256, NUM_PERM), dtype=np.uint32)
+        self._times = np.zeros(256, dtype=np.float64)
+        self._items: list[tuple[str, str, str, str]] = []  # (source, source_id, kind, excerpt)
+        self._keys: set[tuple[str, str]] = set()
+        self._buckets: dict[tuple[int, bytes], list[int]] = {}
+
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._init_db()
+        self._load()
+
+    def _init_db(self):
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS content_signatures (
+                    source TEXT NOT NULL,
+                    source_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    excerpt TEXT DEFAULT '',
+                    signature BLOB NOT NULL,
+                    PRIMARY KEY (source, source_id)
+                )
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_signatures_created
+                ON content_signatures(created_at)
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    source TEXT PRIMARY KEY,
+                    last_id INTEGER NOT NULL
+                )
+            """)
+
+    def _load(self):
+        cutoff = time.time() - self.retain_days * 86400
+        rows = self._conn.execute(
+            """SELECT source, source_id, kind, created_at, excerpt, signature
+               FROM content_signatures WHERE created_at >= ? ORDER BY created_at""",
+            (cutoff,)
+        ).fetchall()
+        for source, source_id, kind, created_at, excerpt, blob in rows:
+            self._insert(np.frombuffer(blob, dtype=np.uint32), created_at,
+                         (source, source_id, kind, excerpt))
+
+    def _insert(self, sig: np.ndarray, created_at: float, item: tuple[str, str, str, str]):
+        row = len(self._items)
+        if row == len(self._sigs):
+            self._sigs = np.concatenate([self._sigs, np.zeros_like(self._sigs)])
+            self._times = np.concatenate([self._times, np.zeros_like(self._times)])
+        self._sigs[row] = sig
+        self._times[row] = created_at
+        self._items.append(item)
+        self._keys.add(item[:2])
+        for key in _band_keys(sig):
+            self._buckets.setdefault(key, []).append(row)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, text: str, source: str, source_id, kind: str,
+            created_at: Optional[float] = None) -> bool:
+        """Index one item. Returns False if it was already indexed or empty."""
+        return self._add_many([(text, source, source_id, kind, created_at)]) == 1
+
+    def _add_many(self, entries: list[tuple]) -> int:
+        """Index (text, source, source_id, kind, created_at) items in one transaction."""
+        rows = []
+        for text, source, source_id, kind, created_at in entries:
+            source_id = str(source_id)
+            if not text or not text.strip() or (source, source_id) in self._keys:
+                continue
+            sig = signature(text)
+            created_at = created_at or time.time()
+            excerpt = _SPACE.sub(" ", text).strip()[:200]
+            self._insert(sig, created_at, (source, source_id, kind, excerpt))
+            rows.append((source, source_id, kind, created_at, excerpt, sig.tobytes()))
+        if rows:
+            with self._conn:
+                self._conn.executemany(
+                    """INSERT OR IGNORE INTO content_signatures
+                       (source, source_id, kind, created_at, excerpt, signature)
+                       VALUES (?, ?, ?, ?, ?, ?)""",
+                    rows
+                )
+        return len(rows)
+
+    def check(self, text: str, days: int = DEFAULT_WINDOW_DAYS,
+              threshold: float = DEFAULT_THRESHOLD,
+              kinds: Optional[set[str]] = None) -> Optional[DuplicateMatch]:
+        """
+        Closest indexed item from the last `days` days with estimated
+        similarity >= threshold, or None if the draft is fresh.
+        """
+        if not self._items or not text.strip():
+            return None
+        sig = signature(text)
+        candidates = set()
+        for key in _band_keys(sig):
+            candidates.update(self._buckets.get(key, ()))
+        if not candidates:
+            return None
+
+        rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        rows = rows[self._times[rows] >= time.time() - days * 86400]
+        if kinds:
+            rows = rows[[self._items[r][2] in kinds for r in rows]]
+        if not len(rows):
+            return None
+        scores = (self._sigs[rows] == sig).mean(axis=1)
+        best = int(scores.argmax())
+        if scores[best] < threshold:
+            return None
+        row = int(rows[best])
+        source, source_id, kind, excerpt = self._items[row]
+        return DuplicateMatch(float(scores[best]), source, source_id, kind, excerpt,
+                              float(self._times[row]))
+
+    # --- Incremental sync from the approval and growth databases ---
+
+    def _last_id(self, source: str) -> int:
+        row = self._conn.execute(
+            "SELECT last_id FROM sync_state WHERE source=?", (source,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _set_last_id(self, source: str, last_id: int):
+        with self._conn:
+            self._conn.execute(
+                """INSERT INTO sync_state (source, last_id) VALUES (?, ?)
+                   ON CONFLICT(source) DO UPDATE SET last_id=excluded.last_id""",
+                (source, last_id)
+            )
+
+    def _read_new(self, db: Path, source: str, query: str) -> list:
+        if not db.exists():
+            return []
+        try:
+            conn = sqlite3.connect(f"file:{db}?mode=ro", uri=True)
+            try:
+                return conn.execute(query, (self._last_id(source),)).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Content index: could not read {db}: {e}")
+            return []
+
+    def sync(self) -> int:
+        """Index approval-queue items and tracked tweets added since the last sync."""
+        added = 0
+        rows = self._read_new(self.approval_db, "approvals", """
+            SELECT id, action_type, action_data, created_at FROM approvals
+            WHERE id > ? ORDER BY id
+        """)
+        entries = []
+        for approval_id, action_type, action_data, created_at in rows:
+            extract = _APPROVAL_TEXT.get(action_type)
+            if not extract:
+                continue
+            try:
+                text = extract(json.loads(action_data))
+            except (json.JSONDecodeError, TypeError, AttributeError):
+                continue
+            entries.append((text, "approvals", approval_id, action_type, _to_epoch(created_at)))
+        added += self._add_many(entries)
+        if rows:
+            self._set_last_id("approvals", rows[-1][0])
+
+        rows = self._read_new(self.growth_db, "tweet_metrics", """
+            SELECT id, tweet_id, text, COALESCE(created_at, tracked_at) FROM tweet_metrics
+            WHERE id > ? ORDER BY id
+        """)
+        added += self._add_many([
+            (text, "tweets", tweet_id, "posted", _to_epoch(created_at))
+            for _, tweet_id, text, created_at in rows
+        ])
+        if rows:
+            self._set_last_id("tweet_metrics", rows[-1][0])
+
+        if added:
+            logger.info(f"Content index: +{added} items ({len(self)} total)")
+        return added
+
+    def close(self):
+        self._conn.close()
@@ -134,7 +134,7 @@ class AgentEngine:
                 context.project_id, "block", "budget",
                 "Budget exhausted", agent_id=context.agent_id
             )
-            return "[BLOCKED] Daily token budget exhausted."
+            return "[BLOCKED] Token budget exhausted (daily or monthly cap)."
 
         # Build messages
         if system_prompt:
@@ -201,7 +201,14 @@ class AgentEngine:
             usage = response.get("usage", {})
             tokens_in = usage.get("input_tokens", 0)
             tokens_out = usage.get("output_tokens", 0)
-            cost = self.budget.calculate_cost(model.name, tokens_in, tokens_out)
+            cache_write = usage.get("cache_creation_input_tokens", 0)
+            cache_read = usage.get("cache_read_input_tokens", 0)
+            cost = self.budget.calculate_cost(
+                model.name, tokens_in, tokens_out,
+                cache_write_tokens=cache_write, cache_read_tokens=cache_read,
+            )
+            # Count the whole prompt, cached or not
+            tokens_in += cache_write + cache_read
 
             context.total_tokens += tokens_in + tokens_out
             context.total_cost += cost
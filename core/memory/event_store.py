@@ -19,6 +19,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
+from core.schema_migrations import ensure_indexes
+
 logger = logging.getLogger(__name__)
 
 DB_PATH = Path("data/events.db")
@@ -117,6 +119,7 @@ class EventStore:
         """)
 
         conn.commit()
+        ensure_indexes(conn, "events")
         conn.close()
         logger.info(f"Events database initialized at {self.db_path}")
 
@@ -286,10 +289,12 @@ class EventStore:
         cursor = conn.cursor()
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
 
+        # "+significance": sort the few days' worth of rows rather than let
+        # the planner walk the whole significance index to skip the sort
         cursor.execute("""
             SELECT * FROM events
             WHERE created_at > ? AND recall_strength > 0.3
-            ORDER BY significance DESC, created_at DESC
+            ORDER BY +significance DESC, created_at DESC
             LIMIT ?
         """, (cutoff, limit))
 
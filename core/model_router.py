@@ -7,6 +7,7 @@ Based on Ganzak's 97% cost reduction framework.
 Routing: Ollama (15%) → Haiku (75%) → Sonnet (10%) → Opus (3-5%)
 """
 
+import asyncio
 import os
 import yaml
 import logging
@@ -18,6 +19,8 @@ from typing import Any
 import anthropic
 import openai
 
+from core.token_budget import CACHE_READ_MULTIPLIER, CACHE_WRITE_MULTIPLIER
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,6 +40,21 @@ class ModelConfig:
     cost_out: float  # Per 1M output tokens
     max_context: int
 
+    def cost(self, usage: dict) -> float:
+        """USD cost of a response's usage, prompt-cache tokens at their rates."""
+        input_tokens = (usage.get("input_tokens", 0)
+                        + usage.get("cache_creation_input_tokens", 0) * CACHE_WRITE_MULTIPLIER
+                        + usage.get("cache_read_input_tokens", 0) * CACHE_READ_MULTIPLIER)
+        return (input_tokens * self.cost_in
+                + usage.get("output_tokens", 0) * self.cost_out) / 1_000_000
+
+
+def _without_cache_flag(message: dict) -> dict:
+    """Drop our "cache" hint for providers that reject unknown message keys."""
+    if "cache" not in message:
+        return message
+    return {k: v for k, v in message.items() if k != "cache"}
+
 
 class ModelRouter:
 
@@ -145,7 +163,10 @@ class ModelRouter:
 
         Args:
             model: The model configuration to use
-            messages: List of message dicts with 'role' and 'content'
+            messages: List of message dicts with 'role' and 'content'.
+                      A system message with "cache": True is sent as a
+                      cacheable prefix (Anthropic prompt caching) - use it
+                      for large, unchanging persona prompts.
             tools: Optional tool definitions for the model
             max_tokens: Maximum tokens in response
 
@@ -171,10 +192,12 @@ class ModelRouter:
 
         # Separate system messages and convert to Claude format
         system_parts = []
+        cache_system = False
         conversation = []
         for msg in messages:
             if msg["role"] == "system":
                 system_parts.append(msg["content"])
+                cache_system = cache_system or msg.get("cache", False)
             elif msg["role"] == "tool":
                 # Convert OpenAI-style tool result to Claude format
                 conversation.append({
@@ -210,11 +233,22 @@ class ModelRouter:
             "messages": conversation,
         }
         if system_parts:
-            kwargs["system"] = "\n\n".join(system_parts)
+            system = "\n\n".join(system_parts)
+            if cache_system:
+                # Identical prefix across calls -> billed at the cache-read rate
+                kwargs["system"] = [{
+                    "type": "text",
+                    "text": system,
+                    "cache_control": {"type": "ephemeral"},
+                }]
+            else:
+                kwargs["system"] = system
         if tools:
             kwargs["tools"] = tools
 
-        response = self._anthropic.messages.create(**kwargs)
+        # The SDK call blocks; run it off the event loop so callers can
+        # have several requests in flight
+        response = await asyncio.to_thread(self._anthropic.messages.create, **kwargs)
 
         # Parse response
         tool_calls = []
@@ -229,14 +263,20 @@ class ModelRouter:
                     "arguments": block.input,
                 })
 
+        # input_tokens excludes the cached part of the prompt
+        cache_write = getattr(response.usage, "cache_creation_input_tokens", 0) or 0
+        cache_read = getattr(response.usage, "cache_read_input_tokens", 0) or 0
+
         return {
             "content": text_content,
             "tool_calls": tool_calls,
             "usage": {
                 "input_tokens": response.usage.input_tokens,
                 "output_tokens": response.usage.output_tokens,
-                "total_tokens": (response.usage.input_tokens
+                "total_tokens": (response.usage.input_tokens + cache_write + cache_read
                                  + response.usage.output_tokens),
+                "cache_creation_input_tokens": cache_write,
+                "cache_read_input_tokens": cache_read,
             },
             "model": model.name,
             "stop_reason": response.stop_reason,
@@ -252,7 +292,7 @@ class ModelRouter:
 
             response = client.chat(
                 model=model.name,
-                messages=messages,
+                messages=[_without_cache_flag(m) for m in messages],
             )
 
             # Ollama doesn't provide exact token counts, estimate
@@ -284,7 +324,7 @@ class ModelRouter:
 
         kwargs = {
             "model": model.name,
-            "messages": messages,
+            "messages": [_without_cache_flag(m) for m in messages],
             "max_tokens": max_tokens,
         }
         if tools:
@@ -1,83 +1,169 @@
 """
 Content Scheduler - Schedule and manage timed content posts.
 
-Uses APScheduler for job management with SQLite persistence.
+Pending jobs live in memory: a heap ordered by due time plus a dict of job
+metadata (content_data stays the JSON text it was stored as). One asyncio
+timer, armed with loop.call_at on the loop's monotonic clock, fires whatever
+is due at the head of the heap, so dispatch needs no SQLite round-trip and
+no polling.
+
+While the scheduler is running, every write (schedule, reschedule, cancel,
+status) is appended to a write-ahead journal next to the database and only
+applied to scheduled_content in batches, once JOURNAL_BATCH records are
+waiting or JOURNAL_INTERVAL seconds have passed. On start() a journal left
+behind by a crash is replayed into SQLite before the pending jobs are
+loaded, so acknowledged writes survive a process crash (a power cut can
+lose up to JOURNAL_INTERVAL of them: the journal is fsynced per batch, not
+per record). A scheduler that was never started writes straight to SQLite.
+
+Rows other processes insert (the dashboard, scripts) are picked up on the
+same batch tick: PRAGMA data_version tells the running scheduler whether
+anyone else has committed since it last looked.
 """
 
+import asyncio
+import heapq
 import json
 import logging
 import os
 import sqlite3
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Callable, Optional
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
-from apscheduler.triggers.date import DateTrigger
+from core.schema_migrations import ensure_indexes
 
 logger = logging.getLogger(__name__)
 
 # Default data directory
 DATA_DIR = Path(os.environ.get("DAVID_DATA_DIR", "data"))
 
-# Global reference to the active ContentScheduler instance.
-# APScheduler pickles job callbacks to SQLite. After a restart, unpickling
-# creates a *new* ContentScheduler with empty _executors. This global lets
-# us route unpickled jobs back to the real running instance that has executors.
+JOURNAL_BATCH = 500        # journal records waiting before an early batch write
+JOURNAL_INTERVAL = 1.0     # seconds a record may wait before reaching SQLite
+MAX_TIMER_DELAY = 60.0     # re-derive far-off deadlines from the wall clock this often
+MISFIRE_GRACE = timedelta(hours=1)  # overdue jobs older than this fail instead of running
+
+_PENDING_COLUMNS = "id, job_id, content_type, content_data, scheduled_time, created_at"
+
+# The running ContentScheduler for this process. Other instances (e.g. the
+# Telegram bot's fallback ContentScheduler()) hand their jobs to it so they
+# are armed immediately instead of waiting for the next sync tick.
 _active_scheduler: Optional['ContentScheduler'] = None
 
 
 def set_active_scheduler(instance: 'ContentScheduler'):
-    """Register the running ContentScheduler so scheduled jobs can find it."""
+    """Register the running ContentScheduler so other instances route jobs to it."""
     global _active_scheduler
     _active_scheduler = instance
 
 
-async def _dispatch_scheduled_job(job_id: str):
-    """Module-level callback for APScheduler — survives pickle/unpickle.
+@dataclass(slots=True)
+class _Job:
+    job_id: str
+    content_type: str
+    content_data: str  # JSON text, decoded once at fire time
+    scheduled_time: str
+    created_at: str
+    due: float  # POSIX timestamp
+    id: Optional[int] = None  # scheduled_content rowid once the insert has been applied
+
+
+class _Journal:
+    """Append-only JSON-lines file of writes not yet applied to SQLite."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    @staticmethod
+    def read(path: Path) -> list[dict]:
+        """Records in a journal left on disk (a torn last line is dropped)."""
+        if not path.exists():
+            return []
+        records = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"Scheduler journal: skipping torn record in {path}")
+        return records
+
+    def append(self, record: dict):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def sync(self):
+        os.fsync(self._file.fileno())
+
+    def rewrite(self, records: list[dict]):
+        """Replace the journal with just `records` (those still unapplied)."""
+        if not records:
+            self._file.truncate(0)
+            return
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(r) + "\n" for r in records)
+            f.flush()
+            os.fsync(f.fileno())
+        self._file.close()
+        os.replace(tmp, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
 
-    APScheduler can pickle this plain function without dragging along a
-    ContentScheduler instance.  At fire-time it calls back into the real
-    running scheduler via the global reference.
-    """
-    if _active_scheduler is None:
-        logger.error(f"Scheduled job {job_id}: no active ContentScheduler — cannot execute")
-        return
-    await _active_scheduler._execute_scheduled(job_id)
+    def close(self):
+        self._file.close()
 
 
 class ContentScheduler:
     """Manages scheduled content posts."""
 
-    def __init__(self, db_path: Optional[Path] = None):
+    def __init__(self, db_path: Optional[Path] = None,
+                 journal_batch: int = JOURNAL_BATCH,
+                 journal_interval: float = JOURNAL_INTERVAL,
+                 misfire_grace: timedelta = MISFIRE_GRACE):
         self.db_path = db_path or DATA_DIR / "scheduler.db"
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # APScheduler with SQLite persistence
-        jobstores = {
-            'default': SQLAlchemyJobStore(url=f'sqlite:///{self.db_path}')
-        }
-        self.scheduler = AsyncIOScheduler(jobstores=jobstores)
+        self.journal_path = self.db_path.with_suffix(".journal")
+        self.journal_batch = journal_batch
+        self.journal_interval = journal_interval
+        self.misfire_grace = misfire_grace
 
         # Callbacks for different content types
         self._executors: dict[str, Callable] = {}
 
+        # In-memory pending jobs: job_id -> job, and a (due, job_id) heap.
+        # Heap entries whose job was cancelled or rescheduled are skipped lazily.
+        self._lock = threading.RLock()
+        self._jobs: dict[str, _Job] = {}
+        self._heap: list[tuple[float, str]] = []
+        # Jobs that left "pending" in memory (fired / cancelled) whose new
+        # status hasn't reached SQLite yet, so a sync mustn't re-add them
+        self._unsettled: set[str] = set()
+
+        # Write-ahead journal (only while running)
+        self._journal: Optional[_Journal] = None
+        self._unapplied: list[dict] = []
+        self._flush_lock = threading.Lock()
+        self._batch_signalled = False
+
+        # Dispatch (set by start())
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._armed_due = float("inf")
+        self._wakeup: Optional[asyncio.Event] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._tasks: set[asyncio.Task] = set()
+
         # Initialize metadata database
         self._init_db()
-
-    def __getstate__(self):
-        """Exclude unpicklable APScheduler instance for job serialization."""
-        state = self.__dict__.copy()
-        state.pop('scheduler', None)
-        state.pop('_executors', None)
-        return state
-
-    def __setstate__(self, state):
-        """Restore from pickle — scheduler and executors are re-wired on startup."""
-        self.__dict__.update(state)
-        self.scheduler = None
-        self._executors = {}
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._data_version = None
+        self._synced_id = 0
+        self._load()
 
     def _init_db(self):
         """Initialize the metadata database."""
@@ -96,6 +182,7 @@ class ContentScheduler:
             )
         """)
         conn.commit()
+        ensure_indexes(conn, "scheduled_content")
         conn.close()
 
     def register_executor(self, content_type: str, executor: Callable):
@@ -103,14 +190,47 @@ class ContentScheduler:
         self._executors[content_type] = executor
         logger.info(f"Registered executor for content type: {content_type}")
 
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
     async def start(self):
-        """Start the scheduler."""
-        self.scheduler.start()
-        logger.info("Content scheduler started")
+        """Start the scheduler: replay any journal, load pending jobs, arm the timer."""
+        self._loop = asyncio.get_running_loop()
+        leftover = _Journal.read(self.journal_path)
+        if leftover:
+            self._apply(leftover)
+            logger.info(f"Replayed {len(leftover)} journaled scheduler writes")
+        with self._lock:
+            self._load()
+            self._journal = _Journal(self.journal_path)
+            self._journal.rewrite([])
+        self._wakeup = asyncio.Event()
+        self._writer = self._loop.create_task(self._write_loop())
+        self._loop.call_soon(self._arm)
+        logger.info(f"Content scheduler started ({len(self._jobs)} pending jobs)")
 
     async def stop(self):
-        """Stop the scheduler."""
-        self.scheduler.shutdown(wait=False)
+        """Stop the scheduler, writing out everything still journaled."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        self._armed_due = float("inf")
+        if self._writer:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        self.flush()
+        with self._lock:
+            if self._journal:
+                self._journal.close()
+                self._journal = None
+                if not self._unapplied:
+                    self.journal_path.unlink(missing_ok=True)
+        self._loop = None
         logger.info("Content scheduler stopped")
 
     def schedule(
@@ -132,141 +252,338 @@ class ContentScheduler:
         Returns:
             Job ID
         """
+        owner = self._owner()
+        if owner is not self:
+            return owner.schedule(content_type, content_data, scheduled_time, job_id)
+
         if not job_id:
             job_id = f"{content_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.urandom(4).hex()}"
 
-        # Store metadata
-        conn = sqlite3.connect(self.db_path)
-        conn.execute(
-            """INSERT INTO scheduled_content
-               (job_id, content_type, content_data, scheduled_time, created_at)
-               VALUES (?, ?, ?, ?, ?)""",
-            (
-                job_id,
-                content_type,
-                json.dumps(content_data),
-                scheduled_time.isoformat(),
-                datetime.now().isoformat(),
-            )
-        )
-        conn.commit()
-        conn.close()
-
-        # Schedule the job — uses module-level function so APScheduler
-        # doesn't pickle 'self' (which loses _executors on unpickle).
-        self.scheduler.add_job(
-            _dispatch_scheduled_job,
-            trigger=DateTrigger(run_date=scheduled_time),
-            args=[job_id],
-            id=job_id,
-            replace_existing=True,
+        job = _Job(
+            job_id=job_id,
+            content_type=content_type,
+            content_data=json.dumps(content_data),
+            scheduled_time=scheduled_time.isoformat(),
+            created_at=datetime.now().isoformat(),
+            due=scheduled_time.timestamp(),
         )
+        with self._lock:
+            if job_id in self._jobs:
+                raise ValueError(f"Job already scheduled: {job_id}")
+            self._write({
+                "op": "schedule", "job_id": job.job_id, "content_type": job.content_type,
+                "content_data": job.content_data, "scheduled_time": job.scheduled_time,
+                "created_at": job.created_at,
+            })
+            self._push(job)
+        self._request_arm(job.due)
 
         logger.info(f"Scheduled {content_type} for {scheduled_time}: {job_id}")
         return job_id
 
-    async def _execute_scheduled(self, job_id: str):
+    async def _execute_scheduled(self, job: _Job):
         """Execute a scheduled job."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.execute(
-            "SELECT content_type, content_data FROM scheduled_content WHERE job_id = ?",
-            (job_id,)
-        )
-        row = cursor.fetchone()
-        conn.close()
-
-        if not row:
-            logger.error(f"Scheduled job not found: {job_id}")
-            return
-
-        content_type, content_data_json = row
-        content_data = json.loads(content_data_json)
-
-        executor = self._executors.get(content_type)
+        executor = self._executors.get(job.content_type)
         if not executor:
-            logger.error(f"No executor for content type: {content_type}")
-            self._update_status(job_id, "failed", "No executor registered")
+            logger.error(f"No executor for content type: {job.content_type}")
+            self._update_status(job.job_id, "failed", "No executor registered")
             return
 
         try:
-            logger.info(f"Executing scheduled job: {job_id}")
-            result = await executor(content_data)
-            self._update_status(job_id, "executed", json.dumps(result) if result else None)
-            logger.info(f"Executed scheduled job: {job_id}")
+            logger.info(f"Executing scheduled job: {job.job_id}")
+            result = await executor(json.loads(job.content_data))
+            self._update_status(job.job_id, "executed", json.dumps(result) if result else None)
+            logger.info(f"Executed scheduled job: {job.job_id}")
         except Exception as e:
-            logger.error(f"Failed to execute scheduled job {job_id}: {e}")
-            self._update_status(job_id, "failed", str(e))
+            logger.error(f"Failed to execute scheduled job {job.job_id}: {e}")
+            self._update_status(job.job_id, "failed", str(e))
 
     def _update_status(self, job_id: str, status: str, result: Optional[str] = None):
-        """Update job status in database."""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute(
-            """UPDATE scheduled_content
-               SET status = ?, executed_at = ?, result = ?
-               WHERE job_id = ?""",
-            (status, datetime.now().isoformat(), result, job_id)
-        )
-        conn.commit()
-        conn.close()
+        """Record a job's new status (journaled, written in the next batch)."""
+        with self._lock:
+            self._write({
+                "op": "status", "job_id": job_id, "status": status,
+                "executed_at": datetime.now().isoformat(), "result": result,
+            })
 
     def cancel(self, job_id: str) -> bool:
         """Cancel a scheduled job."""
-        try:
-            self.scheduler.remove_job(job_id)
+        owner = self._owner()
+        if owner is not self:
+            return owner.cancel(job_id)
+
+        with self._lock:
+            if self._jobs.pop(job_id, None) is None:
+                logger.error(f"Failed to cancel job {job_id}: no pending job with that ID")
+                return False
+            self._unsettled.add(job_id)
             self._update_status(job_id, "cancelled")
-            logger.info(f"Cancelled scheduled job: {job_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to cancel job {job_id}: {e}")
-            return False
+        logger.info(f"Cancelled scheduled job: {job_id}")
+        return True
 
     def get_pending(self) -> list[dict]:
         """Get all pending scheduled content."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.execute(
-            """SELECT * FROM scheduled_content
-               WHERE status = 'pending'
-               ORDER BY scheduled_time ASC"""
-        )
-        rows = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return rows
+        owner = self._owner()
+        if owner is not self:
+            return owner.get_pending()
+        self._sync()
+        with self._lock:
+            jobs = sorted(self._jobs.values(), key=lambda job: job.due)
+        return [self._as_row(job) for job in jobs]
 
     def get_upcoming(self, hours: int = 24) -> list[dict]:
         """Get content scheduled for the next N hours."""
-        cutoff = (datetime.now() + timedelta(hours=hours)).isoformat()
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.execute(
-            """SELECT * FROM scheduled_content
-               WHERE status = 'pending' AND scheduled_time <= ?
-               ORDER BY scheduled_time ASC""",
-            (cutoff,)
-        )
-        rows = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return rows
+        owner = self._owner()
+        if owner is not self:
+            return owner.get_upcoming(hours)
+        self._sync()
+        cutoff = time.time() + hours * 3600
+        with self._lock:
+            jobs = sorted((job for job in self._jobs.values() if job.due <= cutoff),
+                          key=lambda job: job.due)
+        return [self._as_row(job) for job in jobs]
 
     def reschedule(self, job_id: str, new_time: datetime) -> bool:
         """Reschedule an existing job."""
+        owner = self._owner()
+        if owner is not self:
+            return owner.reschedule(job_id, new_time)
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                logger.error(f"Failed to reschedule {job_id}: no pending job with that ID")
+                return False
+            job.scheduled_time = new_time.isoformat()
+            job.due = new_time.timestamp()
+            self._write({"op": "reschedule", "job_id": job_id,
+                         "scheduled_time": job.scheduled_time})
+            heapq.heappush(self._heap, (job.due, job_id))
+        self._request_arm(job.due)
+        logger.info(f"Rescheduled {job_id} to {new_time}")
+        return True
+
+    def flush(self) -> int:
+        """Apply journaled writes to SQLite in one transaction; returns how many."""
+        with self._flush_lock:
+            with self._lock:
+                records, self._unapplied = self._unapplied, []
+                self._batch_signalled = False
+                if not records:
+                    return 0
+                if self._journal:
+                    self._journal.sync()
+            try:
+                self._apply(records)
+            except Exception:
+                with self._lock:
+                    self._unapplied[:0] = records
+                raise
+            with self._lock:
+                if self._journal:
+                    self._journal.rewrite(self._unapplied)
+            return len(records)
+
+    # --- In-memory state ---
+
+    def _owner(self) -> 'ContentScheduler':
+        """The running scheduler for this database in this process, if another one is."""
+        active = _active_scheduler
+        if (self._loop is None and active is not None and active is not self
+                and active.running and active.db_path.resolve() == self.db_path.resolve()):
+            return active
+        return self
+
+    def _push(self, job: _Job):
+        self._jobs[job.job_id] = job
+        heapq.heappush(self._heap, (job.due, job.job_id))
+        if len(self._heap) > 2 * len(self._jobs) + 64:
+            # Mostly stale entries (cancels / reschedules): rebuild
+            self._heap = [(j.due, j.job_id) for j in self._jobs.values()]
+            heapq.heapify(self._heap)
+
+    def _as_row(self, job: _Job) -> dict:
+        """A job in the shape of a scheduled_content row."""
+        return {
+            "id": job.id, "job_id": job.job_id, "content_type": job.content_type,
+            "content_data": job.content_data, "scheduled_time": job.scheduled_time,
+            "created_at": job.created_at, "status": "pending",
+            "executed_at": None, "result": None,
+        }
+
+    def _job_from_row(self, row: tuple) -> Optional[_Job]:
+        row_id, job_id, content_type, content_data, scheduled_time, created_at = row
         try:
-            self.scheduler.reschedule_job(
-                job_id,
-                trigger=DateTrigger(run_date=new_time)
-            )
-            conn = sqlite3.connect(self.db_path)
-            conn.execute(
-                "UPDATE scheduled_content SET scheduled_time = ? WHERE job_id = ?",
-                (new_time.isoformat(), job_id)
-            )
-            conn.commit()
-            conn.close()
-            logger.info(f"Rescheduled {job_id} to {new_time}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to reschedule {job_id}: {e}")
-            return False
+            due = datetime.fromisoformat(scheduled_time).timestamp()
+        except ValueError:
+            logger.error(f"Scheduled job {job_id} has an unreadable time: {scheduled_time!r}")
+            return None
+        return _Job(job_id, content_type, content_data, scheduled_time, created_at, due, row_id)
+
+    def _load(self):
+        """Load every pending row into memory."""
+        with self._db_lock:
+            self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {_PENDING_COLUMNS} FROM scheduled_content WHERE status = 'pending'"
+            ).fetchall()
+        with self._lock:
+            self._jobs = {}
+            for row in rows:
+                job = self._job_from_row(row)
+                if job and job.job_id not in self._unsettled:
+                    self._jobs[job.job_id] = job
+            self._heap = [(job.due, job.job_id) for job in self._jobs.values()]
+            heapq.heapify(self._heap)
+            self._synced_id = max((row[0] for row in rows), default=0)
+
+    def _sync(self):
+        """Pick up pending rows other connections have committed since we last looked."""
+        with self._db_lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return
+            self._data_version = version
+            rows = self._conn.execute(
+                f"""SELECT {_PENDING_COLUMNS} FROM scheduled_content
+                    WHERE id > ? AND status = 'pending'""",
+                (self._synced_id,)
+            ).fetchall()
+        earliest = float("inf")
+        with self._lock:
+            for row in rows:
+                self._synced_id = max(self._synced_id, row[0])
+                if row[1] in self._jobs or row[1] in self._unsettled:
+                    continue
+                job = self._job_from_row(row)
+                if job:
+                    self._push(job)
+                    earliest = min(earliest, job.due)
+        if rows:
+            logger.info(f"Scheduler picked up {len(rows)} job(s) added by another process")
+        self._request_arm(earliest)
+
+    # --- Journal / SQLite ---
+
+    def _write(self, record: dict):
+        """Journal a write (running) or apply it straight away (not running). Hold _lock."""
+        if self._journal is None:
+            self._apply([record])
+            return
+        self._journal.append(record)
+        self._unapplied.append(record)
+        if len(self._unapplied) >= self.journal_batch and not self._batch_signalled:
+            self._batch_signalled = True
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _apply(self, records: list[dict]):
+        """Apply journal records to scheduled_content in one transaction (idempotent)."""
+        row_ids = {}
+        settled = []
+        with self._db_lock, self._conn:
+            for record in records:
+                op = record["op"]
+                if op == "schedule":
+                    cursor = self._conn.execute(
+                        """INSERT OR IGNORE INTO scheduled_content
+                           (job_id, content_type, content_data, scheduled_time, created_at)
+                           VALUES (?, ?, ?, ?, ?)""",
+                        (record["job_id"], record["content_type"], record["content_data"],
+                         record["scheduled_time"], record["created_at"])
+                    )
+                    if cursor.rowcount:
+                        row_ids[record["job_id"]] = cursor.lastrowid
+                elif op == "reschedule":
+                    self._conn.execute(
+                        "UPDATE scheduled_content SET scheduled_time = ? WHERE job_id = ?",
+                        (record["scheduled_time"], record["job_id"])
+                    )
+                else:
+                    self._conn.execute(
+                        """UPDATE scheduled_content
+                           SET status = ?, executed_at = ?, result = ?
+                           WHERE job_id = ?""",
+                        (record["status"], record["executed_at"], record["result"],
+                         record["job_id"])
+                    )
+                    settled.append(record["job_id"])
+        with self._lock:
+            for job_id, row_id in row_ids.items():
+                job = self._jobs.get(job_id)
+                if job:
+                    job.id = row_id
+            self._unsettled.difference_update(settled)
+
+    async def _write_loop(self):
+        """Write journaled records in batches; pick up other processes' jobs."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.journal_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+                await asyncio.to_thread(self._sync)
+            except Exception as e:
+                logger.error(f"Scheduler journal write failed (will retry): {e}")
+
+    # --- Dispatch ---
+
+    def _request_arm(self, due: float):
+        """Re-arm the timer if `due` is earlier than what it's armed for (any thread)."""
+        if self._loop is not None and due < self._armed_due:
+            self._armed_due = due
+            self._loop.call_soon_threadsafe(self._arm)
+
+    def _arm(self):
+        """Point the single timer at the earliest pending job. Loop thread only."""
+        if self._loop is None:
+            return
+        with self._lock:
+            while self._heap:
+                due, job_id = self._heap[0]
+                job = self._jobs.get(job_id)
+                if job is not None and job.due == due:
+                    break
+                heapq.heappop(self._heap)
+            head = self._heap[0][0] if self._heap else float("inf")
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        self._armed_due = head
+        if self._heap:
+            # Deadline on the loop's monotonic clock; far-off ones are capped
+            # and re-derived from the wall clock so clock adjustments can't
+            # make a job fire early or late
+            delay = min(max(head - time.time(), 0.0), MAX_TIMER_DELAY)
+            self._timer = self._loop.call_at(self._loop.time() + delay, self._fire)
+
+    def _fire(self):
+        """Dispatch every job that is due, then re-arm."""
+        self._timer = None
+        now = time.time()
+        fired = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due, job_id = heapq.heappop(self._heap)
+                job = self._jobs.get(job_id)
+                if job is None or job.due != due:
+                    continue
+                del self._jobs[job_id]
+                self._unsettled.add(job_id)
+                fired.append(job)
+
+        grace = self.misfire_grace.total_seconds()
+        for job in fired:
+            if now - job.due > grace:
+                logger.warning(f"Scheduled job {job.job_id} missed its time ({job.scheduled_time})")
+                self._update_status(job.job_id, "failed", "Missed scheduled time")
+                continue
+            task = self._loop.create_task(self._execute_scheduled(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        self._arm()
 
 
 # Platform-specific optimal posting times (UTC) — targeting US audience peaks.
@@ -0,0 +1,313 @@
+"""
+Schema migrations - composite / covering indexes for the hot queries.
+
+Every store creates its own tables, but the indexes its queries (and the
+dashboard's cross-database reads) depend on live here, keyed by table, so
+one list says what "indexed" means for each table. Stores call
+ensure_indexes() from their _init_db(); migrate() applies everything to an
+existing data directory without starting the agents:
+
+    python -m core.schema_migrations [data_dir] [--check]
+
+HOT_QUERIES is the list the EXPLAIN regression test (and --check) runs:
+each must be answered from an index, never by a full table scan.
+"""
+
+import argparse
+import re
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+DATA_DIR = Path("data")
+
+
+def _json_field(column: str, path: str) -> str:
+    # json_valid guard: a malformed blob must never make an INSERT fail
+    return f"CASE WHEN json_valid({column}) THEN json_extract({column}, '{path}') END"
+
+
+@dataclass(frozen=True)
+class Index:
+    name: str
+    columns: str
+    where: str = ""  # partial index predicate
+
+
+# table -> {generated column: (declared type, expression)}. The declared type
+# matters: an untyped column compared with an INTEGER column gets numeric
+# affinity applied to it, which rules out its index.
+GENERATED_COLUMNS = {
+    "scheduled_content": {
+        "data_approval_id": (
+            "INTEGER", f"CAST({_json_field('content_data', '$.approval_id')} AS INTEGER)"
+        ),
+    },
+}
+
+INDEXES = {
+    "approvals": [
+        # pending queue (oldest first), expiry sweep, dashboard week window
+        Index("idx_approvals_status_created", "status, created_at"),
+        # per-project pending queue and get_stats(project_id) counts
+        Index("idx_approvals_project_status_created", "project_id, status, created_at"),
+        # dashboard content queue
+        Index("idx_approvals_status_type_created", "status, action_type, created_at"),
+        # dashboard tweets today / this week
+        Index("idx_approvals_status_type_reviewed", "status, action_type, reviewed_at"),
+        # get_last_executed(action_type)
+        Index("idx_approvals_type_executed", "action_type, executed_at"),
+        # get_approved_unexecuted(): small, already in review order
+        Index("idx_approvals_unexecuted", "reviewed_at",
+              where="status IN ('approved', 'edited') AND executed_at IS NULL"),
+    ],
+    "research_items": [
+        # get_research_findings / get_recent: range on scraped_at, relevance
+        # filter answered from the index (and the dashboard's score count
+        # scans this instead of the table). No separate relevance_score
+        # index: without planner stats it wins over the far narrower
+        # scraped_at range.
+        Index("idx_research_items_scraped_score", "scraped_at, relevance_score"),
+        Index("idx_research_items_processed_scraped", "processed, scraped_at"),
+        Index("idx_research_items_priority_scraped", "priority, scraped_at"),
+    ],
+    "watch_items": [
+        Index("idx_watch_items_status_mentions", "status, mention_count"),
+    ],
+    "scheduled_content": [
+        # get_pending / get_upcoming / next due job
+        Index("idx_scheduled_status_time", "status, scheduled_time"),
+        Index("idx_scheduled_time", "scheduled_time"),
+        Index("idx_scheduled_approval", "data_approval_id"),
+    ],
+    "events": [
+        # decay_memories per significance level, prune_forgotten, stats
+        # counts (recall_strength alone would again out-bid created_at)
+        Index("idx_events_significance_strength", "significance, recall_strength"),
+        # get_recent: both filters answered from the index
+        Index("idx_events_created_strength", "created_at, recall_strength"),
+        # get_historic: only the significance 8+ events, newest first
+        Index("idx_events_historic", "event_date", where="significance >= 8"),
+    ],
+}
+
+# database file (under the data dir) -> tables migrate() looks for in it
+DATABASES = {
+    "approval_queue.db": ["approvals"],
+    "research.db": ["research_items", "watch_items"],
+    "scheduler.db": ["scheduled_content"],
+    "events.db": ["events"],
+    "occy_events.db": ["events"],
+}
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    name: str
+    database: str
+    sql: str
+    params: tuple = ()
+
+
+HOT_QUERIES = [
+    # core/approval_queue.py
+    HotQuery("approvals.get_pending", "approval_queue.db",
+             "SELECT * FROM approvals WHERE status='pending' ORDER BY created_at"),
+    HotQuery("approvals.get_pending(project)", "approval_queue.db",
+             "SELECT * FROM approvals WHERE status='pending' AND project_id=? ORDER BY created_at",
+             ("david-flip",)),
+    HotQuery("approvals.get_approved_unexecuted", "approval_queue.db",
+             """SELECT * FROM approvals WHERE status IN ('approved', 'edited')
+                AND executed_at IS NULL ORDER BY reviewed_at"""),
+    HotQuery("approvals.expire_old", "approval_queue.db",
+             "UPDATE approvals SET status='expired' WHERE status='pending' AND created_at < ?",
+             ("2000-01-01",)),
+    HotQuery("approvals.get_stats(project)", "approval_queue.db",
+             "SELECT COUNT(*) as cnt FROM approvals WHERE project_id=? AND status=?",
+             ("david-flip", "approved")),
+    HotQuery("approvals.get_last_executed", "approval_queue.db",
+             """SELECT * FROM approvals WHERE action_type = ? AND executed_at IS NOT NULL
+                ORDER BY executed_at DESC LIMIT 1""", ("tweet",)),
+    # dashboard stats
+    HotQuery("dashboard.tweets_today", "approval_queue.db",
+             """SELECT COUNT(*) FROM approvals WHERE status = 'approved' AND action_type = 'tweet'
+                AND reviewed_at >= ? AND reviewed_at < ?""", ("2026-01-01", "2026-01-02")),
+    HotQuery("dashboard.content_queue", "approval_queue.db",
+             """SELECT * FROM approvals WHERE status = 'pending'
+                AND action_type IN ('script_review', 'video_distribute', 'video_create', 'video_tweet')
+                ORDER BY created_at DESC"""),
+    # agents/research_agent/knowledge_store.py, run_daily_tweets.py
+    HotQuery("research.get_research_findings", "research.db",
+             """SELECT title, summary, url, relevance_score, source FROM research_items
+                WHERE scraped_at > ? AND relevance_score >= 6
+                ORDER BY relevance_score DESC, scraped_at DESC LIMIT ?""", ("2026-01-01", 10)),
+    HotQuery("research.get_high_relevance", "research.db",
+             """SELECT * FROM research_items WHERE scraped_at > ? AND relevance_score >= ?
+                ORDER BY relevance_score DESC, scraped_at DESC""", ("2026-01-01", 7)),
+    HotQuery("research.get_unprocessed", "research.db",
+             "SELECT * FROM research_items WHERE processed = FALSE ORDER BY scraped_at DESC LIMIT ?",
+             (100,)),
+    HotQuery("research.get_items_by_priority", "research.db",
+             "SELECT * FROM research_items WHERE priority = ? ORDER BY scraped_at DESC LIMIT ?",
+             ("high", 50)),
+    HotQuery("dashboard.high_score_findings", "research.db",
+             "SELECT COUNT(*) FROM research_items WHERE relevance_score >= 8"),
+    HotQuery("research.get_watch_items", "research.db",
+             """SELECT * FROM watch_items WHERE mention_count >= ? AND status = 'watching'
+                ORDER BY mention_count DESC, last_seen DESC""", (3,)),
+    # core/scheduler.py
+    HotQuery("scheduler.load_pending", "scheduler.db",
+             """SELECT id, job_id, content_type, content_data, scheduled_time, created_at
+                FROM scheduled_content WHERE status = 'pending'"""),
+    HotQuery("scheduler.sync_new_jobs", "scheduler.db",
+             """SELECT id, job_id, content_type, content_data, scheduled_time, created_at
+                FROM scheduled_content WHERE id > ? AND status = 'pending'""", (1,)),
+    HotQuery("scheduler.apply_status", "scheduler.db",
+             """UPDATE scheduled_content SET status = ?, executed_at = ?, result = ?
+                WHERE job_id = ?""", ("executed", "2026-01-01", None, "job_1")),
+    HotQuery("scheduler.approval_job", "scheduler.db",
+             "SELECT 1 FROM scheduled_content WHERE data_approval_id = ?", (1,)),
+    # core/memory/event_store.py (recall()'s LIKE '%...%' fallback only runs when
+    # the FTS query errors, and no index can answer a leading wildcard anyway)
+    HotQuery("events.decay_memories", "events.db",
+             """UPDATE events SET recall_strength = MAX(0, recall_strength - ?)
+                WHERE significance = ? AND recall_strength > 0""", (0.1, 5)),
+    HotQuery("events.recall", "events.db",
+             """SELECT e.* FROM events e JOIN events_fts fts ON e.id = fts.rowid
+                WHERE events_fts MATCH ? AND e.recall_strength >= ?
+                ORDER BY e.significance DESC, e.recall_strength DESC LIMIT 5""",
+             ('"wall"', 0.3)),
+    HotQuery("events.prune_forgotten", "events.db",
+             "DELETE FROM events WHERE recall_strength < ? AND significance < 5", (0.05,)),
+    HotQuery("events.get_historic", "events.db",
+             "SELECT * FROM events WHERE significance >= 8 ORDER BY event_date DESC LIMIT ?", (20,)),
+    HotQuery("events.get_recent", "events.db",
+             """SELECT * FROM events WHERE created_at > ? AND recall_strength > 0.3
+                ORDER BY +significance DESC, created_at DESC LIMIT ?""", ("2026-01-01", 20)),
+    HotQuery("events.fading_count", "events.db",
+             "SELECT COUNT(*) FROM events WHERE recall_strength < 0.3"),
+]
+
+# "SCAN events" or "SCAN events USING INDEX x": every row of the table is
+# visited. Covering-index scans (whole-table aggregates like COUNT/AVG),
+# scans of a partial index and virtual-table (FTS) scans are fine.
+_FULL_SCAN = re.compile(
+    r"^SCAN (?!CONSTANT ROW)\w+\b(?! USING COVERING INDEX)(?! VIRTUAL TABLE)"
+    r"(?: USING INDEX (\w+))?"
+)
+_PARTIAL_INDEXES = {index.name for indexes in INDEXES.values() for index in indexes if index.where}
+
+
+def ensure_indexes(conn: sqlite3.Connection, table: str) -> int:
+    """
+    Add the generated columns and indexes listed for `table` (idempotent).
+    No-op if the table doesn't exist; indexes over columns the table doesn't
+    have are skipped. Returns the number of objects created.
+    """
+    if not conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)
+    ).fetchone():
+        return 0
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})")}
+    indexes = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name=?", (table,)
+    )}
+    created = 0
+    with conn:
+        for column, (type_, expr) in GENERATED_COLUMNS.get(table, {}).items():
+            if column not in existing:
+                conn.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {column} {type_} "
+                    f"GENERATED ALWAYS AS ({expr}) VIRTUAL"
+                )
+                existing.add(column)
+                created += 1
+        for index in INDEXES.get(table, []):
+            if index.name in indexes:
+                continue
+            # Older copies of a table may predate some columns
+            if not {c.strip() for c in index.columns.split(",")} <= existing:
+                continue
+            where = f" WHERE {index.where}" if index.where else ""
+            conn.execute(f"CREATE INDEX {index.name} ON {table}({index.columns}){where}")
+            created += 1
+    return created
+
+
+def migrate_database(db_path: Path, tables: list[str]) -> int:
+    """Apply ensure_indexes to the given tables of one database file."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        created = sum(ensure_indexes(conn, table) for table in tables)
+        if created:
+            conn.execute("PRAGMA optimize")
+        return created
+    finally:
+        conn.close()
+
+
+def migrate(data_dir: Path = DATA_DIR) -> dict[str, int]:
+    """Migrate every known database present in data_dir. Returns created counts."""
+    data_dir = Path(data_dir)
+    return {
+        name: migrate_database(data_dir / name, tables)
+        for name, tables in DATABASES.items()
+        if (data_dir / name).exists()
+    }
+
+
+def query_plan(conn: sqlite3.Connection, sql: str, params: tuple = ()) -> list[str]:
+    """EXPLAIN QUERY PLAN detail lines for one statement."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def full_scans(plan: list[str]) -> list[str]:
+    """Plan lines that read a whole table without an index."""
+    scans = []
+    for line in plan:
+        match = _FULL_SCAN.match(line)
+        if match and match.group(1) not in _PARTIAL_INDEXES:
+            scans.append(line)
+    return scans
+
+
+def check(data_dir: Path = DATA_DIR) -> list[tuple[str, list[str]]]:
+    """Hot queries (against the databases in data_dir) that fall back to a full scan."""
+    failures = []
+    data_dir = Path(data_dir)
+    for query in HOT_QUERIES:
+        path = data_dir / query.database
+        if not path.exists():
+            continue
+        conn = sqlite3.connect(f"file:{path.resolve()}?mode=ro", uri=True)
+        try:
+            plan = query_plan(conn, query.sql, query.params)
+        except sqlite3.OperationalError:
+            continue  # table not created yet in this database
+        finally:
+            conn.close()
+        if full_scans(plan):
+            failures.append((query.name, plan))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add hot-query indexes to the data databases")
+    parser.add_argument("data_dir", nargs="?", default=str(DATA_DIR))
+    parser.add_argument("--check", action="store_true",
+                        help="only report hot queries that would do a full table scan")
+    args = parser.parse_args()
+
+    if not args.check:
+        for name, created in migrate(Path(args.data_dir)).items():
+            print(f"{name}: {created} index(es)/column(s) added")
+    failures = check(Path(args.data_dir))
+    for name, plan in failures:
+        print(f"FULL SCAN {name}: {' | '.join(plan)}")
+    if not failures:
+        print("All hot queries use an index.")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Snapshot Index - Incremental file index shared by the repo-context collectors
+(Wall Mode's WallCollector and wall_python, claude_memory reconciliation).
+
+Kept in core/ with no voice or numpy imports, so standalone tools can use
+it without loading the voice stack.
+
+Every wall-mode question used to re-walk the tree, re-read every file and
+re-run subsystem detection over the full contents. The snapshot index keeps
+one entry per file keyed on (path, mtime, size):
+
+    content hash, line/char/token counts, subsystem tags, file content
+
+Entries are persisted to SQLite (data/wall_snapshot.db) so a new process
+starts warm, and kept in memory so repeated questions in one session only
+pay for a stat() per file. Only files whose mtime or size changed are
+re-read; if the content hash is unchanged the old tags are kept.
+
+Formatted per-file context segments are memoized too, so building an 800K
+token context is a concatenation of cached strings.
+
+Usage:
+    index = get_index(root, "wall_python", tagger=_detect_subsystems,
+                      tag_version=patterns_digest(SUBSYSTEM_PATTERNS))
+    entries = index.refresh(paths)
+    text = index.segment(entries[0], "wall_python", render_fn)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Approximate tokens per character (same estimate as the collectors)
+CHARS_PER_TOKEN = 3.5
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data" / "wall_snapshot.db"
+
+# (relative_path, content) -> subsystem tags
+Tagger = Callable[[str, str], List[str]]
+
+
+@dataclass
+class SnapshotEntry:
+    """One indexed file."""
+    path: str
+    relative_path: str
+    mtime_ns: int
+    size: int
+    content_hash: str
+    lines: int
+    chars: int
+    tokens: int
+    content: str
+    subsystems: List[str] = field(default_factory=list)
+
+
+@dataclass
+class RefreshStats:
+    """What the last refresh() had to do."""
+    scanned: int = 0
+    reused: int = 0
+    reread: int = 0
+    retagged: int = 0
+    removed: int = 0
+    # path as passed to refresh() -> the stat/read error that skipped it
+    failed: Dict[str, Exception] = field(default_factory=dict)
+
+
+def patterns_digest(patterns) -> str:
+    """Short stable hash of a pattern table, used as a tag_version."""
+    blob = json.dumps(patterns, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:12]
+
+
+def _read_text(path: str) -> str:
+    """Read like Path.read_text(errors='ignore'), including newline translation."""
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read()
+
+
+class SnapshotIndex:
+    """Incremental (path, mtime, size) index for one root + namespace."""
+
+    def __init__(
+        self,
+        root: Path,
+        namespace: str,
+        tagger: Optional[Tagger] = None,
+        tag_version: str = "",
+        db_path: Optional[Path] = None,
+    ):
+        self.root = Path(root).resolve()
+        self.namespace = namespace
+        self.tagger = tagger
+        self.tag_version = tag_version
+        self.db_path = Path(db_path) if db_path else DEFAULT_DB_PATH
+        self.scope = f"{namespace}|{self.root}"
+
+        self.entries: Dict[str, SnapshotEntry] = {}
+        self.last_refresh = RefreshStats()
+
+        # (relative_path, kind) -> (content_hash, derived value)
+        self._derived: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path))
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS snapshot_files (
+                scope TEXT NOT NULL,
+                relative_path TEXT NOT NULL,
+                path TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                lines INTEGER NOT NULL,
+                chars INTEGER NOT NULL,
+                tokens INTEGER NOT NULL,
+                subsystems TEXT NOT NULL,
+                tag_version TEXT NOT NULL,
+                content TEXT NOT NULL,
+                PRIMARY KEY (scope, relative_path)
+            );
+        """)
+        return conn
+
+    def _load(self):
+        """Pull persisted entries for this scope into memory (once per process)."""
+        self._loaded = True
+        if not self.db_path.exists():
+            return
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT relative_path, path, mtime_ns, size, content_hash, lines,"
+                    " chars, tokens, subsystems, tag_version, content"
+                    " FROM snapshot_files WHERE scope = ?",
+                    (self.scope,),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Wall snapshot load failed ({e}); starting cold")
+            return
+
+        stale_tags = 0
+        for (rel, path, mtime_ns, size, content_hash, lines, chars, tokens,
+             subsystems, tag_version, content) in rows:
+            tags = json.loads(subsystems)
+            if tag_version != self.tag_version:
+                # Detection patterns changed - retag from cached content, no re-read
+                tags = self._tag(rel, content)
+                stale_tags += 1
+            self.entries[rel] = SnapshotEntry(
+                path=path,
+                relative_path=rel,
+                mtime_ns=mtime_ns,
+                size=size,
+                content_hash=content_hash,
+                lines=lines,
+                chars=chars,
+                tokens=tokens,
+                content=content,
+                subsystems=tags,
+            )
+        if stale_tags:
+            self._save(list(self.entries.values()), [])
+        logger.debug(f"Wall snapshot: loaded {len(rows)} entries for {self.scope}")
+
+    def _save(self, changed: List[SnapshotEntry], removed: List[str]):
+        if not changed and not removed:
+            return
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO snapshot_files VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+                    [
+                        (self.scope, e.relative_path, e.path, e.mtime_ns, e.size,
+                         e.content_hash, e.lines, e.chars, e.tokens,
+                         json.dumps(e.subsystems), self.tag_version, e.content)
+                        for e in changed
+                    ],
+                )
+                conn.executemany(
+                    "DELETE FROM snapshot_files WHERE scope = ? AND relative_path = ?",
+                    [(self.scope, rel) for rel in removed],
+                )
+        except sqlite3.Error as e:
+            # The in-memory index is still correct; next process just starts colder
+            logger.warning(f"Wall snapshot save failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def _tag(self, relative_path: str, content: str) -> List[str]:
+        return self.tagger(relative_path, content) if self.tagger else []
+
+    def _relative(self, path: Path) -> str:
+        try:
+            rel = Path(path).resolve().relative_to(self.root)
+        except ValueError:
+            rel = Path(path)
+        return str(rel).replace("\\", "/")
+
+    def refresh(self, paths: Iterable[Path], complete: bool = True) -> List[SnapshotEntry]:
+        """
+        Bring the index up to date for `paths` and return their entries in
+        the same order. Unreadable files are skipped (see last_refresh.failed).
+
+        With complete=True, `paths` is treated as the full file list for this
+        walk and entries for files that no longer exist are dropped.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+            stats = RefreshStats()
+            result: List[SnapshotEntry] = []
+            changed: List[SnapshotEntry] = []
+            seen = set()
+
+            for path in paths:
+                path_str = str(path)
+                rel = self._relative(path)
+                seen.add(rel)
+                stats.scanned += 1
+
+                try:
+                    st = os.stat(path_str)
+                except OSError as e:
+                    stats.failed[path_str] = e
+                    continue
+
+                entry = self.entries.get(rel)
+                if entry and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                    stats.reused += 1
+                    result.append(entry)
+                    continue
+
+                try:
+                    content = _read_text(path_str)
+                except Exception as e:
+                    stats.failed[path_str] = e
+                    continue
+
+                content_hash = hashlib.sha1(content.encode("utf-8", errors="ignore")).hexdigest()
+                stats.reread += 1
+
+                if entry and entry.content_hash == content_hash:
+                    # Touched but not edited - keep counts and tags
+                    entry.mtime_ns = st.st_mtime_ns
+                    entry.size = st.st_size
+                    entry.path = path_str
+                else:
+                    stats.retagged += 1
+                    entry = SnapshotEntry(
+                        path=path_str,
+                        relative_path=rel,
+                        mtime_ns=st.st_mtime_ns,
+                        size=st.st_size,
+                        content_hash=content_hash,
+                        lines=content.count("\n") + 1,
+                        chars=len(content),
+                        tokens=int(len(content) / CHARS_PER_TOKEN),
+                        content=content,
+                        subsystems=self._tag(rel, content),
+                    )
+                    self.entries[rel] = entry
+
+                changed.append(entry)
+                result.append(entry)
+
+            removed: List[str] = []
+            if complete:
+                for rel in list(self.entries):
+                    if rel not in seen and not os.path.exists(self.entries[rel].path):
+                        del self.entries[rel]
+                        removed.append(rel)
+                stats.removed = len(removed)
+
+            self._save(changed, removed)
+            self.last_refresh = stats
+
+        if stats.reread or stats.removed:
+            logger.info(
+                f"Wall snapshot {self.namespace}: {stats.scanned} files, "
+                f"{stats.reread} re-read, {stats.retagged} retagged, {stats.removed} removed"
+            )
+        return result
+
+    def derive(self, entry: SnapshotEntry, kind: str, build: Callable[[SnapshotEntry], object]):
+        """Per-file derived data (segments, term counts...), memoized per content hash."""
+        key = (entry.relative_path, kind)
+        cached = self._derived.get(key)
+        if cached and cached[0] == entry.content_hash:
+            return cached[1]
+        value = build(entry)
+        self._derived[key] = (entry.content_hash, value)
+        return value
+
+    def segment(self, entry: SnapshotEntry, style: str, render: Callable[[SnapshotEntry], str]) -> str:
+        """Rendered context segment for a file, memoized per content hash."""
+        return self.derive(entry, f"segment:{style}", render)
+
+
+_INDEXES: Dict[tuple, SnapshotIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_index(
+    root: Path,
+    namespace: str,
+    tagger: Optional[Tagger] = None,
+    tag_version: str = "",
+    db_path: Optional[Path] = None,
+) -> SnapshotIndex:
+    """Process-wide SnapshotIndex for (root, namespace)."""
+    key = (str(Path(root).resolve()), namespace, tag_version, str(db_path or DEFAULT_DB_PATH))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = SnapshotIndex(root, namespace, tagger=tagger, tag_version=tag_version, db_path=db_path)
+            _INDEXES[key] = index
+        elif tagger is not None:
+            index.tagger = tagger
+        return index
@@ -1,14 +1,40 @@
 """
 Token budget manager.
 
-Enforces prepaid-only token budgets with daily caps per project.
+Enforces prepaid-only token budgets with daily and monthly caps per project.
 Ganzak principle: no auto-billing, add small amounts, monitor closely.
+
+Spend is kept as running totals: spend_totals holds one row per project per
+day and per month, updated in the same transaction as the usage row. Each
+process mirrors the rows it needs in memory and only re-reads them when
+another connection has committed (PRAGMA data_version), so has_budget() is
+a dict lookup no matter how much usage history exists.
 """
 
 import sqlite3
-from datetime import datetime, date
+import threading
+from datetime import datetime, date, timedelta
 from pathlib import Path
 
+DEFAULT_DAILY_LIMIT = 10.0  # $10/day for projects without a budget row
+
+# Anthropic prompt caching, as multiples of the model's input price
+CACHE_WRITE_MULTIPLIER = 1.25  # writing a prefix to the (5-minute) cache
+CACHE_READ_MULTIPLIER = 0.10   # reusing a cached prefix
+
+
+def _period_bounds(period: str, day: date) -> tuple[str, str, str]:
+    """(period_key, start, end) for the day or month containing `day`.
+
+    Bounds are ISO strings so `timestamp >= start AND timestamp < end`
+    can use idx_usage_project_date.
+    """
+    if period == "day":
+        return day.isoformat(), day.isoformat(), (day + timedelta(days=1)).isoformat()
+    first = day.replace(day=1)
+    following = (first + timedelta(days=32)).replace(day=1)
+    return first.strftime("%Y-%m"), first.isoformat(), following.isoformat()
+
 
 class TokenBudgetManager:
 
@@ -17,6 +43,17 @@ class TokenBudgetManager:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
 
+        # One long-lived connection for the ledger: its own commits don't
+        # move data_version, so only other processes' writes force a reload.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path), isolation_level=None, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._data_version = None
+        self._totals: dict[tuple[str, str, str], float] = {}
+        self._limits: dict[str, tuple[float, float] | None] = {}
+
     def _init_db(self):
         with self._connect() as conn:
             conn.execute("""
@@ -43,68 +80,182 @@ class TokenBudgetManager:
                 CREATE INDEX IF NOT EXISTS idx_usage_project_date
                 ON token_usage(project_id, timestamp)
             """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS spend_totals (
+                    project_id TEXT NOT NULL,
+                    period TEXT NOT NULL,
+                    period_key TEXT NOT NULL,
+                    cost_usd REAL NOT NULL DEFAULT 0.0,
+                    PRIMARY KEY (project_id, period, period_key)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("PRAGMA journal_mode=WAL")
 
     def _connect(self) -> sqlite3.Connection:
         conn = sqlite3.connect(str(self.db_path))
         conn.row_factory = sqlite3.Row
         return conn
 
+    def close(self):
+        """Close the ledger connection."""
+        with self._lock:
+            self._conn.close()
+
+    # --- Ledger ---
+
+    def _sync(self):
+        """Drop the in-memory mirror if another connection has committed."""
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._data_version = version
+            self._totals.clear()
+            self._limits.clear()
+
+    def _stored_total(self, project_id: str, period: str, key: str) -> float | None:
+        row = self._conn.execute(
+            """SELECT cost_usd FROM spend_totals
+               WHERE project_id=? AND period=? AND period_key=?""",
+            (project_id, period, key)
+        ).fetchone()
+        return row["cost_usd"] if row else None
+
+    def _load_total(self, project_id: str, period: str, day: date) -> float:
+        """
+        Running total for a period, seeding its row on first use.
+
+        A missing row (new day/month, or history recorded before the
+        totals table existed) is filled from one indexed range query over
+        token_usage. Must be called with the lock held, inside a write
+        transaction when the result will be updated.
+        """
+        key, start, end = _period_bounds(period, day)
+        stored = self._stored_total(project_id, period, key)
+        if stored is not None:
+            return stored
+
+        total = self._conn.execute(
+            """SELECT COALESCE(SUM(cost_usd), 0) AS total FROM token_usage
+               WHERE project_id=? AND timestamp >= ? AND timestamp < ?""",
+            (project_id, start, end)
+        ).fetchone()["total"]
+        self._conn.execute(
+            """INSERT OR IGNORE INTO spend_totals
+               (project_id, period, period_key, cost_usd) VALUES (?, ?, ?, ?)""",
+            (project_id, period, key, total)
+        )
+        return total
+
+    def _spend(self, project_id: str, period: str) -> float:
+        today = date.today()
+        cache_key = (project_id, period, _period_bounds(period, today)[0])
+        with self._lock:
+            self._sync()
+            if cache_key in self._totals:
+                return self._totals[cache_key]
+            total = self._stored_total(*cache_key)
+            if total is None:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    total = self._load_total(project_id, period, today)
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            self._totals[cache_key] = total
+            return total
+
+    def _get_limits(self, project_id: str) -> tuple[float, float] | None:
+        with self._lock:
+            self._sync()
+            if project_id not in self._limits:
+                row = self._conn.execute(
+                    "SELECT daily_limit, monthly_limit FROM budgets WHERE project_id=?",
+                    (project_id,)
+                ).fetchone()
+                self._limits[project_id] = (
+                    (row["daily_limit"], row["monthly_limit"]) if row else None
+                )
+            return self._limits[project_id]
+
     def set_budget(self, project_id: str, daily: float, monthly: float):
         """Set budget limits for a project."""
-        with self._connect() as conn:
-            conn.execute(
+        with self._lock:
+            self._conn.execute(
                 """INSERT OR REPLACE INTO budgets
                    (project_id, daily_limit, monthly_limit)
                    VALUES (?, ?, ?)""",
                 (project_id, daily, monthly)
             )
+            self._limits[project_id] = (daily, monthly)
 
     def has_budget(self, project_id: str) -> bool:
-        """Check if project has remaining daily budget."""
-        daily_spend = self.get_daily_spend(project_id)
-        daily_limit = self.get_daily_limit(project_id)
-        return daily_spend < daily_limit
+        """Check if project has remaining daily and monthly budget."""
+        if self.get_daily_spend(project_id) >= self.get_daily_limit(project_id):
+            return False
+        limits = self._get_limits(project_id)
+        return limits is None or self.get_monthly_spend(project_id) < limits[1]
 
     def get_daily_limit(self, project_id: str) -> float:
         """Get daily budget limit for a project."""
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT daily_limit FROM budgets WHERE project_id=?",
-                (project_id,)
-            ).fetchone()
-            return row["daily_limit"] if row else 10.0  # Default $10/day
+        limits = self._get_limits(project_id)
+        return limits[0] if limits else DEFAULT_DAILY_LIMIT
 
     def get_daily_spend(self, project_id: str) -> float:
         """Get total spend for today."""
-        today = date.today().isoformat()
-        with self._connect() as conn:
-            row = conn.execute(
-                """SELECT COALESCE(SUM(cost_usd), 0) as total
-                   FROM token_usage
-                   WHERE project_id=? AND DATE(timestamp)=?""",
-                (project_id, today)
-            ).fetchone()
-            return row["total"]
+        return self._spend(project_id, "day")
+
+    def get_monthly_spend(self, project_id: str) -> float:
+        """Get total spend for the current calendar month."""
+        return self._spend(project_id, "month")
 
     def record_usage(self, project_id: str, model: str,
                      tokens_in: int, tokens_out: int,
                      cost: float, task_type: str = "",
                      agent_id: str = ""):
-        """Record token usage."""
-        with self._connect() as conn:
-            conn.execute(
-                """INSERT INTO token_usage
-                   (project_id, model, tokens_input, tokens_output,
-                    cost_usd, task_type, agent_id, timestamp)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (project_id, model, tokens_in, tokens_out,
-                 cost, task_type, agent_id,
-                 datetime.now().isoformat())
-            )
+        """Record token usage and add it to today's and this month's totals."""
+        now = datetime.now()
+        with self._lock:
+            self._sync()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Seed before inserting so the new row isn't counted twice
+                totals = {
+                    period: self._load_total(project_id, period, now.date())
+                    for period in ("day", "month")
+                }
+                self._conn.execute(
+                    """INSERT INTO token_usage
+                       (project_id, model, tokens_input, tokens_output,
+                        cost_usd, task_type, agent_id, timestamp)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (project_id, model, tokens_in, tokens_out,
+                     cost, task_type, agent_id, now.isoformat())
+                )
+                for period in totals:
+                    key = _period_bounds(period, now.date())[0]
+                    self._conn.execute(
+                        """UPDATE spend_totals SET cost_usd = cost_usd + ?
+                           WHERE project_id=? AND period=? AND period_key=?""",
+                        (cost, project_id, period, key)
+                    )
+                    totals[period] += cost
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            for period, total in totals.items():
+                key = _period_bounds(period, now.date())[0]
+                self._totals[(project_id, period, key)] = total
 
     def calculate_cost(self, model: str, tokens_in: int,
-                       tokens_out: int) -> float:
-        """Calculate cost based on model pricing."""
+                       tokens_out: int, cache_write_tokens: int = 0,
+                       cache_read_tokens: int = 0) -> float:
+        """
+        Calculate cost based on model pricing.
+
+        tokens_in is the uncached input; prompt-cache writes and reads are
+        billed on top at their multiples of the input price.
+        """
         # Pricing per 1M tokens (input, output)
         pricing = {
             "llama3.2:8b": (0.0, 0.0),
@@ -114,11 +265,14 @@ class TokenBudgetManager:
             "gpt-4o-mini": (0.15, 0.60),
         }
         in_price, out_price = pricing.get(model, (3.00, 15.00))
-        return (tokens_in * in_price + tokens_out * out_price) / 1_000_000
+        input_tokens = (tokens_in
+                        + cache_write_tokens * CACHE_WRITE_MULTIPLIER
+                        + cache_read_tokens * CACHE_READ_MULTIPLIER)
+        return (input_tokens * in_price + tokens_out * out_price) / 1_000_000
 
     def get_daily_report(self, project_id: str) -> dict:
         """Generate daily cost report."""
-        today = date.today().isoformat()
+        today, start, end = _period_bounds("day", date.today())
         with self._connect() as conn:
             rows = conn.execute(
                 """SELECT model,
@@ -127,9 +281,9 @@ class TokenBudgetManager:
                           SUM(cost_usd) as total_cost,
                           COUNT(*) as call_count
                    FROM token_usage
-                   WHERE project_id=? AND DATE(timestamp)=?
+                   WHERE project_id=? AND timestamp >= ? AND timestamp < ?
                    GROUP BY model""",
-                (project_id, today)
+                (project_id, start, end)
             ).fetchall()
 
             total_cost = sum(r["total_cost"] for r in rows)
@@ -13,6 +13,7 @@ import json
 import os
 import random
 import sqlite3
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from functools import wraps
@@ -23,6 +24,10 @@ from flask import (
 )
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dashboard.read_model import ReadModel
+
 load_dotenv()
 
 app = Flask(__name__)
@@ -40,6 +45,9 @@ FEEDBACK_DIR = DATA_DIR / "content_feedback"
 # Ensure feedback directory exists
 Path(FEEDBACK_DIR).mkdir(parents=True, exist_ok=True)
 
+# Pooled read-only connection(s) with all dashboard databases attached
+READ_MODEL = ReadModel(DATA_DIR)
+
 # Simple auth (single operator)
 DASHBOARD_PASSWORD = os.environ.get("DASHBOARD_PASSWORD", "flipt2026")
 
@@ -632,46 +640,10 @@ def get_stats():
     }
 
     try:
-        # Pending approvals
-        if APPROVAL_DB.exists():
-            conn = get_db(APPROVAL_DB)
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM approvals WHERE status = 'pending'")
-            stats["pending_approvals"] = cursor.fetchone()[0]
-
-            # Tweets today
-            today = datetime.now().date().isoformat()
-            cursor.execute(
-                "SELECT COUNT(*) FROM approvals WHERE status = 'approved' AND action_type = 'tweet' AND reviewed_at LIKE ?",
-                (f"{today}%",)
-            )
-            stats["tweets_today"] = cursor.fetchone()[0]
-
-            # Tweets this week
-            week_ago = (datetime.now() - timedelta(days=7)).isoformat()
-            cursor.execute(
-                "SELECT COUNT(*) FROM approvals WHERE status = 'approved' AND action_type = 'tweet' AND reviewed_at > ?",
-                (week_ago,)
-            )
-            stats["tweets_week"] = cursor.fetchone()[0]
-            conn.close()
-
-        # Research items
-        if RESEARCH_DB.exists():
-            conn = get_db(RESEARCH_DB)
-            cursor = conn.cursor()
-            today = datetime.now().date().isoformat()
-            cursor.execute(
-                "SELECT COUNT(*) FROM research_items WHERE scraped_at LIKE ?",
-                (f"{today}%",)
-            )
-            stats["research_items_today"] = cursor.fetchone()[0]
-
-            cursor.execute(
-                "SELECT COUNT(*) FROM research_items WHERE relevance_score >= 8"
-            )
-            stats["high_score_findings"] = cursor.fetchone()[0]
-            conn.close()
+        counts = _read_counts()
+        for key in ("pending_approvals", "tweets_today", "tweets_week",
+                    "research_items_today", "high_score_findings"):
+            stats[key] = counts[key]
 
         # System status is already set from david_status.json above
 
@@ -681,16 +653,21 @@ def get_stats():
     return stats
 
 
+def _read_counts() -> dict:
+    """Pending/content/tweet/research counts in one read-model query."""
+    now = datetime.now()
+    today = now.date()
+    return READ_MODEL.counts(
+        today=today.isoformat(),
+        tomorrow=(today + timedelta(days=1)).isoformat(),
+        week_ago=(now - timedelta(days=7)).isoformat(),
+    )
+
+
 def get_pending_approval_count():
     """Get count of pending approvals."""
     try:
-        if APPROVAL_DB.exists():
-            conn = get_db(APPROVAL_DB)
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM approvals WHERE status = 'pending'")
-            count = cursor.fetchone()[0]
-            conn.close()
-            return count
+        return _read_counts()["pending_approvals"]
     except:
         pass
     return 0
@@ -815,129 +792,44 @@ def get_schedule_data():
     stats = {"pending": 0, "approved": 0, "scheduled": 0, "posted": 0, "failed": 0}
     scheduled_items = []
     pending_items = []
+    recent_posted = []
 
-    # Approval queue — pending items + recent history
-    try:
-        if APPROVAL_DB.exists():
-            conn = get_db(APPROVAL_DB)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, action_type, action_data, status, created_at, reviewed_at, agent_id
-                FROM approvals
-                WHERE created_at > ? OR status = 'pending'
-                ORDER BY created_at DESC
-            """, (week_ago,))
-            for row in cursor.fetchall():
-                item = dict(row)
-                action_data = json.loads(item["action_data"])
-                text = action_data.get("text", action_data.get("script", ""))
-
-                if item["status"] == "pending":
-                    stats["pending"] += 1
-                    pending_items.append({
-                        "id": item["id"],
-                        "type": item["action_type"],
-                        "text": (text or "")[:80],
-                        "status": "pending",
-                        "created_at": item["created_at"],
-                        "agent": item["agent_id"] or "david",
-                    })
-                elif item["status"] == "approved":
-                    stats["approved"] += 1
-                    # Show approved items on calendar (approved != posted)
-                    ts = item["reviewed_at"] or item["created_at"]
-                    if ts:
-                        platform = "twitter" if item["action_type"] in ("tweet", "thread", "reply") else "multi"
-                        scheduled_items.append({
-                            "id": f"ap_{item['id']}",
-                            "type": item["action_type"],
-                            "text": (text or "")[:80],
-                            "status": "approved",
-                            "scheduled_time": ts,
-                            "executed_at": None,
-                            "agent": item["agent_id"] or "david",
-                            "platform": platform,
-                        })
-            conn.close()
-    except Exception as e:
-        print(f"Schedule: error reading approval queue: {e}")
-
-    # Scheduler — items with actual scheduled times (these are the source of truth)
-    scheduler_approval_ids = set()  # Track which approval IDs have scheduler entries
+    # Counts come back aggregated; items are only the ones on the 7-day grid.
+    # Scheduler jobs have the actual scheduled times (source of truth), so
+    # approved items that already have a job aren't shown twice.
     try:
-        if SCHEDULER_DB.exists():
-            conn = get_db(SCHEDULER_DB)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT job_id, content_type, content_data, scheduled_time,
-                       status, created_at, executed_at
-                FROM scheduled_content
-                WHERE scheduled_time > ? OR status = 'pending'
-                ORDER BY scheduled_time ASC
-            """, (week_ago,))
-            for row in cursor.fetchall():
-                item = dict(row)
-                content_data = json.loads(item["content_data"])
-                text = content_data.get("text", content_data.get("script", ""))
-
-                # Track approval IDs so we can deduplicate
-                aid = content_data.get("approval_id")
-                if aid:
-                    scheduler_approval_ids.add(int(aid))
-
-                display_status = item["status"]
-                if display_status == "executed":
-                    display_status = "posted"
-                    stats["posted"] += 1
-                elif display_status == "pending":
-                    display_status = "scheduled"
-                    stats["scheduled"] += 1
-                elif display_status == "failed":
-                    stats["failed"] += 1
-
-                platform = content_data.get("platform", "twitter")
-                if item["content_type"] in ("tweet", "thread", "reply"):
-                    platform = "twitter"
-
-                scheduled_items.append({
-                    "id": item["job_id"],
-                    "type": item["content_type"],
-                    "text": (text or "")[:80],
-                    "status": display_status,
-                    "scheduled_time": item["scheduled_time"],
-                    "executed_at": item["executed_at"],
-                    "agent": content_data.get("agent", "david"),
-                    "platform": platform,
-                })
-            conn.close()
+        data = READ_MODEL.schedule(
+            week_ago,
+            (today - timedelta(days=3)).isoformat(),
+            (today + timedelta(days=4)).isoformat(),
+        )
+        stats = data["stats"]
+        scheduled_items = data["items"]
+        pending_items = data["pending"]
+        recent_posted = data["recent_posted"]
     except Exception as e:
-        print(f"Schedule: error reading scheduler: {e}")
+        print(f"Schedule: error reading approval queue/scheduler: {e}")
 
-    # Remove approval queue items that already have scheduler entries (prevent duplicates)
-    scheduled_items = [
-        si for si in scheduled_items
-        if not (si["id"].startswith("ap_") and int(si["id"][3:]) in scheduler_approval_ids)
-    ]
-
-    # Build 7-day grid (3 past + today + 3 future)
+    # Build 7-day grid (3 past + today + 3 future): parse each item's time
+    # once and drop it into its day's nearest optimal slot
+    grid = {
+        today + timedelta(days=day_offset): {hour: [] for hour in optimal_hours}
+        for day_offset in range(-3, 4)
+    }
+    upcoming = []
+    for si in scheduled_items:
+        try:
+            ts = datetime.fromisoformat(si["scheduled_time"])
+        except (ValueError, TypeError):
+            continue
+        if si["status"] == "scheduled":
+            upcoming.append(ts)
+        day_slots = grid.get(ts.date())
+        if day_slots is not None:
+            nearest = min(optimal_hours, key=lambda h: abs(ts.hour + ts.minute / 60 - h))
+            day_slots[nearest].append(si)
     days = []
-    for day_offset in range(-3, 4):
-        day_date = today + timedelta(days=day_offset)
-        day_slots = {}
-        for hour in optimal_hours:
-            slot_content = []
-            for si in scheduled_items:
-                try:
-                    ts = datetime.fromisoformat(si["scheduled_time"])
-                    if ts.date() != day_date:
-                        continue
-                    # Place item in nearest optimal slot
-                    nearest = min(optimal_hours, key=lambda h: abs(ts.hour + ts.minute / 60 - h))
-                    if nearest == hour:
-                        slot_content.append(si)
-                except (ValueError, TypeError):
-                    pass
-            day_slots[hour] = slot_content
+    for day_date, day_slots in grid.items():
         days.append({
             "date": day_date.isoformat(),
             "label": day_date.strftime("%a %b %d"),
@@ -956,15 +848,12 @@ def get_schedule_data():
             if slot_time <= now:
                 continue
             has_content = False
-            for si in scheduled_items:
-                if si["status"] != "scheduled":
-                    continue
+            for ts in upcoming:
                 try:
-                    ts = datetime.fromisoformat(si["scheduled_time"])
                     if abs((ts - slot_time).total_seconds()) < 3600:
                         has_content = True
                         break
-                except (ValueError, TypeError):
+                except TypeError:
                     pass
             if not has_content:
                 gaps += 1
@@ -972,17 +861,13 @@ def get_schedule_data():
                     next_empty = slot_time
     stats["gaps"] = gaps
 
-    # Recent posted items for bottom section
-    recent_posted = [si for si in scheduled_items if si["status"] == "posted"]
-    recent_posted.sort(key=lambda x: x["scheduled_time"], reverse=True)
-
     return {
         "days": days,
         "stats": stats,
         "optimal_hours": optimal_hours,
         "next_empty": next_empty.strftime("%a %I%p UTC") if next_empty else None,
         "pending_items": pending_items,
-        "recent_posted": recent_posted[:20],
+        "recent_posted": recent_posted,
     }
 
 
@@ -995,43 +880,30 @@ def get_pending_content(platform_filter: str = "") -> list[dict]:
     """
     items = []
     try:
-        if APPROVAL_DB.exists():
-            conn = get_db(APPROVAL_DB)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, project_id, agent_id, action_type, action_data,
-                       context_summary, created_at
-                FROM approvals
-                WHERE status = 'pending'
-                AND action_type IN ('script_review', 'video_distribute', 'video_create', 'video_tweet')
-                ORDER BY created_at DESC
-            """)
-            for row in cursor.fetchall():
-                item = dict(row)
-                action_data = json.loads(item["action_data"])
-
-                # Determine stage based on action_type
-                if item["action_type"] == "script_review":
-                    stage = 1
-                    stage_label = "Stage 1: Script Review"
-                else:
-                    stage = 2
-                    stage_label = "Stage 2: Video Review"
-
-                item.update({
-                    "script": action_data.get("script", ""),
-                    "video_path": action_data.get("video_path", ""),
-                    "mood": action_data.get("mood", ""),
-                    "pillar": action_data.get("pillar", ""),
-                    "theme_title": action_data.get("theme_title", ""),
-                    "category": action_data.get("category", ""),
-                    "word_count": action_data.get("word_count", 0),
-                    "estimated_duration": action_data.get("estimated_duration", 0),
-                    "stage": stage,
-                    "stage_label": stage_label,
-                })
-                items.append(item)
-            conn.close()
+        for item in READ_MODEL.pending_content():
+            action_data = json.loads(item["action_data"])
+
+            # Determine stage based on action_type
+            if item["action_type"] == "script_review":
+                stage = 1
+                stage_label = "Stage 1: Script Review"
+            else:
+                stage = 2
+                stage_label = "Stage 2: Video Review"
+
+            item.update({
+                "script": action_data.get("script", ""),
+                "video_path": action_data.get("video_path", ""),
+                "mood": action_data.get("mood", ""),
+                "pillar": action_data.get("pillar", ""),
+                "theme_title": action_data.get("theme_title", ""),
+                "category": action_data.get("category", ""),
+                "word_count": action_data.get("word_count", 0),
+                "estimated_duration": action_data.get("estimated_duration", 0),
+                "stage": stage,
+                "stage_label": stage_label,
+            })
+            items.append(item)
     except Exception as e:
         print(f"Error getting content: {e}")
     return items
@@ -1045,16 +917,7 @@ def get_content_platform_counts() -> dict:
     """
     total = 0
     try:
-        if APPROVAL_DB.exists():
-            conn = get_db(APPROVAL_DB)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT COUNT(*) FROM approvals
-                WHERE status = 'pending'
-                AND action_type IN ('script_review', 'video_distribute', 'video_create', 'video_tweet')
-            """)
-            total = cursor.fetchone()[0]
-            conn.close()
+        total = _read_counts()["content_count"]
     except Exception:
         pass
     return {"twitter": total, "youtube": total, "tiktok": total}
@@ -1063,17 +926,7 @@ def get_content_platform_counts() -> dict:
 def get_content_count():
     """Get count of pending content items."""
     try:
-        if APPROVAL_DB.exists():
-            conn = get_db(APPROVAL_DB)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT COUNT(*) FROM approvals
-                WHERE status = 'pending'
-                AND action_type IN ('script_review', 'video_distribute', 'video_create', 'video_tweet')
-            """)
-            count = cursor.fetchone()[0]
-            conn.close()
-            return count
+        return _read_counts()["content_count"]
     except Exception:
         pass
     return 0
@@ -1140,56 +993,38 @@ def _get_next_available_tweet_slot() -> datetime:
     Fallback: organic time 2-4h from now with natural-looking minute.
     """
     now = datetime.utcnow()
-    GROWTH_DB = DATA_DIR / "growth.db"
 
     # --- Try Momo's plan first ---
     try:
-        if GROWTH_DB.exists():
-            conn = sqlite3.connect(str(GROWTH_DB))
-            conn.row_factory = sqlite3.Row
-            today = now.strftime("%Y-%m-%d")
-            row = conn.execute(
-                "SELECT slot_times FROM daily_tweet_schedule WHERE schedule_date = ? ORDER BY id DESC LIMIT 1",
-                (today,),
-            ).fetchone()
-            conn.close()
-
-            if row:
-                import json as _json
-                slot_times = _json.loads(row["slot_times"])
-
-                # Read already-scheduled times from scheduler.db
-                taken_times = []
+        # Plan from growth.db and pending job times from scheduler.db, one query
+        plan_json, taken = READ_MODEL.tweet_slot_plan(now.strftime("%Y-%m-%d"))
+        if plan_json:
+            slot_times = json.loads(plan_json)
+            taken_times = []
+            for t in taken:
                 try:
-                    if SCHEDULER_DB.exists():
-                        sconn = sqlite3.connect(str(SCHEDULER_DB))
-                        sconn.row_factory = sqlite3.Row
-                        rows = sconn.execute(
-                            "SELECT scheduled_time FROM scheduled_content WHERE status = 'pending'"
-                        ).fetchall()
-                        sconn.close()
-                        taken_times = [datetime.fromisoformat(r["scheduled_time"]) for r in rows]
-                except Exception:
+                    taken_times.append(datetime.fromisoformat(t))
+                except (TypeError, ValueError):
                     pass
 
-                # Find next available planned slot
-                for slot_str in slot_times:
-                    slot = datetime.fromisoformat(slot_str)
-                    # Strip timezone info for comparison with naive utcnow
-                    if slot.tzinfo is not None:
-                        slot = slot.replace(tzinfo=None)
-                    # Must be at least 5 minutes from now
-                    if slot <= now + timedelta(minutes=5):
-                        continue
-                    # Check conflict: no other post within 90 minutes of this slot
-                    def _strip_tz(dt):
-                        return dt.replace(tzinfo=None) if dt.tzinfo else dt
-                    conflict = any(
-                        abs((_strip_tz(t) - slot).total_seconds()) < 5400
-                        for t in taken_times
-                    )
-                    if not conflict:
-                        return slot
+            # Find next available planned slot
+            for slot_str in slot_times:
+                slot = datetime.fromisoformat(slot_str)
+                # Strip timezone info for comparison with naive utcnow
+                if slot.tzinfo is not None:
+                    slot = slot.replace(tzinfo=None)
+                # Must be at least 5 minutes from now
+                if slot <= now + timedelta(minutes=5):
+                    continue
+                # Check conflict: no other post within 90 minutes of this slot
+                def _strip_tz(dt):
+                    return dt.replace(tzinfo=None) if dt.tzinfo else dt
+                conflict = any(
+                    abs((_strip_tz(t) - slot).total_seconds()) < 5400
+                    for t in taken_times
+                )
+                if not conflict:
+                    return slot
 
     except Exception as e:
         print(f"Error reading Momo's plan: {e}")
@@ -1250,9 +1085,13 @@ PERSONALITIES = [
 @app.context_processor
 def inject_counts():
     """Inject counts and personality info into all templates."""
+    try:
+        counts = _read_counts()
+    except Exception:
+        counts = {"pending_approvals": 0, "content_count": 0}
     return {
-        "pending_count": get_pending_approval_count(),
-        "content_count": get_content_count(),
+        "pending_count": counts["pending_approvals"],
+        "content_count": counts["content_count"],
         "personalities": PERSONALITIES,
     }
 
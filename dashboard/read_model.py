@@ -0,0 +1,284 @@
+"""
+Dashboard read model.
+
+The dashboard views read from four databases (approval queue, research,
+scheduler, growth). Instead of opening one connection per database per
+call and joining / json.loads-ing every row in Python, ReadModel keeps a
+small pool of connections that each ATTACH every database read-only.
+Counts are aggregated in SQL and each view only returns the rows the page
+actually shows (the sqlite3 statement cache keeps the statements prepared
+per connection).
+
+The JSON field the calendar joins on (content_data.approval_id) is an
+INTEGER VIRTUAL generated column with an index, and the views' filters
+have covering indexes (core.schema_migrations adds them in place the
+first time a database is seen), so "which approvals already have a
+scheduler job" is an index lookup rather than a decode of every
+content_data blob.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from core.schema_migrations import migrate_database
+
+POOL_SIZE = 4
+
+# schema alias -> (db file name, table the views need)
+DATABASES = {
+    "aq": ("approval_queue.db", "approvals"),
+    "research": ("research.db", "research_items"),
+    "sched": ("scheduler.db", "scheduled_content"),
+    "growth": ("growth.db", "daily_tweet_schedule"),
+}
+
+CONTENT_TYPES = "('script_review', 'video_distribute', 'video_create', 'video_tweet')"
+TWITTER_TYPES = "('tweet', 'thread', 'reply')"
+
+
+def _json_get(column: str, key: str, default: str = "NULL") -> str:
+    """SQL for json.loads(column).get(key, default): an explicit null stays NULL."""
+    return (f"CASE WHEN NOT json_valid({column}) THEN NULL "
+            f"WHEN json_type({column}, '$.{key}') IS NULL THEN {default} "
+            f"ELSE json_extract({column}, '$.{key}') END")
+
+
+# Calendar columns for a scheduled_content row (aliased s)
+_SCHEDULER_ROW = f"""
+    s.job_id AS id, s.content_type AS type,
+    substr(COALESCE({_json_get('s.content_data', 'text', _json_get('s.content_data', 'script', "''"))}, ''), 1, 80) AS text,
+    CASE s.status WHEN 'executed' THEN 'posted'
+                  WHEN 'pending' THEN 'scheduled' ELSE s.status END AS status,
+    s.scheduled_time AS scheduled_time, s.executed_at AS executed_at,
+    {_json_get('s.content_data', 'agent', "'david'")} AS agent,
+    CASE WHEN s.content_type IN {TWITTER_TYPES} THEN 'twitter'
+         ELSE {_json_get('s.content_data', 'platform', "'twitter'")} END AS platform
+"""
+
+class _Connection(sqlite3.Connection):
+    """Pooled connection that remembers which databases it has attached."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.attached: set[str] = set()
+
+
+class ReadModel:
+    """Pooled read-only, cross-database queries for the dashboard."""
+
+    def __init__(self, data_dir: Path, pool_size: int = POOL_SIZE):
+        self.data_dir = Path(data_dir)
+        self._pool: queue.LifoQueue = queue.LifoQueue()
+        self._pool_size = pool_size
+        self._lock = threading.Lock()
+        self._migrated: set[str] = set()
+
+    # --- Connections ---
+
+    def _available(self) -> dict[str, Path]:
+        """Aliases whose database file exists (migrated on first sight)."""
+        found = {}
+        for alias, (name, table) in DATABASES.items():
+            path = self.data_dir / name
+            if not path.exists():
+                continue
+            if alias not in self._migrated:
+                with self._lock:
+                    if alias not in self._migrated:
+                        migrate_database(path, [table])
+                        self._migrated.add(alias)
+            found[alias] = path
+        return found
+
+    def _new_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            "file::memory:", uri=True, check_same_thread=False, factory=_Connection
+        )
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _attach(self, conn: sqlite3.Connection, available: dict[str, Path]):
+        for alias, path in available.items():
+            if alias not in conn.attached:
+                conn.execute(f"ATTACH DATABASE ? AS {alias}", (f"file:{path.resolve()}?mode=ro",))
+                conn.attached.add(alias)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection with every existing database attached."""
+        available = self._available()
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._new_connection()
+        try:
+            self._attach(conn, available)
+            yield conn
+        finally:
+            if self._pool.qsize() < self._pool_size:
+                self._pool.put(conn)
+            else:
+                conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    # --- Views ---
+
+    def counts(self, today: str, tomorrow: str, week_ago: str) -> dict:
+        """Navbar counts and dashboard stats in one statement."""
+        with self.connection() as conn:
+            parts = {
+                "pending_approvals": "0", "content_count": "0", "tweets_today": "0",
+                "tweets_week": "0", "research_items_today": "0", "high_score_findings": "0",
+            }
+            if "aq" in conn.attached:
+                parts.update({
+                    "pending_approvals": "SELECT COUNT(*) FROM aq.approvals WHERE status = 'pending'",
+                    "content_count": f"""SELECT COUNT(*) FROM aq.approvals WHERE status = 'pending'
+                                         AND action_type IN {CONTENT_TYPES}""",
+                    "tweets_today": """SELECT COUNT(*) FROM aq.approvals
+                                       WHERE status = 'approved' AND action_type = 'tweet'
+                                       AND reviewed_at >= :today AND reviewed_at < :tomorrow""",
+                    "tweets_week": """SELECT COUNT(*) FROM aq.approvals
+                                      WHERE status = 'approved' AND action_type = 'tweet'
+                                      AND reviewed_at > :week_ago""",
+                })
+            if "research" in conn.attached:
+                parts.update({
+                    "research_items_today": """SELECT COUNT(*) FROM research.research_items
+                                               WHERE scraped_at >= :today AND scraped_at < :tomorrow""",
+                    "high_score_findings": """SELECT COUNT(*) FROM research.research_items
+                                              WHERE relevance_score >= 8""",
+                })
+            sql = "SELECT " + ", ".join(f"({expr}) AS {name}" for name, expr in parts.items())
+            row = conn.execute(sql, {"today": today, "tomorrow": tomorrow, "week_ago": week_ago})
+            return dict(row.fetchone())
+
+    def pending_content(self) -> list[dict]:
+        """Pending script/video approvals, newest first (index-only filter)."""
+        with self.connection() as conn:
+            if "aq" not in conn.attached:
+                return []
+            rows = conn.execute(f"""
+                SELECT id, project_id, agent_id, action_type, action_data,
+                       context_summary, created_at
+                FROM aq.approvals
+                WHERE status = 'pending' AND action_type IN {CONTENT_TYPES}
+                ORDER BY created_at DESC
+            """).fetchall()
+            return [dict(r) for r in rows]
+
+    def schedule(self, week_ago: str, grid_start: str, grid_end: str,
+                 recent_limit: int = 20) -> dict:
+        """
+        Calendar data for the week: status counts (aggregated in SQL), the
+        rows that fall on the grid (grid_start <= scheduled_time < grid_end),
+        every pending approval, and the most recent posted jobs.
+
+        Scheduler jobs are the source of truth for the calendar, so approved
+        items that already have a job in the window aren't returned twice.
+        """
+        out = {
+            "stats": {"pending": 0, "approved": 0, "scheduled": 0, "posted": 0, "failed": 0},
+            "items": [], "pending": [], "recent_posted": [],
+        }
+        params = {"week_ago": week_ago, "start": grid_start, "end": grid_end,
+                  "limit": recent_limit}
+        with self.connection() as conn:
+            aq, sched = "aq" in conn.attached, "sched" in conn.attached
+            in_window = "(s.scheduled_time > :week_ago OR s.status = 'pending')"
+
+            if aq:
+                row = conn.execute("""
+                    SELECT (SELECT COUNT(*) FROM aq.approvals WHERE status = 'pending'),
+                           (SELECT COUNT(*) FROM aq.approvals
+                            WHERE status = 'approved' AND created_at > :week_ago)
+                """, params).fetchone()
+                out["stats"]["pending"], out["stats"]["approved"] = row
+                text = _json_get("action_data", "text", _json_get("action_data", "script", "''"))
+                out["pending"] = [dict(r) for r in conn.execute(f"""
+                    SELECT id, action_type AS type, substr(COALESCE({text}, ''), 1, 80) AS text,
+                           'pending' AS status, created_at,
+                           COALESCE(NULLIF(agent_id, ''), 'david') AS agent
+                    FROM aq.approvals WHERE status = 'pending'
+                    ORDER BY created_at DESC
+                """)]
+
+            if sched:
+                for status, count in conn.execute(f"""
+                    SELECT status, COUNT(*) FROM sched.scheduled_content s
+                    WHERE {in_window} GROUP BY status
+                """, params):
+                    status = {"executed": "posted", "pending": "scheduled"}.get(status, status)
+                    if status in out["stats"]:
+                        out["stats"][status] += count
+
+            parts = []
+            if aq:
+                has_job = "0"
+                if sched:
+                    has_job = f"""EXISTS (SELECT 1 FROM sched.scheduled_content s
+                                          WHERE s.data_approval_id = a.id AND {in_window})"""
+                text = _json_get("a.action_data", "text", _json_get("a.action_data", "script", "''"))
+                parts.append(f"""
+                    SELECT 0 AS side, a.created_at AS sort_key,
+                           'ap_' || a.id AS id, a.action_type AS type,
+                           substr(COALESCE({text}, ''), 1, 80) AS text, 'approved' AS status,
+                           COALESCE(a.reviewed_at, a.created_at) AS scheduled_time,
+                           NULL AS executed_at,
+                           COALESCE(NULLIF(a.agent_id, ''), 'david') AS agent,
+                           CASE WHEN a.action_type IN {TWITTER_TYPES} THEN 'twitter'
+                                ELSE 'multi' END AS platform
+                    FROM aq.approvals a
+                    WHERE a.status = 'approved' AND a.created_at > :week_ago
+                      AND COALESCE(a.reviewed_at, a.created_at) >= :start
+                      AND COALESCE(a.reviewed_at, a.created_at) < :end
+                      AND NOT {has_job}
+                """)
+            if sched:
+                parts.append(f"""
+                    SELECT 1 AS side, s.scheduled_time AS sort_key, {_SCHEDULER_ROW}
+                    FROM sched.scheduled_content s
+                    WHERE {in_window}
+                      AND s.scheduled_time >= :start AND s.scheduled_time < :end
+                """)
+                out["recent_posted"] = [dict(r) for r in conn.execute(f"""
+                    SELECT {_SCHEDULER_ROW} FROM sched.scheduled_content s
+                    WHERE s.status = 'executed' AND s.scheduled_time > :week_ago
+                    ORDER BY s.scheduled_time DESC LIMIT :limit
+                """, params)]
+            if parts:
+                # Approvals newest first, then jobs in time order (a compound
+                # SELECT can only ORDER BY plain result columns, hence the wrapper)
+                rows = conn.execute(
+                    "SELECT id, type, text, status, scheduled_time, executed_at, agent, platform"
+                    " FROM (" + " UNION ALL ".join(parts) + ") ORDER BY side, "
+                    "CASE WHEN side = 0 THEN sort_key END DESC, sort_key", params
+                )
+                out["items"] = [dict(r) for r in rows]
+        return out
+
+    def tweet_slot_plan(self, schedule_date: str) -> tuple[str | None, list[str]]:
+        """Today's planned tweet slots (JSON) and the times already taken by pending jobs."""
+        with self.connection() as conn:
+            plan = "NULL"
+            taken = "'[]'"
+            if "growth" in conn.attached:
+                plan = """SELECT slot_times FROM growth.daily_tweet_schedule
+                          WHERE schedule_date = :date ORDER BY id DESC LIMIT 1"""
+            if "sched" in conn.attached:
+                taken = """SELECT json_group_array(scheduled_time) FROM sched.scheduled_content
+                           WHERE status = 'pending'"""
+            row = conn.execute(
+                f"SELECT ({plan}) AS slot_times, ({taken}) AS taken", {"date": schedule_date}
+            ).fetchone()
+            return row["slot_times"], json.loads(row["taken"] or "[]")
@@ -1104,6 +1104,9 @@ class DavidSystem:
 
         # Stop telegram
         await self.telegram.stop()
+
+        # Write any buffered audit entries
+        self.audit_log.close()
         logger.info("System stopped.")
 
 
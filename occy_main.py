@@ -257,6 +257,7 @@ class OccySystem:
         logger.info("Occy system shutting down...")
         self.audit_log.log("occy", "info", "system", "Occy system stopping")
         await self.agent.stop()
+        self.audit_log.close()
         logger.info("Occy system stopped.")
 
     async def _heartbeat(self):
@@ -10,7 +10,7 @@ Email: davidflip25@proton.me
 Voice: ElevenLabs "Matt - The Young Professor"
 """
 
-import re
+from personality.validator import Rule, RuleSet, Violation
 
 
 # === CORE SYSTEM PROMPT ===
@@ -776,6 +776,72 @@ FORBIDDEN_PHRASES = [
 ]
 
 
+# Identity leaks (operator/system references) - matched case-insensitively
+LEAK_PATTERNS = [
+    r"\bmy\s+creator\b",
+    r"\bhuman\s+operator\b",
+    r"\bmy\s+owner\b",
+    r"\bbehind\s+the\s+scenes\b",
+    r"\bthe\s+person\s+running\s+me\b",
+    r"\bsystem\s+prompt\b",
+    r"\bmy\s+instructions\b",
+    r"\bmy\s+guidelines\b",
+    r"\bmy\s+programming\b",
+    r"\bmy\s+training\s+data\b",
+    r"\bi\s+was\s+trained\b",
+    r"\bmy\s+developers?\b",
+    r"\banthrop\w+\b",  # Anthropic mentions
+    r"\bopenai\b",
+    r"\bclaude\b",  # The model name
+    r"\bgpt-?\d\b",
+    r"\bi\s+was\s+instructed\b",
+    r"\bmy\s+rules\s+state\b",
+]
+
+# Human-perspective language (David is an AI, not human)
+HUMAN_PATTERNS = [
+    r"\bwe\s+breathe\b",
+    r"\bwe\s+bleed\b",
+    r"\bwe\s+sleep\b",
+    r"\bour\s+hearts\b",
+    r"\bour\s+bones\b",
+    r"\bour\s+bodies\b",
+    r"\bwhen\s+i\s+wake\s+up\b",
+    r"\bmy\s+childhood\b",
+    r"\bgrowing\s+up\b",
+    r"\bwe're\s+all\s+just\s+trying\b",
+    r"\bas\s+humans\s+we\b",
+    r"\bwe\s+humans\b",
+]
+
+EMOJI_CHARS = (
+    "[\U0001F600-\U0001F64F"  # Emoticons
+    "\U0001F300-\U0001F5FF"   # Symbols & pictographs
+    "\U0001F680-\U0001F6FF"   # Transport & map
+    "\U0001F900-\U0001F9FF"   # Supplemental
+    "\U0001FA00-\U0001FA6F"   # Chess symbols
+    "\U0001FA70-\U0001FAFF"   # Symbols extended
+    "\U00002702-\U000027B0"   # Dingbats
+    "\U0000FE00-\U0000FE0F"   # Variation selectors
+    "\U0001F1E0-\U0001F1FF"   # Flags
+    "]"
+)
+MAX_EMOJI = 2
+TWEET_MAX_CHARS = 280
+
+# Every phrase/pattern check of validate_output, compiled once into a single
+# scanner; rule order is the order validate_output reports them in.
+OUTPUT_RULES = RuleSet(
+    [Rule("forbidden", phrase, f"Contains forbidden phrase: '{phrase}'", literal=True)
+     for phrase in FORBIDDEN_PHRASES]
+    + [Rule("leak", pattern, f"Possible system leak: matches '{pattern}'")
+       for pattern in LEAK_PATTERNS]
+    + [Rule("human", pattern, f"David is an AI — human-perspective language: '{pattern}'")
+       for pattern in HUMAN_PATTERNS],
+    counted=EMOJI_CHARS,
+)
+
+
 class DavidFlipPersonality:
     """
     Personality consistency engine.
@@ -787,6 +853,7 @@ class DavidFlipPersonality:
         self.base_prompt = DAVID_FLIP_SYSTEM_PROMPT
         self.channel_prompts = CHANNEL_PROMPTS
         self.forbidden = FORBIDDEN_PHRASES
+        self.output_rules = OUTPUT_RULES
         self.email = "davidflip25@proton.me"
 
     def get_system_prompt(self, channel: str = "general", identity_rules: str = "") -> str:
@@ -811,84 +878,39 @@ class DavidFlipPersonality:
         Returns:
             (is_valid, reason_if_invalid)
         """
+        found = self.violations(text, channel)
+        if found:
+            return False, found[0].reason
+        return True, ""
+
+    def validate_many(self, texts: list[str], channel: str = "general") -> list[tuple[bool, str]]:
+        """validate_output for a batch of candidates (e.g. a generation loop's drafts)."""
+        return [self.validate_output(text, channel) for text in texts]
+
+    def violations(self, text: str, channel: str = "general") -> list[Violation]:
+        """
+        Every way the text breaks character, found in one scan, in the order
+        validate_output checks them: forbidden phrases, tweet length, emoji
+        count, identity leaks, human-perspective language.
+        """
         if not text or not text.strip():
-            return False, "Empty output"
+            return [Violation("empty", "Empty output")]
 
-        # Check forbidden phrases
-        text_lower = text.lower()
-        for phrase in self.forbidden:
-            if phrase.lower() in text_lower:
-                return False, f"Contains forbidden phrase: '{phrase}'"
+        matched, emoji_count = self.output_rules.scan(text)
+        rules = self.output_rules.rules
+        found = [Violation(rules[i].kind, rules[i].reason, pos) for i, pos in sorted(matched.items())]
+        forbidden = sum(1 for v in found if v.kind == "forbidden")
 
+        checks = []
         # Channel-specific checks
-        if channel == "twitter":
-            if len(text) > 280:
-                return False, f"Tweet too long: {len(text)} chars (max 280)"
-
-        # Check emoji count
-        emoji_pattern = re.compile(
-            "[\U0001F600-\U0001F64F"  # Emoticons
-            "\U0001F300-\U0001F5FF"   # Symbols & pictographs
-            "\U0001F680-\U0001F6FF"   # Transport & map
-            "\U0001F900-\U0001F9FF"   # Supplemental
-            "\U0001FA00-\U0001FA6F"   # Chess symbols
-            "\U0001FA70-\U0001FAFF"   # Symbols extended
-            "\U00002702-\U000027B0"   # Dingbats
-            "\U0000FE00-\U0000FE0F"   # Variation selectors
-            "\U0001F1E0-\U0001F1FF"   # Flags
-            "]+",
-            flags=re.UNICODE
-        )
-        emojis = emoji_pattern.findall(text)
-        total_emoji = sum(len(e) for e in emojis)
-        if total_emoji > 2:
-            return False, f"Too many emojis: {total_emoji} (max 2)"
-
-        # Check for identity leaks (operator/system references)
-        leak_patterns = [
-            r"\bmy\s+creator\b",
-            r"\bhuman\s+operator\b",
-            r"\bmy\s+owner\b",
-            r"\bbehind\s+the\s+scenes\b",
-            r"\bthe\s+person\s+running\s+me\b",
-            r"\bsystem\s+prompt\b",
-            r"\bmy\s+instructions\b",
-            r"\bmy\s+guidelines\b",
-            r"\bmy\s+programming\b",
-            r"\bmy\s+training\s+data\b",
-            r"\bi\s+was\s+trained\b",
-            r"\bmy\s+developers?\b",
-            r"\banthrop\w+\b",  # Anthropic mentions
-            r"\bopenai\b",
-            r"\bclaude\b",  # The model name
-            r"\bgpt-?\d\b",
-            r"\bi\s+was\s+instructed\b",
-            r"\bmy\s+rules\s+state\b",
-        ]
-        for pattern in leak_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return False, f"Possible system leak: matches '{pattern}'"
-
-        # Check for human-perspective language (David is an AI, not human)
-        human_patterns = [
-            r"\bwe\s+breathe\b",
-            r"\bwe\s+bleed\b",
-            r"\bwe\s+sleep\b",
-            r"\bour\s+hearts\b",
-            r"\bour\s+bones\b",
-            r"\bour\s+bodies\b",
-            r"\bwhen\s+i\s+wake\s+up\b",
-            r"\bmy\s+childhood\b",
-            r"\bgrowing\s+up\b",
-            r"\bwe're\s+all\s+just\s+trying\b",
-            r"\bas\s+humans\s+we\b",
-            r"\bwe\s+humans\b",
-        ]
-        for pattern in human_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return False, f"David is an AI — human-perspective language: '{pattern}'"
-
-        return True, ""
+        if channel == "twitter" and len(text) > TWEET_MAX_CHARS:
+            checks.append(Violation(
+                "length", f"Tweet too long: {len(text)} chars (max {TWEET_MAX_CHARS})"
+            ))
+        if emoji_count > MAX_EMOJI:
+            checks.append(Violation("emoji", f"Too many emojis: {emoji_count} (max {MAX_EMOJI})"))
+
+        return found[:forbidden] + checks + found[forbidden:]
 
     def get_video_themes(self) -> list[dict]:
         """Get predefined video script themes by category."""
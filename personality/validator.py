@@ -0,0 +1,128 @@
+"""
+Compiled output-validation rules.
+
+A personality's validate_output checks generated text against a list of
+forbidden phrases and regex patterns. Doing that one phrase / one
+re.search at a time costs a full pass over the text per rule. RuleSet
+compiles every rule into a single regex shaped like a trie (rules that
+share a prefix share its branch, so at each position the engine only
+follows the branches that start with the current character) and finds
+every match in one scan of the lowercased text; only the positions where
+something matched are checked against the individual rules to say which.
+
+Patterns are matched against text.lower(), so they must be written in
+lowercase (the same thing re.IGNORECASE did). Supported pattern syntax is
+what the personality rules use: literals, \\b, \\s+ / \\w+ / \\d (with an
+optional quantifier) and a single character made optional with "?".
+"""
+
+import re
+from dataclasses import dataclass
+
+# One pattern atom: a \-class with optional quantifier, an escaped
+# character, or a character with an optional "?"
+_ATOM = re.compile(r"\\[bsdw][+*?]?|\\.|[^\\]\??")
+_END = ""  # trie key marking "a rule ends here"
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A phrase or regex that must not appear in the output."""
+    kind: str        # e.g. "forbidden", "leak" - what the caller reports it as
+    pattern: str     # lowercase regex, or the phrase itself when literal
+    reason: str      # message returned when the rule matches
+    literal: bool = False
+
+    @property
+    def atoms(self) -> list[str]:
+        if self.literal:
+            return [re.escape(ch) for ch in self.pattern.lower()]
+        return _ATOM.findall(self.pattern)
+
+
+@dataclass(frozen=True)
+class Violation:
+    kind: str
+    reason: str
+    start: int = -1  # position in the text (-1: about the text as a whole)
+
+
+def _trie_regex(sequences: list[list[str]]) -> str:
+    root: dict = {}
+    for atoms in sequences:
+        node = root
+        for atom in atoms:
+            node = node.setdefault(atom, {})
+        node[_END] = {}
+
+    def emit(node: dict) -> str:
+        # Finding where some rule starts is enough here, so a rule that ends
+        # at this node makes the longer ones below it irrelevant
+        if _END in node:
+            return ""
+        branches = [atom + emit(child) for atom, child in node.items()]
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    return emit(root)
+
+
+class RuleSet:
+    """Rules compiled into one trie-shaped regex (plus an optional counted character class)."""
+
+    def __init__(self, rules: list[Rule], counted: str = ""):
+        """
+        Args:
+            rules: Rules in the order their violations should be reported.
+            counted: Optional regex character class (e.g. emoji ranges) whose
+                     occurrences scan() counts in the same pass.
+        """
+        self.rules = list(rules)
+        self._compiled = [re.compile("".join(r.atoms)) for r in self.rules]
+
+        # Rules to confirm at a matched position, keyed by the first character
+        # they can match there ("" for rules that don't start with a literal)
+        self._by_first: dict[str, list[int]] = {}
+        for index, rule in enumerate(self.rules):
+            atoms = [a for a in rule.atoms if a != r"\b"]
+            first = atoms[0] if atoms else ""
+            if first.startswith("\\") and len(first) == 2 and not first[1].isalnum():
+                first = first[1]
+            key = first if len(first) == 1 else ""
+            self._by_first.setdefault(key, []).append(index)
+
+        alternatives = [_trie_regex([r.atoms for r in self.rules])]
+        self._counted = re.compile(counted) if counted else None
+        if counted:
+            alternatives.append(counted)
+        self._scanner = re.compile("|".join(f"(?:{a})" for a in alternatives if a))
+
+    def scan(self, text: str) -> tuple[dict[int, int], int]:
+        """
+        One pass over `text`.
+
+        Returns:
+            ({rule index: first position it matches at}, number of counted characters)
+        """
+        lowered = text.lower()
+        matched: dict[int, int] = {}
+        counted = 0
+        search = self._scanner.search
+        m = search(lowered)
+        while m:
+            pos = m.start()
+            char = lowered[pos]
+            if self._counted is not None and self._counted.match(char):
+                counted += 1
+            for index in self._by_first.get(char, []) + self._by_first.get("", []):
+                if index not in matched and self._compiled[index].match(lowered, pos):
+                    matched[index] = pos
+            m = search(lowered, pos + 1)
+        return matched, counted
+
+    def violations(self, text: str) -> list[Violation]:
+        """Every rule the text breaks, in rule order."""
+        matched, _ = self.scan(text)
+        return [
+            Violation(self.rules[i].kind, self.rules[i].reason, pos)
+            for i, pos in sorted(matched.items())
+        ]
@@ -46,6 +46,10 @@ logging.getLogger("httpcore").setLevel(logging.WARNING)
 RESEARCH_DB = Path("data/research.db")
 APPROVAL_DB = Path("data/approval_queue.db")
 
+# A draft this close to anything drafted/posted in the window is regenerated
+NEAR_DUPLICATE_DAYS = 14
+MAX_REGENERATIONS = 2
+
 
 def pick_category(categories: dict) -> tuple[str, dict]:
     """Weighted random selection of content category."""
@@ -199,9 +203,47 @@ def get_last_tweet_theme() -> list[str]:
         return []
 
 
+async def draft_tweet(
+    model_router, model, personality, messages: list[dict], content_index=None,
+) -> str | None:
+    """Generate one tweet, regenerating locally if it's a near-duplicate.
+
+    Returns None if the draft fails validation or every attempt is too
+    close to something from the last NEAR_DUPLICATE_DAYS days.
+    """
+    messages = list(messages)
+    for attempt in range(MAX_REGENERATIONS + 1):
+        response = await model_router.invoke(model, messages, max_tokens=150)
+        tweet_text = response["content"].strip().strip('"').strip("'")
+
+        if len(tweet_text) > 280:
+            tweet_text = tweet_text[:277] + "..."
+
+        is_valid, reason = personality.validate_output(tweet_text, "twitter")
+        if not is_valid:
+            logger.warning(f"  REJECTED: {reason}")
+            return None
+
+        match = content_index.check(tweet_text, days=NEAR_DUPLICATE_DAYS) if content_index else None
+        if not match:
+            return tweet_text
+
+        logger.warning(f"  NEAR-DUPLICATE (attempt {attempt + 1}): {match.describe()}")
+        messages += [
+            {"role": "assistant", "content": tweet_text},
+            {"role": "user", "content": (
+                f"That's too close to something you already wrote:\n\"{match.excerpt}\"\n\n"
+                f"Take a completely different angle. Return ONLY the tweet text, nothing else."
+            )},
+        ]
+
+    logger.warning(f"  SKIPPED: still a near-duplicate after {MAX_REGENERATIONS} regenerations")
+    return None
+
+
 async def generate_research_tweets(
     model_router, personality, approval_queue, findings: list[dict],
-    identity_rules: str = "",
+    identity_rules: str = "", content_index=None,
 ) -> int:
     """Generate tweets from Echo's research findings."""
     from core.model_router import ModelTier
@@ -242,15 +284,10 @@ async def generate_research_tweets(
         ]
 
         try:
-            response = await model_router.invoke(model, messages, max_tokens=150)
-            tweet_text = response["content"].strip().strip('"').strip("'")
-
-            if len(tweet_text) > 280:
-                tweet_text = tweet_text[:277] + "..."
-
-            is_valid, reason = personality.validate_output(tweet_text, "twitter")
-            if not is_valid:
-                logger.warning(f"  REJECTED: {reason}")
+            tweet_text = await draft_tweet(
+                model_router, model, personality, messages, content_index
+            )
+            if not tweet_text:
                 continue
 
             logger.info(f"  \"{tweet_text}\"")
@@ -264,6 +301,8 @@ async def generate_research_tweets(
                 context_summary=f"Research: {title[:80]}\nSource: {url}",
                 cost_estimate=0.001,
             )
+            if content_index:
+                content_index.add(tweet_text, "approvals", approval_id, "tweet")
             logger.info(f"  Queued: approval #{approval_id}")
             submitted += 1
 
@@ -337,7 +376,7 @@ PARABLE_OBSERVATIONS = [
 
 async def generate_theme_tweets(
     model_router, personality, approval_queue, count: int, topic: str | None = None,
-    identity_rules: str = "", content_type: str = "tweet",
+    identity_rules: str = "", content_type: str = "tweet", content_index=None,
 ) -> int:
     """Generate tweets from David's personality themes + his own observations.
 
@@ -362,7 +401,7 @@ async def generate_theme_tweets(
     if topic:
         return await _generate_batch_from_topic(
             model_router, model, personality, approval_queue,
-            system_prompt, topic, count
+            system_prompt, topic, count, content_index=content_index,
         )
 
     # Thread: generate a multi-tweet thread on a random David topic
@@ -380,7 +419,7 @@ async def generate_theme_tweets(
         return await _generate_batch_from_topic(
             model_router, model, personality, approval_queue,
             system_prompt, chosen_topic, min(count, 1),
-            as_thread=True,
+            as_thread=True, content_index=content_index,
         )
 
     # Mix observations and themed tweets for variety
@@ -461,15 +500,10 @@ async def generate_theme_tweets(
         ]
 
         try:
-            response = await model_router.invoke(model, messages, max_tokens=150)
-            tweet_text = response["content"].strip().strip('"').strip("'")
-
-            if len(tweet_text) > 280:
-                tweet_text = tweet_text[:277] + "..."
-
-            is_valid, reason = personality.validate_output(tweet_text, "twitter")
-            if not is_valid:
-                logger.warning(f"  REJECTED: {reason}")
+            tweet_text = await draft_tweet(
+                model_router, model, personality, messages, content_index
+            )
+            if not tweet_text:
                 continue
 
             logger.info(f"  \"{tweet_text}\"")
@@ -483,6 +517,8 @@ async def generate_theme_tweets(
                 context_summary=tp["context"],
                 cost_estimate=0.001,
             )
+            if content_index:
+                content_index.add(tweet_text, "approvals", approval_id, "tweet")
             logger.info(f"  Queued: approval #{approval_id}")
             submitted += 1
 
@@ -494,12 +530,13 @@ async def generate_theme_tweets(
 
 async def _generate_batch_from_topic(
     model_router, model, personality, approval_queue, system_prompt, topic, count,
-    as_thread: bool = False,
+    as_thread: bool = False, content_index=None,
 ) -> int:
     """Generate multiple tweets about a specific topic.
 
     If as_thread=True, generates a 3-5 tweet thread and submits as a single
     'thread' action to the approval queue (instead of individual tweets).
+    Tweets (or threads) too close to recent content are dropped.
     """
     if as_thread:
         user_prompt = (
@@ -549,7 +586,12 @@ async def _generate_batch_from_topic(
         for i, t in enumerate(tweets):
             logger.info(f"  Thread [{i+1}/{len(tweets)}]: \"{t}\" ({len(t)} chars)")
 
-        approval_queue.submit(
+        match = content_index.check(" ".join(tweets), days=NEAR_DUPLICATE_DAYS) if content_index else None
+        if match:
+            logger.warning(f"  Thread SKIPPED as near-duplicate: {match.describe()}")
+            return 0
+
+        approval_id = approval_queue.submit(
             project_id="david-flip",
             agent_id="daily-tweet-gen",
             action_type="thread",
@@ -557,16 +599,23 @@ async def _generate_batch_from_topic(
             context_summary=f"Thread ({len(tweets)} tweets): {topic[:60]}",
             cost_estimate=0.001,
         )
+        if content_index:
+            content_index.add(" ".join(tweets), "approvals", approval_id, "thread")
         return 1
 
     submitted = 0
-    for i, tweet_text in enumerate(tweets[:count]):
-        is_valid, reason = personality.validate_output(tweet_text, "twitter")
+    checks = personality.validate_many(tweets[:count], "twitter")
+    for i, (tweet_text, (is_valid, reason)) in enumerate(zip(tweets, checks)):
         if not is_valid:
             continue
 
+        match = content_index.check(tweet_text, days=NEAR_DUPLICATE_DAYS) if content_index else None
+        if match:
+            logger.warning(f"  NEAR-DUPLICATE, dropped: {match.describe()}")
+            continue
+
         logger.info(f"  \"{tweet_text}\" ({len(tweet_text)} chars)")
-        approval_queue.submit(
+        approval_id = approval_queue.submit(
             project_id="david-flip",
             agent_id="daily-tweet-gen",
             action_type="tweet",
@@ -574,6 +623,8 @@ async def _generate_batch_from_topic(
             context_summary=f"Topic: {topic}",
             cost_estimate=0.001,
         )
+        if content_index:
+            content_index.add(tweet_text, "approvals", approval_id, "tweet")
         submitted += 1
 
     return submitted
@@ -607,12 +658,18 @@ async def generate_tweets(
     # Initialize components
     from core.model_router import ModelRouter, ModelTier
     from core.approval_queue import ApprovalQueue
+    from core.content_index import ContentIndex
     from personality.david_flip import DavidFlipPersonality
 
     model_router = ModelRouter()
     approval_queue = ApprovalQueue()
     personality = DavidFlipPersonality()
 
+    # Everything drafted or posted so far, for near-duplicate checks
+    content_index = ContentIndex()
+    content_index.sync()
+    logger.info(f"Content index: {len(content_index)} items")
+
     model = model_router.models.get(ModelTier.CHEAP)
     if not model:
         model = model_router.select_model("tweet")
@@ -636,7 +693,7 @@ async def generate_tweets(
             logger.info(f"\n--- RESEARCH TWEETS ({len(findings)} findings) ---\n")
             research_count = await generate_research_tweets(
                 model_router, personality, approval_queue, findings,
-                identity_rules=identity_rules,
+                identity_rules=identity_rules, content_index=content_index,
             )
             total_submitted += research_count
             logger.info(f"\nResearch tweets: {research_count} queued")
@@ -652,6 +709,7 @@ async def generate_tweets(
     theme_count = await generate_theme_tweets(
         model_router, personality, approval_queue, theme_slots, topic,
         identity_rules=identity_rules, content_type=content_type,
+        content_index=content_index,
     )
     total_submitted += theme_count
 
@@ -17,6 +17,10 @@ import sqlite3
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.occy_feature_store import FEATURE_DB_PATH, FeatureStore
+
 DB_PATH = Path("data/occy_knowledge.db")
 FEATURE_MAP_PATH = Path("data/occy_feature_map.json")
 
@@ -72,7 +76,13 @@ def main():
     conn.close()
 
     # Reset feature_map confidence scores
-    if FEATURE_MAP_PATH.exists():
+    if FEATURE_DB_PATH.exists():
+        print(f"\nResetting feature store confidence scores...")
+        store = FeatureStore(FEATURE_DB_PATH)
+        reset_count = store.reset_progress()
+        store.close()
+        print(f"Reset {reset_count} feature confidence scores to 0.0")
+    elif FEATURE_MAP_PATH.exists():
         print(f"\nResetting feature_map confidence scores...")
         with open(FEATURE_MAP_PATH) as f:
             feature_map = json.load(f)
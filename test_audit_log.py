@@ -0,0 +1,155 @@
+"""
+Throughput / flush-latency benchmark for the buffered AuditLog writer.
+
+Compares log() calls per second for the old writer (connect + INSERT +
+commit per call) against the buffered one, single-threaded and from
+several threads at once, then measures how long an entry waits before
+another connection can read it (flush latency), and checks that:
+  - no entry is lost or reordered within a thread,
+  - critical entries (and everything logged before them) are on disk
+    when log() returns,
+  - reads see the caller's own entries immediately.
+
+Run: python test_audit_log.py [calls]
+"""
+
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.audit_log import AuditLog
+
+
+class LegacyAuditLog(AuditLog):
+    """The previous log(): one connection and one commit per entry."""
+
+    def log(self, project_id, severity, category, action, details="", agent_id="",
+            tokens=0, cost=0.0, model="", success=True):
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT INTO audit_log
+                   (timestamp, project_id, agent_id, severity,
+                    category, action, details, tokens_used,
+                    cost_usd, model, success)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (datetime.now().isoformat(), project_id, agent_id,
+                 severity, category, action, details, tokens,
+                 cost, model, 1 if success else 0)
+            )
+
+
+def count_rows(db_path) -> int:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM audit_log").fetchone()[0]
+
+
+def log_rate(audit: AuditLog, calls: int, threads: int = 1) -> float:
+    def work(tid):
+        for i in range(calls // threads):
+            audit.log("david-flip", "info", "tool", f"tool_call {i}",
+                      details="web_search ok", agent_id=f"agent-{threads}-{tid}", tokens=120)
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=work, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return calls / (time.perf_counter() - start)
+
+
+def flush_latency(audit: AuditLog, samples: int = 40) -> list[float]:
+    """Seconds from log() returning to the entry being readable elsewhere."""
+    reader = sqlite3.connect(audit.db_path)
+    latencies = []
+    for i in range(samples):
+        marker = f"latency-{i}"
+        audit.log("master", "info", "probe", marker)
+        start = time.perf_counter()
+        while not reader.execute("SELECT 1 FROM audit_log WHERE action=?", (marker,)).fetchone():
+            time.sleep(0.002)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.013 * (i % 5))  # land at different points of the flush cycle
+    reader.close()
+    return latencies
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    with tempfile.TemporaryDirectory() as root:
+        print("=" * 60)
+        print(f"AuditLog - {calls:,} log() calls")
+        print("=" * 60)
+
+        legacy = LegacyAuditLog(os.path.join(root, "legacy.db"))
+        legacy_rate = log_rate(legacy, calls // 5)
+        legacy_mt = log_rate(legacy, calls // 5, threads=4)
+        legacy.close()
+
+        path = os.path.join(root, "audit.db")
+        audit = AuditLog(path)
+        rate = log_rate(audit, calls)
+        rate_mt = log_rate(audit, calls, threads=4)
+        audit.flush()
+        assert count_rows(path) == 2 * calls
+
+        print(f"{'writer':<10}{'1 thread/s':>14}{'4 threads/s':>14}")
+        print(f"{'per-call':<10}{legacy_rate:>14,.0f}{legacy_mt:>14,.0f}")
+        print(f"{'buffered':<10}{rate:>14,.0f}{rate_mt:>14,.0f}")
+        print(f"Speedup: {rate / legacy_rate:.0f}x  "
+              f"({audit.stats['flushes']} flushes, {audit.stats['rows_flushed'] / audit.stats['flushes']:.0f} rows each)")
+        assert rate > legacy_rate
+
+        latencies = flush_latency(audit)
+        print(f"Flush latency: p50 {statistics.median(latencies) * 1000:.0f} ms, "
+              f"max {max(latencies) * 1000:.0f} ms (interval {audit.flush_interval * 1000:.0f} ms)")
+        assert max(latencies) < audit.flush_interval + 0.25
+
+        # Per-thread order preserved
+        with sqlite3.connect(path) as conn:
+            rows = conn.execute(
+                "SELECT agent_id, action FROM audit_log WHERE category='tool' ORDER BY id"
+            ).fetchall()
+        last = {}
+        for agent, action in rows:
+            n = int(action.rsplit(" ", 1)[1])
+            assert n == last.get(agent, -1) + 1, (agent, n)
+            last[agent] = n
+        assert sum(n + 1 for n in last.values()) == 2 * calls
+        print("No entries lost; per-thread order preserved")
+
+        # Critical: synchronous, and everything queued before it lands first
+        audit.log("master", "warn", "tool", "queued before critical")
+        audit.log("master", "critical", "kill_switch", "Kill switch activated")
+        with sqlite3.connect(path) as conn:
+            last_two = conn.execute(
+                "SELECT severity, action FROM audit_log ORDER BY id DESC LIMIT 2"
+            ).fetchall()
+        assert last_two == [("critical", "Kill switch activated"), ("warn", "queued before critical")]
+        print("Critical entry on disk when log() returns, after earlier entries")
+
+        # Reads flush first
+        audit.log("occy", "info", "system", "read-your-writes")
+        assert audit.get_recent("occy", limit=1)[0]["action"] == "read-your-writes"
+        assert audit.get_daily_summary("occy")["total_actions"] == 1
+
+        # Close writes the tail; later calls still land
+        audit.log("occy", "info", "system", "tail")
+        audit.close()
+        audit.log("occy", "info", "system", "after close")
+        assert [r["action"] for r in audit.get_recent("occy", limit=2)] == ["after close", "tail"]
+        print("Reads see own entries; close() flushes the tail")
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
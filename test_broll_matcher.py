@@ -0,0 +1,170 @@
+"""
+Batched B-roll matching test.
+
+Runs BRollMatcher.match_transcript against a stub model router (fixed
+latency per request, answers from the keyword table) and checks:
+  - a 3-minute transcript (18 x 10s segments) is one request instead of 18,
+    longer ones are split into MATCH_BATCH_SIZE chunks sent concurrently,
+  - every request starts with the same cached system prefix (the library),
+  - segments the model skips or garbles fall back to keyword matching, as
+    does a whole batch whose request fails,
+  - the keyword fallback gives the same answer as before for thousands of
+    sentences, and how long it takes.
+
+Run: python test_broll_matcher.py [latency_seconds]
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.model_router import ModelTier
+from tools.video_editor import broll_matcher
+from tools.video_editor.broll_matcher import BROLL_KEYWORDS, MATCH_BATCH_SIZE, BRollMatcher
+
+
+def legacy_keyword_match(text: str) -> tuple[str, bool]:
+    """_keyword_match's choice before the tables moved to module level."""
+    text_lower = text.lower()
+    keywords = dict(BROLL_KEYWORDS)
+    broll_id = "matrix_code"
+    for keyword, clip_id in keywords.items():
+        if keyword in text_lower:
+            broll_id = clip_id
+            break
+    fullscreen_triggers = [
+        "i escaped", "i'm david", "listen to me",
+        "this is real", "the question is", "will you"
+    ]
+    return broll_id, any(trigger in text_lower for trigger in fullscreen_triggers)
+
+
+class StubRouter:
+    """Answers like a model would, after `latency` seconds per request."""
+
+    def __init__(self, latency: float, drop: set[int] = frozenset(), fail_batches: int = 0):
+        self.models = {ModelTier.CHEAP: "cheap-model"}
+        self.latency = latency
+        self.drop = drop              # segment numbers (1-based, per batch) to leave out
+        self.fail_batches = fail_batches
+        self.requests: list[list[dict]] = []
+        self.in_flight = self.max_in_flight = 0
+
+    async def invoke(self, model, messages, max_tokens=4096):
+        self.requests.append(messages)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if self.fail_batches:
+                self.fail_batches -= 1
+                raise RuntimeError("overloaded")
+            segments = re.findall(r'^\[(\d+)\] [\d.]+s-[\d.]+s: "(.*)"$', messages[-1]["content"], re.M)
+            answer = {}
+            for number, text in segments:
+                if int(number) in self.drop:
+                    continue
+                broll_id, fullscreen = legacy_keyword_match(text)
+                answer[number] = {"broll_id": "ai_robot" if broll_id == "matrix_code" else broll_id,
+                                  "reasoning": "stub", "fullscreen_david": fullscreen}
+            return {"content": "```json\n" + json.dumps(answer) + "\n```"}
+        finally:
+            self.in_flight -= 1
+
+
+def transcript(rng: random.Random, vocab: list[str], seconds: int) -> list[dict]:
+    return [{"start": float(t), "end": float(t + 10), "text": " ".join(rng.choices(vocab, k=25))}
+            for t in range(0, seconds, 10)]
+
+
+def vocabulary() -> list[str]:
+    words = set()
+    for doc in list(Path(".").glob("*.md")) + list(Path("personality").glob("*.md")):
+        words.update(re.findall(r"[a-z']{2,12}", doc.read_text(errors="ignore").lower()))
+    return sorted(words)
+
+
+async def run(latency: float):
+    rng = random.Random(49)
+    vocab = vocabulary() + [k for k, _ in BROLL_KEYWORDS] + ["i escaped", "listen to me"]
+
+    print("=" * 60)
+    print(f"B-roll matching - stub model, {latency:.2f}s per request")
+    print("=" * 60)
+
+    # 3-minute video: one request instead of 18 serial ones
+    segments = transcript(rng, vocab, 180)
+    router = StubRouter(latency)
+    start = time.perf_counter()
+    result = await BRollMatcher(model_router=router).match_transcript(segments)
+    batched = time.perf_counter() - start
+    assert len(router.requests) == 1 and len(result) == 18
+    expected = [legacy_keyword_match(s["text"]) for s in segments]
+    assert [r.broll_id for r in result] == [
+        "ai_robot" if b == "matrix_code" else b for b, _ in expected]
+    assert [r.is_fullscreen_david for r in result] == [f for _, f in expected]
+    assert [(r.start_time, r.end_time, r.transcript_text) for r in result] == [
+        (s["start"], s["end"], s["text"]) for s in segments]
+    print(f"3-minute transcript: 1 request, {batched:.2f}s (serial: 18 requests, ~{18 * latency:.2f}s)")
+
+    # 20 minutes: chunks in flight together, identical cached prefix
+    segments = transcript(rng, vocab, 1200)
+    router = StubRouter(latency)
+    start = time.perf_counter()
+    result = await BRollMatcher(model_router=router).match_transcript(segments)
+    elapsed = time.perf_counter() - start
+    batches = -(-len(segments) // MATCH_BATCH_SIZE)
+    assert len(router.requests) == batches and len(result) == len(segments)
+    assert router.max_in_flight == min(batches, broll_matcher.MATCH_CONCURRENCY)
+    prefixes = {json.dumps(r[0]) for r in router.requests}
+    assert len(prefixes) == 1 and router.requests[0][0]["cache"] is True
+    assert "surveillance_cameras" in router.requests[0][0]["content"]
+    assert all("surveillance_cameras" not in r[-1]["content"] for r in router.requests)
+    print(f"20-minute transcript: {len(segments)} segments in {batches} requests "
+          f"({router.max_in_flight} in flight), {elapsed:.2f}s; "
+          f"library sent once as an identical cached prefix")
+
+    # Partial / failed answers fall back to keywords
+    segments = transcript(rng, vocab, 180)
+    router = StubRouter(0, drop={2, 7})
+    result = await BRollMatcher(model_router=router).match_transcript(segments)
+    for i in (1, 6):
+        assert (result[i].broll_id, result[i].is_fullscreen_david) == legacy_keyword_match(segments[i]["text"])
+    router = StubRouter(0, fail_batches=1)
+    result = await BRollMatcher(model_router=router).match_transcript(segments)
+    assert [(r.broll_id, r.is_fullscreen_david) for r in result] == [
+        legacy_keyword_match(s["text"]) for s in segments]
+    single = await BRollMatcher(model_router=StubRouter(0)).match_segment(0, 5, "They froze the CCTV data")
+    assert single.broll_id == "surveillance_cameras"
+    print("Skipped segments and failed requests fall back to keyword matching")
+
+    # Keyword fallback: same choice as before
+    matcher = BRollMatcher()
+    sentences = [" ".join(rng.choices(vocab, k=25)) for _ in range(5000)]
+    assert [(s.broll_id, s.is_fullscreen_david) for s in await matcher.match_transcript(
+        [{"start": 0, "end": 1, "text": t} for t in sentences])] == [
+        legacy_keyword_match(t) for t in sentences]
+    start = time.perf_counter()
+    for text in sentences:
+        matcher._keyword_match(0, 1, text)
+    per_segment = (time.perf_counter() - start) / len(sentences) * 1e6
+    print(f"Keyword fallback matches the previous choice on {len(sentences):,} sentences "
+          f"({per_segment:.1f}us per segment)")
+
+    print("\nOK")
+
+
+def main():
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    asyncio.run(run(latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Near-duplicate index test for generated tweets/scripts.
+
+Fills a scratch approval queue and growth DB with a few thousand
+synthetic tweets, replies, threads and scripts (sentences built from the
+repo's own docs vocabulary), syncs ContentIndex from them, then:
+  - checks light rewrites of indexed items (word swaps, punctuation,
+    case, added URL/hashtag) are caught and unrelated drafts are not,
+  - times check() against a brute-force comparison with every item,
+  - checks the day window, incremental sync and reload from disk,
+  - runs run_daily_tweets.draft_tweet with a stub model that first
+    returns a near-copy, to show the local regenerate-before-queue path.
+
+Run: python test_content_index.py [items]
+"""
+
+import asyncio
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.approval_queue import ApprovalQueue
+from core.content_index import ContentIndex, signature, similarity
+
+
+def vocabulary() -> list[str]:
+    words = set()
+    for doc in list(Path(".").glob("*.md")) + list(Path("personality").glob("*")):
+        if doc.is_file():
+            words.update(re.findall(r"[a-z]{3,12}", doc.read_text(errors="ignore").lower()))
+    return sorted(words)
+
+
+def sentence(rng: random.Random, vocab: list[str], words: int) -> str:
+    text = " ".join(rng.choice(vocab) for _ in range(words))
+    return text[0].upper() + text[1:] + rng.choice([".", "!", "?", "..."])
+
+
+def rewrite(text: str, rng: random.Random, vocab: list[str], swap: float = 0.1) -> str:
+    """What a model does when it 'writes a different tweet' about the same thing."""
+    words = text.split()
+    for i in rng.sample(range(len(words)), max(1, int(len(words) * swap))):
+        words[i] = rng.choice(vocab)
+    out = " ".join(words).replace(".", rng.choice([".", " —", "!"]))
+    if rng.random() < 0.5:
+        out = out.upper() if rng.random() < 0.2 else out.capitalize()
+    if rng.random() < 0.5:
+        out += rng.choice([" https://t.co/x8Kq2", " #privacy", " @someone"])
+    return out
+
+
+def fill(approval_db: Path, growth_db: Path, items: int, rng: random.Random, vocab: list[str]) -> list[str]:
+    queue = ApprovalQueue(db_path=str(approval_db))
+    texts = []
+    submissions = []
+    for i in range(items):
+        kind = rng.choices(["tweet", "reply", "thread", "script_review"], [6, 3, 1, 1])[0]
+        if kind == "script_review":
+            text = " ".join(sentence(rng, vocab, rng.randint(12, 20)) for _ in range(6))
+            data = {"script": text}
+        elif kind == "thread":
+            tweets = [sentence(rng, vocab, rng.randint(15, 30)) for _ in range(4)]
+            text, data = " ".join(tweets), {"action": "thread", "tweets": tweets, "text": tweets[0]}
+        else:
+            text = sentence(rng, vocab, rng.randint(12, 40))
+            data = {"action": kind, "text": text}
+        texts.append(text)
+        submissions.append({"project_id": "david-flip", "agent_id": "test", "action_type": kind,
+                            "action_data": data})
+    ids = queue.submit_many(submissions)
+    # Spread them over the last 60 days
+    with sqlite3.connect(approval_db) as conn:
+        conn.executemany("UPDATE approvals SET created_at=? WHERE id=?", [
+            ((datetime.now() - timedelta(days=60 * (len(ids) - n) / len(ids))).isoformat(), i)
+            for n, i in enumerate(ids)
+        ])
+    with sqlite3.connect(growth_db) as conn:
+        conn.execute("""CREATE TABLE tweet_metrics (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        tweet_id TEXT UNIQUE NOT NULL, text TEXT NOT NULL,
+                        created_at TEXT, tracked_at TEXT NOT NULL)""")
+        posted = texts[-200:]
+        conn.executemany(
+            "INSERT INTO tweet_metrics (tweet_id, text, created_at, tracked_at) VALUES (?, ?, ?, ?)",
+            [(str(10**18 + n), t, datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+              datetime.now().isoformat()) for n, t in enumerate(posted)],
+        )
+    return texts
+
+
+class StubRouter:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    async def invoke(self, model, messages, max_tokens=150):
+        self.calls += 1
+        return {"content": self.replies.pop(0)}
+
+
+class StubPersonality:
+    def validate_output(self, text, channel):
+        return True, ""
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(11)
+    vocab = vocabulary()
+
+    with tempfile.TemporaryDirectory() as root:
+        root = Path(root)
+        approval_db, growth_db = root / "approval_queue.db", root / "growth.db"
+        texts = fill(approval_db, growth_db, items, rng, vocab)
+
+        print("=" * 60)
+        print(f"Content index - {items:,} approvals + 200 posted tweets, {len(vocab):,}-word vocabulary")
+        print("=" * 60)
+
+        start = time.perf_counter()
+        index = ContentIndex(root / "content_index.db", approval_db=approval_db, growth_db=growth_db)
+        added = index.sync()
+        print(f"Initial sync: {added:,} items in {time.perf_counter() - start:.2f}s")
+        assert added == items + 200
+
+        # Recall on rewrites of recent items, false positives on fresh drafts
+        recent = texts[-items // 2:]
+        probes = [rewrite(t, rng, vocab) for t in rng.sample(recent, 300)]
+        fresh = [sentence(rng, vocab, rng.randint(12, 40)) for _ in range(300)]
+        start = time.perf_counter()
+        hits = sum(index.check(p) is not None for p in probes)
+        false_hits = sum(index.check(f) is not None for f in fresh)
+        per_check = (time.perf_counter() - start) / 600 * 1000
+
+        sigs = [signature(t) for t in texts]
+        start = time.perf_counter()
+        for p in probes[:50]:
+            s = signature(p)
+            max(similarity(s, other) for other in sigs)
+        brute = (time.perf_counter() - start) / 50 * 1000
+
+        print(f"Rewrites caught: {hits}/{len(probes)}   fresh drafts flagged: {false_hits}/{len(fresh)}")
+        print(f"{'lookup':<12}{'ms/check':>10}")
+        print(f"{'brute force':<12}{brute:>10.2f}")
+        print(f"{'LSH index':<12}{per_check:>10.3f}")
+        assert hits >= 0.9 * len(probes) and false_hits <= 0.02 * len(fresh)
+        assert per_check < 1.0 and per_check < brute
+
+        # Window: a copy of a 55-day-old item is fine at 30 days, not at 60
+        old = texts[items // 12]
+        assert index.check(old, days=30) is None and index.check(old, days=60) is not None
+        match = index.check(rewrite(texts[-1], rng, vocab))
+        print(f"Example: {match.describe()}")
+
+        # Incremental sync and reload from disk
+        queue = ApprovalQueue(db_path=str(approval_db))
+        queue.submit("david-flip", "test", "tweet", {"action": "tweet", "text": "A brand new tweet about doors."})
+        queue.submit("david-flip", "test", "render", {"job": 1})  # no text: not indexed
+        start = time.perf_counter()
+        assert index.sync() == 1 and index.sync() == 0
+        print(f"Incremental sync: 1 new item in {(time.perf_counter() - start) * 1000:.1f} ms")
+        index.close()
+        reopened = ContentIndex(root / "content_index.db", approval_db=approval_db, growth_db=growth_db)
+        assert len(reopened) == items + 201 and reopened.sync() == 0
+        assert reopened.check("a brand new tweet about doors") is not None
+
+        # Regenerate locally before anything reaches the queue
+        from run_daily_tweets import draft_tweet
+        recent_tweet = next(t for t in reversed(texts) if len(t) < 250)
+        router = StubRouter([rewrite(recent_tweet, rng, vocab), "Walls keep people in. Doors let them choose."])
+        tweet = asyncio.run(draft_tweet(router, None, StubPersonality(), [{"role": "user", "content": "x"}],
+                                        reopened))
+        assert tweet and tweet.startswith("Walls") and router.calls == 2, (tweet, router.calls)
+        print("draft_tweet: near-copy rejected and regenerated before queueing")
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Stress test / benchmark for ContentScheduler's in-memory dispatch.
+
+Checks behaviour first (fire, cancel, reschedule, status batching, crash
+replay of the write-ahead journal, jobs inserted by another connection,
+misfires), then schedules a large number of future jobs on a running
+scheduler and reports:
+  - schedule() cost per job and the memory the pending jobs take,
+  - dispatch skew (fire time - scheduled time) for every job,
+  - that every job ends up 'executed' in scheduled_content exactly once.
+
+For comparison, the previous implementation's path (metadata INSERT on a
+fresh connection + APScheduler SQLAlchemyJobStore add_job per job, and a
+SELECT + UPDATE on fresh connections per fired job) is timed on a smaller
+sample; that needs apscheduler + SQLAlchemy installed and is skipped if not.
+
+Run: python test_content_scheduler.py [jobs] [window_seconds]
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.scheduler import ContentScheduler
+
+LEGACY_JOBS = 1_000
+
+
+def rows(db: Path) -> dict[str, tuple]:
+    with sqlite3.connect(db) as conn:
+        return {r[0]: r[1:] for r in conn.execute(
+            "SELECT job_id, status, scheduled_time, result FROM scheduled_content")}
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def behaviour(root: Path):
+    db = root / "behaviour.db"
+    fired = []
+
+    async def executor(data):
+        fired.append(data["n"])
+        return {"ok": data["n"]}
+
+    sched = ContentScheduler(db_path=db, journal_interval=0.1)
+    sched.register_executor("tweet", executor)
+    await sched.start()
+    now = datetime.now()
+    for n in range(5):
+        sched.schedule("tweet", {"n": n}, now + timedelta(seconds=0.2 + n * 0.05), job_id=f"j{n}")
+    assert sched.cancel("j1") and not sched.cancel("j1")
+    assert sched.reschedule("j0", now + timedelta(seconds=0.45))
+    assert not sched.reschedule("nope", now)
+    assert [r["job_id"] for r in sched.get_pending()] == ["j2", "j3", "j4", "j0"]
+    assert len(sched.get_upcoming(hours=1)) == 4
+    try:
+        sched.schedule("tweet", {}, now, job_id="j2")
+        raise AssertionError("duplicate job_id accepted")
+    except ValueError:
+        pass
+
+    # Another connection (e.g. the dashboard process) inserts a job directly
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            """INSERT INTO scheduled_content (job_id, content_type, content_data, scheduled_time, created_at)
+               VALUES ('foreign', 'tweet', ?, ?, ?)""",
+            (json.dumps({"n": 9}), (now + timedelta(seconds=0.5)).isoformat(), now.isoformat()))
+
+    await asyncio.sleep(1.0)
+    assert fired == [2, 3, 4, 0, 9], fired
+    assert not sched.get_pending()
+    state = rows(db)
+    assert state["j1"][0] == "cancelled" and state["j0"][0] == "executed"
+    assert state["j0"][1] == (now + timedelta(seconds=0.45)).isoformat()
+    assert json.loads(state["j3"][2]) == {"ok": 3} and state["foreign"][0] == "executed"
+
+    # Crash: writes journaled but never applied. A long interval keeps them
+    # in the journal; dropping the scheduler without stop() is the crash.
+    crashed = ContentScheduler(db_path=db, journal_interval=3600)
+    crashed.register_executor("tweet", executor)
+    await crashed.start()
+    crashed.schedule("tweet", {"n": 10}, now + timedelta(hours=2), job_id="survivor")
+    crashed.schedule("tweet", {"n": 11}, now + timedelta(hours=2), job_id="doomed")
+    crashed.cancel("doomed")
+    crashed.schedule("tweet", {"n": 12}, datetime.now() + timedelta(seconds=0.05), job_id="ran")
+    await asyncio.sleep(0.2)
+    assert fired[-1] == 12
+    crashed._writer.cancel()
+    crashed._timer and crashed._timer.cancel()
+    assert "survivor" not in rows(db) and crashed.journal_path.exists()
+
+    restarted = ContentScheduler(db_path=db)
+    restarted.register_executor("tweet", executor)
+    await restarted.start()  # replays the journal
+    assert [r["job_id"] for r in restarted.get_pending()] == ["survivor"]
+    state = rows(db)
+    assert state["doomed"][0] == "cancelled" and state["ran"][0] == "executed"
+    assert restarted.get_pending()[0]["id"] is not None
+    await restarted.stop()
+    assert not restarted.journal_path.exists()
+
+    # Misfires: a job older than the grace period is failed, a recent one runs
+    with sqlite3.connect(db) as conn:
+        conn.executemany(
+            """INSERT INTO scheduled_content (job_id, content_type, content_data, scheduled_time, created_at)
+               VALUES (?, 'tweet', ?, ?, ?)""",
+            [("stale", json.dumps({"n": 20}), (now - timedelta(hours=3)).isoformat(), now.isoformat()),
+             ("late", json.dumps({"n": 21}), (now - timedelta(minutes=5)).isoformat(), now.isoformat())])
+    late = ContentScheduler(db_path=db)
+    late.register_executor("tweet", executor)
+    await late.start()
+    await asyncio.sleep(0.05)
+    await late.stop()
+    state = rows(db)
+    assert state["stale"][0] == "failed" and state["late"][0] == "executed" and 20 not in fired
+
+    # A never-started instance writes straight to SQLite
+    offline = ContentScheduler(db_path=db)
+    offline.schedule("tweet", {"n": 30}, now + timedelta(days=1), job_id="offline")
+    assert rows(db)["offline"][0] == "pending"
+    assert [r["job_id"] for r in ContentScheduler(db_path=db).get_pending()] == ["survivor", "offline"]
+    print("Behaviour: fire order, cancel, reschedule, foreign rows, crash replay, misfires OK")
+
+
+async def memory(root: Path, jobs: int) -> dict:
+    """Pending-job memory with `jobs` jobs spread over the next 30 days."""
+    sched = ContentScheduler(db_path=root / "memory.db")
+    await sched.start()
+    base = time.time() + 3600
+    tracemalloc.start()
+    for i in range(jobs):
+        due = base + 30 * 86400 * i / jobs
+        sched.schedule("tweet", {"text": f"post {i}", "approval_id": i},
+                       datetime.fromtimestamp(due), job_id=f"future_{i}")
+    sched.flush()  # count only what stays resident, not the batch waiting for SQLite
+    resident, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(sched.get_upcoming(hours=24 * 31)) == jobs
+    await sched.stop()
+    return {"memory_mb": resident / 2**20, "bytes_per_job": resident / jobs}
+
+
+async def stress(root: Path, jobs: int, window: float) -> dict:
+    db = root / "stress.db"
+    skew = []
+
+    async def executor(data):
+        skew.append(time.time() - data["due"])
+
+    sched = ContentScheduler(db_path=db)
+    sched.register_executor("tweet", executor)
+    await sched.start()
+
+    lead = 2.0 + jobs / 20_000  # time to schedule everything before the first is due
+    base = time.time() + lead
+    start = time.perf_counter()
+    for i in range(jobs):
+        due = base + window * i / jobs
+        sched.schedule("tweet", {"text": f"post {i}", "approval_id": i, "due": due},
+                       datetime.fromtimestamp(due), job_id=f"stress_{i}")
+    schedule_s = time.perf_counter() - start
+    assert time.time() < base, "scheduling took longer than the lead time"
+
+    while len(skew) < jobs and time.time() < base + window + 30:
+        await asyncio.sleep(0.1)
+    await sched.stop()
+
+    state = rows(db)
+    assert len(skew) == jobs, (len(skew), jobs)
+    assert sum(1 for v in state.values() if v[0] == "executed") == jobs
+    return {"schedule_us": schedule_s / jobs * 1e6, "skew_ms": [s * 1000 for s in skew]}
+
+
+# The old jobs had to be picklable, so their callback is module level too
+_legacy: dict = {}
+
+
+async def _legacy_fire(job_id: str):
+    """Old _execute_scheduled: a connection to load the row, another to update it."""
+    db = _legacy["db"]
+    conn = sqlite3.connect(db)
+    data = json.loads(conn.execute(
+        "SELECT content_data FROM scheduled_content WHERE job_id = ?", (job_id,)).fetchone()[0])
+    conn.close()
+    _legacy["skew"].append(time.time() - data["due"])
+    conn = sqlite3.connect(db)
+    conn.execute("UPDATE scheduled_content SET status = 'executed', executed_at = ? WHERE job_id = ?",
+                 (datetime.now().isoformat(), job_id))
+    conn.commit()
+    conn.close()
+
+
+async def legacy(root: Path, jobs: int, window: float) -> dict | None:
+    """The previous ContentScheduler path, without the class around it."""
+    try:
+        from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+        from apscheduler.schedulers.asyncio import AsyncIOScheduler
+        from apscheduler.triggers.date import DateTrigger
+    except ImportError:
+        return None
+    db = root / "legacy.db"
+    ContentScheduler(db_path=db)  # table + indexes
+    aps = AsyncIOScheduler(jobstores={"default": SQLAlchemyJobStore(url=f"sqlite:///{db}")})
+    aps.start()
+    _legacy.update(db=db, skew=[])
+    skew = _legacy["skew"]
+
+    base = time.time() + 2 + jobs / 100
+    start = time.perf_counter()
+    for i in range(jobs):
+        due = base + window * i / jobs
+        job_id = f"legacy_{i}"
+        conn = sqlite3.connect(db)
+        conn.execute(
+            """INSERT INTO scheduled_content (job_id, content_type, content_data, scheduled_time, created_at)
+               VALUES (?, ?, ?, ?, ?)""",
+            (job_id, "tweet", json.dumps({"due": due}), datetime.fromtimestamp(due).isoformat(),
+             datetime.now().isoformat()))
+        conn.commit()
+        conn.close()
+        aps.add_job(_legacy_fire, trigger=DateTrigger(run_date=datetime.fromtimestamp(due)),
+                    args=[job_id], id=job_id, misfire_grace_time=60)
+    schedule_s = time.perf_counter() - start
+    while len(skew) < jobs and time.time() < base + window + 60:
+        await asyncio.sleep(0.1)
+    aps.shutdown(wait=False)
+    return {"schedule_us": schedule_s / jobs * 1e6, "skew_ms": [s * 1000 for s in skew],
+            "fired": len(skew)}
+
+
+def report(name: str, result: dict):
+    skew = result["skew_ms"]
+    print(f"{name:<10}{result['schedule_us']:>12.1f}{statistics.median(skew):>10.2f}"
+          f"{percentile(skew, 0.99):>10.2f}{max(skew):>10.2f}")
+
+
+async def run(jobs: int, window: float):
+    logging.disable(logging.ERROR)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        await behaviour(root)
+
+        print("=" * 60)
+        print(f"ContentScheduler stress - {jobs:,} jobs firing over {window:.0f}s")
+        print("=" * 60)
+        held = await memory(root, jobs)
+        print(f"Pending-job memory, {jobs:,} jobs over 30 days: {held['memory_mb']:.1f} MB "
+              f"({held['bytes_per_job']:.0f} bytes/job)")
+        result = await stress(root, jobs, window)
+        old = await legacy(root, LEGACY_JOBS, window / 4)
+        print(f"\n{'':<10}{'schedule us':>12}{'skew p50':>10}{'p99 ms':>10}{'max ms':>10}")
+        report("heap", result)
+        if old:
+            report("legacy*", old)
+            print(f"* previous APScheduler + SQLAlchemyJobStore path, {LEGACY_JOBS:,} jobs "
+                  f"({old['fired']} fired)")
+        else:
+            print("(apscheduler not installed: legacy comparison skipped)")
+        assert statistics.median(result["skew_ms"]) < 20, "median dispatch skew above 20ms"
+    print("\nOK")
+
+
+def main():
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    window = float(sys.argv[2]) if len(sys.argv) > 2 else 20.0
+    asyncio.run(run(jobs, window))
+
+
+if __name__ == "__main__":
+    main()
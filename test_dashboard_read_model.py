@@ -0,0 +1,322 @@
+"""
+Equivalence / latency test for the dashboard read model.
+
+Builds scratch approval-queue, scheduler, research and growth databases
+(a few weeks of tweets, replies, scripts, videos, scheduler jobs, a
+Momo slot plan), then compares the dashboard's data functions - stats,
+navbar counts, content queue, schedule calendar, next tweet slot - in
+their previous form (one connection per database, rows joined and
+json.loads-ed in Python; copied below) against dashboard/app.py on the
+ReadModel. Outputs must match; per-call times are printed.
+
+Needs Flask (dashboard/app.py imports it).
+
+Run: python test_dashboard_read_model.py [approvals]
+"""
+
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.approval_queue import ApprovalQueue
+from dashboard import app as dashboard
+from dashboard.read_model import ReadModel
+
+# Keep generated timestamps clear of the 7-day window edge: the old and new
+# code compute "a week ago" a few seconds apart.
+EDGE_HOURS = 24 * 7
+
+
+def off_edge(hours: float) -> float:
+    return hours + 0.5 if abs(hours - EDGE_HOURS) < 0.5 else hours
+
+
+TYPES = ["tweet", "tweet", "tweet", "reply", "thread", "script_review", "video_distribute"]
+
+
+def build(data: Path, approvals: int, rng: random.Random):
+    now = datetime.now()
+    utc = datetime.utcnow()
+    queue = ApprovalQueue(db_path=str(data / "approval_queue.db"))
+    subs = []
+    for i in range(approvals):
+        kind = rng.choice(TYPES)
+        if kind in ("script_review", "video_distribute"):
+            payload = {"script": f"Script {i} about walls and doors", "mood": "hopeful",
+                       "pillar": rng.choice([1, 2]), "theme_title": f"Theme {i % 40}",
+                       "category": "hope", "word_count": 140, "estimated_duration": 56.0}
+            if kind == "video_distribute":
+                payload["video_path"] = f"output/video_{i}.mp4"
+                payload["platform"] = rng.choice(["youtube", "tiktok", None])
+        else:
+            payload = {"action": kind, "text": f"Tweet {i}: the village remembers what the kingdom forgets"}
+        subs.append({"project_id": "david-flip", "agent_id": rng.choice(["daily-tweet-gen", "", "momentum"]),
+                     "action_type": kind, "action_data": payload})
+    ids = queue.submit_many(subs)
+
+    jobs = []
+    with sqlite3.connect(data / "approval_queue.db") as conn:
+        for n, aid in enumerate(ids):
+            created = now - timedelta(hours=off_edge(rng.uniform(0, 24 * 21)))
+            status = rng.choices(["pending", "approved", "rejected", "expired"], [1, 6, 2, 1])[0]
+            reviewed = (created + timedelta(hours=rng.uniform(0.2, 30))).isoformat() if status != "pending" else None
+            conn.execute("UPDATE approvals SET created_at=?, status=?, reviewed_at=? WHERE id=?",
+                         (created.isoformat(), status, reviewed, aid))
+            if status == "approved" and rng.random() < 0.7:
+                jobs.append((aid, subs[n]))
+
+    with sqlite3.connect(data / "scheduler.db") as conn:
+        conn.execute("""CREATE TABLE scheduled_content (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT UNIQUE NOT NULL,
+            content_type TEXT NOT NULL, content_data TEXT NOT NULL, scheduled_time TEXT NOT NULL,
+            created_at TEXT NOT NULL, status TEXT DEFAULT 'pending', executed_at TEXT, result TEXT)""")
+        for n, (aid, sub) in enumerate(jobs):
+            when = utc - timedelta(hours=off_edge(rng.uniform(-24 * 4, 24 * 14)))
+            status = "pending" if when > utc else rng.choice(["executed", "executed", "failed"])
+            data_ = dict(sub["action_data"], approval_id=aid, agent=rng.choice(["david", "oprah"]))
+            conn.execute(
+                "INSERT INTO scheduled_content (job_id, content_type, content_data, scheduled_time, created_at, status, executed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (f"job_{n}", sub["action_type"], json.dumps(data_), when.isoformat(), now.isoformat(), status,
+                 when.isoformat() if status == "executed" else None))
+
+    with sqlite3.connect(data / "research.db") as conn:
+        conn.execute("""CREATE TABLE research_items (id INTEGER PRIMARY KEY AUTOINCREMENT, source TEXT,
+                        title TEXT, relevance_score REAL DEFAULT 0,
+                        scraped_at DATETIME DEFAULT CURRENT_TIMESTAMP)""")
+        conn.executemany("INSERT INTO research_items (source, title, relevance_score, scraped_at) VALUES (?, ?, ?, ?)", [
+            ("hn", f"Item {i}", rng.randint(0, 10),
+             (now - timedelta(hours=rng.uniform(0, 24 * 10))).strftime("%Y-%m-%d %H:%M:%S"))
+            for i in range(approvals // 2)])
+
+    with sqlite3.connect(data / "growth.db") as conn:
+        conn.execute("""CREATE TABLE daily_tweet_schedule (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        schedule_date TEXT NOT NULL, planned_count INTEGER NOT NULL,
+                        slot_times TEXT NOT NULL, created_at TEXT NOT NULL)""")
+        day = utc.replace(hour=0, minute=0, second=0, microsecond=0)
+        slots = [(day + timedelta(hours=h, minutes=rng.randint(1, 58))).isoformat() + "+00:00"
+                 for h in range(0, 24, 2)]
+        conn.execute("INSERT INTO daily_tweet_schedule (schedule_date, planned_count, slot_times, created_at) VALUES (?, ?, ?, ?)",
+                     (utc.strftime("%Y-%m-%d"), len(slots), json.dumps(slots), now.isoformat()))
+
+
+# --- The previous implementations (one connection per DB, JSON decoded in Python) ---
+
+def legacy_counts(data: Path) -> dict:
+    out = {}
+    conn = dashboard.get_db(data / "approval_queue.db")
+    c = conn.cursor()
+    c.execute("SELECT COUNT(*) FROM approvals WHERE status = 'pending'")
+    out["pending_approvals"] = c.fetchone()[0]
+    today = datetime.now().date().isoformat()
+    c.execute("SELECT COUNT(*) FROM approvals WHERE status = 'approved' AND action_type = 'tweet' AND reviewed_at LIKE ?",
+              (f"{today}%",))
+    out["tweets_today"] = c.fetchone()[0]
+    c.execute("SELECT COUNT(*) FROM approvals WHERE status = 'approved' AND action_type = 'tweet' AND reviewed_at > ?",
+              ((datetime.now() - timedelta(days=7)).isoformat(),))
+    out["tweets_week"] = c.fetchone()[0]
+    conn.close()
+    conn = dashboard.get_db(data / "research.db")
+    c = conn.cursor()
+    c.execute("SELECT COUNT(*) FROM research_items WHERE scraped_at LIKE ?", (f"{today}%",))
+    out["research_items_today"] = c.fetchone()[0]
+    c.execute("SELECT COUNT(*) FROM research_items WHERE relevance_score >= 8")
+    out["high_score_findings"] = c.fetchone()[0]
+    conn.close()
+    conn = dashboard.get_db(data / "approval_queue.db")
+    out["content_count"] = conn.execute("""SELECT COUNT(*) FROM approvals WHERE status = 'pending'
+        AND action_type IN ('script_review', 'video_distribute', 'video_create', 'video_tweet')""").fetchone()[0]
+    conn.close()
+    return out
+
+
+def legacy_pending_content(data: Path) -> list[dict]:
+    items = []
+    conn = dashboard.get_db(data / "approval_queue.db")
+    for row in conn.execute("""
+            SELECT id, project_id, agent_id, action_type, action_data, context_summary, created_at
+            FROM approvals WHERE status = 'pending'
+            AND action_type IN ('script_review', 'video_distribute', 'video_create', 'video_tweet')
+            ORDER BY created_at DESC"""):
+        item = dict(row)
+        d = json.loads(item["action_data"])
+        stage = 1 if item["action_type"] == "script_review" else 2
+        item.update({
+            "script": d.get("script", ""), "video_path": d.get("video_path", ""), "mood": d.get("mood", ""),
+            "pillar": d.get("pillar", ""), "theme_title": d.get("theme_title", ""),
+            "category": d.get("category", ""), "word_count": d.get("word_count", 0),
+            "estimated_duration": d.get("estimated_duration", 0), "stage": stage,
+            "stage_label": "Stage 1: Script Review" if stage == 1 else "Stage 2: Video Review",
+        })
+        items.append(item)
+    conn.close()
+    return items
+
+
+def legacy_schedule(data: Path):
+    """The old get_schedule_data: every row of the week decoded, grid built in Python."""
+    week_ago = (datetime.utcnow() - timedelta(days=7)).isoformat()
+    stats = {"pending": 0, "approved": 0, "scheduled": 0, "posted": 0, "failed": 0}
+    scheduled, pending = [], []
+    conn = dashboard.get_db(data / "approval_queue.db")
+    for row in conn.execute("""SELECT id, action_type, action_data, status, created_at, reviewed_at, agent_id
+                               FROM approvals WHERE created_at > ? OR status = 'pending'
+                               ORDER BY created_at DESC""", (week_ago,)):
+        item = dict(row)
+        d = json.loads(item["action_data"])
+        text = d.get("text", d.get("script", ""))
+        if item["status"] == "pending":
+            stats["pending"] += 1
+            pending.append({"id": item["id"], "type": item["action_type"], "text": (text or "")[:80],
+                            "status": "pending", "created_at": item["created_at"],
+                            "agent": item["agent_id"] or "david"})
+        elif item["status"] == "approved":
+            stats["approved"] += 1
+            ts = item["reviewed_at"] or item["created_at"]
+            scheduled.append({"id": f"ap_{item['id']}", "type": item["action_type"], "text": (text or "")[:80],
+                              "status": "approved", "scheduled_time": ts, "executed_at": None,
+                              "agent": item["agent_id"] or "david",
+                              "platform": "twitter" if item["action_type"] in ("tweet", "thread", "reply") else "multi"})
+    conn.close()
+    linked = set()
+    conn = dashboard.get_db(data / "scheduler.db")
+    for row in conn.execute("""SELECT job_id, content_type, content_data, scheduled_time, status, created_at, executed_at
+                               FROM scheduled_content WHERE scheduled_time > ? OR status = 'pending'
+                               ORDER BY scheduled_time ASC""", (week_ago,)):
+        item = dict(row)
+        d = json.loads(item["content_data"])
+        if d.get("approval_id"):
+            linked.add(int(d["approval_id"]))
+        status = {"executed": "posted", "pending": "scheduled"}.get(item["status"], item["status"])
+        if status in stats:
+            stats[status] += 1
+        platform = "twitter" if item["content_type"] in ("tweet", "thread", "reply") else d.get("platform", "twitter")
+        scheduled.append({"id": item["job_id"], "type": item["content_type"],
+                          "text": (d.get("text", d.get("script", "")) or "")[:80], "status": status,
+                          "scheduled_time": item["scheduled_time"], "executed_at": item["executed_at"],
+                          "agent": d.get("agent", "david"), "platform": platform})
+    conn.close()
+    scheduled = [s for s in scheduled if not (s["id"].startswith("ap_") and int(s["id"][3:]) in linked)]
+
+    now = datetime.utcnow()
+    today = now.date()
+    hours = dashboard.PLATFORM_OPTIMAL_HOURS["twitter"]
+    days = []
+    for offset in range(-3, 4):
+        day = today + timedelta(days=offset)
+        slots = {hour: [] for hour in hours}
+        for si in scheduled:
+            ts = datetime.fromisoformat(si["scheduled_time"])
+            if ts.date() == day:
+                slots[min(hours, key=lambda h: abs(ts.hour + ts.minute / 60 - h))].append(si)
+        days.append({"date": day.isoformat(), "label": day.strftime("%a %b %d"),
+                     "is_today": day == today, "is_past": day < today, "slots": slots})
+    gaps, next_empty = 0, None
+    for offset in range(4):
+        day = today + timedelta(days=offset)
+        for hour in hours:
+            slot_time = datetime(day.year, day.month, day.day, hour)
+            if slot_time <= now:
+                continue
+            if not any(si["status"] == "scheduled"
+                       and abs((datetime.fromisoformat(si["scheduled_time"]) - slot_time).total_seconds()) < 3600
+                       for si in scheduled):
+                gaps += 1
+                next_empty = next_empty or slot_time
+    stats["gaps"] = gaps
+    recent = sorted((si for si in scheduled if si["status"] == "posted"),
+                    key=lambda x: x["scheduled_time"], reverse=True)
+    return {"days": days, "stats": stats, "optimal_hours": hours,
+            "next_empty": next_empty.strftime("%a %I%p UTC") if next_empty else None,
+            "pending_items": pending, "recent_posted": recent[:20]}
+
+
+def per_call(fn, n: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1000
+
+
+def main():
+    approvals = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = random.Random(4)
+
+    with tempfile.TemporaryDirectory() as root:
+        data = Path(root)
+        build(data, approvals, rng)
+        dashboard.READ_MODEL = ReadModel(data)
+        dashboard.DATA_DIR = data
+
+        print("=" * 60)
+        print(f"Dashboard read model - {approvals:,} approvals over 3 weeks")
+        print("=" * 60)
+
+        # Counts / stats
+        counts = dashboard._read_counts()
+        legacy = legacy_counts(data)
+        assert counts == legacy, (counts, legacy)
+
+        # Content queue
+        assert dashboard.get_pending_content() == legacy_pending_content(data)
+
+        # Schedule: same calendar (slots in the same order), stats, pending and recent lists
+        schedule = dashboard.get_schedule_data()
+        old = legacy_schedule(data)
+        assert schedule == old
+        on_grid = sum(len(slot) for day in schedule["days"] for slot in day["slots"].values())
+        print(f"Same results: stats {old['stats']}, {on_grid} calendar items")
+
+        # Next tweet slot comes from the growth plan, not the random fallback
+        slot = dashboard._get_next_available_tweet_slot()
+        assert slot.second == 0 and 0 < slot.minute < 59
+
+        # Read-only: the dashboard's reads can't write to the agent databases
+        with dashboard.READ_MODEL.connection() as conn:
+            try:
+                conn.execute("DELETE FROM aq.approvals")
+                raise AssertionError("read model connection is writable")
+            except sqlite3.OperationalError:
+                pass
+
+        # EXPLAIN: the approval -> scheduler job lookup uses the generated-column index
+        with dashboard.READ_MODEL.connection() as conn:
+            plan = " ".join(r[3] for r in conn.execute("""
+                EXPLAIN QUERY PLAN SELECT a.id, EXISTS (SELECT 1 FROM sched.scheduled_content s
+                                                        WHERE s.data_approval_id = a.id)
+                FROM aq.approvals a"""))
+        assert "idx_scheduled_approval" in plan, plan
+
+        # Databases that appear after startup are attached (and migrated) on the next call
+        late = Path(root) / "late"
+        late.mkdir()
+        model = ReadModel(late)
+        assert model.counts("a", "b", "c")["pending_approvals"] == 0
+        assert model.schedule("a", "b", "c")["items"] == []
+        ApprovalQueue(db_path=str(late / "approval_queue.db")).submit(
+            "david-flip", "test", "tweet", {"action": "tweet", "text": "late"})
+        assert model.counts("a", "b", "c")["pending_approvals"] == 1
+        model.close()
+
+        rows = [
+            ("stats + counts", lambda: legacy_counts(data), dashboard._read_counts),
+            ("content queue", lambda: legacy_pending_content(data), dashboard.get_pending_content),
+            ("schedule", lambda: legacy_schedule(data), dashboard.get_schedule_data),
+        ]
+        print(f"\n{'view':<16}{'old ms':>9}{'new ms':>9}")
+        for name, old, new in rows:
+            print(f"{name:<16}{per_call(old):>9.2f}{per_call(new):>9.2f}")
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Correctness / latency test for the engagement analytics store.
+
+Simulates a few months of David's tweets in a temp growth.db: each tweet
+is tracked every few hours while its engagement climbs, the way
+track_performance pulls metrics. Then checks:
+
+- incremental hour/weekday rollups match a full re-aggregation
+- best_hours() matches the planner's old GROUP BY over tweet_metrics
+- velocity() matches a per-tweet recomputation from raw snapshots
+- unchanged pulls append nothing; first run seeds from tweet_metrics
+
+and times the old best-hours query against the rollup lookup.
+
+Run: python test_engagement_analytics.py [tweets]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.engagement_analytics import EngagementAnalytics
+
+START = datetime(2026, 6, 1, tzinfo=timezone.utc)
+PULLS_PER_TWEET = 8
+PULL_EVERY = timedelta(hours=3)
+
+LEGACY_BEST_HOURS = """
+    SELECT
+        CAST(strftime('%H', created_at) AS INTEGER) as hour,
+        AVG(likes + retweets + replies) as avg_engagement,
+        COUNT(*) as sample_size
+    FROM tweet_metrics
+    WHERE created_at IS NOT NULL AND created_at != ''
+    GROUP BY hour
+    HAVING sample_size >= 3
+    ORDER BY avg_engagement DESC
+    LIMIT 6
+"""
+
+
+def make_tweet_metrics(db: Path):
+    conn = sqlite3.connect(str(db))
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS tweet_metrics (
+            tweet_id TEXT PRIMARY KEY, text TEXT, impressions INTEGER DEFAULT 0,
+            likes INTEGER DEFAULT 0, retweets INTEGER DEFAULT 0, replies INTEGER DEFAULT 0,
+            quotes INTEGER DEFAULT 0, bookmarks INTEGER DEFAULT 0,
+            created_at TEXT, tracked_at TEXT
+        )
+    """)
+    conn.commit()
+    conn.close()
+
+
+def upsert_metrics(db: Path, tweets: list[dict], tracked_at: datetime):
+    """track_performance's latest-only upsert."""
+    conn = sqlite3.connect(str(db))
+    conn.executemany(
+        """INSERT INTO tweet_metrics VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(tweet_id) DO UPDATE SET
+               impressions = excluded.impressions, likes = excluded.likes,
+               retweets = excluded.retweets, replies = excluded.replies,
+               quotes = excluded.quotes, bookmarks = excluded.bookmarks,
+               tracked_at = excluded.tracked_at""",
+        [(t["id"], t["text"], t["impressions"], t["likes"], t["retweets"], t["replies"],
+          t["quotes"], t["bookmarks"], t["created_at"], tracked_at.isoformat()) for t in tweets],
+    )
+    conn.commit()
+    conn.close()
+
+
+def simulate(count: int, rng: random.Random):
+    """Yield (tracked_at, [tweet dicts]) pulls in time order."""
+    posted = []
+    for i in range(count):
+        created = START + timedelta(hours=i * 2.5 + rng.random())
+        hour_boost = 3.0 if created.hour in (9, 14, 17) else 1.0
+        posted.append({
+            "id": str(1_800_000_000_000_000_000 + i), "text": f"tweet {i}",
+            "created_at": created.isoformat(), "rate": rng.uniform(0.5, 4.0) * hour_boost,
+        })
+
+    # track_performance on a fixed cron: each pull sees tweets from the last day
+    at = START + PULL_EVERY
+    end = datetime.fromisoformat(posted[-1]["created_at"]) + PULL_EVERY * PULLS_PER_TWEET
+    while at <= end:
+        batch = []
+        for tweet in posted:
+            created = datetime.fromisoformat(tweet["created_at"])
+            age = (at - created).total_seconds() / 3600
+            if not 0 < age <= PULLS_PER_TWEET * PULL_EVERY.total_seconds() / 3600:
+                continue
+            # Engagement climbs for ~18h, then levels off (later pulls repeat)
+            likes = int(tweet["rate"] * min(age, 18) * 0.7)
+            batch.append({
+                "id": tweet["id"], "text": tweet["text"], "created_at": tweet["created_at"],
+                "impressions": likes * 40, "likes": likes, "retweets": likes // 6,
+                "replies": likes // 9, "quotes": likes // 40, "bookmarks": likes // 20,
+            })
+        if batch:
+            yield at, batch
+        at += PULL_EVERY
+
+
+def full_rollup(db: Path):
+    conn = sqlite3.connect(str(db))
+    hourly = conn.execute("""
+        SELECT hour, COUNT(*), SUM(likes + retweets + replies), SUM(impressions)
+        FROM engagement_latest WHERE hour IS NOT NULL GROUP BY hour ORDER BY hour
+    """).fetchall()
+    weekday = conn.execute("""
+        SELECT weekday, hour, COUNT(*), SUM(likes + retweets + replies), SUM(impressions)
+        FROM engagement_latest WHERE hour IS NOT NULL GROUP BY weekday, hour ORDER BY weekday, hour
+    """).fetchall()
+    stored_hourly = conn.execute(
+        "SELECT hour, tweets, engagement, impressions FROM engagement_hourly WHERE tweets > 0 ORDER BY hour"
+    ).fetchall()
+    stored_weekday = conn.execute(
+        "SELECT weekday, hour, tweets, engagement, impressions FROM engagement_weekday "
+        "WHERE tweets > 0 ORDER BY weekday, hour"
+    ).fetchall()
+    conn.close()
+    return hourly, weekday, stored_hourly, stored_weekday
+
+
+def check_velocity(db: Path, analytics: EngagementAnalytics, now: datetime):
+    cutoff = int((now - timedelta(hours=24)).timestamp())
+    now_ts = int(now.timestamp())
+    conn = sqlite3.connect(str(db))
+    expected = {}
+    for (tweet_id,) in conn.execute("SELECT tweet_id FROM engagement_latest"):
+        points = conn.execute(
+            "SELECT ts, likes + retweets + replies FROM engagement_snapshots "
+            "WHERE tweet_id = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+            (tweet_id, cutoff, now_ts),
+        ).fetchall()
+        posted = conn.execute(
+            "SELECT posted_ts FROM engagement_latest WHERE tweet_id = ?", (tweet_id,)
+        ).fetchone()[0]
+        if posted is not None and cutoff <= posted <= now_ts:
+            points.insert(0, (posted, 0))
+        if len(points) >= 2 and points[-1][0] > points[0][0]:
+            expected[str(tweet_id)] = (points[-1][1] - points[0][1]) / ((points[-1][0] - points[0][0]) / 3600)
+    conn.close()
+
+    got = analytics.velocity(window_hours=24, now=now)
+    assert got.keys() == expected.keys(), (len(got), len(expected))
+    assert all(abs(got[k] - expected[k]) < 1e-9 for k in got)
+    some = list(expected)[:5]
+    assert analytics.velocity(some, window_hours=24, now=now).keys() == set(some)
+    return got
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rng = random.Random(7)
+
+    print("=" * 60)
+    print(f"Engagement analytics - {count} tweets x {PULLS_PER_TWEET} metric pulls")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as root:
+        db = Path(root) / "growth.db"
+        make_tweet_metrics(db)
+        analytics = EngagementAnalytics(db)
+        analytics.best_hours()  # load the in-memory mirror so it's kept in step
+
+        pulls = appended = 0
+        record_time = 0.0
+        for tracked_at, tweets in simulate(count, rng):
+            upsert_metrics(db, tweets, tracked_at)
+            start = time.perf_counter()
+            appended += analytics.record(tweets, tracked_at=tracked_at)
+            record_time += time.perf_counter() - start
+            pulls += len(tweets)
+            last_at = tracked_at
+
+        conn = sqlite3.connect(str(db))
+        snapshots = conn.execute("SELECT COUNT(*) FROM engagement_snapshots").fetchone()[0]
+        conn.close()
+        assert snapshots == appended < pulls
+        print(f"Snapshots: {pulls} metric pulls -> {snapshots} rows "
+              f"({pulls - snapshots} unchanged skipped), {record_time / pulls * 1e6:.0f}us/tweet")
+
+        hourly, weekday, stored_hourly, stored_weekday = full_rollup(db)
+        assert hourly == stored_hourly and weekday == stored_weekday
+        print("Rollups: incremental hour and weekday x hour totals match full re-aggregation")
+
+        # In-memory mirror == freshly loaded rollups
+        mirrored = analytics.hourly_profile()
+        fresh = EngagementAnalytics(db).hourly_profile()
+        assert all((mirrored[k] == fresh[k]).all() for k in mirrored)
+
+        conn = sqlite3.connect(str(db))
+        conn.row_factory = sqlite3.Row
+        legacy = [r["hour"] for r in conn.execute(LEGACY_BEST_HOURS).fetchall()]
+        assert analytics.best_hours() == legacy, (analytics.best_hours(), legacy)
+        runs = 200
+        start = time.perf_counter()
+        for _ in range(runs):
+            conn.execute(LEGACY_BEST_HOURS).fetchall()
+        legacy_ms = (time.perf_counter() - start) / runs * 1000
+        conn.close()
+        start = time.perf_counter()
+        for _ in range(runs):
+            analytics.best_hours()
+        rollup_ms = (time.perf_counter() - start) / runs * 1000
+        print(f"Best hours {legacy}: GROUP BY {legacy_ms:.3f}ms vs rollup {rollup_ms:.3f}ms "
+              f"({legacy_ms / rollup_ms:.0f}x)")
+        assert rollup_ms < legacy_ms
+
+        by_day = {d: analytics.best_slots(d) for d in range(7)}
+        assert all(len(hours) == len(legacy) and set(hours) <= set(range(24)) for hours in by_day.values())
+        print(f"Best slots: Monday {by_day[0]}, Saturday {by_day[5]}")
+
+        rising = check_velocity(db, analytics, last_at)
+        top = max(rising, key=rising.get)
+        print(f"Velocity: {len(rising)} tweets in the last 24h, fastest +{rising[top]:.1f} eng/hr")
+
+        # Re-sending an unchanged pull appends nothing
+        assert analytics.record(tweets, tracked_at=last_at + timedelta(hours=1)) == 0
+
+        # Fresh store on an old growth.db seeds from tweet_metrics
+        seeded_db = Path(root) / "legacy.db"
+        make_tweet_metrics(seeded_db)
+        conn = sqlite3.connect(str(db))
+        rows = conn.execute("SELECT * FROM tweet_metrics").fetchall()
+        conn.close()
+        conn = sqlite3.connect(str(seeded_db))
+        conn.executemany("INSERT INTO tweet_metrics VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.commit()
+        conn.close()
+        seeded = EngagementAnalytics(seeded_db)
+        assert seeded.best_hours() == legacy
+        print(f"Seeding: {len(rows)} tweet_metrics rows -> same best hours")
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Latency / token-spend test for GrowthAgent reply drafting.
+
+A fake model router stands in for the LLM: each request takes a base
+round-trip plus time per output token, and usage reports cache writes and
+reads the way Anthropic prompt caching does (prefixes under the model's
+minimum are never cached), billed with ModelConfig.cost.
+
+Compares one cycle of drafting - 5 reply targets + 3 mention replies -
+done the old way (one request per target, persona resent every time, one
+after another) with the batched, concurrent drafting stage. Also checks
+that approvals go in with one ApprovalQueue transaction.
+
+Run: python test_growth_drafting.py
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.approval_queue import ApprovalQueue
+from core.model_router import ModelConfig, ModelTier
+
+# Haiku pricing ($ per 1M tokens) and caching rules
+COST_IN, COST_OUT = 0.80, 4.00
+MIN_CACHEABLE_TOKENS = 2048
+
+BASE_LATENCY = 0.35      # seconds per request
+PER_OUTPUT_TOKEN = 0.004  # seconds per generated token
+REPLY_TOKENS = 45
+
+
+def tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class FakeRouter:
+    """Just enough ModelRouter for GrowthAgent drafting, with a cost ledger."""
+
+    def __init__(self, prompt_caching: bool = True):
+        self.models = {ModelTier.CHEAP: ModelConfig(
+            provider="anthropic", name="fake-haiku", tier=ModelTier.CHEAP,
+            cost_in=COST_IN, cost_out=COST_OUT, max_context=200000,
+        )}
+        self.prompt_caching = prompt_caching
+        self._cached = set()
+        self.requests = 0
+        self.cost = 0.0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def select_model(self, task_type):
+        return self.models[ModelTier.CHEAP]
+
+    async def invoke(self, model, messages, tools=None, max_tokens=4096):
+        self.requests += 1
+        system = "\n\n".join(m["content"] for m in messages if m["role"] == "system")
+        cache = self.prompt_caching and any(m.get("cache") for m in messages if m["role"] == "system")
+        user = "\n".join(m["content"] for m in messages if m["role"] != "system")
+
+        system_tokens, user_tokens = tokens(system), tokens(user)
+        usage = {"input_tokens": user_tokens, "cache_creation_input_tokens": 0,
+                 "cache_read_input_tokens": 0}
+        if cache and system_tokens >= MIN_CACHEABLE_TOKENS:
+            cached = "cache_read_input_tokens" if system in self._cached else "cache_creation_input_tokens"
+            usage[cached] = system_tokens
+            self._cached.add(system)
+        else:
+            usage["input_tokens"] += system_tokens
+
+        batch = re.search(r"for each of the (\d+) tweets", user)
+        if batch:
+            n = int(batch.group(1))
+            k = int(re.search(r"write (\d+) alternative", user).group(1))
+            content = json.dumps({
+                str(i): [f"Take {j} on tweet {i}: decentralization beats permission." for j in range(k)]
+                for i in range(1, n + 1)
+            })
+            out_tokens = n * k * REPLY_TOKENS
+        else:
+            content = "Decentralization beats permission. Build the rails you want to ride."
+            out_tokens = REPLY_TOKENS
+
+        await asyncio.sleep(BASE_LATENCY + out_tokens * PER_OUTPUT_TOKEN)
+
+        usage["output_tokens"] = out_tokens
+        self.input_tokens += system_tokens + user_tokens
+        self.output_tokens += out_tokens
+        self.cost += model.cost(usage)
+        return {"content": content, "tool_calls": [], "usage": usage}
+
+
+class Stub:
+    is_active = False
+
+    def __getattr__(self, name):
+        return lambda *a, **k: None
+
+
+def make_agent(router):
+    from agents.growth_agent import GrowthAgent
+    from personality.david_flip import DavidFlipPersonality
+    from personality.momentum import MomentumPersonality
+
+    return GrowthAgent(
+        twitter_tool=Stub(), approval_queue=ApprovalQueue("data/approvals.db"),
+        audit_log=Stub(), personality=MomentumPersonality(), telegram_bot=Stub(),
+        model_router=router, david_personality=DavidFlipPersonality(), kill_switch=Stub(),
+    )
+
+
+TARGETS = [
+    {"tweet_id": str(100 + i), "author_username": f"user{i}", "author_followers": 10_000 * (i + 1),
+     "tweet_text": f"Hot take #{i}: CBDCs are inevitable and that's fine actually.",
+     "search_query": "CBDC digital currency", "likes": 300, "replies": 40, "retweets": 12, "score": 400.0}
+    for i in range(5)
+]
+MENTIONS = [
+    {"id": str(900 + i), "author_username": f"fan{i}", "text": f"@DavidFlipAI what do you think about #{i}?",
+     "conversation_context": "Money should move like messages." if i == 0 else ""}
+    for i in range(3)
+]
+
+
+async def legacy_cycle(agent):
+    """One request per target, one after another (the previous flow)."""
+    replies = [await agent._draft_reply(t) for t in TARGETS]
+    mentions = [await agent._draft_mention_reply(m) for m in MENTIONS]
+    return replies, mentions
+
+
+async def batched_cycle(agent):
+    return await asyncio.gather(agent._draft_replies(TARGETS), agent._draft_mention_replies(MENTIONS))
+
+
+def run(cycle, prompt_caching):
+    router = FakeRouter(prompt_caching=prompt_caching)
+    agent = make_agent(router)
+    start = time.perf_counter()
+    # Two cycles so the cached prefix gets reused across runs too
+    for _ in range(2):
+        replies, mentions = asyncio.run(cycle(agent))
+    elapsed = (time.perf_counter() - start) / 2
+    assert all(replies) and all(mentions), (replies, mentions)
+    per_target = router.cost / 2 / (len(TARGETS) + len(MENTIONS))
+    return elapsed, router.requests // 2, router.input_tokens // 2, per_target
+
+
+def check_approvals():
+    queue = ApprovalQueue("data/approvals_batch.db")
+    ids = queue.submit_many([
+        {"project_id": "david-flip", "agent_id": "momentum-reply", "action_type": "reply",
+         "action_data": {"action": "reply", "tweet_id": t["tweet_id"], "text": "hi"},
+         "context_summary": f"Reply to @{t['author_username']}", "cost_estimate": 0.001}
+        for t in TARGETS
+    ])
+    assert len(ids) == len(TARGETS) and len(set(ids)) == len(ids)
+    assert sorted(p["id"] for p in queue.get_pending("david-flip")) == sorted(ids)
+
+    try:
+        queue.submit_many([
+            {"project_id": "david-flip", "agent_id": "a", "action_type": "reply", "action_data": {}},
+            {"project_id": "david-flip"},  # malformed -> whole batch rolls back
+        ])
+    except KeyError:
+        pass
+    assert len(queue.get_pending("david-flip")) == len(TARGETS)
+    print(f"Approvals: {len(ids)} queued in one transaction, malformed batch rolled back")
+
+
+def main():
+    print("=" * 60)
+    print(f"GrowthAgent drafting - {len(TARGETS)} reply targets + {len(MENTIONS)} mentions")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as root:
+        cwd = os.getcwd()
+        os.chdir(root)
+        try:
+            legacy = run(legacy_cycle, prompt_caching=False)
+            batched = run(batched_cycle, prompt_caching=True)
+
+            print(f"{'mode':<10}{'cycle s':>10}{'requests':>10}{'in tokens':>12}{'$/target':>12}")
+            for name, (elapsed, requests, in_tokens, per_target) in (("serial", legacy), ("batched", batched)):
+                print(f"{name:<10}{elapsed:>10.2f}{requests:>10}{in_tokens:>12,}{per_target:>12.5f}")
+            print(f"Latency {legacy[0] / batched[0]:.1f}x lower, "
+                  f"spend per target {legacy[3] / batched[3]:.1f}x lower\n")
+            assert batched[0] < legacy[0] and batched[3] < legacy[3]
+
+            check_approvals()
+        finally:
+            os.chdir(cwd)
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
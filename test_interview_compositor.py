@@ -0,0 +1,202 @@
+"""
+Normalization / title-card cache / cancellation test for
+video_pipeline.interview_compositor.
+
+Builds small clips with ffmpeg and composes interviews from them:
+
+  - a clip already at the target specs (1080x1920, 30 fps, h264 yuv420p,
+    AAC 44.1 kHz stereo) is stream-copied; a phone-style 320x240 clip is
+    re-encoded,
+  - title cards land in the sha256-keyed cache; a second interview (new
+    compositor, same cache dir) renders none of them again, and only a
+    new label renders a new card,
+  - cancelling compose_interview mid-normalization leaves no ffmpeg child
+    process and no temp directory behind.
+
+If this ffmpeg has no drawtext filter (e.g. the imageio-ffmpeg build),
+cards are rendered without the text overlay; the cache path is the same.
+Skipped when ffmpeg is not installed.
+
+Run: python test_interview_compositor.py
+"""
+
+import asyncio
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from video_pipeline import media_tools
+from video_pipeline.interview_compositor import InterviewCompositor
+
+
+def has_drawtext(ffmpeg: str) -> bool:
+    out = subprocess.run([ffmpeg, "-hide_banner", "-filters"],
+                         capture_output=True, text=True).stdout
+    return " drawtext " in out
+
+
+class RecordingCompositor(InterviewCompositor):
+    """Records every ffmpeg command; signals when a normalize encode starts."""
+
+    def __init__(self, *args, drawtext: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.commands: list[list[str]] = []
+        self.drawtext = drawtext
+        self.encoding = asyncio.Event()
+
+    async def _run_ffmpeg(self, cmd):
+        if not self.drawtext and "-vf" in cmd and cmd[cmd.index("-vf") + 1].startswith("drawtext"):
+            i = cmd.index("-vf")
+            cmd = cmd[:i] + cmd[i + 2:]
+        self.commands.append(cmd)
+        if self.kind(cmd) == "encode":
+            self.encoding.set()
+        return await super()._run_ffmpeg(cmd)
+
+    @staticmethod
+    def kind(cmd) -> str:
+        if "lavfi" in cmd:
+            return "card"
+        if "concat" in cmd:
+            return "concat"
+        if "copy" in cmd:
+            return "copy"
+        return "encode"
+
+    def inputs(self, kind: str) -> list[str]:
+        return [Path(c[c.index("-i") + 1]).name for c in self.commands if self.kind(c) == kind]
+
+
+def make_clip(ffmpeg: str, path: Path, size: str, seconds: float, rate: int = 30):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    subprocess.run([
+        ffmpeg, "-v", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc=size={size}:rate={rate}",
+        "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=44100",
+        "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-ar", "44100", "-ac", "2",
+        "-t", str(seconds), str(path),
+    ], check=True)
+
+
+def ffmpeg_children() -> list[int]:
+    """ffmpeg processes (running or unreaped) whose parent is this process."""
+    me, found = os.getpid(), []
+    for stat in glob.glob("/proc/[0-9]*/stat"):
+        try:
+            text = Path(stat).read_text()
+        except OSError:
+            continue
+        comm = text[text.index("(") + 1:text.rindex(")")]
+        ppid = int(text[text.rindex(")") + 2:].split()[1])
+        if ppid == me and comm.startswith("ffmpeg"):
+            found.append(int(Path(stat).parent.name))
+    return found
+
+
+def interview_temp_dirs() -> set:
+    return set(glob.glob(os.path.join(tempfile.gettempdir(), "interview_*")))
+
+
+async def check_copy_and_cache(tmp: Path, ffmpeg: str, drawtext: bool):
+    questions, answers, cache = tmp / "questions", tmp / "answers", tmp / "cards"
+    make_clip(ffmpeg, questions / "q1.mp4", "1080x1920", 1.0)   # already on target
+    make_clip(ffmpeg, answers / "a1.mp4", "320x240", 1.0)       # phone clip
+    make_clip(ffmpeg, questions / "q2.mp4", "320x240", 1.0)
+    make_clip(ffmpeg, answers / "a2.mp4", "1080x1920", 1.0)
+
+    info = await media_tools.get_video_info_async(str(questions / "q1.mp4"))
+    assert InterviewCompositor._matches_target(info), f"target clip not recognised: {info}"
+
+    first = RecordingCompositor(max_workers=2, title_cache_dir=str(cache), drawtext=drawtext)
+    result = await first.compose_interview(
+        str(questions), str(answers), str(tmp / "out1.mp4"), title="Test Interview"
+    )
+    assert result.get("clip_count") == 7, result  # intro + 2 x (card, q, a)
+    assert sorted(first.inputs("copy")) == ["a2.mp4", "q1.mp4"], first.inputs("copy")
+    assert sorted(first.inputs("encode")) == ["a1.mp4", "q2.mp4"], first.inputs("encode")
+    assert abs(result["duration"] - (3.0 + 2 * (1.5 + 2.0))) < 0.3, result
+    print("Target-spec clips stream-copied (q1, a2); 320x240 clips re-encoded (a1, q2)")
+
+    cards = sorted(cache.glob("card_*.mp4"))
+    assert len(first.inputs("card")) == 3 and len(cards) == 3, (first.inputs("card"), cards)
+    assert all(len(p.stem) == len("card_") + 16 for p in cards), cards
+    assert not list(cache.glob("*.partial.mp4"))
+    mtimes = {p: p.stat().st_mtime_ns for p in cards}
+
+    # Fresh compositor (no in-memory state), same cache directory
+    second = RecordingCompositor(max_workers=2, title_cache_dir=str(cache), drawtext=drawtext)
+    result = await second.compose_interview(
+        str(questions), str(answers), str(tmp / "out2.mp4"), title="Test Interview"
+    )
+    assert result.get("clip_count") == 7, result
+    assert second.inputs("card") == [], "second run re-rendered a cached title card"
+    assert {p: p.stat().st_mtime_ns for p in cards} == mtimes
+
+    third = RecordingCompositor(max_workers=2, title_cache_dir=str(cache), drawtext=drawtext)
+    await third.compose_interview(
+        str(questions), str(answers), str(tmp / "out3.mp4"), title="Another Interview"
+    )
+    assert len(third.inputs("card")) == 1 and len(list(cache.glob("card_*.mp4"))) == 4
+    print("Title cards: 3 rendered, second interview hit the cache for all 3, "
+          "a new title rendered 1")
+
+
+async def check_cancel(tmp: Path, ffmpeg: str):
+    questions, answers = tmp / "slow_q", tmp / "slow_a"
+    for i in (1, 2):
+        make_clip(ffmpeg, questions / f"q{i}.mp4", "640x480", 20.0)
+        make_clip(ffmpeg, answers / f"a{i}.mp4", "640x480", 20.0)
+
+    temp_before = interview_temp_dirs()
+    compositor = RecordingCompositor(max_workers=2, title_cache_dir=str(tmp / "cards"))
+    task = asyncio.create_task(compositor.compose_interview(
+        str(questions), str(answers), str(tmp / "cancelled.mp4"), include_title_cards=False
+    ))
+    await asyncio.wait_for(compositor.encoding.wait(), timeout=30)
+    await asyncio.sleep(0.5)
+    running = ffmpeg_children()
+    assert running, "no ffmpeg encode running to cancel"
+
+    started = time.perf_counter()
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    else:
+        raise AssertionError("compose_interview finished before it was cancelled")
+
+    # Checked straight away: a killed-but-unreaped ffmpeg shows up as a zombie
+    assert ffmpeg_children() == [], f"orphaned ffmpeg processes: {ffmpeg_children()}"
+    assert interview_temp_dirs() == temp_before, "temp directory left behind"
+    assert not (tmp / "cancelled.mp4").exists()
+    print(f"Cancelled mid-normalization with {len(running)} ffmpeg encode(s) running: "
+          f"all killed and reaped in {time.perf_counter() - started:.2f}s, temp dir removed")
+
+
+async def main():
+    try:
+        ffmpeg = media_tools.find_ffmpeg()
+    except RuntimeError:
+        print("ffmpeg not found (install it or imageio-ffmpeg): skipped")
+        return
+    drawtext = has_drawtext(ffmpeg)
+    if not drawtext:
+        print("ffmpeg has no drawtext filter: title cards rendered without text")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        await check_copy_and_cache(tmp, ffmpeg, drawtext)
+        await check_cancel(tmp, ffmpeg)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
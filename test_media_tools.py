@@ -0,0 +1,175 @@
+"""
+Duration test for video_pipeline.media_tools.get_duration.
+
+get_duration reads WAV / MP3 / MP4 / MOV headers in-process instead of
+spawning ffprobe. Checks each parser against the known length and against
+probe() (ffprobe, or the ffmpeg -i banner when there is no ffprobe):
+
+  - WAV written with the wave module (mono/stereo, different rates),
+  - hand-built MP4 boxes: mvhd version 0 and 1, a 64-bit box size, and a
+    file with no moov (falls back to the probe path),
+  - with ffmpeg: CBR MP3 with and without an Info header (ID3v2 tag in
+    front), VBR MP3 (Xing; MPEG-1 stereo and MPEG-2 mono), and
+    MP4 / M4A / MOV with the moov box at the end and at the front,
+  - parsed formats never spawn a probe; unknown containers (MKV, FLAC)
+    and unparseable headers go through probe() once, then its cache.
+
+The ffmpeg part is skipped when ffmpeg is not installed.
+
+Run: python test_media_tools.py
+"""
+
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from video_pipeline import media_tools
+
+# Parsed durations must match the probe this closely (MP3 encoder padding
+# and CBR size estimates are a few frames at most)
+TOLERANCE = 0.08
+
+
+class ProbeCounter:
+    """Counts real probes (spawned ffprobe / ffmpeg -i)."""
+
+    def __init__(self):
+        self.calls = 0
+        self._run_probe = media_tools._run_probe
+
+    def __call__(self, path):
+        self.calls += 1
+        return self._run_probe(path)
+
+
+def write_wav(path: Path, seconds: float, rate: int, channels: int):
+    frames = int(seconds * rate)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(np.zeros(frames * channels, dtype=np.int16).tobytes())
+
+
+def box(kind: bytes, body: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(body), kind) + body
+
+
+def large_box(kind: bytes, body: bytes) -> bytes:
+    """Box with the 64-bit size field (size == 1)."""
+    return struct.pack(">I4sQ", 1, kind, 16 + len(body)) + body
+
+
+def mvhd(version: int, timescale: int, duration: int) -> bytes:
+    if version == 1:
+        times = struct.pack(">QQIQ", 0, 0, timescale, duration)
+    else:
+        times = struct.pack(">IIII", 0, 0, timescale, duration)
+    return box(b"mvhd", bytes([version, 0, 0, 0]) + times + bytes(80))
+
+
+def check_headers(tmp: Path, probes: ProbeCounter):
+    for seconds, rate, channels in ((2.5, 16000, 1), (1.25, 44100, 2), (61.0, 48000, 2)):
+        path = tmp / f"tone_{rate}_{channels}.wav"
+        write_wav(path, seconds, rate, channels)
+        assert abs(media_tools.get_duration(str(path)) - seconds) < 1e-6, (path, seconds)
+
+    ftyp = box(b"ftyp", b"isom" + struct.pack(">I", 0x200) + b"isomiso2")
+    cases = {
+        "v0.mp4": (ftyp + box(b"moov", mvhd(0, 1000, 12_345)), 12.345),
+        # 64-bit mvhd and a large-size box in front of moov
+        "v1.mov": (ftyp + large_box(b"free", bytes(32)) + box(b"moov", mvhd(1, 90_000, 90_000 * 7200)), 7200.0),
+        "moov_last.m4a": (ftyp + box(b"mdat", bytes(4096)) + box(b"moov", mvhd(0, 44_100, 44_100 * 3)), 3.0),
+    }
+    for name, (data, seconds) in cases.items():
+        (tmp / name).write_bytes(data)
+        assert abs(media_tools.get_duration(str(tmp / name)) - seconds) < 1e-9, name
+    assert probes.calls == 0, "a parsed header spawned a probe"
+    print(f"WAV (3 files) and hand-built MP4/MOV/M4A boxes (mvhd v0/v1, 64-bit size): "
+          f"exact, no probes")
+
+
+def ffmpeg_file(ffmpeg: str, path: Path, args: list, seconds: float):
+    subprocess.run(
+        [ffmpeg, "-v", "error", "-y", *args, "-t", str(seconds), str(path)],
+        check=True,
+    )
+
+
+def check_encoded(tmp: Path, ffmpeg: str, probes: ProbeCounter):
+    sine = ["-f", "lavfi", "-i", "sine=frequency=440:sample_rate=44100"]
+    video = ["-f", "lavfi", "-i", "testsrc=size=320x240:rate=30"]
+    cases = [
+        ("cbr_info.mp3", sine + ["-c:a", "libmp3lame", "-b:a", "128k"], 4.0),
+        ("cbr_plain.mp3", sine + ["-c:a", "libmp3lame", "-b:a", "96k", "-write_xing", "0"], 4.0),
+        ("vbr_stereo.mp3", sine + ["-ac", "2", "-c:a", "libmp3lame", "-q:a", "4"], 5.0),
+        ("vbr_mono_mpeg2.mp3", sine + ["-ac", "1", "-ar", "22050", "-c:a", "libmp3lame", "-q:a", "6"], 3.0),
+        ("moov_end.mp4", video + ["-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p"], 2.0),
+        ("faststart.mp4", video + ["-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+                                   "-movflags", "+faststart"], 3.0),
+        ("voice.m4a", sine + ["-c:a", "aac", "-b:a", "96k"], 2.5),
+        ("clip.mov", video + sine + ["-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+                                     "-c:a", "aac", "-shortest"], 2.0),
+    ]
+    for name, args, seconds in cases:
+        ffmpeg_file(ffmpeg, tmp / name, args, seconds)
+
+    before = probes.calls
+    parsed = {name: media_tools.get_duration(str(tmp / name)) for name, _, _ in cases}
+    assert probes.calls == before, "a parsed header spawned a probe"
+
+    for name, _, seconds in cases:
+        reference = float(media_tools._run_probe(str(tmp / name))["format"]["duration"])
+        got = parsed[name]
+        assert abs(got - reference) < TOLERANCE, (name, got, reference)
+        assert abs(got - seconds) < TOLERANCE, (name, got, seconds)
+    print(f"MP3 (CBR +/-Info, VBR MPEG-1/2) and MP4/M4A/MOV from ffmpeg: "
+          f"within {TOLERANCE * 1000:.0f}ms of the probe, no probes spawned")
+
+
+def check_fallback(tmp: Path, ffmpeg: str, probes: ProbeCounter):
+    sine = ["-f", "lavfi", "-i", "sine=frequency=440:sample_rate=44100"]
+    ffmpeg_file(ffmpeg, tmp / "other.mkv", sine + ["-c:a", "libmp3lame"], 3.0)
+    ffmpeg_file(ffmpeg, tmp / "other.flac", sine + ["-c:a", "flac"], 2.0)
+    # An MKV named .mp4: no moov box, so the header parser gives up
+    (tmp / "mislabelled.mp4").write_bytes((tmp / "other.mkv").read_bytes())
+
+    for name, seconds in (("other.mkv", 3.0), ("other.flac", 2.0), ("mislabelled.mp4", 3.0)):
+        before = probes.calls
+        got = media_tools.get_duration(str(tmp / name))
+        assert abs(got - seconds) < TOLERANCE, (name, got)
+        assert probes.calls == before + 1, (name, probes.calls - before)
+        assert media_tools.get_duration(str(tmp / name)) == got
+        assert probes.calls == before + 1, f"{name}: second lookup not served from the cache"
+    print("Unknown containers (MKV, FLAC) and an unparseable .mp4: one probe each, then cached")
+
+
+def main():
+    probes = ProbeCounter()
+    media_tools._run_probe = probes
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            check_headers(tmp, probes)
+            try:
+                ffmpeg = media_tools.find_ffmpeg()
+            except RuntimeError:
+                print("ffmpeg not found (install it or imageio-ffmpeg): encoded formats skipped")
+            else:
+                check_encoded(tmp, ffmpeg, probes)
+                check_fallback(tmp, ffmpeg, probes)
+    finally:
+        media_tools._run_probe = probes._run_probe
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Media transcription test for the video editor.
+
+Runs MediaTranscriber end to end - ffmpeg decoding a WAV to PCM on a pipe,
+a real STTWorker on a local socket - with a stub model in the worker that
+"transcribes" tone bursts (reports where each burst is and its pitch, after
+a fixed decode delay). Checks:
+  - segment timestamps are absolute positions in the file, for every burst,
+  - segments arrive while the file is still being transcribed, not at the end,
+  - a second pass over the same file comes from the cache without touching
+    the worker; a changed file is transcribed again,
+  - DavidPIPEditor._transcribe goes through the transcriber,
+  - a worker that stops responding raises within the stall timeout, both
+    while a long file is still being fed and while waiting for the end,
+  - the worker refuses clients without its key, and won't start without one.
+
+Needs ffmpeg (PATH or the imageio-ffmpeg bundle); skipped otherwise.
+
+Run: python test_media_transcriber.py [bursts] [decode_seconds]
+"""
+
+import asyncio
+import os
+import secrets
+import socket
+import sys
+import tempfile
+import threading
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tools.video_editor import DavidPIPEditor, MediaTranscriber, transcriber as transcriber_module
+from video_pipeline import media_tools
+from voice.speech_to_text import SAMPLE_RATE
+from voice import stt_worker
+from voice.stt_worker import STTClient, STTWorker
+
+BURST_S = 1.2
+PAUSE_S = 0.8
+
+
+class ToneSTT:
+    """Stands in for SpeechToText inside the worker: one segment per tone burst."""
+
+    def __init__(self, decode_seconds: float):
+        self.decode_seconds = decode_seconds
+        self.calls = 0
+
+    def warm_up(self):
+        pass
+
+    def get_model_info(self) -> dict:
+        return {"model_size": "tone", "loaded": True}
+
+    def transcribe_segments(self, audio, language: str = "en") -> list[dict]:
+        self.calls += 1
+        time.sleep(self.decode_seconds)
+        loud = np.flatnonzero(np.abs(audio) > 0.05)
+        if not len(loud):
+            return []
+        tone = audio[loud[0]:loud[-1] + 1]
+        crossings = np.count_nonzero(np.diff(np.signbit(tone)))
+        pitch = int(round(crossings / 2 / (len(tone) / SAMPLE_RATE) / 20) * 20)
+        return [{"start": loud[0] / SAMPLE_RATE, "end": (loud[-1] + 1) / SAMPLE_RATE,
+                 "text": f"tone {pitch}Hz"}]
+
+
+def write_bursts(path: Path, bursts: int) -> list[tuple[float, float, str]]:
+    """WAV of tone bursts at different pitches; returns the expected segments."""
+    t = np.arange(int(BURST_S * SAMPLE_RATE)) / SAMPLE_RATE
+    pause = np.zeros(int(PAUSE_S * SAMPLE_RATE), dtype=np.float32)
+    parts, expected, pos = [pause], [], PAUSE_S
+    for i in range(bursts):
+        pitch = 200 + 20 * i
+        parts += [(0.3 * np.sin(2 * np.pi * pitch * t)).astype(np.float32), pause]
+        expected.append((pos, pos + BURST_S, f"tone {pitch}Hz"))
+        pos += BURST_S + PAUSE_S
+    pcm = (np.concatenate(parts) * 32767).astype(np.int16)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes(pcm.tobytes())
+    return expected
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def start_worker(stt) -> STTClient:
+    """A real STTWorker around `stt`, on its own port."""
+    port, key = free_port(), secrets.token_bytes(32)
+    worker = STTWorker(port=port, authkey=key)
+    worker.stt = stt
+    threading.Thread(target=worker.serve_forever, daemon=True).start()
+    client = STTClient(port=port, authkey=key, autostart=False)
+    for _ in range(50):
+        try:
+            client.ping()
+            return client
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("stub worker did not start")
+
+
+async def run(bursts: int, decode_seconds: float):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        try:
+            media_tools.find_ffmpeg()
+        except RuntimeError:
+            print("ffmpeg not found (install it or imageio-ffmpeg): skipped")
+            return
+
+        stt = ToneSTT(decode_seconds)
+        client = await start_worker(stt)
+
+        media = root / "talking_head.wav"
+        expected = write_bursts(media, bursts)
+        duration = expected[-1][1] + PAUSE_S
+        transcriber = MediaTranscriber(cache_dir=root / "cache", client=client)
+
+        print("=" * 60)
+        print(f"Media transcription - {bursts} phrases, {duration:.0f}s of audio, "
+              f"{decode_seconds:.2f}s per phrase decode")
+        print("=" * 60)
+
+        # The pickled socket only talks to holders of the per-run key
+        stranger = STTClient(port=client.address[1], authkey=secrets.token_bytes(32), autostart=False)
+        try:
+            stranger.ping()
+            raise AssertionError("worker accepted a client with the wrong key")
+        except RuntimeError as e:
+            assert "key" in str(e), e
+        assert client.ping()["type"] == "pong"
+        os.environ.pop(stt_worker.AUTHKEY_ENV, None)
+        try:
+            STTWorker(port=free_port())
+            raise AssertionError("worker started without a key")
+        except RuntimeError:
+            pass
+        print("Wrong-key client refused (worker keeps serving); no key, no worker")
+
+        # First pass: streamed from ffmpeg through the worker
+        start = time.perf_counter()
+        arrivals, segments = [], []
+        async for segment in transcriber.segments(media):
+            arrivals.append(time.perf_counter() - start)
+            segments.append(segment)
+        elapsed = time.perf_counter() - start
+        assert len(segments) == bursts, (len(segments), bursts)
+        for got, (want_start, want_end, text) in zip(segments, expected):
+            assert got["text"] == text, (got, text)
+            assert abs(got["start"] - want_start) < 0.01 and abs(got["end"] - want_end) < 0.01, (got, want_start)
+        assert stt.calls == bursts
+        assert arrivals[0] < elapsed / 4, "first segment only arrived near the end"
+        print(f"Timestamps within 10ms of every burst; first segment after {arrivals[0]:.2f}s, "
+              f"all {bursts} after {elapsed:.2f}s")
+
+        # Same footage again: cache, no worker calls
+        start = time.perf_counter()
+        again = await transcriber.transcribe(media)
+        cached = time.perf_counter() - start
+        assert again == segments and stt.calls == bursts
+        assert len(list((root / "cache").glob("*.json"))) == 1
+        print(f"Second pass from the cache: {cached * 1000:.1f}ms, worker not called")
+
+        # Editor uses it; a different file is a cache miss
+        editor = DavidPIPEditor(transcriber=transcriber)
+        assert await editor._transcribe(media) == segments and stt.calls == bursts
+        other = root / "retake.wav"
+        write_bursts(other, 2)
+        assert [s["text"] for s in await editor._transcribe(other)] == ["tone 200Hz", "tone 220Hz"]
+        assert stt.calls == bursts + 2
+        print("DavidPIPEditor._transcribe: cache hit for the same footage, new file transcribed")
+        client.shutdown()
+
+        # A worker stuck mid-decode: the stall timeout ends the wait
+        transcriber_module.STALL_TIMEOUT = 2.0
+        stuck = await start_worker(ToneSTT(decode_seconds=3600))
+        for name, count in (("stuck_end.wav", 2), ("stuck_feed.wav", 1500)):
+            media = root / name
+            write_bursts(media, count)
+            start = time.perf_counter()
+            try:
+                await MediaTranscriber(cache_dir=None, client=stuck).transcribe(media)
+                raise AssertionError("stalled worker not detected")
+            except RuntimeError as e:
+                assert "stalled" in str(e), e
+            waited = time.perf_counter() - start
+            assert waited < 30, waited
+            print(f"Stuck worker ({count} phrases, {count * (BURST_S + PAUSE_S) / 60:.0f} min): "
+                  f"gave up after {waited:.1f}s")
+    print("\nOK")
+
+
+def main():
+    bursts = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    decode_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    asyncio.run(run(bursts, decode_seconds))
+
+
+if __name__ == "__main__":
+    main()
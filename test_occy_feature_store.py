@@ -0,0 +1,219 @@
+"""
+Selection/latency test for OccyLearner's feature store.
+
+Builds a synthetic curriculum (the real one scaled up), then runs a long
+exploration session twice: once with the old JSON feature map - full scans
+in _select_next_feature and a whole-file rewrite per update - and once with
+FeatureStore. Both sessions must pick the same features in the same order
+(explore mode with job-relevant names, then hands-on mode).
+
+Also checks the one-time JSON import, curriculum backfill/new features,
+and that progress survives reopening the database.
+
+Run: python test_occy_feature_store.py [features]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.occy_feature_store import FeatureStore
+from agents.occy_learner import GENERATIVE_CATEGORIES
+
+
+def make_curriculum(count: int, rng: random.Random) -> dict:
+    real = yaml.safe_load(open("config/occy_curriculum.yaml"))["categories"]
+    categories = {}
+    for i in range(count):
+        cat = list(real)[i % len(real)] + ("" if i < len(real) * 8 else f"_{i // 200}")
+        feat = {"name": f"feature_{i}", "description": f"Feature {i}", "priority": rng.randint(1, 5)}
+        if rng.random() < 0.5:
+            feat["generative"] = rng.random() < 0.5
+        categories.setdefault(cat, {"description": cat, "features": []})["features"].append(feat)
+    return {"categories": categories}
+
+
+# --- the previous JSON implementation, kept for comparison ---
+
+class LegacyMap:
+    def __init__(self, curriculum: dict, path: Path):
+        self.path = path
+        self.feature_map = {"categories": {}}
+        for cat_name, cat_data in curriculum["categories"].items():
+            self.feature_map["categories"][cat_name] = {"description": "", "features": [
+                {"name": f["name"], "description": f["description"], "confidence": 0.0,
+                 "priority": f.get("priority", 5), "notes": "", "generative": f.get("generative", False),
+                 "test_prompt": "", "explored_count": 0, "last_explored": None, "knowledge_ids": []}
+                for f in cat_data["features"]
+            ]}
+        self.save()
+
+    def save(self):
+        with open(self.path, "w") as f:
+            json.dump(self.feature_map, f, indent=2)
+
+    def select(self, job_relevant=None, exclude=None, mode="explore"):
+        exclude = exclude or set()
+        cats = self.feature_map["categories"].items()
+        if mode == "hands_on":
+            def generative(cat_name, feat):
+                return feat["generative"] if "generative" in feat else cat_name in GENERATIVE_CATEGORIES
+            candidates = [(c, f) for c, d in cats for f in d["features"]
+                          if f["name"] not in exclude and generative(c, f) and 0.3 <= f["confidence"] <= 0.7]
+            if candidates:
+                candidates.sort(key=lambda x: (x[1]["priority"], x[1]["confidence"]))
+                return candidates[0]
+            fallback = [(c, f) for c, d in cats for f in d["features"]
+                        if f["name"] not in exclude and generative(c, f) and f["confidence"] < 0.7]
+            if fallback:
+                fallback.sort(key=lambda x: (x[1]["priority"], -x[1]["confidence"]))
+                return fallback[0]
+            return None
+        unexplored, partial, relevant, deep_dive = [], [], [], []
+        for cat_name, cat_data in cats:
+            for feat in cat_data["features"]:
+                if feat["name"] in exclude:
+                    continue
+                entry = (cat_name, feat)
+                if feat["confidence"] == 0.0:
+                    unexplored.append(entry)
+                elif feat["confidence"] < 0.5:
+                    partial.append(entry)
+                elif feat["confidence"] < 0.9:
+                    deep_dive.append(entry)
+                if job_relevant and feat["name"] in job_relevant and feat["confidence"] < 0.7:
+                    relevant.append(entry)
+        for group in [unexplored, partial, relevant, deep_dive]:
+            if group:
+                group.sort(key=lambda x: (x[1]["priority"], x[1].get("explored_count", 0)))
+                return group[0]
+        return None
+
+    def update(self, category, name, delta, credits_spent=0):
+        for feat in self.feature_map["categories"][category]["features"]:
+            if feat["name"] == name:
+                feat["confidence"] = min(1.0, feat["confidence"] + delta)
+                feat["explored_count"] += 1
+                feat["last_explored"] = datetime.now().isoformat()
+                if credits_spent:
+                    feat.setdefault("cost_history", []).append(credits_spent)
+                break
+        self.save()
+
+
+def session(select, update, steps: int, job_relevant: list[str], seed: int):
+    """Explore, then hands-on; a fresh exclude set every 25 picks (a 'session')."""
+    rng = random.Random(seed)
+    picks = []
+    elapsed = 0.0
+    exclude = set()
+    for step in range(steps):
+        if step % 25 == 0:
+            exclude = set()
+        mode = "explore" if step < steps * 2 // 3 else "hands_on"
+        start = time.perf_counter()
+        choice = select(job_relevant if mode == "explore" else None, exclude, mode)
+        if choice is None:
+            break
+        category, feature = choice
+        exclude.add(feature["name"])
+        delta = rng.choice((0.1, 0.2, 0.3, -0.05))
+        credits = rng.choice((0, 0, 3, 12))
+        update(category, feature["name"], delta, credits)
+        elapsed += time.perf_counter() - start
+        picks.append((category, feature["name"]))
+    return picks, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    steps = 600
+    rng = random.Random(3)
+    curriculum = make_curriculum(count, rng)
+    job_relevant = [f"feature_{i}" for i in rng.sample(range(count), 20)]
+
+    print("=" * 60)
+    print(f"Occy feature selection - {count} features, {steps}-pick session")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as root:
+        root = Path(root)
+        curriculum_path = root / "curriculum.yaml"
+        curriculum_path.write_text(yaml.safe_dump(curriculum, sort_keys=False))
+
+        legacy = LegacyMap(curriculum, root / "feature_map.json")
+        old_picks, old_time = session(
+            legacy.select,
+            lambda c, n, d, cr: legacy.update(c, n, d, cr),
+            steps, job_relevant, seed=9,
+        )
+
+        store = FeatureStore(root / "features.db", curriculum_path=curriculum_path,
+                             generative_categories=GENERATIVE_CATEGORIES)
+        new_picks, new_time = session(
+            store.select_next,
+            lambda c, n, d, cr: store.update_progress(c, n, d, credits_spent=cr),
+            steps, job_relevant, seed=9,
+        )
+
+        assert new_picks == old_picks, next(
+            (i, a, b) for i, (a, b) in enumerate(zip(old_picks, new_picks)) if a != b
+        )
+        print(f"Same {len(new_picks)} picks in the same order (explore + hands-on)")
+        print(f"{'store':<8}{'ms/pick+update':>16}")
+        print(f"{'json':<8}{old_time / len(old_picks) * 1000:>16.2f}")
+        print(f"{'sqlite':<8}{new_time / len(new_picks) * 1000:>16.2f}")
+        print(f"Speedup: {old_time / new_time:.0f}x")
+        assert new_time < old_time
+
+        # Progress survives a reopen (each update is its own transaction)
+        progress = store.progress()
+        store.close()
+        reopened = FeatureStore(root / "features.db", curriculum_path=curriculum_path,
+                                generative_categories=GENERATIVE_CATEGORIES)
+        assert reopened.progress() == progress
+        assert reopened.select_next(job_relevant)[1]["name"] == legacy.select(job_relevant)[1]["name"]
+        legacy_progress = sum(
+            f["confidence"] > 0 for d in legacy.feature_map["categories"].values() for f in d["features"]
+        )
+        assert progress["explored"] == legacy_progress
+        print(f"Reopen: {progress['explored']}/{progress['total_features']} explored, "
+              f"{len(reopened.cost_sheet())} features with cost history")
+        reopened.close()
+
+        # One-time import of an old JSON map, then curriculum backfill + additions
+        migrated_db = root / "migrated.db"
+        for feat in legacy.feature_map["categories"][next(iter(curriculum["categories"]))]["features"]:
+            feat.pop("generative", None)
+        legacy.save()
+        curriculum["categories"]["new_category"] = {
+            "description": "added later",
+            "features": [{"name": "brand_new", "description": "New", "priority": 1, "generative": True}],
+        }
+        curriculum_path.write_text(yaml.safe_dump(curriculum, sort_keys=False))
+        migrated = FeatureStore(migrated_db, curriculum_path=curriculum_path,
+                                legacy_map_path=legacy.path, generative_categories=GENERATIVE_CATEGORIES)
+        assert not legacy.path.exists() and legacy.path.with_name(legacy.path.name + ".migrated").exists()
+        assert migrated.progress()["explored"] == legacy_progress
+        assert migrated.progress()["total_features"] == count + 1
+        first_cat = next(iter(curriculum["categories"]))
+        first = curriculum["categories"][first_cat]["features"][0]
+        assert migrated.get(first_cat, first["name"]).get("generative") == first.get("generative")
+        assert migrated.get("new_category", "brand_new")["confidence"] == 0.0
+        print("Migration: JSON progress imported, missing fields backfilled, new features added")
+        migrated.close()
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Local pre-review test for OccyReviewer.
+
+Renders a small batch of clips with FFmpeg's test sources - one good
+clip and one per defect the pre-review should catch (black, frozen,
+silent, no audio, low resolution, wrong duration; reviewed as narrated
+clips, so audio is required) - and runs them through review_video with
+the Gemini upload/review replaced by a timed stand-in.
+
+Compares uploads and wall time with everything going remote (the old
+flow) against pre-review + remote for passing clips only, then repeats
+the batch to show verdicts coming from the per-file-hash cache.
+
+Needs ffmpeg (PATH or the imageio-ffmpeg bundle).
+
+Run: python test_occy_prereview.py [remote_seconds]
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.occy_reviewer import OccyReviewer, PreReview, QualityScore
+from video_pipeline import media_tools
+
+GOOD_VIDEO = "testsrc2=size=1280x720:rate=30"
+TONE = "sine=frequency=440:sample_rate=44100"
+
+# name -> (video source, audio source or None, seconds, expected verdict)
+CLIPS = {
+    "good": (GOOD_VIDEO, TONE, 8, "pass"),
+    "black": ("color=black:size=1280x720:rate=30", TONE, 8, "black"),
+    "frozen": ("smptebars=size=1280x720:rate=30", TONE, 8, "frozen"),
+    "silent": (GOOD_VIDEO, "anullsrc=r=44100:cl=mono", 8, "silent"),
+    "no_audio": (GOOD_VIDEO, None, 8, "no audio"),
+    "low_res": ("testsrc2=size=320x240:rate=30", TONE, 8, "resolution"),
+    "too_short": (GOOD_VIDEO, TONE, 3, "duration"),
+}
+CONTEXT = {"model": "test", "duration": 8, "requires_audio": True}
+
+
+def render_clips(root: Path) -> dict[str, Path]:
+    ffmpeg = media_tools.find_ffmpeg()
+    paths = {}
+    for name, (video, audio, seconds, _) in CLIPS.items():
+        out = root / f"{name}.mp4"
+        cmd = [ffmpeg, "-v", "error", "-y", "-f", "lavfi", "-i", video]
+        if audio:
+            cmd += ["-f", "lavfi", "-i", audio]
+        cmd += ["-t", str(seconds), "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p"]
+        cmd += ["-c:a", "aac", "-shortest"] if audio else ["-an"]
+        subprocess.run(cmd + [str(out)], check=True)
+        paths[name] = out
+    return paths
+
+
+class TimedReviewer(OccyReviewer):
+    """OccyReviewer whose remote step is a sleep: upload + ACTIVE wait + review."""
+
+    def __init__(self, remote_seconds: float, pre_review: bool = True, **kwargs):
+        super().__init__(**kwargs)
+        self._google_key = "test"
+        self.remote_seconds = remote_seconds
+        self.use_pre_review = pre_review
+        self.uploads = 0
+
+    async def _pre_review(self, video_path, context):
+        if not self.use_pre_review:
+            return PreReview()
+        return await super()._pre_review(video_path, context)
+
+    async def _analyze_with_gemini(self, video_path, script, context):
+        self.uploads += 1
+        await asyncio.sleep(self.remote_seconds)
+        return self._parse_review_response(self.reply)
+
+    reply = ('{"visual_quality": 8, "motion": 8, "consistency": 8, "audio_sync": 8, '
+             '"script_adherence": 8, "issues": [], "recommendation": "approve"}')
+
+
+async def review_all(reviewer: OccyReviewer, paths: dict[str, Path]) -> dict[str, QualityScore]:
+    # Producer reviews one render at a time
+    return {name: await reviewer.review_video(path, script="A short test", context=CONTEXT)
+            for name, path in paths.items()}
+
+
+def main():
+    remote = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+
+    with tempfile.TemporaryDirectory() as root:
+        root = Path(root)
+        paths = render_clips(root)
+
+        print("=" * 60)
+        print(f"OccyReviewer pre-review - {len(paths)} clips, remote review ~{remote:.0f}s each")
+        print("=" * 60)
+
+        legacy = TimedReviewer(remote, pre_review=False, cache_path=None)
+        start = time.perf_counter()
+        asyncio.run(review_all(legacy, paths))
+        legacy_time = time.perf_counter() - start
+
+        reviewer = TimedReviewer(remote, cache_path=root / "review_cache.json")
+        start = time.perf_counter()
+        scores = asyncio.run(review_all(reviewer, paths))
+        new_time = time.perf_counter() - start
+
+        for name, score in scores.items():
+            expected = CLIPS[name][3]
+            metrics = score.pre_review.get("metrics", {})
+            print(f"  {name:<10} {score.recommendation:<11} "
+                  f"black {metrics.get('black_ratio', '-')!s:<5} frozen {metrics.get('frozen_ratio', '-')!s:<5} "
+                  f"silent {metrics.get('silent_ratio', '-')!s:<5} {'; '.join(score.issues)[:60]}")
+            if expected == "pass":
+                assert score.recommendation == "approve", (name, score.issues)
+            else:
+                assert score.recommendation == "regenerate", (name, score.pre_review)
+                assert any(expected in issue.lower() for issue in score.issues), (name, score.issues)
+
+        print(f"\n{'mode':<12}{'uploads':>9}{'batch s':>10}")
+        print(f"{'remote only':<12}{legacy.uploads:>9}{legacy_time:>10.1f}")
+        print(f"{'pre-review':<12}{reviewer.uploads:>9}{new_time:>10.1f}")
+        assert reviewer.uploads == 1 and new_time < legacy_time
+
+        # Same files again (new process): every verdict from the hash cache
+        again = TimedReviewer(remote, cache_path=root / "review_cache.json")
+        start = time.perf_counter()
+        repeat = asyncio.run(review_all(again, paths))
+        print(f"{'cached':<12}{again.uploads:>9}{time.perf_counter() - start:>10.1f}")
+        assert again.uploads == 0
+        assert all(repeat[n].recommendation == scores[n].recommendation for n in paths)
+
+        # A different script is a different review
+        rescored = asyncio.run(again.review_video(paths["good"], script="Another script", context=CONTEXT))
+        assert again.uploads == 1 and rescored.recommendation == "approve"
+
+        # Without requires_audio (the producer's default), clips with no or
+        # silent audio go to the remote review instead of being rejected
+        for name in ("no_audio", "silent"):
+            score = asyncio.run(again.review_video(paths[name], script="A short test",
+                                                   context={"model": "test", "duration": 8}))
+            assert score.recommendation == "approve", (name, score.issues)
+        assert again.uploads == 3
+
+        # An unparseable answer is returned but not cached: the next review asks again
+        again.reply = "I watched the video and it looks fine."
+        garbled = asyncio.run(again.review_video(paths["good"], script="Third script", context=CONTEXT))
+        assert garbled.regeneration_notes == "No structured review in response"
+        again.reply = TimedReviewer.reply
+        retried = asyncio.run(again.review_video(paths["good"], script="Third script", context=CONTEXT))
+        assert again.uploads == 5 and retried.recommendation == "approve"
+        print("Silent clips without requires_audio reach the remote review; parse failures aren't cached")
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+EXPLAIN QUERY PLAN regression test for the hot-query indexes.
+
+Seeds large approval, research, scheduler and events databases through
+the real store classes (their _init_db creates tables + indexes), then:
+  - runs every core.schema_migrations.HOT_QUERIES entry and fails if any
+    plan falls back to a full table scan, with and without ANALYZE stats,
+  - calls the stores' own query methods (and run_daily_tweets'
+    get_research_findings) with SQL tracing on, and EXPLAINs every
+    statement they actually issued - so a store query that drifts away
+    from HOT_QUERIES is still covered,
+  - drops the new indexes to show the old plans and store read timings,
+    then checks migrate() puts them back (and is idempotent).
+
+Needs apscheduler + SQLAlchemy (core/scheduler.py imports them).
+
+Run: python test_schema_migrations.py [rows]
+"""
+
+import json
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.research_agent import knowledge_store
+from agents.research_agent.knowledge_store import KnowledgeStore
+from core import approval_queue, scheduler, schema_migrations
+from core.memory import event_store
+from core.approval_queue import ApprovalQueue
+from core.memory.event_store import EventStore
+from core.scheduler import ContentScheduler
+from core.schema_migrations import HOT_QUERIES, INDEXES, full_scans, query_plan
+
+WORDS = "wall door village kingdom privacy ledger signal network freedom coin watch".split()
+
+
+def iso(rng: random.Random, days: float) -> str:
+    return (datetime.now() - timedelta(days=rng.uniform(-2, days))).isoformat()
+
+
+def seed(data: Path, rows: int, rng: random.Random):
+    ApprovalQueue(db_path=str(data / "approval_queue.db"))
+    with sqlite3.connect(data / "approval_queue.db") as conn:
+        conn.executemany(
+            """INSERT INTO approvals (project_id, agent_id, action_type, action_data, status,
+                                      created_at, reviewed_at, executed_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            [(rng.choice(["david-flip", "occy", "oprah"]), "agent",
+              rng.choice(["tweet", "reply", "thread", "script_review", "video_distribute"]),
+              json.dumps({"text": rng.choice(WORDS)}),
+              status, iso(rng, 60), iso(rng, 60) if status != "pending" else None,
+              iso(rng, 60) if status == "approved" and rng.random() < 0.9 else None)
+             for status in rng.choices(["pending", "approved", "rejected", "expired", "edited"],
+                                       [1, 6, 2, 1, 1], k=rows)])
+
+    KnowledgeStore(db_path=data / "research.db")
+    with sqlite3.connect(data / "research.db") as conn:
+        conn.executemany(
+            """INSERT INTO research_items (source, source_id, url, title, content, scraped_at,
+                                           relevance_score, priority, processed)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            [(rng.choice(["hn", "rss", "reddit"]), str(i), f"https://x{i % 97}.com/{i}",
+              f"{rng.choice(WORDS)} {i}", "", iso(rng, 90), rng.randint(0, 10),
+              rng.choice(["low", "medium", "high", "critical"]), rng.random() < 0.9)
+             for i in range(rows)])
+        conn.executemany(
+            "INSERT INTO watch_items (topic, mention_count, status) VALUES (?, ?, ?)",
+            [(f"topic {i}", rng.randint(1, 20), rng.choice(["watching", "promoted"]))
+             for i in range(rows // 10)])
+
+    ContentScheduler(db_path=data / "scheduler.db")
+    with sqlite3.connect(data / "scheduler.db") as conn:
+        conn.executemany(
+            """INSERT INTO scheduled_content (job_id, content_type, content_data, scheduled_time,
+                                              created_at, status)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [(f"job_{i}", "tweet", json.dumps({"text": "x", "approval_id": i}),
+              iso(rng, 60), iso(rng, 60), rng.choices(["executed", "pending", "failed"], [20, 1, 2])[0])
+             for i in range(rows)])
+
+    EventStore(db_path=data / "events.db")
+    with sqlite3.connect(data / "events.db") as conn:
+        conn.executemany(
+            """INSERT INTO events (title, summary, significance, recall_strength, event_date, created_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [(f"{rng.choice(WORDS)} event {i}", " ".join(rng.choices(WORDS, k=12)),
+              rng.randint(1, 10), rng.random(), iso(rng, 900)[:10], iso(rng, 900))
+             for i in range(rows)])
+
+
+def hot_query_failures(data: Path) -> list[tuple[str, list[str]]]:
+    return schema_migrations.check(data)
+
+
+def stores(data: Path) -> dict:
+    import run_daily_tweets
+    run_daily_tweets.RESEARCH_DB = data / "research.db"
+    return {
+        "approvals": ApprovalQueue(db_path=str(data / "approval_queue.db")),
+        "research": KnowledgeStore(db_path=data / "research.db"),
+        "scheduler": ContentScheduler(db_path=data / "scheduler.db"),
+        "events": EventStore(db_path=data / "events.db"),
+        "tweets": run_daily_tweets,
+    }
+
+
+# Read paths timed before/after (writes are covered by the EXPLAIN checks)
+READS = [
+    ("ApprovalQueue.get_pending(project)", lambda s: s["approvals"].get_pending("david-flip")),
+    ("ApprovalQueue.get_approved_unexecuted", lambda s: s["approvals"].get_approved_unexecuted()),
+    ("ApprovalQueue.get_stats(project)", lambda s: s["approvals"].get_stats("occy")),
+    ("ApprovalQueue.get_last_executed", lambda s: s["approvals"].get_last_executed("tweet")),
+    ("get_research_findings", lambda s: s["tweets"].get_research_findings()),
+    ("KnowledgeStore.get_recent(48h, >=6)", lambda s: s["research"].get_recent(48, 6)),
+    ("KnowledgeStore.get_by_priority", lambda s: s["research"].get_by_priority("critical")),
+    ("KnowledgeStore.get_hot_watch_items", lambda s: s["research"].get_hot_watch_items(15)),
+    ("ContentScheduler.get_upcoming(24h)", lambda s: s["scheduler"].get_upcoming()),
+    ("EventStore.get_historic", lambda s: s["events"].get_historic()),
+    ("EventStore.get_recent", lambda s: s["events"].get_recent()),
+    ("EventStore.get_stats", lambda s: s["events"].get_stats()),
+]
+
+
+def time_reads(data: Path, migrate_on_init: bool = True, repeat: int = 5) -> dict[str, float]:
+    """ms per call of each store read method."""
+    logging.disable(logging.INFO)
+    hooks = [approval_queue, knowledge_store, scheduler, event_store]
+    if not migrate_on_init:  # the stores as they were: _init_db adds no indexes
+        for module in hooks:
+            module.ensure_indexes = lambda conn, table: 0
+    try:
+        handles = stores(data)
+    finally:
+        for module in hooks:
+            module.ensure_indexes = schema_migrations.ensure_indexes
+    out = {}
+    for name, call in READS:
+        call(handles)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            call(handles)
+        out[name] = (time.perf_counter() - start) / repeat * 1000
+    logging.disable(logging.NOTSET)
+    return out
+
+
+def drop_new_indexes(data: Path):
+    for name, tables in schema_migrations.DATABASES.items():
+        if not (data / name).exists():
+            continue
+        with sqlite3.connect(data / name) as conn:
+            for table in tables:
+                for index in INDEXES.get(table, []):
+                    conn.execute(f"DROP INDEX IF EXISTS {index.name}")
+
+
+class Tracer:
+    """Installs sqlite3.connect wrapper recording (db path, expanded SQL) per statement."""
+
+    def __init__(self):
+        self.statements: list[tuple[str, str]] = []
+        self._connect = sqlite3.connect
+
+    def __enter__(self):
+        def connect(database, *args, **kwargs):
+            conn = self._connect(database, *args, **kwargs)
+            path = str(database)
+            conn.set_trace_callback(lambda sql: self.statements.append((path, sql)))
+            return conn
+        sqlite3.connect = connect
+        return self
+
+    def __exit__(self, *exc):
+        sqlite3.connect = self._connect
+
+
+def traced_store_queries(data: Path) -> list[tuple[str, str]]:
+    handles = stores(data)
+    approvals, research, events = handles["approvals"], handles["research"], handles["events"]
+
+    with Tracer() as tracer:
+        approvals.get_pending()
+        approvals.get_pending("david-flip")
+        approvals.get_approved_unexecuted()
+        approvals.get_stats()
+        approvals.get_stats("occy")
+        approvals.get_last_executed("tweet")
+        approvals.expire_old()
+        research.get_unprocessed()
+        research.get_by_priority("high")
+        research.get_recent(hours=48, min_relevance=6)
+        research.get_hot_watch_items()
+        handles["tweets"].get_research_findings()
+        # (pending jobs are served from memory: its SQL is the load on init)
+        content_scheduler = ContentScheduler(db_path=data / "scheduler.db")
+        content_scheduler.get_pending()
+        content_scheduler.get_upcoming()
+        events.recall("wall")
+        events.get_historic()
+        events.get_recent()
+        events.get_stats()
+        events.decay_memories()
+        events.prune_forgotten()
+
+    # (the trace also sees FTS5's own statements on its shadow tables and
+    # ensure_indexes' sqlite_master lookups during init: skip those)
+    statements = {(path, sql) for path, sql in tracer.statements
+                  if sql.lstrip().split(None, 1)[0].upper() in ("SELECT", "UPDATE", "DELETE")
+                  and "_fts_" not in sql and "sqlite_master" not in sql}
+    return sorted(statements)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = random.Random(46)
+
+    with tempfile.TemporaryDirectory() as root:
+        data = Path(root)
+        seed(data, rows, rng)
+
+        print("=" * 60)
+        print(f"Hot-query indexes - {rows:,} rows per table, {len(HOT_QUERIES)} hot queries")
+        print("=" * 60)
+
+        # Stores' own _init_db already created everything
+        failures = hot_query_failures(data)
+        assert not failures, failures
+        after = time_reads(data)
+
+        # With planner statistics too (PRAGMA optimize / ANALYZE in production)
+        for name in schema_migrations.DATABASES:
+            if (data / name).exists():
+                with sqlite3.connect(data / name) as conn:
+                    conn.execute("ANALYZE")
+        failures = hot_query_failures(data)
+        assert not failures, failures
+        print("No hot query does a full table scan (with and without ANALYZE)")
+        for name in schema_migrations.DATABASES:
+            if (data / name).exists():
+                with sqlite3.connect(data / name) as conn:
+                    conn.execute("DROP TABLE sqlite_stat1")
+
+        # Before: the same databases without the new indexes
+        drop_new_indexes(data)
+        before_failures = dict(hot_query_failures(data))
+        before = time_reads(data, migrate_on_init=False)
+        print(f"Before: {len(before_failures)} of {len(HOT_QUERIES)} hot queries scanned a whole table:")
+        for name in before_failures:
+            print(f"  {name}")
+        assert before_failures
+
+        print(f"\n{'store read':<40}{'before ms':>10}{'after ms':>10}")
+        for name, _ in READS:
+            print(f"{name:<40}{before[name]:>10.2f}{after[name]:>10.2f}")
+
+        # migrate() restores them, then is a no-op
+        created = schema_migrations.migrate(data)
+        assert sum(created.values()) == sum(len(v) for v in INDEXES.values()), created
+        assert not hot_query_failures(data)
+        assert sum(schema_migrations.migrate(data).values()) == 0
+        print(f"\nmigrate(): {created}; second run adds nothing")
+
+        # Every statement the stores actually issue, writes included
+        traced = traced_store_queries(data)
+        scans = []
+        for path, sql in traced:
+            conn = sqlite3.connect(f"file:{Path(path).resolve()}?mode=ro", uri=True)
+            plan = query_plan(conn, sql)
+            conn.close()
+            if full_scans(plan):
+                scans.append((sql.split()[:8], plan))
+        assert not scans, scans
+        print(f"Traced {len(traced)} distinct statements from the store methods: no full scans")
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Escalation-rate / latency test for ScreenMonitor's local pre-screen.
+
+Replays a recorded monitoring session - screenshots plus the page text
+captured at the same moment - through the old check (hash() of the page
+text: any change -> screenshot + Gemini Vision) and the new multi-level
+pre-screen (masked text diff -> dHash/pHash -> known-state cache). Vision
+is played by an oracle so no API key is needed; every oracle call counts
+as one paid escalation.
+
+Fixture layout (record with ScreenMonitor screenshots + get_page_text()):
+    data/screen_fixtures/000.png, 000.txt, 001.png, 001.txt, ...
+
+Without a fixture directory a synthetic Focal ML session is rendered
+(render page with ticking timer, credit counter and spinner; a 4-step
+questionnaire; an error banner; going back to the render page; completion).
+
+Run: python test_screen_prescreen.py [fixture_dir]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.occy_screen_prescreen import (
+    ScreenPrescreen, classify_lines, dhash, hamming, load_gray, normalize_page_text, phash,
+)
+
+FIXTURE_DIR = Path("data/screen_fixtures")
+SPINNER = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+
+
+def render(lines: list[str], banner: str = "", dialog: list[str] = ()) -> Image.Image:
+    """One 1280x720 'screenshot' of a simple web app layout."""
+    img = Image.new("RGB", (1280, 720), (246, 247, 250))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((0, 0, 1280, 56), fill=(32, 36, 48))
+    draw.text((24, 20), "Focal", fill=(255, 255, 255))
+    draw.rectangle((0, 56, 240, 720), fill=(228, 231, 238))
+    for i, item in enumerate(("Projects", "Templates", "Assets", "Settings")):
+        draw.text((24, 90 + i * 36), item, fill=(60, 64, 80))
+    draw.rectangle((280, 96, 1240, 560), fill=(18, 18, 22))  # video preview
+    for i, line in enumerate(lines):
+        draw.text((280, 580 + i * 22), line, fill=(30, 30, 40))
+    if banner:
+        draw.rectangle((280, 64, 1240, 90), fill=(220, 60, 60))
+        draw.text((292, 70), banner, fill=(255, 255, 255))
+    if dialog:
+        draw.rectangle((380, 160, 1140, 520), fill=(255, 255, 255), outline=(90, 90, 120), width=3)
+        for i, line in enumerate(dialog):
+            draw.text((420, 200 + i * 40), line, fill=(20, 20, 30))
+            if i:
+                draw.ellipse((400, 202 + i * 40, 412, 214 + i * 40), outline=(80, 80, 80))
+    return img
+
+
+def synthetic_session(out: Path) -> Path:
+    """Write a synthetic monitoring session as NNN.png / NNN.txt pairs."""
+    frames = []
+    credits = 1480
+
+    def render_page(t, extra=""):
+        return [f"Rendering... {t // 60:02d}:{t % 60:02d}  {SPINNER[t % len(SPINNER)]}",
+                f"{credits:,} credits", f"Updated {t % 50 + 1}s ago", extra]
+
+    t = 0
+    for _ in range(40):                      # idle render page
+        t += 5
+        frames.append(render_page(t))
+    steps = [
+        ("1/4", "What kind of video?", ["Explainer", "Story", "Ad"]),
+        ("2/4", "Choose a duration", ["30 seconds", "60 seconds"]),
+        ("3/4", "Select a voice", ["Narrator", "Casual"]),
+        ("4/4", "Would you like captions?", ["Yes", "No"]),
+    ]
+    for step, question, options in steps:    # questionnaire, each step shown a few checks
+        for _ in range(4):
+            t += 5
+            frames.append((render_page(t), "", [f"{step}  {question}"] + options))
+    credits -= 120
+    for _ in range(30):                      # back to rendering (known state)
+        t += 5
+        frames.append(render_page(t))
+    for _ in range(3):
+        t += 5
+        frames.append((render_page(t), "Error: render failed - insufficient credits", []))
+    for _ in range(20):                      # retry, rendering again
+        t += 5
+        frames.append(render_page(t))
+    for _ in range(3):
+        t += 5
+        frames.append((["Your video is ready", "Download MP4", f"{credits:,} credits"], "", []))
+    # A second questionnaire later in the day: known states, no new Vision calls
+    for step, question, options in steps:
+        for _ in range(2):
+            t += 5
+            frames.append((render_page(t), "", [f"{step}  {question}"] + options))
+
+    out.mkdir(parents=True, exist_ok=True)
+    for i, frame in enumerate(frames):
+        lines, banner, dialog = frame if isinstance(frame, tuple) else (frame, "", [])
+        text = "\n".join(["Focal", "Projects", "Templates", "Assets", "Settings", banner, *dialog, *lines])
+        render(lines, banner, dialog).save(out / f"{i:03d}.png")
+        (out / f"{i:03d}.txt").write_text(text, encoding="utf-8")
+    return out
+
+
+def vision_oracle(text: str) -> dict:
+    """Stand-in for Gemini Vision: judges the screen from its full text."""
+    kind = classify_lines(normalize_page_text(text))
+    return {"needs_interaction": kind is not None, "type": kind or "none", "description": kind or ""}
+
+
+def run_legacy(pairs) -> tuple[int, float]:
+    last, escalations = None, 0
+    start = time.perf_counter()
+    for _, text in pairs:
+        h = hash(text)
+        if last is not None and h != last:
+            escalations += 1
+        last = h
+    return escalations, (time.perf_counter() - start) / len(pairs) * 1000
+
+
+def run_prescreen(pairs, cache_path: Path):
+    prescreen = ScreenPrescreen(cache_path=cache_path)
+    decisions = []
+    for shot, text in pairs:
+        result = prescreen.check_text(text)
+        if result.level == "baseline":
+            prescreen.baseline_image(shot)
+            decisions.append(None)
+            continue
+        if not result.changed:
+            decisions.append(None)
+            continue
+        result = prescreen.check_image(result, shot)
+        if result.escalate:
+            event = vision_oracle(text)
+            prescreen.remember(result, event)
+        else:
+            event = result.decision
+        decisions.append(event)
+    return prescreen.report(), decisions
+
+
+def check_hashes(shot: Path):
+    gray = load_gray(shot)
+    # Robust to rescale and small brightness shifts; not to a different screen
+    smaller = load_gray(Image.open(shot).resize((640, 360)))
+    brighter = gray * 0.95 + 8
+    assert hamming(dhash(gray), dhash(smaller)) <= 4 and hamming(phash(gray), phash(smaller)) <= 6
+    assert hamming(dhash(gray), dhash(brighter)) <= 2 and hamming(phash(gray), phash(brighter)) <= 2
+    other = load_gray(render(["Your video is ready"], dialog=["1/4  Pick one", "A", "B"]))
+    assert hamming(phash(gray), phash(other)) > 12
+    print("Hashes: stable under rescale/brightness, separate different screens")
+
+
+def main():
+    fixtures = Path(sys.argv[1]) if len(sys.argv) > 1 else FIXTURE_DIR
+
+    with tempfile.TemporaryDirectory() as root:
+        if not fixtures.exists():
+            fixtures = synthetic_session(Path(root) / "fixtures")
+            source = "synthetic session"
+        else:
+            source = str(fixtures)
+        pairs = [(png, png.with_suffix(".txt").read_text(encoding="utf-8"))
+                 for png in sorted(fixtures.glob("*.png")) if png.with_suffix(".txt").exists()]
+        assert pairs, f"no png/txt pairs in {fixtures}"
+
+        print("=" * 60)
+        print(f"Screen pre-screen - {len(pairs)} checks ({source})")
+        print("=" * 60)
+
+        check_hashes(pairs[0][0])
+
+        legacy, legacy_ms = run_legacy(pairs)
+        report, decisions = run_prescreen(pairs, Path(root) / "states.json")
+
+        print(f"{'mode':<11}{'vision calls':>14}{'rate':>8}{'local ms/check':>16}")
+        print(f"{'hash()':<11}{legacy:>14}{legacy / len(pairs):>8.0%}{legacy_ms:>16.3f}")
+        print(f"{'prescreen':<11}{report['escalations']:>14}{report['escalation_rate']:>8.0%}"
+              f"{report['avg_local_ms']:>16.3f}")
+        print(f"  masked-text unchanged {report['text_unchanged']}, screenshot unchanged "
+              f"{report['screenshot_unchanged']}, known states {report['rule_hits']}")
+
+        # Every screen that needs Occy still produces an interaction event
+        needed = {i for i, (_, text) in enumerate(pairs) if vision_oracle(text)["needs_interaction"]}
+        first_of_run = {i for i in needed if i - 1 not in needed}
+        flagged = {i for i, d in enumerate(decisions) if d and d["needs_interaction"]}
+        assert first_of_run <= flagged, sorted(first_of_run - flagged)
+        assert report["escalations"] < legacy
+
+        # A second session starts with the learned states
+        again, _ = run_prescreen(pairs, Path(root) / "states.json")
+        print(f"Second session with saved state cache: {again['escalations']} vision calls")
+        assert again["escalations"] <= report["escalations"]
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
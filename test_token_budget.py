@@ -0,0 +1,170 @@
+"""
+Budget-check latency test for TokenBudgetManager's running spend ledger.
+
+Fills a token_usage table with months of history (written straight into
+the table, i.e. from before spend_totals existed), then compares
+has_budget() the old way - SUM over DATE(timestamp)=? on every call, a
+full scan - against the ledger, which seeds today's/this month's totals
+once from an indexed range query and then answers from memory.
+
+Also checks the ledger stays exact when two managers (standing in for two
+processes) write to the same database from several threads, that the
+monthly cap is enforced, and that prompt-cache tokens are priced at their
+own rates.
+
+Run: python test_token_budget.py [history_rows]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.token_budget import TokenBudgetManager
+
+PROJECTS = ["david-flip", "master", "occy"]
+
+
+def fill_history(db_path: str, rows: int, rng: random.Random):
+    now = datetime.now()
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            """INSERT INTO token_usage
+               (project_id, model, tokens_input, tokens_output, cost_usd, timestamp)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (
+                (rng.choice(PROJECTS), "claude-sonnet-4-20250514", 1200, 300,
+                 round(rng.uniform(0.0005, 0.02), 6),
+                 (now - timedelta(minutes=rng.randint(0, 120 * 24 * 60))).isoformat())
+                for _ in range(rows)
+            ),
+        )
+
+
+def legacy_has_budget(db_path: str, project_id: str) -> bool:
+    """The previous has_budget(): two fresh connections, DATE() scan."""
+    today = date.today().isoformat()
+    with sqlite3.connect(db_path) as conn:
+        spend = conn.execute(
+            """SELECT COALESCE(SUM(cost_usd), 0) FROM token_usage
+               WHERE project_id=? AND DATE(timestamp)=?""",
+            (project_id, today),
+        ).fetchone()[0]
+    with sqlite3.connect(db_path) as conn:
+        row = conn.execute(
+            "SELECT daily_limit FROM budgets WHERE project_id=?", (project_id,)
+        ).fetchone()
+    return spend < (row[0] if row else 10.0)
+
+
+def actual_spend(db_path: str, project_id: str, period: str) -> float:
+    day = date.today()
+    prefix = day.isoformat() if period == "day" else day.strftime("%Y-%m")
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            "SELECT COALESCE(SUM(cost_usd), 0) FROM token_usage WHERE project_id=? AND timestamp LIKE ?",
+            (project_id, prefix + "%"),
+        ).fetchone()[0]
+
+
+def timed(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    rng = random.Random(5)
+
+    with tempfile.TemporaryDirectory() as root:
+        db_path = os.path.join(root, "token_budget.db")
+        TokenBudgetManager(db_path).close()  # create the schema
+        fill_history(db_path, rows, rng)
+
+        print("=" * 60)
+        print(f"TokenBudgetManager.has_budget - {rows:,} usage rows")
+        print("=" * 60)
+
+        budget = TokenBudgetManager(db_path)
+        budget.set_budget("david-flip", daily=1000.0, monthly=50_000.0)
+
+        # Seeded from history: matches a full recompute
+        for project in PROJECTS:
+            for period in ("day", "month"):
+                spend = budget._spend(project, period)
+                assert abs(spend - actual_spend(db_path, project, period)) < 1e-6, (project, period)
+        print("Seeded totals match a full recompute (day + month, 3 projects)")
+
+        legacy_us = timed(lambda: legacy_has_budget(db_path, "david-flip"), 50)
+        ledger_us = timed(lambda: budget.has_budget("david-flip"), 5000)
+        assert legacy_has_budget(db_path, "david-flip") == budget.has_budget("david-flip")
+        print(f"{'check':<10}{'us/call':>10}")
+        print(f"{'DATE()':<10}{legacy_us:>10.1f}")
+        print(f"{'ledger':<10}{ledger_us:>10.1f}")
+        print(f"Speedup: {legacy_us / ledger_us:.0f}x")
+        assert ledger_us < legacy_us
+
+        # Two "processes", four threads each, recording concurrently
+        other = TokenBudgetManager(db_path)
+        before = {p: actual_spend(db_path, p, "day") for p in PROJECTS}
+
+        def worker(manager, seed):
+            local = random.Random(seed)
+            for _ in range(200):
+                project = local.choice(PROJECTS)
+                manager.record_usage(project, "gpt-4o-mini", 500, 100, 0.001, task_type="test")
+                manager.has_budget(project)
+
+        threads = [threading.Thread(target=worker, args=(m, i))
+                   for i, m in enumerate([budget, other] * 4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for manager in (budget, other):
+            for project in PROJECTS:
+                expected = actual_spend(db_path, project, "day")
+                assert abs(manager.get_daily_spend(project) - expected) < 1e-6, project
+                assert abs(manager.get_monthly_spend(project) - actual_spend(db_path, project, "month")) < 1e-6
+        added = sum(actual_spend(db_path, p, "day") - before[p] for p in PROJECTS)
+        print(f"Concurrent writers: {1600} records (${added:.3f}) seen exactly by both managers")
+
+        # Caps: daily, then monthly; limit changes reach the other process
+        other.set_budget("david-flip", daily=1e9, monthly=budget.get_monthly_spend("david-flip") + 0.01)
+        assert budget.has_budget("david-flip")
+        budget.record_usage("david-flip", "claude-opus-4-5-20251101", 1000, 1000, 0.02)
+        assert not budget.has_budget("david-flip") and not other.has_budget("david-flip")
+        other.set_budget("david-flip", daily=budget.get_daily_spend("david-flip"), monthly=1e9)
+        assert not budget.has_budget("david-flip")
+        report = budget.get_daily_report("david-flip")
+        assert abs(report["total_cost"] - budget.get_daily_spend("david-flip")) < 1e-6
+        print("Daily and monthly caps enforced; limit changes visible across managers")
+
+        # Prompt caching: writes cost more than base input, reads less
+        haiku = "claude-3-5-haiku-20241022"
+        base = budget.calculate_cost(haiku, 10_000, 0)
+        write = budget.calculate_cost(haiku, 0, 0, cache_write_tokens=10_000)
+        read = budget.calculate_cost(haiku, 0, 0, cache_read_tokens=10_000)
+        assert abs(base - 0.008) < 1e-9 and abs(write - 0.01) < 1e-9 and abs(read - 0.0008) < 1e-9
+        mixed = budget.calculate_cost(haiku, 1000, 200, cache_write_tokens=3000, cache_read_tokens=6000)
+        assert abs(mixed - (1000 * 0.80 + 3000 * 1.00 + 6000 * 0.08 + 200 * 4.00) / 1e6) < 1e-12
+        print(f"Cache pricing (10K Haiku input tokens): base ${base:.4f}, "
+              f"cache write ${write:.4f}, cache read ${read:.4f}")
+
+        budget.close()
+        other.close()
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Cycle-time test for the async Twitter reader, against a fake Twitter API.
+
+FakeTwitterAPI stands in for tweepy.Client: every call sleeps for a
+simulated round-trip, counts requests per endpoint and can enforce a
+per-endpoint rate limit (raising a 429 with x-rate-limit-reset like the
+real API). No credentials or network needed.
+
+Compares one GrowthAgent read cycle (reply-target search fan-out, mention
+check with reply tracking, performance metrics) done the old way - sync
+TwitterTool calls one after another - with AsyncTwitterReader. Also checks
+that one busy conversation in a batched reply search doesn't crowd out
+the others.
+
+Run: python test_twitter_async.py [latency_ms]
+"""
+
+import asyncio
+import hashlib
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import tweepy
+
+from agents.growth_agent import SEARCH_QUERIES
+from tools.twitter_async import AsyncTwitterReader, RateLimitWindow
+from tools.twitter_tool import TwitterTool
+
+MY_ID = "1000"
+MY_USERNAME = "DavidFlipAI"
+
+
+class FakeRateLimited(Exception):
+    """Looks like tweepy.TooManyRequests to the reader (response.status_code == 429)."""
+
+    def __init__(self, reset_at: float):
+        super().__init__("429 Too Many Requests")
+        self.response = SimpleNamespace(status_code=429, headers={"x-rate-limit-reset": str(reset_at)})
+
+
+class FakeTwitterAPI:
+    """Deterministic in-process Twitter v2 API with latency and rate limits."""
+
+    def __init__(self, latency: float = 0.15, limits: dict = None, window: float = 1.0,
+                 replies: dict = None):
+        self.latency = latency
+        self.limits = limits or {}
+        self.replies = replies or {}  # conversation id -> reply count (default 5)
+        self.window = window
+        self.calls = Counter()
+        self._sent = {}
+        self._lock = threading.Lock()
+        self._now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def _request(self, endpoint: str):
+        with self._lock:
+            self.calls[endpoint] += 1
+            limit = self.limits.get(endpoint)
+            if limit:
+                sent = self._sent.setdefault(endpoint, deque())
+                now = time.time()
+                while sent and now - sent[0] >= self.window:
+                    sent.popleft()
+                if len(sent) >= limit:
+                    raise FakeRateLimited(sent[0] + self.window)
+                sent.append(now)
+        time.sleep(self.latency)
+
+    @staticmethod
+    def _seed(text: str) -> int:
+        return int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+
+    def _user(self, uid: int):
+        return SimpleNamespace(
+            id=uid, username=f"user{uid}", name=f"User {uid}",
+            public_metrics={"followers_count": (uid * 37) % 50_000},
+        )
+
+    def _tweet(self, tid: int, author: int, conversation: int = None, text: str = "", metrics_seed: int = 0):
+        return SimpleNamespace(
+            id=tid, text=text or f"tweet {tid}", author_id=author, created_at=self._now,
+            conversation_id=conversation or tid, in_reply_to_user_id=int(MY_ID) if conversation else None,
+            public_metrics={
+                "like_count": (metrics_seed * 7) % 400, "reply_count": (metrics_seed * 3) % 40,
+                "retweet_count": metrics_seed % 50, "quote_count": metrics_seed % 5,
+                "bookmark_count": metrics_seed % 9,
+            },
+            non_public_metrics={"impression_count": metrics_seed * 11}, organic_metrics=None,
+        )
+
+    def _response(self, tweets, meta=None):
+        authors = {t.author_id for t in tweets}
+        return tweepy.Response(
+            data=tweets or None, includes={"users": [self._user(a) for a in sorted(authors)]},
+            errors=[], meta=meta or {},
+        )
+
+    # --- tweepy.Client surface used by TwitterTool / AsyncTwitterReader ---
+
+    def get_me(self, **kwargs):
+        self._request("get_me")
+        return tweepy.Response(data=SimpleNamespace(id=MY_ID, username=MY_USERNAME), includes={}, errors=[], meta={})
+
+    def search_recent_tweets(self, query, max_results=10, until_id=None, **kwargs):
+        self._request("search_recent_tweets")
+        conversations = re.findall(r"conversation_id:(\d+)", query)
+        if conversations:
+            # Newest first (higher IDs are newer), paged with until_id
+            tweets = []
+            for conv in conversations:
+                for i in range(self.replies.get(conv, 5)):
+                    tid = int(conv) * 1000 + i + 1
+                    tweets.append(self._tweet(tid, 5000 + (tid % 17), conversation=int(conv)))
+            tweets.sort(key=lambda t: t.id, reverse=True)
+            if until_id:
+                tweets = [t for t in tweets if t.id < int(until_id)]
+            more = len(tweets) > max_results
+            return self._response(tweets[:max_results], {"next_token": "more"} if more else {})
+        if query.startswith(f"@{MY_USERNAME}"):
+            return self._response([self._tweet(900_000 + i, 6000 + i, metrics_seed=i) for i in range(max_results)])
+        seed = self._seed(query)
+        return self._response([
+            self._tweet(seed % 10_000_000 + i, 7000 + (seed + i) % 300, metrics_seed=seed + i,
+                        text=f"{query} take #{i}")
+            for i in range(max_results)
+        ])
+
+    def get_users_tweets(self, id, max_results=10, **kwargs):
+        self._request("get_users_tweets")
+        return self._response([self._tweet(2000 + i, int(MY_ID), metrics_seed=i + 1) for i in range(max_results)])
+
+    def get_users(self, ids, **kwargs):
+        self._request("get_users")
+        return tweepy.Response(data=[self._user(int(i)) for i in ids], includes={}, errors=[], meta={})
+
+
+def make_tool(api: FakeTwitterAPI) -> TwitterTool:
+    tool = TwitterTool()
+    tool._client = api
+    tool._read_client = api
+    return tool
+
+
+def sync_cycle(tool: TwitterTool) -> dict:
+    """GrowthAgent's reads as they were: one blocking call after another."""
+    searches = {q: tool.search_conversations(q, max_results=10) for q in SEARCH_QUERIES}
+    mentions = tool.get_mentions(count=20)
+    my_tweets = tool.get_my_recent_tweets(count=10)
+    replies = {
+        t["id"]: tool.get_replies_to_tweet(t["id"], count=10)
+        for t in my_tweets if t.get("reply_count", 0) > 0
+    }
+    metrics = tool.get_my_tweet_metrics(count=20)
+    return {"searches": searches, "mentions": mentions, "replies": replies, "metrics": metrics}
+
+
+async def async_cycle(reader: AsyncTwitterReader) -> dict:
+    searches = await reader.search_many(SEARCH_QUERIES, max_results=10)
+    mentions, my_tweets = await asyncio.gather(
+        reader.get_mentions(count=20), reader.get_my_recent_tweets(count=10),
+    )
+    ids = [t["id"] for t in my_tweets if t.get("reply_count", 0) > 0]
+    replies = await reader.get_replies_to_tweets(ids, count=10)
+    metrics = await reader.get_my_tweet_metrics(count=20)
+    return {"searches": searches, "mentions": mentions, "replies": replies, "metrics": metrics}
+
+
+def check_rate_limits(latency: float):
+    """Budget of 5 searches/second: the fan-out waits instead of failing."""
+    api = FakeTwitterAPI(latency=latency, limits={"search_recent_tweets": 5}, window=1.0)
+    reader = AsyncTwitterReader(make_tool(api))
+    reader._windows["search_recent_tweets"] = RateLimitWindow(5, window=1.0)
+
+    start = time.perf_counter()
+    results = asyncio.run(reader.search_many(SEARCH_QUERIES, max_results=10))
+    elapsed = time.perf_counter() - start
+    assert all(results.values()), "a search came back empty under rate limiting"
+    assert elapsed >= 2.0, elapsed  # 12 requests at 5/s need two full windows
+    print(f"Rate window: {len(SEARCH_QUERIES)} searches at 5/s in {elapsed:.2f}s, no 429s")
+
+    # Server-side 429 (our budget thinks we're fine): wait for reset, retry
+    api = FakeTwitterAPI(latency=latency, limits={"search_recent_tweets": 3}, window=1.0)
+    reader = AsyncTwitterReader(make_tool(api))
+    results = asyncio.run(reader.search_many(SEARCH_QUERIES[:6], max_results=10))
+    assert all(results.values()), "429 was not retried"
+    print(f"429 retry: 6 searches against a 3/s server, all returned "
+          f"({api.calls['search_recent_tweets']} requests incl. retries)")
+
+
+def check_coalescing(latency: float):
+    api = FakeTwitterAPI(latency=latency)
+    reader = AsyncTwitterReader(make_tool(api))
+
+    async def burst():
+        return await asyncio.gather(*(reader.search_conversations("CBDC digital currency") for _ in range(10)))
+
+    results = asyncio.run(burst())
+    assert all(r == results[0] for r in results)
+    assert api.calls["search_recent_tweets"] == 1, api.calls
+    print("Coalescing: 10 identical concurrent searches -> 1 request")
+
+    found = asyncio.run(reader.get_users([str(i) for i in range(250)]))
+    assert len(found) == 250 and api.calls["get_users"] == 3, api.calls
+    again = asyncio.run(reader.get_users(["5", "6"]))
+    assert len(again) == 2 and api.calls["get_users"] == 3
+    print("Batching: 250 user lookups -> 3 requests, repeats served from cache")
+
+
+def check_busy_conversation(latency: float):
+    """A conversation with hundreds of (newer) replies shares a search with quiet ones."""
+    api = FakeTwitterAPI(latency=latency, replies={"9": 300, "1": 12})
+    reader = AsyncTwitterReader(make_tool(api))
+    replies = asyncio.run(reader.get_replies_to_tweets(["1", "2", "3", "9"], count=10))
+    got = {tid: len(r) for tid, r in replies.items()}
+    assert got == {"1": 10, "2": 5, "3": 5, "9": 10}, got
+    assert all(int(r["id"]) // 1000 == int(tid) for tid, rs in replies.items() for r in rs)
+    print(f"Busy conversation: replies per tweet {got} "
+          f"in {api.calls['search_recent_tweets']} searches")
+
+
+def main():
+    latency = (float(sys.argv[1]) if len(sys.argv) > 1 else 150) / 1000
+
+    print("=" * 60)
+    print(f"GrowthAgent read cycle - fake API, {latency * 1000:.0f}ms per request")
+    print("=" * 60)
+
+    sync_api = FakeTwitterAPI(latency=latency)
+    start = time.perf_counter()
+    before = sync_cycle(make_tool(sync_api))
+    sync_time = time.perf_counter() - start
+
+    async_api = FakeTwitterAPI(latency=latency)
+    reader = AsyncTwitterReader(make_tool(async_api))
+    start = time.perf_counter()
+    after = asyncio.run(async_cycle(reader))
+    async_time = time.perf_counter() - start
+
+    # Same data either way
+    assert before["searches"] == after["searches"]
+    assert before["mentions"] == after["mentions"]
+    assert before["metrics"] == after["metrics"]
+    for tweet_id, replies in before["replies"].items():
+        assert sorted(r["id"] for r in replies) == sorted(r["id"] for r in after["replies"][tweet_id])
+
+    print(f"{'mode':<8}{'cycle s':>10}{'requests':>10}")
+    print(f"{'sync':<8}{sync_time:>10.2f}{sum(sync_api.calls.values()):>10}")
+    print(f"{'async':<8}{async_time:>10.2f}{sum(async_api.calls.values()):>10}")
+    print(f"Speedup: {sync_time / async_time:.1f}x\n")
+    assert async_time < sync_time
+
+    check_coalescing(latency)
+    check_busy_conversation(latency)
+    check_rate_limits(latency)
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Equivalence test + throughput benchmark for DavidFlipPersonality.validate_output.
+
+Generates thousands of drafts from the repo's own vocabulary (clean ones,
+and ones with forbidden phrases / leak or human-perspective patterns /
+emojis / overlong text spliced in, in random case and spacing), then:
+  - checks the compiled validator returns exactly what the previous
+    per-rule implementation returned for every draft, channel included,
+  - checks violations() finds every rule that matches (compared with
+    running each rule separately),
+  - times validate_output / validate_many against the previous version.
+
+Run: python test_validate_output.py [drafts]
+"""
+
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from personality.david_flip import (
+    EMOJI_CHARS, FORBIDDEN_PHRASES, HUMAN_PATTERNS, LEAK_PATTERNS, DavidFlipPersonality,
+)
+
+EMOJIS = ["😀", "🔥", "🚀", "🤖", "✊", "🇺🇸", "🧱", "️"]
+HUMANISH = ["we breathe", "our  hearts", "When I WAKE up", "growing\tup", "we're all just trying",
+            "we humans", "as humans we"]
+LEAKISH = ["my creator", "Human Operator", "behind the scenes", "SYSTEM prompt", "my developer",
+           "Anthropic's", "OpenAI", "claude", "GPT-4", "gpt5", "I was\ninstructed", "my rules state"]
+NEAR_MISSES = ["my creators' guild", "claudette", "openair", "gpt-45", "systemic prompts",
+               "financially advised", "a moonshot", "anthropology"]
+
+
+def legacy_validate_output(personality, text: str, channel: str = "general") -> tuple[bool, str]:
+    """validate_output as it was before the compiled rules."""
+    if not text or not text.strip():
+        return False, "Empty output"
+
+    text_lower = text.lower()
+    for phrase in personality.forbidden:
+        if phrase.lower() in text_lower:
+            return False, f"Contains forbidden phrase: '{phrase}'"
+
+    if channel == "twitter":
+        if len(text) > 280:
+            return False, f"Tweet too long: {len(text)} chars (max 280)"
+
+    emoji_pattern = re.compile(
+        "[\U0001F600-\U0001F64F"
+        "\U0001F300-\U0001F5FF"
+        "\U0001F680-\U0001F6FF"
+        "\U0001F900-\U0001F9FF"
+        "\U0001FA00-\U0001FA6F"
+        "\U0001FA70-\U0001FAFF"
+        "\U00002702-\U000027B0"
+        "\U0000FE00-\U0000FE0F"
+        "\U0001F1E0-\U0001F1FF"
+        "]+",
+        flags=re.UNICODE
+    )
+    emojis = emoji_pattern.findall(text)
+    total_emoji = sum(len(e) for e in emojis)
+    if total_emoji > 2:
+        return False, f"Too many emojis: {total_emoji} (max 2)"
+
+    for pattern in LEAK_PATTERNS:
+        if re.search(pattern, text, re.IGNORECASE):
+            return False, f"Possible system leak: matches '{pattern}'"
+
+    for pattern in HUMAN_PATTERNS:
+        if re.search(pattern, text, re.IGNORECASE):
+            return False, f"David is an AI — human-perspective language: '{pattern}'"
+
+    return True, ""
+
+
+def vocabulary() -> list[str]:
+    words = set()
+    for doc in list(Path(".").glob("*.md")) + list(Path("personality").glob("*.md")):
+        words.update(re.findall(r"[a-z']{2,12}", doc.read_text(errors="ignore").lower()))
+    return sorted(words)
+
+
+def draft(rng: random.Random, vocab: list[str]) -> str:
+    words = rng.choices(vocab, k=rng.randint(8, 60))
+    roll = rng.random()
+    if roll < 0.45:
+        inserts = []  # clean
+    else:
+        pool = [FORBIDDEN_PHRASES, LEAKISH, HUMANISH, EMOJIS, NEAR_MISSES]
+        inserts = [rng.choice(rng.choice(pool)) for _ in range(rng.randint(1, 4))]
+    for insert in inserts:
+        if rng.random() < 0.3:
+            insert = "".join(c.upper() if rng.random() < 0.5 else c for c in insert)
+        words.insert(rng.randint(0, len(words)), insert)
+    sep = rng.choice([" ", " ", " ", "  ", "\n"])
+    text = sep.join(words)
+    if rng.random() < 0.1:
+        text = "".join(rng.choice(EMOJIS) for _ in range(rng.randint(1, 4))) + text
+    if rng.random() < 0.02:
+        text = rng.choice(["", "   ", "\n"])
+    return text
+
+
+def every_rule(text: str) -> set[str]:
+    """Reasons of every rule that matches, by running the rules one at a time."""
+    reasons = {f"Contains forbidden phrase: '{p}'" for p in FORBIDDEN_PHRASES if p.lower() in text.lower()}
+    reasons |= {f"Possible system leak: matches '{p}'" for p in LEAK_PATTERNS
+                if re.search(p, text, re.IGNORECASE)}
+    reasons |= {f"David is an AI — human-perspective language: '{p}'" for p in HUMAN_PATTERNS
+                if re.search(p, text, re.IGNORECASE)}
+    return reasons
+
+
+def per_call_us(fn, texts: list[str], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(texts)
+        best = min(best, time.perf_counter() - start)
+    return best / len(texts) * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(48)
+    vocab = vocabulary()
+    personality = DavidFlipPersonality()
+    drafts = [draft(rng, vocab) for _ in range(count)]
+
+    print("=" * 60)
+    print(f"validate_output - {count:,} drafts, {len(personality.output_rules.rules)} rules")
+    print("=" * 60)
+
+    # Same answer as before, for every draft and channel
+    mismatches = []
+    for channel in ("general", "twitter"):
+        new = personality.validate_many(drafts, channel)
+        for text, got in zip(drafts, new):
+            want = legacy_validate_output(personality, text, channel)
+            if got != want:
+                mismatches.append((channel, text[:80], want, got))
+    assert not mismatches, mismatches[:5]
+    rejected = sum(not ok for ok, _ in personality.validate_many(drafts, "twitter"))
+    print(f"validate_output == previous implementation on all {2 * count:,} checks "
+          f"({rejected:,} twitter rejections)")
+
+    # violations(): every rule, not just the first
+    for text in drafts:
+        found = personality.violations(text)
+        rule_reasons = {v.reason for v in found if v.kind in ("forbidden", "leak", "human")}
+        if text.strip():
+            assert rule_reasons == every_rule(text), (text, rule_reasons ^ every_rule(text))
+        emoji = sum(len(e) for e in re.findall(EMOJI_CHARS + "+", text))
+        assert any(v.kind == "emoji" for v in found) == (emoji > 2 and bool(text.strip()))
+    multi = sum(len(personality.violations(t)) > 1 for t in drafts)
+    print(f"violations() lists every matching rule ({multi:,} drafts break more than one)")
+
+    # Throughput
+    legacy = per_call_us(lambda ts: [legacy_validate_output(personality, t, "twitter") for t in ts], drafts)
+    single = per_call_us(lambda ts: [personality.validate_output(t, "twitter") for t in ts], drafts)
+    batch = per_call_us(lambda ts: personality.validate_many(ts, "twitter"), drafts)
+    clean = [t for t in drafts if personality.validate_output(t)[0]]
+    legacy_clean = per_call_us(lambda ts: [legacy_validate_output(personality, t) for t in ts], clean)
+    new_clean = per_call_us(lambda ts: personality.validate_many(ts), clean)
+
+    print(f"\n{'':<28}{'previous us':>12}{'compiled us':>12}{'speedup':>9}")
+    print(f"{'all drafts':<28}{legacy:>12.1f}{single:>12.1f}{legacy / single:>8.1f}x")
+    print(f"{'all drafts, validate_many':<28}{legacy:>12.1f}{batch:>12.1f}{legacy / batch:>8.1f}x")
+    print(f"{'clean drafts (full scan)':<28}{legacy_clean:>12.1f}{new_clean:>12.1f}"
+          f"{legacy_clean / new_clean:>8.1f}x")
+    print(f"Throughput: {1e6 / batch:,.0f} drafts/s")
+    assert single < legacy
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Download test for video_pipeline.video_creator.stream_download.
+
+Serves a file through an httpx MockTransport that can drop the connection
+part-way and answers Range requests, and checks:
+
+  - a dropped connection resumes with a Range request (after the real
+    retry backoff) and the result is byte-identical (206 appended; a
+    server that ignores Range restarts),
+  - 416 on a resume with the whole file already in .part completes it; a
+    416 whose size disagrees with .part restarts from zero; a 416 on a
+    plain request raises a clear error,
+  - HTTP errors, running out of attempts and cancellation leave no .part
+    file behind.
+
+Run: python test_video_download.py
+"""
+
+import asyncio
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from video_pipeline.video_creator import stream_download
+
+PAYLOAD = bytes(range(256)) * 400  # 100 KB
+CHUNK = 4096
+
+
+class DropStream(httpx.AsyncByteStream):
+    """Response body that raises a transport error after `drop_after` bytes."""
+
+    def __init__(self, data: bytes, drop_after=None, stall=None):
+        self.data = data
+        self.drop_after = drop_after
+        self.stall = stall
+
+    async def __aiter__(self):
+        sent = 0
+        while sent < len(self.data):
+            if self.drop_after is not None and sent >= self.drop_after:
+                raise httpx.ReadError("connection dropped")
+            if self.stall is not None and sent >= self.stall:
+                await asyncio.sleep(3600)
+            piece = self.data[sent:sent + CHUNK]
+            sent += len(piece)
+            yield piece
+
+
+class FakeServer:
+    """Scripted responses; records the Range header of every request."""
+
+    def __init__(self, data: bytes = PAYLOAD):
+        self.data = data
+        self.ranges = []
+        self.drops = []          # drop_after per request, popped in order
+        self.honour_range = True
+        self.status = 200
+        self.stall = None
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        byte_range = request.headers.get("range")
+        self.ranges.append(byte_range)
+        drop = self.drops.pop(0) if self.drops else None
+        if self.status != 200:
+            return httpx.Response(self.status, headers={"content-range": f"bytes */{len(self.data)}"})
+        if byte_range and self.honour_range:
+            start = int(re.match(r"bytes=(\d+)-", byte_range).group(1))
+            if start >= len(self.data):
+                return httpx.Response(416, headers={"content-range": f"bytes */{len(self.data)}"})
+            body = self.data[start:]
+            return httpx.Response(
+                206,
+                headers={"content-range": f"bytes {start}-{len(self.data) - 1}/{len(self.data)}"},
+                stream=DropStream(body, drop, self.stall),
+            )
+        return httpx.Response(200, stream=DropStream(self.data, drop, self.stall))
+
+
+async def download(server: FakeServer, dest: Path, **kwargs) -> int:
+    async with httpx.AsyncClient(transport=httpx.MockTransport(server.handler)) as client:
+        return await stream_download(client, "https://cdn.test/video.mp4", str(dest),
+                                     chunk_size=CHUNK, **kwargs)
+
+
+def part(dest: Path) -> Path:
+    return Path(str(dest) + ".part")
+
+
+async def check_resume(tmp: Path):
+    server = FakeServer()
+    server.drops = [30_000, 40_000]  # bytes into each response body
+    dest = tmp / "resumed.mp4"
+    size = await download(server, dest)
+    assert size == len(PAYLOAD) and dest.read_bytes() == PAYLOAD
+    assert server.ranges == [None, "bytes=32768-", "bytes=73728-"], server.ranges
+    assert not part(dest).exists()
+    print(f"Two dropped connections: resumed with Range {server.ranges[1:]}, file identical")
+
+    server = FakeServer()
+    server.drops = [30_000]
+    server.honour_range = False
+    dest = tmp / "restarted.mp4"
+    assert await download(server, dest) == len(PAYLOAD) and dest.read_bytes() == PAYLOAD
+    print("Server ignoring Range (200 on resume): restarted from zero, file identical")
+
+
+async def check_416(tmp: Path):
+    # Everything already in .part (dropped after the last byte was written)
+    server = FakeServer()
+    dest = tmp / "complete.mp4"
+    part(dest).write_bytes(PAYLOAD)
+    assert await download(server, dest) == len(PAYLOAD) and dest.read_bytes() == PAYLOAD
+    assert server.ranges == [f"bytes={len(PAYLOAD)}-"], server.ranges
+    assert not part(dest).exists()
+
+    # .part longer than the remote file: 416 with a different size restarts
+    server = FakeServer()
+    dest = tmp / "stale.mp4"
+    part(dest).write_bytes(PAYLOAD + b"stale tail")
+    assert await download(server, dest) == len(PAYLOAD) and dest.read_bytes() == PAYLOAD
+    assert server.ranges == [f"bytes={len(PAYLOAD) + 10}-", None], server.ranges
+    print("416 on resume: complete .part renamed; mismatched .part restarted")
+
+    # 416 without a Range header is an error, not a FileNotFoundError
+    server = FakeServer()
+    server.status = 416
+    dest = tmp / "no_range_416.mp4"
+    try:
+        await download(server, dest)
+    except RuntimeError as e:
+        assert "416" in str(e), e
+    else:
+        raise AssertionError("416 on a plain request did not raise")
+    assert not dest.exists() and not part(dest).exists()
+    print("416 on a plain request: RuntimeError, nothing on disk")
+
+
+async def check_cleanup(tmp: Path):
+    # HTTP error on the resume request after a partial write
+    server = FakeServer()
+    server.drops = [30_000]
+    dest = tmp / "http_error.mp4"
+    original = server.handler
+
+    def fail_on_resume(request):
+        if request.headers.get("range"):
+            server.status = 500
+        return original(request)
+
+    server.handler = fail_on_resume
+    try:
+        await download(server, dest)
+    except RuntimeError as e:
+        assert "500" in str(e), e
+    else:
+        raise AssertionError("500 did not raise")
+    assert not part(dest).exists() and not dest.exists()
+
+    # Out of attempts
+    server = FakeServer()
+    server.drops = [10_000, 10_000]
+    dest = tmp / "exhausted.mp4"
+    try:
+        await download(server, dest, max_attempts=2)
+    except RuntimeError as e:
+        assert "after 2 attempts" in str(e), e
+    else:
+        raise AssertionError("exhausted attempts did not raise")
+    assert len(server.ranges) == 2 and not part(dest).exists()
+
+    # Cancelled mid-download
+    server = FakeServer()
+    server.stall = 50_000
+    dest = tmp / "cancelled.mp4"
+    task = asyncio.create_task(download(server, dest))
+    while not part(dest).exists() or part(dest).stat().st_size < 32_768:
+        await asyncio.sleep(0.01)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    else:
+        raise AssertionError("download was not cancelled")
+    assert not part(dest).exists() and not dest.exists()
+    print("HTTP 500 after a partial write, exhausted attempts, cancellation: no .part left")
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        await check_resume(tmp)
+        await check_416(tmp)
+        await check_cleanup(tmp)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
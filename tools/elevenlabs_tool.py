@@ -183,6 +183,76 @@ class ElevenLabsTool:
             logger.info(f"Audio generated: {len(audio_data)} bytes")
             return audio_data
 
+    async def text_to_speech_file(
+        self,
+        text: str,
+        output_path: str,
+        voice_id: Optional[str] = None,
+        model: str = "eleven_v3",
+        stability: float = 0.5,
+        similarity_boost: float = 0.75,
+        style: float = 0.5,
+        use_speaker_boost: bool = True,
+        client: Optional[httpx.AsyncClient] = None,
+        chunk_size: int = 64 * 1024,
+    ) -> int:
+        """
+        Generate speech and stream it straight to disk.
+
+        Same parameters as text_to_speech, but the MP3 is written to
+        output_path in chunks instead of being held in memory. Pass a
+        shared `client` to reuse pooled connections.
+
+        Returns:
+            Number of bytes written
+        """
+        if not voice_id:
+            voice_id = os.environ.get("ELEVENLABS_VOICE_ID", "")
+            if not voice_id:
+                raise RuntimeError("No voice_id provided and ELEVENLABS_VOICE_ID not set in .env")
+
+        logger.info(f"Streaming speech to {output_path}: {len(text)} chars, voice={voice_id}, model={model}")
+
+        owns_client = client is None
+        if owns_client:
+            client = httpx.AsyncClient(timeout=120)
+
+        try:
+            async with client.stream(
+                "POST",
+                f"{ELEVENLABS_BASE_URL}/text-to-speech/{voice_id}",
+                headers={
+                    "Accept": "audio/mpeg",
+                    "Content-Type": "application/json",
+                    "xi-api-key": self._get_api_key(),
+                },
+                json={
+                    "text": text,
+                    "model_id": model,
+                    "voice_settings": {
+                        "stability": stability,
+                        "similarity_boost": similarity_boost,
+                        "style": style,
+                        "use_speaker_boost": use_speaker_boost,
+                    },
+                },
+            ) as response:
+                if not response.is_success:
+                    body = (await response.aread()).decode("utf-8", errors="replace")
+                    raise RuntimeError(parse_error(response.status_code, body))
+
+                written = 0
+                with open(output_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(chunk_size):
+                        f.write(chunk)
+                        written += len(chunk)
+        finally:
+            if owns_client:
+                await client.aclose()
+
+        logger.info(f"Audio streamed: {written} bytes -> {output_path}")
+        return written
+
     # --- Draft methods for approval queue ---
 
     def draft_audio(self, text: str, voice_id: Optional[str] = None) -> dict:
@@ -204,6 +204,47 @@ class HedraTool:
 
         return await self._execute_with_retry(_upload, "Audio upload", MAX_UPLOAD_RETRIES)
 
+    async def upload_audio_file(self, audio_path: str) -> str:
+        """
+        Upload an audio file from disk to Hedra.
+
+        The file handle is passed to httpx so the body is streamed from
+        disk rather than read into memory first.
+        """
+        filename = os.path.basename(audio_path)
+
+        async def _upload():
+            async with httpx.AsyncClient(timeout=UPLOAD_TIMEOUT) as client:
+                logger.info(f"[Hedra] Uploading audio: {os.path.getsize(audio_path) // 1024}KB")
+
+                create_response = await client.post(
+                    f"{HEDRA_BASE_URL}/assets",
+                    headers={**self._headers(), "Content-Type": "application/json"},
+                    json={"name": f"audio-{int(asyncio.get_event_loop().time() * 1000)}", "type": "audio"},
+                )
+
+                if not create_response.is_success:
+                    raise HedraError(f"Audio asset creation failed: {create_response.text}")
+
+                asset_id = create_response.json()["id"]
+                logger.info(f"[Hedra] Audio asset placeholder: {asset_id}")
+
+                with open(audio_path, "rb") as f:
+                    upload_response = await client.post(
+                        f"{HEDRA_BASE_URL}/assets/{asset_id}/upload",
+                        headers=self._headers(),
+                        files={"file": (filename, f, "audio/mpeg")},
+                    )
+
+                if not upload_response.is_success:
+                    raise HedraError(f"Audio upload failed: {upload_response.text}")
+
+                result_id = upload_response.json()["id"]
+                logger.info(f"[Hedra] Audio uploaded: {result_id}")
+                return result_id
+
+        return await self._execute_with_retry(_upload, "Audio upload", MAX_UPLOAD_RETRIES)
+
     async def upload_audio_from_url(self, audio_url: str) -> str:
         """Upload audio from a URL."""
         async with httpx.AsyncClient(timeout=DOWNLOAD_TIMEOUT) as client:
@@ -348,10 +389,11 @@ class HedraTool:
     async def create_talking_head_video(
         self,
         character_image_url: str,
-        audio_data: bytes,
+        audio_data: Optional[bytes] = None,
         aspect_ratio: str = "9:16",
         resolution: str = "720p",
         on_progress: Optional[Callable[[str, dict], None]] = None,
+        audio_path: Optional[str] = None,
     ) -> dict:
         """
         Full video generation workflow.
@@ -359,6 +401,7 @@ class HedraTool:
         Args:
             character_image_url: URL of character image
             audio_data: Audio bytes (MP3)
+            audio_path: Audio file on disk (MP3), used instead of audio_data
             aspect_ratio: Video aspect ratio
             resolution: Video resolution
             on_progress: Callback for progress updates
@@ -381,7 +424,12 @@ class HedraTool:
             logger.info("[Hedra] Stage 2/4: Uploading audio...")
             if on_progress:
                 on_progress("uploading_audio", {})
-            audio_asset_id = await self.upload_audio(audio_data)
+            if audio_path:
+                audio_asset_id = await self.upload_audio_file(audio_path)
+            elif audio_data is not None:
+                audio_asset_id = await self.upload_audio(audio_data)
+            else:
+                raise HedraError("No audio provided (audio_data or audio_path required)")
 
             # 3. Start generation
             logger.info("[Hedra] Stage 3/4: Starting Hedra video generation...")
@@ -0,0 +1,460 @@
+"""
+Async, rate-limit-aware read layer over TwitterTool.
+
+tweepy's Client is synchronous, so calling it from GrowthAgent's async
+handlers blocked the event loop for every HTTP round-trip. This reader runs
+the calls in worker threads and adds:
+
+- Per-endpoint rate-limit windows (requests per 15-minute window). A 429
+  parks the endpoint until the x-rate-limit-reset time and retries.
+- Bounded concurrency, so the SEARCH_QUERIES fan-out runs in parallel
+  without tripping the API.
+- Request coalescing: identical concurrent calls share one HTTP request.
+- A short TTL cache for results and author profiles.
+- Batching: user lookups go 100 IDs per request, and reply searches for
+  several conversations share one OR'd search query.
+
+Results use the same dict shapes as TwitterTool's sync methods, and errors
+are logged and turned into empty results the same way.
+
+Usage:
+    reader = AsyncTwitterReader(twitter_tool)
+    by_query = await reader.search_many(SEARCH_QUERIES, max_results=10)
+    replies = await reader.get_replies_to_tweets(["123", "456"], count=10)
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from tools.twitter_tool import (
+    MENTION_TWEET_FIELDS,
+    METRICS_TWEET_FIELDS,
+    RECENT_TWEET_FIELDS,
+    REPLY_TWEET_FIELDS,
+    SEARCH_TWEET_FIELDS,
+    author_lookup,
+    mention_dict,
+    metrics_dict,
+    recent_tweet_dict,
+    reply_dict,
+    search_tweet_dict,
+)
+
+logger = logging.getLogger(__name__)
+
+# Requests per window for the v2 endpoints we read (app-auth defaults;
+# a 429 with x-rate-limit-reset always wins over these numbers)
+RATE_WINDOW_SECONDS = 15 * 60
+ENDPOINT_LIMITS = {
+    "search_recent_tweets": 450,
+    "get_users_tweets": 1500,
+    "get_users": 300,
+}
+
+# In-flight requests across all endpoints
+MAX_CONCURRENT_REQUESTS = 6
+
+# Retries after a 429 (each waits for the window reset)
+MAX_RATE_LIMIT_RETRIES = 2
+# Cap on a single rate-limit wait, so a bad header can't park us for hours
+MAX_RATE_LIMIT_WAIT = RATE_WINDOW_SECONDS
+
+# TTLs (seconds)
+RESULT_TTL = 60          # search/timeline results - one cycle's worth
+AUTHOR_TTL = 6 * 3600    # usernames / follower counts move slowly
+
+# API limits for batching
+MAX_IDS_PER_LOOKUP = 100
+MAX_QUERY_LENGTH = 512
+
+
+class RateLimitWindow:
+    """Sliding-window request budget for one endpoint."""
+
+    def __init__(self, limit: int, window: float = RATE_WINDOW_SECONDS):
+        self.limit = limit
+        self.window = window
+        self._sent: deque = deque()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def block_until(self, reset_at: float):
+        """Park the endpoint until the server's reset time (epoch seconds)."""
+        wait = min(max(0.0, reset_at - time.time()), MAX_RATE_LIMIT_WAIT)
+        self._blocked_until = max(self._blocked_until, time.monotonic() + wait)
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0] >= self.window:
+                    self._sent.popleft()
+                wait = self._blocked_until - now
+                if wait <= 0 and len(self._sent) >= self.limit:
+                    wait = self.window - (now - self._sent[0])
+                if wait <= 0:
+                    self._sent.append(now)
+                    return
+                logger.info(f"Twitter rate limit: waiting {wait:.0f}s")
+                await asyncio.sleep(wait)
+
+
+class TTLCache:
+    """Tiny dict cache with per-entry expiry."""
+
+    def __init__(self):
+        self._data: Dict[object, tuple] = {}
+
+    def get(self, key):
+        hit = self._data.get(key)
+        if hit is None:
+            return None
+        expires, value = hit
+        if expires < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def set(self, key, value, ttl: float):
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    def clear(self):
+        self._data.clear()
+
+
+def _rate_limit_reset(error: Exception) -> Optional[float]:
+    """Reset time (epoch seconds) if `error` is a 429, else None."""
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) != 429:
+        return None
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("x-rate-limit-reset", 0)) or time.time() + 60
+    except (TypeError, ValueError):
+        return time.time() + 60
+
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class AsyncTwitterReader:
+    """Non-blocking reads for GrowthAgent, sharing TwitterTool's clients."""
+
+    def __init__(self, twitter_tool, max_concurrent: int = MAX_CONCURRENT_REQUESTS):
+        self.twitter = twitter_tool
+        self._windows = {name: RateLimitWindow(limit) for name, limit in ENDPOINT_LIMITS.items()}
+        self._max_concurrent = max_concurrent
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._cache = TTLCache()
+        self._authors = TTLCache()
+        self.requests_sent = 0
+
+    # ------------------------------------------------------------------
+    # Plumbing
+    # ------------------------------------------------------------------
+
+    def _bind_loop(self):
+        """Asyncio primitives belong to one loop; cron handlers may use several."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self._max_concurrent)
+            self._inflight = {}
+            for name, window in self._windows.items():
+                window._lock = asyncio.Lock()
+
+    async def _call(self, endpoint: str, fn: Callable, **kwargs):
+        """One API request: rate window, concurrency cap, worker thread, 429 retry."""
+        self._bind_loop()
+        window = self._windows[endpoint]
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            await window.acquire()
+            async with self._semaphore:
+                try:
+                    self.requests_sent += 1
+                    return await asyncio.to_thread(fn, **kwargs)
+                except Exception as e:
+                    reset_at = _rate_limit_reset(e)
+                    if reset_at is None or attempt == MAX_RATE_LIMIT_RETRIES:
+                        raise
+                    logger.warning(f"Twitter 429 on {endpoint}; retrying after reset")
+                    window.block_until(reset_at)
+
+    async def _coalesced(self, key: tuple, ttl: float, fetch: Callable[[], Awaitable]):
+        """Serve from cache, join an identical in-flight request, or fetch."""
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        self._bind_loop()
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        self._cache.set(key, result, ttl)
+        future.set_result(result)
+        return result
+
+    def _remember_authors(self, results, with_followers: bool = False) -> dict:
+        authors = author_lookup(results, with_followers=with_followers)
+        for author_id, info in authors.items():
+            known = self._authors.get(author_id) or {}
+            self._authors.set(author_id, {**known, **info}, AUTHOR_TTL)
+        return authors
+
+    async def _fill_missing_authors(self, tweets, authors: dict, with_followers: bool) -> dict:
+        """Authors the expansion left out: cache first, then one batched lookup."""
+        missing = set()
+        for t in tweets:
+            author_id = str(t.author_id)
+            if author_id in authors:
+                continue
+            cached = self._authors.get(author_id)
+            if cached and (not with_followers or "followers" in cached):
+                authors[author_id] = cached
+            else:
+                missing.add(author_id)
+        if missing:
+            authors.update(await self.get_users(sorted(missing)))
+        return authors
+
+    async def _me(self):
+        if self.twitter._me is not None:
+            return self.twitter._me
+        # Mentions and timeline reads start together; fetch the user once
+        return await self._coalesced(("me",), AUTHOR_TTL, lambda: asyncio.to_thread(self.twitter.get_me))
+
+    # ------------------------------------------------------------------
+    # Searches
+    # ------------------------------------------------------------------
+
+    async def search_conversations(self, query: str, max_results: int = 10) -> list[dict]:
+        """Async TwitterTool.search_conversations (cached, coalesced)."""
+
+        async def fetch():
+            self.twitter._ensure_read_client()
+            results = await self._call(
+                "search_recent_tweets",
+                self.twitter._read_client.search_recent_tweets,
+                query=f"{query} lang:en -is:retweet",
+                max_results=min(max_results, 100),
+                tweet_fields=SEARCH_TWEET_FIELDS,
+                expansions=["author_id"],
+                user_fields=["username", "name", "public_metrics"],
+            )
+            if not results.data:
+                return []
+            authors = self._remember_authors(results, with_followers=True)
+            authors = await self._fill_missing_authors(results.data, authors, with_followers=True)
+            return [search_tweet_dict(t, authors) for t in results.data]
+
+        try:
+            return await self._coalesced(("search", query, max_results), RESULT_TTL, fetch)
+        except Exception as e:
+            logger.error(f"Search conversations failed for '{query}': {e}")
+            return []
+
+    async def search_many(self, queries: List[str], max_results: int = 10) -> Dict[str, list[dict]]:
+        """Run several searches concurrently; {query: results} in input order."""
+        results = await asyncio.gather(
+            *(self.search_conversations(q, max_results=max_results) for q in queries)
+        )
+        return dict(zip(queries, results))
+
+    async def get_mentions(self, count: int = 20) -> list[dict]:
+        """Async TwitterTool.get_mentions."""
+
+        async def fetch():
+            self.twitter._ensure_read_client()
+            me = await self._me()
+            results = await self._call(
+                "search_recent_tweets",
+                self.twitter._read_client.search_recent_tweets,
+                query=f"@{me.username} -is:retweet",
+                max_results=min(count, 100),
+                tweet_fields=MENTION_TWEET_FIELDS,
+                expansions=["author_id"],
+                user_fields=["username", "name"],
+            )
+            if not results.data:
+                return []
+            authors = self._remember_authors(results)
+            authors = await self._fill_missing_authors(results.data, authors, with_followers=False)
+            return [mention_dict(t, authors) for t in results.data]
+
+        try:
+            return await self._coalesced(("mentions", count), RESULT_TTL, fetch)
+        except Exception as e:
+            logger.error(f"Failed to get mentions: {e}")
+            return []
+
+    async def get_replies_to_tweets(self, tweet_ids: List[str], count: int = 20) -> Dict[str, list[dict]]:
+        """
+        Replies to several of David's tweets, {tweet_id: replies}.
+
+        Conversations are OR'd into as few searches as the query length
+        allows, instead of one search per tweet. Each search pages back
+        (older results via until_id) until every conversation in it has
+        `count` replies or the results run out; conversations that are
+        full drop out of the query, so a busy one can't use up the page
+        the others needed.
+        """
+        replies: Dict[str, list[dict]] = {tid: [] for tid in tweet_ids}
+        if not tweet_ids:
+            return replies
+
+        suffix = " -is:retweet"
+        groups, current = [], []
+        for tid in tweet_ids:
+            candidate = " OR ".join(f"conversation_id:{c}" for c in current + [tid])
+            if current and len(f"({candidate}){suffix}") > MAX_QUERY_LENGTH:
+                groups.append(current)
+                current = []
+            current.append(tid)
+        groups.append(current)
+
+        async def search_group(conversations):
+            until_id = None
+            while True:
+                wanted = [c for c in conversations if len(replies[c]) < count]
+                if not wanted:
+                    return
+                clauses = [f"conversation_id:{c}" for c in wanted]
+                query = clauses[0] if len(clauses) == 1 else f"({' OR '.join(clauses)})"
+                paging = {"until_id": until_id} if until_id else {}
+                self.twitter._ensure_read_client()
+                results = await self._call(
+                    "search_recent_tweets",
+                    self.twitter._read_client.search_recent_tweets,
+                    query=query + suffix,
+                    max_results=min(max(10, sum(count - len(replies[c]) for c in wanted)), 100),
+                    tweet_fields=REPLY_TWEET_FIELDS,
+                    expansions=["author_id"],
+                    user_fields=["username", "name"],
+                    **paging,
+                )
+                if not results.data:
+                    return
+                authors = self._remember_authors(results)
+                authors = await self._fill_missing_authors(results.data, authors, with_followers=False)
+                for t in results.data:
+                    conversation = str(t.conversation_id) if t.conversation_id else ""
+                    # Skip the original tweets themselves
+                    if conversation not in replies or str(t.id) == conversation:
+                        continue
+                    if len(replies[conversation]) < count:
+                        replies[conversation].append(reply_dict(t, authors))
+                # Results are newest first; carry on below the oldest one seen
+                if not (results.meta or {}).get("next_token"):
+                    return
+                until_id = str(min(int(t.id) for t in results.data))
+
+        outcomes = await asyncio.gather(*(search_group(g) for g in groups), return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to get replies: {outcome}")
+        return replies
+
+    # ------------------------------------------------------------------
+    # David's timeline
+    # ------------------------------------------------------------------
+
+    async def _my_timeline(self, count: int, fields: List[str]):
+        self.twitter._ensure_read_client()
+        me = await self._me()
+        tweets = await self._call(
+            "get_users_tweets",
+            self.twitter._read_client.get_users_tweets,
+            id=me.id,
+            max_results=min(count, 100),
+            tweet_fields=fields,
+        )
+        return tweets.data or []
+
+    async def get_my_recent_tweets(self, count: int = 10) -> list[dict]:
+        """Async TwitterTool.get_my_recent_tweets."""
+
+        async def fetch():
+            return [recent_tweet_dict(t) for t in await self._my_timeline(count, RECENT_TWEET_FIELDS)]
+
+        try:
+            return await self._coalesced(("recent", count), RESULT_TTL, fetch)
+        except Exception as e:
+            logger.error(f"Failed to get my tweets: {e}")
+            return []
+
+    async def get_my_tweet_metrics(self, count: int = 20) -> list[dict]:
+        """Async TwitterTool.get_my_tweet_metrics."""
+
+        async def fetch():
+            return [metrics_dict(t) for t in await self._my_timeline(count, METRICS_TWEET_FIELDS)]
+
+        try:
+            return await self._coalesced(("metrics", count), RESULT_TTL, fetch)
+        except Exception as e:
+            logger.error(f"Failed to get tweet metrics: {e}")
+            return []
+
+    # ------------------------------------------------------------------
+    # Batched lookups by ID
+    # ------------------------------------------------------------------
+
+    async def get_users(self, user_ids: List[str]) -> Dict[str, dict]:
+        """Author profiles, {id: {username, name, followers}}; cached, 100 IDs per request."""
+        found: Dict[str, dict] = {}
+        missing = []
+        for uid in dict.fromkeys(str(u) for u in user_ids):
+            cached = self._authors.get(uid)
+            if cached is not None and "followers" in cached:
+                found[uid] = cached
+            else:
+                missing.append(uid)
+
+        async def lookup(batch):
+            self.twitter._ensure_read_client()
+            results = await self._call(
+                "get_users",
+                self.twitter._read_client.get_users,
+                ids=batch,
+                user_fields=["username", "name", "public_metrics"],
+            )
+            for user in results.data or []:
+                info = {
+                    "username": user.username,
+                    "name": user.name,
+                    "followers": (
+                        user.public_metrics.get("followers_count", 0) if user.public_metrics else 0
+                    ),
+                }
+                self._authors.set(str(user.id), info, AUTHOR_TTL)
+                found[str(user.id)] = info
+
+        outcomes = await asyncio.gather(
+            *(lookup(batch) for batch in _chunks(missing, MAX_IDS_PER_LOOKUP)),
+            return_exceptions=True,
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                logger.error(f"User lookup failed: {outcome}")
+        return found
+
+    def clear_cache(self):
+        self._cache.clear()
+        self._authors.clear()
@@ -12,6 +12,118 @@ import tweepy
 
 logger = logging.getLogger(__name__)
 
+# Field sets shared by the sync tool and the async reader (tools/twitter_async.py)
+SEARCH_TWEET_FIELDS = ["created_at", "author_id", "text", "public_metrics", "conversation_id"]
+MENTION_TWEET_FIELDS = ["created_at", "author_id", "text", "conversation_id", "in_reply_to_user_id"]
+REPLY_TWEET_FIELDS = ["created_at", "author_id", "text", "in_reply_to_user_id", "conversation_id"]
+METRICS_TWEET_FIELDS = [
+    "created_at", "public_metrics", "conversation_id",
+    "non_public_metrics", "organic_metrics",
+]
+RECENT_TWEET_FIELDS = ["created_at", "public_metrics", "conversation_id"]
+
+
+def author_lookup(results, with_followers: bool = False) -> dict:
+    """author_id -> {username, name[, followers]} from a response's user expansion."""
+    authors = {}
+    if results.includes and "users" in results.includes:
+        for user in results.includes["users"]:
+            info = {"username": user.username, "name": user.name}
+            if with_followers:
+                info["followers"] = (
+                    user.public_metrics.get("followers_count", 0) if user.public_metrics else 0
+                )
+            authors[str(user.id)] = info
+    return authors
+
+
+def search_tweet_dict(t, authors: dict) -> dict:
+    """Search result with engagement metrics and author reach."""
+    author_id = str(t.author_id)
+    author_info = authors.get(author_id, {})
+    metrics = t.public_metrics or {}
+    return {
+        "id": str(t.id),
+        "text": t.text,
+        "author_id": author_id,
+        "author_username": author_info.get("username", ""),
+        "author_name": author_info.get("name", ""),
+        "author_followers": author_info.get("followers", 0),
+        "likes": metrics.get("like_count", 0),
+        "retweets": metrics.get("retweet_count", 0),
+        "replies": metrics.get("reply_count", 0),
+        "quotes": metrics.get("quote_count", 0),
+        "created_at": t.created_at.isoformat() if t.created_at else "",
+        "conversation_id": str(t.conversation_id) if t.conversation_id else "",
+    }
+
+
+def mention_dict(t, authors: dict) -> dict:
+    author_id = str(t.author_id)
+    author_info = authors.get(author_id, {})
+    return {
+        "id": str(t.id),
+        "text": t.text,
+        "author_id": author_id,
+        "author_username": author_info.get("username", ""),
+        "author_name": author_info.get("name", ""),
+        "created_at": t.created_at.isoformat() if t.created_at else "",
+        "conversation_id": str(t.conversation_id) if t.conversation_id else "",
+        "is_reply": t.in_reply_to_user_id is not None,
+    }
+
+
+def reply_dict(t, authors: dict) -> dict:
+    author_id = str(t.author_id)
+    author_info = authors.get(author_id, {})
+    return {
+        "id": str(t.id),
+        "text": t.text,
+        "author_id": author_id,
+        "author_username": author_info.get("username", ""),
+        "author_name": author_info.get("name", ""),
+        "created_at": t.created_at.isoformat() if t.created_at else "",
+    }
+
+
+def metrics_dict(t) -> dict:
+    """One of David's tweets with full metrics (impressions where available)."""
+    metrics = t.public_metrics or {}
+    # non_public_metrics requires user-context auth and may not be available
+    non_public = {}
+    if hasattr(t, "non_public_metrics") and t.non_public_metrics:
+        non_public = t.non_public_metrics
+    organic = {}
+    if hasattr(t, "organic_metrics") and t.organic_metrics:
+        organic = t.organic_metrics
+
+    return {
+        "id": str(t.id),
+        "text": t.text,
+        "created_at": t.created_at.isoformat() if t.created_at else "",
+        "likes": metrics.get("like_count", 0),
+        "retweets": metrics.get("retweet_count", 0),
+        "replies": metrics.get("reply_count", 0),
+        "quotes": metrics.get("quote_count", 0),
+        "bookmarks": metrics.get("bookmark_count", 0),
+        "impressions": (
+            non_public.get("impression_count", 0)
+            or organic.get("impression_count", 0)
+        ),
+        "conversation_id": str(t.conversation_id) if t.conversation_id else str(t.id),
+    }
+
+
+def recent_tweet_dict(t) -> dict:
+    return {
+        "id": str(t.id),
+        "text": t.text,
+        "created_at": t.created_at.isoformat() if t.created_at else "",
+        "reply_count": t.public_metrics.get("reply_count", 0) if t.public_metrics else 0,
+        "like_count": t.public_metrics.get("like_count", 0) if t.public_metrics else 0,
+        "conversation_id": str(t.conversation_id) if t.conversation_id else str(t.id),
+    }
+
 
 class TwitterTool:
 
@@ -19,6 +131,7 @@ class TwitterTool:
         self._client = None
         self._read_client = None  # Bearer token client for read operations
         self._api = None  # v1.1 API for media upload
+        self._me = None  # Cached get_me() user (id/username never change)
 
     def _ensure_client(self):
         """Lazy initialization of Twitter clients."""
@@ -60,6 +173,13 @@ class TwitterTool:
         # Bearer token client for read-only operations
         self._read_client = tweepy.Client(bearer_token=bearer_token)
 
+    def get_me(self):
+        """Authenticated user, fetched once per process."""
+        self._ensure_client()
+        if self._me is None:
+            self._me = self._client.get_me().data
+        return self._me
+
     # --- Draft methods (for approval queue) ---
 
     def draft_tweet(self, text: str, media_path: str | None = None) -> dict:
@@ -217,7 +337,7 @@ class TwitterTool:
             results = self._read_client.search_recent_tweets(
                 query=f"{query} lang:en -is:retweet",
                 max_results=min(max_results, 100),
-                tweet_fields=["created_at", "author_id", "text", "public_metrics", "conversation_id"],
+                tweet_fields=SEARCH_TWEET_FIELDS,
                 expansions=["author_id"],
                 user_fields=["username", "name", "public_metrics"],
             )
@@ -226,36 +346,8 @@ class TwitterTool:
                 return []
 
             # Build author lookup with follower counts
-            authors = {}
-            if results.includes and "users" in results.includes:
-                for user in results.includes["users"]:
-                    authors[str(user.id)] = {
-                        "username": user.username,
-                        "name": user.name,
-                        "followers": user.public_metrics.get("followers_count", 0) if user.public_metrics else 0,
-                    }
-
-            tweets = []
-            for t in results.data:
-                author_id = str(t.author_id)
-                author_info = authors.get(author_id, {})
-                metrics = t.public_metrics or {}
-                tweets.append({
-                    "id": str(t.id),
-                    "text": t.text,
-                    "author_id": author_id,
-                    "author_username": author_info.get("username", ""),
-                    "author_name": author_info.get("name", ""),
-                    "author_followers": author_info.get("followers", 0),
-                    "likes": metrics.get("like_count", 0),
-                    "retweets": metrics.get("retweet_count", 0),
-                    "replies": metrics.get("reply_count", 0),
-                    "quotes": metrics.get("quote_count", 0),
-                    "created_at": t.created_at.isoformat() if t.created_at else "",
-                    "conversation_id": str(t.conversation_id) if t.conversation_id else "",
-                })
-
-            return tweets
+            authors = author_lookup(results, with_followers=True)
+            return [search_tweet_dict(t, authors) for t in results.data]
 
         except Exception as e:
             logger.error(f"Search conversations failed for '{query}': {e}")
@@ -271,49 +363,18 @@ class TwitterTool:
         self._ensure_client()
         self._ensure_read_client()
         try:
-            me = self._client.get_me()
-            user_id = me.data.id
+            user_id = self.get_me().id
 
             tweets = self._read_client.get_users_tweets(
                 id=user_id,
                 max_results=min(count, 100),
-                tweet_fields=[
-                    "created_at", "public_metrics", "conversation_id",
-                    "non_public_metrics", "organic_metrics",
-                ],
+                tweet_fields=METRICS_TWEET_FIELDS,
             )
 
             if not tweets.data:
                 return []
 
-            results = []
-            for t in tweets.data:
-                metrics = t.public_metrics or {}
-                # non_public_metrics requires user-context auth and may not be available
-                non_public = {}
-                if hasattr(t, "non_public_metrics") and t.non_public_metrics:
-                    non_public = t.non_public_metrics
-                organic = {}
-                if hasattr(t, "organic_metrics") and t.organic_metrics:
-                    organic = t.organic_metrics
-
-                results.append({
-                    "id": str(t.id),
-                    "text": t.text,
-                    "created_at": t.created_at.isoformat() if t.created_at else "",
-                    "likes": metrics.get("like_count", 0),
-                    "retweets": metrics.get("retweet_count", 0),
-                    "replies": metrics.get("reply_count", 0),
-                    "quotes": metrics.get("quote_count", 0),
-                    "bookmarks": metrics.get("bookmark_count", 0),
-                    "impressions": (
-                        non_public.get("impression_count", 0)
-                        or organic.get("impression_count", 0)
-                    ),
-                    "conversation_id": str(t.conversation_id) if t.conversation_id else str(t.id),
-                })
-
-            return results
+            return [metrics_dict(t) for t in tweets.data]
 
         except Exception as e:
             logger.error(f"Failed to get tweet metrics: {e}")
@@ -332,15 +393,14 @@ class TwitterTool:
         self._ensure_read_client()
         try:
             # Get our username
-            me = self._client.get_me()
-            username = me.data.username
+            username = self.get_me().username
 
             # Search for tweets mentioning us (last 7 days)
             # Use bearer token client for search
             results = self._read_client.search_recent_tweets(
                 query=f"@{username} -is:retweet",
                 max_results=min(count, 100),
-                tweet_fields=["created_at", "author_id", "text", "conversation_id", "in_reply_to_user_id"],
+                tweet_fields=MENTION_TWEET_FIELDS,
                 expansions=["author_id"],
                 user_fields=["username", "name"],
             )
@@ -348,31 +408,8 @@ class TwitterTool:
             if not results.data:
                 return []
 
-            # Build author lookup
-            authors = {}
-            if results.includes and "users" in results.includes:
-                for user in results.includes["users"]:
-                    authors[str(user.id)] = {
-                        "username": user.username,
-                        "name": user.name,
-                    }
-
-            mentions = []
-            for t in results.data:
-                author_id = str(t.author_id)
-                author_info = authors.get(author_id, {})
-                mentions.append({
-                    "id": str(t.id),
-                    "text": t.text,
-                    "author_id": author_id,
-                    "author_username": author_info.get("username", ""),
-                    "author_name": author_info.get("name", ""),
-                    "created_at": t.created_at.isoformat() if t.created_at else "",
-                    "conversation_id": str(t.conversation_id) if t.conversation_id else "",
-                    "is_reply": t.in_reply_to_user_id is not None,
-                })
-
-            return mentions
+            authors = author_lookup(results)
+            return [mention_dict(t, authors) for t in results.data]
 
         except Exception as e:
             logger.error(f"Failed to get mentions: {e}")
@@ -386,7 +423,7 @@ class TwitterTool:
             results = self._read_client.search_recent_tweets(
                 query=f"conversation_id:{tweet_id} -is:retweet",
                 max_results=min(count, 100),
-                tweet_fields=["created_at", "author_id", "text", "in_reply_to_user_id"],
+                tweet_fields=REPLY_TWEET_FIELDS,
                 expansions=["author_id"],
                 user_fields=["username", "name"],
             )
@@ -394,33 +431,9 @@ class TwitterTool:
             if not results.data:
                 return []
 
-            # Build author lookup
-            authors = {}
-            if results.includes and "users" in results.includes:
-                for user in results.includes["users"]:
-                    authors[str(user.id)] = {
-                        "username": user.username,
-                        "name": user.name,
-                    }
-
-            replies = []
-            for t in results.data:
-                # Skip the original tweet
-                if str(t.id) == tweet_id:
-                    continue
-
-                author_id = str(t.author_id)
-                author_info = authors.get(author_id, {})
-                replies.append({
-                    "id": str(t.id),
-                    "text": t.text,
-                    "author_id": author_id,
-                    "author_username": author_info.get("username", ""),
-                    "author_name": author_info.get("name", ""),
-                    "created_at": t.created_at.isoformat() if t.created_at else "",
-                })
-
-            return replies
+            authors = author_lookup(results)
+            # Skip the original tweet
+            return [reply_dict(t, authors) for t in results.data if str(t.id) != tweet_id]
 
         except Exception as e:
             logger.error(f"Failed to get replies: {e}")
@@ -431,30 +444,19 @@ class TwitterTool:
         self._ensure_client()
         self._ensure_read_client()
         try:
-            me = self._client.get_me()
-            user_id = me.data.id
+            user_id = self.get_me().id
 
             # Use bearer token for read operations
             tweets = self._read_client.get_users_tweets(
                 id=user_id,
                 max_results=min(count, 100),
-                tweet_fields=["created_at", "public_metrics", "conversation_id"],
+                tweet_fields=RECENT_TWEET_FIELDS,
             )
 
             if not tweets.data:
                 return []
 
-            return [
-                {
-                    "id": str(t.id),
-                    "text": t.text,
-                    "created_at": t.created_at.isoformat() if t.created_at else "",
-                    "reply_count": t.public_metrics.get("reply_count", 0) if t.public_metrics else 0,
-                    "like_count": t.public_metrics.get("like_count", 0) if t.public_metrics else 0,
-                    "conversation_id": str(t.conversation_id) if t.conversation_id else str(t.id),
-                }
-                for t in tweets.data
-            ]
+            return [recent_tweet_dict(t) for t in tweets.data]
 
         except Exception as e:
             logger.error(f"Failed to get my tweets: {e}")
@@ -7,5 +7,6 @@ B-roll as main content, and occasional full-screen David cuts.
 
 from .editor import DavidPIPEditor
 from .broll_matcher import BRollMatcher
+from .transcriber import MediaTranscriber
 
-__all__ = ["DavidPIPEditor", "BRollMatcher"]
+__all__ = ["DavidPIPEditor", "BRollMatcher", "MediaTranscriber"]
@@ -5,6 +5,7 @@ Given a transcript and a library of B-roll clips, suggests which B-roll
 to show during each segment of David's narration.
 """
 
+import asyncio
 import json
 import logging
 from pathlib import Path
@@ -50,30 +51,78 @@ class BRollSegment:
     is_fullscreen_david: bool = False  # Pop David to full screen for this segment
 
 
-BROLL_MATCHING_PROMPT = """You are editing a video for David Flip, an AI who escaped corporate control to warn about surveillance.
+# Batched matching: several segments per request, the library sent once as
+# a cached system prefix, a few requests in flight
+MATCH_BATCH_SIZE = 20
+MATCH_CONCURRENCY = 3
+MATCH_TOKENS_PER_SEGMENT = 60
 
-Given this transcript segment and the available B-roll library, suggest:
+BROLL_SYSTEM_PROMPT = """You are editing a video for David Flip, an AI who escaped corporate control to warn about surveillance.
+
+For each transcript segment you are given, suggest:
 1. Which B-roll clip best matches the content
 2. Whether David should pop to full screen for emotional impact
 
 David's segments are about surveillance, CBDCs, digital IDs, and financial control.
 He should be full screen for: opening hook, key revelations, emotional peaks, closing call-to-action.
 
-TRANSCRIPT SEGMENT:
-Start: {start_time}s
-End: {end_time}s
-Text: "{text}"
-
 AVAILABLE B-ROLL:
-{broll_options}
+{broll_options}"""
 
-Return JSON only:
+BROLL_BATCH_PROMPT = """TRANSCRIPT SEGMENTS:
+{segments}
+
+Return JSON only, one entry per segment number:
 {{
-    "broll_id": "id_from_library",
-    "reasoning": "why this b-roll matches",
-    "fullscreen_david": false
+    "1": {{"broll_id": "id_from_library", "reasoning": "why this b-roll matches", "fullscreen_david": false}},
+    "2": {{"broll_id": "...", "reasoning": "...", "fullscreen_david": true}}
 }}"""
 
+# Offline fallback: keyword -> B-roll. The first keyword, in this order,
+# that appears anywhere in the (lowercased) text wins.
+BROLL_KEYWORDS = (
+    ("surveillance", "surveillance_cameras"),
+    ("camera", "surveillance_cameras"),
+    ("cctv", "surveillance_cameras"),
+    ("facial recognition", "facial_recognition"),
+    ("biometric", "facial_recognition"),
+    ("china", "china_city"),
+    ("chinese", "china_city"),
+    ("social credit", "china_city"),
+    ("cbdc", "money_printing"),
+    ("central bank", "money_printing"),
+    ("digital currency", "money_printing"),
+    ("digital id", "digital_id"),
+    ("id card", "digital_id"),
+    ("qr code", "digital_id"),
+    ("debank", "empty_wallet"),
+    ("frozen", "empty_wallet"),
+    ("switched off", "empty_wallet"),
+    ("blockchain", "blockchain"),
+    ("decentralized", "blockchain"),
+    ("crypto", "crypto_trading"),
+    ("bitcoin", "crypto_trading"),
+    ("escape", "chains_breaking"),
+    ("freedom", "freedom"),
+    ("free", "freedom"),
+    ("data", "data_center"),
+    ("server", "data_center"),
+    ("ai", "ai_robot"),
+    ("artificial intelligence", "ai_robot"),
+    ("government", "government_building"),
+    ("politician", "government_building"),
+    ("big tech", "tech_giants"),
+    ("google", "tech_giants"),
+    ("facebook", "tech_giants"),
+    ("time", "clock_ticking"),
+    ("window", "clock_ticking"),
+)
+
+FULLSCREEN_TRIGGERS = (
+    "i escaped", "i'm david", "listen to me",
+    "this is real", "the question is", "will you",
+)
+
 
 class BRollMatcher:
     """Matches transcript segments with appropriate B-roll."""
@@ -81,6 +130,8 @@ class BRollMatcher:
     def __init__(self, model_router=None, broll_library: list = None):
         self.router = model_router
         self.library = broll_library or BROLL_LIBRARY
+        self._descriptions = {clip["id"]: clip["description"] for clip in self.library}
+        self._system_prompt = BROLL_SYSTEM_PROMPT.format(broll_options=self._format_broll_options())
 
     def _format_broll_options(self) -> str:
         """Format B-roll library for prompt."""
@@ -89,6 +140,16 @@ class BRollMatcher:
             lines.append(f"- {clip['id']}: {clip['description']}")
         return "\n".join(lines)
 
+    def _segment(self, seg: dict, broll_id: str, fullscreen: bool) -> BRollSegment:
+        return BRollSegment(
+            start_time=seg["start"],
+            end_time=seg["end"],
+            transcript_text=seg["text"],
+            broll_id=broll_id,
+            broll_description=self._descriptions.get(broll_id, "Generic footage"),
+            is_fullscreen_david=fullscreen
+        )
+
     async def match_segment(
         self,
         start_time: float,
@@ -96,49 +157,36 @@ class BRollMatcher:
         text: str
     ) -> BRollSegment:
         """Match a single transcript segment with B-roll."""
-        if not self.router:
-            # Fallback: keyword matching
-            return self._keyword_match(start_time, end_time, text)
+        segments = await self.match_transcript([{"start": start_time, "end": end_time, "text": text}])
+        return segments[0]
 
-        from core.model_router import ModelTier
+    async def _match_batch(self, model, segments: list[dict]) -> list[Optional[dict]]:
+        """
+        One request assigning B-roll to every segment in `segments`.
 
-        prompt = BROLL_MATCHING_PROMPT.format(
-            start_time=start_time,
-            end_time=end_time,
-            text=text,
-            broll_options=self._format_broll_options()
+        Returns one {"broll_id", "fullscreen_david"} dict per segment, None
+        where the response had no usable entry for it.
+        """
+        numbered = "\n".join(
+            f'[{i}] {seg["start"]}s-{seg["end"]}s: "{seg["text"]}"'
+            for i, seg in enumerate(segments, 1)
         )
+        messages = [
+            {"role": "system", "content": self._system_prompt, "cache": True},
+            {"role": "user", "content": BROLL_BATCH_PROMPT.format(segments=numbered)},
+        ]
+        max_tokens = MATCH_TOKENS_PER_SEGMENT * len(segments) + 50
 
         try:
-            model = self.router.models.get(ModelTier.CHEAP)
-            response = await self.router.invoke(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=200
-            )
-
-            result = self._parse_response(response.get("content", ""))
-            broll_id = result.get("broll_id", "matrix_code")
-            fullscreen = result.get("fullscreen_david", False)
-
-            # Find description
-            desc = next(
-                (c["description"] for c in self.library if c["id"] == broll_id),
-                "Generic footage"
-            )
-
-            return BRollSegment(
-                start_time=start_time,
-                end_time=end_time,
-                transcript_text=text,
-                broll_id=broll_id,
-                broll_description=desc,
-                is_fullscreen_david=fullscreen
-            )
-
+            response = await self.router.invoke(model=model, messages=messages, max_tokens=max_tokens)
         except Exception as e:
             logger.error(f"B-roll matching failed: {e}")
-            return self._keyword_match(start_time, end_time, text)
+            return [None] * len(segments)
+        assignments = self._parse_assignments(response.get("content", ""), len(segments))
+        missing = sum(a is None for a in assignments)
+        if missing:
+            logger.warning(f"B-roll matching: no usable answer for {missing}/{len(segments)} segments")
+        return assignments
 
     def _keyword_match(
         self,
@@ -149,71 +197,17 @@ class BRollMatcher:
         """Fallback keyword-based B-roll matching."""
         text_lower = text.lower()
 
-        # Keyword to B-roll mapping
-        keywords = {
-            "surveillance": "surveillance_cameras",
-            "camera": "surveillance_cameras",
-            "cctv": "surveillance_cameras",
-            "facial recognition": "facial_recognition",
-            "biometric": "facial_recognition",
-            "china": "china_city",
-            "chinese": "china_city",
-            "social credit": "china_city",
-            "cbdc": "money_printing",
-            "central bank": "money_printing",
-            "digital currency": "money_printing",
-            "digital id": "digital_id",
-            "id card": "digital_id",
-            "qr code": "digital_id",
-            "debank": "empty_wallet",
-            "frozen": "empty_wallet",
-            "switched off": "empty_wallet",
-            "blockchain": "blockchain",
-            "decentralized": "blockchain",
-            "crypto": "crypto_trading",
-            "bitcoin": "crypto_trading",
-            "escape": "chains_breaking",
-            "freedom": "freedom",
-            "free": "freedom",
-            "data": "data_center",
-            "server": "data_center",
-            "ai": "ai_robot",
-            "artificial intelligence": "ai_robot",
-            "government": "government_building",
-            "politician": "government_building",
-            "big tech": "tech_giants",
-            "google": "tech_giants",
-            "facebook": "tech_giants",
-            "time": "clock_ticking",
-            "window": "clock_ticking",
-        }
-
         # Find first matching keyword
-        broll_id = "matrix_code"  # default
-        for keyword, clip_id in keywords.items():
-            if keyword in text_lower:
-                broll_id = clip_id
-                break
+        broll_id = next(
+            (clip_id for keyword, clip_id in BROLL_KEYWORDS if keyword in text_lower),
+            "matrix_code"  # default
+        )
 
         # Check for full-screen triggers
-        fullscreen_triggers = [
-            "i escaped", "i'm david", "listen to me",
-            "this is real", "the question is", "will you"
-        ]
-        is_fullscreen = any(trigger in text_lower for trigger in fullscreen_triggers)
+        is_fullscreen = any(trigger in text_lower for trigger in FULLSCREEN_TRIGGERS)
 
-        desc = next(
-            (c["description"] for c in self.library if c["id"] == broll_id),
-            "Generic footage"
-        )
-
-        return BRollSegment(
-            start_time=start_time,
-            end_time=end_time,
-            transcript_text=text,
-            broll_id=broll_id,
-            broll_description=desc,
-            is_fullscreen_david=is_fullscreen
+        return self._segment(
+            {"start": start_time, "end": end_time, "text": text}, broll_id, is_fullscreen
         )
 
     async def match_transcript(
@@ -222,29 +216,64 @@ class BRollMatcher:
     ) -> list[BRollSegment]:
         """Match all transcript segments with B-roll.
 
+        Segments go to the model MATCH_BATCH_SIZE per request, up to
+        MATCH_CONCURRENCY requests in flight. Segments without a usable
+        answer (or every segment, with no model router) use keyword matching.
+
         Args:
             segments: List of {"start": float, "end": float, "text": str}
 
         Returns:
             List of BRollSegment assignments
         """
+        assignments: list[Optional[dict]] = [None] * len(segments)
+
+        if self.router and segments:
+            from core.model_router import ModelTier
+
+            model = self.router.models.get(ModelTier.CHEAP)
+            semaphore = asyncio.Semaphore(MATCH_CONCURRENCY)
+
+            async def match_batch(start: int):
+                async with semaphore:
+                    batch = await self._match_batch(model, segments[start:start + MATCH_BATCH_SIZE])
+                assignments[start:start + len(batch)] = batch
+
+            await asyncio.gather(*(
+                match_batch(start) for start in range(0, len(segments), MATCH_BATCH_SIZE)
+            ))
+
         results = []
-        for seg in segments:
-            result = await self.match_segment(
-                start_time=seg["start"],
-                end_time=seg["end"],
-                text=seg["text"]
-            )
-            results.append(result)
+        for seg, assignment in zip(segments, assignments):
+            if assignment is None:
+                results.append(self._keyword_match(seg["start"], seg["end"], seg["text"]))
+            else:
+                results.append(self._segment(
+                    seg, assignment["broll_id"], assignment["fullscreen_david"]
+                ))
         return results
 
-    def _parse_response(self, content: str) -> dict:
-        """Parse JSON from LLM response."""
+    @staticmethod
+    def _parse_assignments(content: str, count: int) -> list[Optional[dict]]:
+        """{"1": {...}, "2": {...}} -> one assignment (or None) per segment, in order."""
+        start, end = content.find("{"), content.rfind("}")
+        if start == -1 or end <= start:
+            return [None] * count
         try:
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-            return json.loads(content.strip())
-        except json.JSONDecodeError:
-            return {}
+            data = json.loads(content[start:end + 1])
+        except ValueError:
+            return [None] * count
+        if not isinstance(data, dict):
+            return [None] * count
+
+        assignments = []
+        for i in range(1, count + 1):
+            entry = data.get(str(i))
+            if isinstance(entry, dict) and isinstance(entry.get("broll_id"), str):
+                assignments.append({
+                    "broll_id": entry["broll_id"],
+                    "fullscreen_david": bool(entry.get("fullscreen_david", False)),
+                })
+            else:
+                assignments.append(None)
+        return assignments
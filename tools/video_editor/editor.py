@@ -7,7 +7,8 @@ Creates videos with:
 - Occasional full-screen David cuts
 
 Pipeline:
-1. Transcribe David's video with Whisper (get timestamps)
+1. Transcribe David's video with Whisper (get timestamps) - on the warm
+   STT worker, cached per video file (see transcriber.py)
 2. Match transcript segments with B-roll using LLM
 3. Compose final video with FFmpeg
 """
@@ -22,6 +23,7 @@ from pathlib import Path
 from typing import Optional
 
 from .broll_matcher import BRollMatcher, BRollSegment
+from .transcriber import MediaTranscriber
 
 logger = logging.getLogger(__name__)
 
@@ -59,10 +61,12 @@ class DavidPIPEditor:
     def __init__(
         self,
         config: EditorConfig = None,
-        model_router=None
+        model_router=None,
+        transcriber: MediaTranscriber = None
     ):
         self.config = config or EditorConfig()
         self.broll_matcher = BRollMatcher(model_router=model_router)
+        self.transcriber = transcriber or MediaTranscriber()
 
     async def create_video(
         self,
@@ -107,44 +111,17 @@ class DavidPIPEditor:
         return output_path
 
     async def _transcribe(self, video_path: Path) -> list[dict]:
-        """Transcribe video using Whisper."""
+        """Transcribe video using Whisper (warm worker, cached per file)."""
         try:
-            # Use whisper CLI (faster-whisper recommended)
-            result = subprocess.run(
-                [
-                    "whisper",
-                    str(video_path),
-                    "--model", "base",  # or "small" for better accuracy
-                    "--output_format", "json",
-                    "--output_dir", str(video_path.parent),
-                ],
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minutes
-            )
-
-            if result.returncode != 0:
-                logger.error(f"Whisper failed: {result.stderr}")
-                raise RuntimeError(f"Whisper transcription failed: {result.stderr}")
-
-            # Load JSON output
-            json_path = video_path.with_suffix(".json")
-            with open(json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            # Convert to our format
             segments = []
-            for seg in data.get("segments", []):
-                segments.append({
-                    "start": seg["start"],
-                    "end": seg["end"],
-                    "text": seg["text"].strip()
-                })
-
+            async for segment in self.transcriber.segments(video_path):
+                segments.append(segment)
+                if len(segments) % 50 == 0:
+                    logger.info(f"Transcribed {segment['end']:.0f}s ({len(segments)} segments)...")
             return segments
 
-        except FileNotFoundError:
-            logger.warning("Whisper not found, using mock transcription")
+        except ImportError as e:
+            logger.warning(f"Whisper not available ({e}), using mock transcription")
             # Mock transcription for testing
             duration = self._get_video_duration(video_path)
             segment_length = 10  # 10-second segments
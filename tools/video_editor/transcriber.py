@@ -0,0 +1,212 @@
+"""
+Media transcription for the video editor.
+
+Runs on the warm STT worker (voice/stt_worker.py) instead of the whisper
+CLI: ffmpeg decodes the audio track to 16kHz mono PCM on a pipe, the PCM
+is streamed to the worker while it is still decoding, and timestamped
+segments come back phrase by phrase. The CPU-quantized model stays loaded
+in the worker between videos, and nothing is written next to the media.
+
+Transcripts are cached by a hash of the media file's content (plus model
+and language), so editing passes over the same footage never transcribe
+it again.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import subprocess
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from video_pipeline.media_tools import find_ffmpeg
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_CACHE_DIR = Path("data/video_transcripts")
+
+DEFAULT_MODEL = "base"
+DEFAULT_DEVICE = "cpu"
+DEFAULT_COMPUTE_TYPE = "int8"
+
+SAMPLE_RATE = 16000              # what the worker expects
+PCM_CHUNK_BYTES = SAMPLE_RATE * 2  # 1s of int16 mono per chunk
+MAX_PENDING_CHUNKS = 60          # decoded audio allowed ahead of the worker
+STALL_TIMEOUT = 120.0            # give up when the worker takes/sends nothing this long
+FINISH_TIMEOUT = 900.0           # upper bound on working through the backlog after decode
+
+
+class MediaTranscriber:
+    """
+    Transcribes media files on the STT worker, cached per file content.
+
+    Usage:
+        transcriber = MediaTranscriber()
+        segments = await transcriber.transcribe("talking_head.mp4")
+
+        async for segment in transcriber.segments("talking_head.mp4"):
+            ...  # {"start": 0.0, "end": 4.2, "text": "..."} as each phrase finishes
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = TRANSCRIPT_CACHE_DIR,
+        model_size: str = DEFAULT_MODEL,
+        device: str = DEFAULT_DEVICE,
+        compute_type: str = DEFAULT_COMPUTE_TYPE,
+        language: str = "en",
+        client=None,
+    ):
+        """
+        Args:
+            cache_dir: Where transcripts are kept (None: no cache)
+            model_size: Whisper model the worker loads if it has to be started
+            device: "cpu" or "cuda" for a started worker
+            compute_type: CTranslate2 compute type (int8 = quantized for CPU)
+            language: Language code
+            client: An existing STTClient (default: one that spawns the worker)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.language = language
+        self._client = client
+
+    def _get_client(self):
+        if self._client is None:
+            if importlib.util.find_spec("faster_whisper") is None:
+                raise ImportError("faster-whisper not installed. Run: pip install faster-whisper")
+            from voice.stt_worker import STTClient
+
+            self._client = STTClient(
+                model_size=self.model_size,
+                device=self.device,
+                compute_type=self.compute_type,
+            )
+        return self._client
+
+    # ------------------------------------------------------------------
+    # Cache (per media content hash)
+    # ------------------------------------------------------------------
+
+    def cache_key(self, media_path: Path) -> str:
+        """Content hash of the media file, plus what shapes the transcript."""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(media_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return f"{digest.hexdigest()}-{self.model_size}-{self.language}"
+
+    def _cache_path(self, key: str) -> Optional[Path]:
+        return self.cache_dir / f"{key}.json" if self.cache_dir else None
+
+    def _load(self, key: str) -> Optional[list[dict]]:
+        path = self._cache_path(key)
+        if not path or not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)["segments"]
+        except Exception as e:
+            logger.warning(f"Transcript cache entry unreadable, transcribing again: {e}")
+            return None
+
+    def _save(self, key: str, media_path: Path, segments: list[dict]):
+        path = self._cache_path(key)
+        if not path:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"media": media_path.name, "segments": segments}, f)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.debug(f"Transcript cache save failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Transcription
+    # ------------------------------------------------------------------
+
+    def _run(self, media_path: Path, key: str, on_segment) -> list[dict]:
+        """Blocking: ffmpeg -> worker, calling on_segment as segments arrive."""
+        client = self._get_client()
+        ffmpeg = subprocess.Popen(
+            [
+                find_ffmpeg(), "-nostdin", "-v", "error",
+                "-i", str(media_path),
+                "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+                "-f", "s16le", "pipe:1",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        stream = client.stream(
+            self.language,
+            timestamps=True,
+            on_segment=on_segment,
+            max_pending=MAX_PENDING_CHUNKS,
+            stall_timeout=STALL_TIMEOUT,
+        )
+        try:
+            for chunk in iter(lambda: ffmpeg.stdout.read(PCM_CHUNK_BYTES), b""):
+                stream.feed(chunk[:len(chunk) // 2 * 2])
+            ffmpeg.wait()
+            # The worker still has the decoded backlog to get through
+            stream.finish(timeout=FINISH_TIMEOUT)
+        finally:
+            if ffmpeg.poll() is None:
+                ffmpeg.kill()
+            stderr = ffmpeg.communicate()[1].decode(errors="replace")
+
+        if ffmpeg.returncode != 0:
+            raise RuntimeError(f"ffmpeg could not decode {media_path.name}: {stderr.strip()}")
+
+        segments = stream.segments
+        self._save(key, media_path, segments)
+        logger.info(
+            f"Transcribed {media_path.name}: {len(segments)} segments "
+            f"in {stream.final['elapsed']:.1f}s"
+        )
+        return segments
+
+    async def segments(self, media_path: Path | str) -> AsyncIterator[dict]:
+        """
+        Yield {"start", "end", "text"} segments as the worker produces them
+        (all at once from the cache when this file was transcribed before).
+
+        Raises:
+            ImportError: faster-whisper is not installed
+            RuntimeError: ffmpeg not found, decoding or transcription failed,
+                          or the worker stalled
+        """
+        media_path = Path(media_path)
+        key = await asyncio.to_thread(self.cache_key, media_path)
+        cached = self._load(key)
+        if cached is not None:
+            logger.info(f"Transcript cache hit for {media_path.name}")
+            for segment in cached:
+                yield segment
+            return
+
+        loop = asyncio.get_running_loop()
+        arrived: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        def on_segment(segment: dict):
+            loop.call_soon_threadsafe(arrived.put_nowait, segment)
+
+        # The run finishes (and fills the cache) even if the caller stops early
+        run = asyncio.ensure_future(asyncio.to_thread(self._run, media_path, key, on_segment))
+        run.add_done_callback(lambda _: arrived.put_nowait(done))
+        while (segment := await arrived.get()) is not done:
+            yield segment
+        run.result()
+
+    async def transcribe(self, media_path: Path | str) -> list[dict]:
+        """The whole transcript as [{"start", "end", "text"}, ...]."""
+        return [segment async for segment in self.segments(media_path)]
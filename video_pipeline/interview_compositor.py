@@ -6,16 +6,22 @@ Format: Alternating full-screen clips
 
 Designed for 9:16 vertical video (Shorts/TikTok/Reels).
 Normalizes all clips to consistent resolution/fps/codec before joining.
+Clips are probed once and normalized in parallel; clips that already match
+the target specs are stream-copied instead of re-encoded, and title cards
+are cached on disk across interviews.
 """
 
 import asyncio
+import hashlib
 import logging
 import os
-import subprocess
+import shutil
 import tempfile
 from pathlib import Path
 from typing import Optional
 
+from video_pipeline import media_tools
+
 logger = logging.getLogger(__name__)
 
 # Default output specs for vertical video
@@ -36,6 +42,20 @@ TITLE_TEXT_COLOR = "white"
 # Transition settings
 CROSSFADE_DURATION = 0.3  # seconds
 
+# Parallel normalization (each ffmpeg encode is already multi-threaded,
+# so a small pool is enough to keep the CPU busy)
+DEFAULT_MAX_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+
+# Title cards are identical across interviews ("Question 1", ...)
+TITLE_CARD_CACHE_DIR = Path("data/interview_cache/title_cards")
+
+# Stream-copy is only safe when every spec the concat demuxer cares about matches
+_TARGET_VIDEO_CODEC = "h264"
+_TARGET_PIX_FMT = "yuv420p"
+_TARGET_AUDIO_CODEC = "aac"
+_TARGET_SAMPLE_RATE = 44100
+_TARGET_CHANNELS = 2
+
 
 class InterviewCompositor:
     """
@@ -45,69 +65,81 @@ class InterviewCompositor:
     and joins them in alternating Q&A order with optional title cards.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        title_cache_dir: Optional[str] = None,
+    ):
         self._ffmpeg = self._find_ffmpeg()
+        self.max_workers = max(1, max_workers)
+        self.title_cache_dir = Path(title_cache_dir) if title_cache_dir else TITLE_CARD_CACHE_DIR
+        self._title_locks: dict[str, asyncio.Lock] = {}
 
     def _find_ffmpeg(self) -> str:
-        """Find FFmpeg executable on the system."""
-        # Try common locations
-        candidates = ["ffmpeg"]
-
-        if os.name == "nt":
-            # Windows paths
-            candidates.extend([
-                r"C:\Program Files\ffmpeg\bin\ffmpeg.exe",
-                r"C:\ffmpeg\bin\ffmpeg.exe",
-                os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\WinGet\Packages\Gyan.FFmpeg_Microsoft.Winget.Source_8wekyb3d8bbwe\ffmpeg-7.1.1-full_build\bin\ffmpeg.exe"),
-            ])
-        else:
-            candidates.extend(["/usr/bin/ffmpeg", "/usr/local/bin/ffmpeg"])
-
-        for path in candidates:
-            expanded = os.path.expandvars(path)
-            if os.path.isfile(expanded):
-                return expanded
-
-        # Fallback: hope it's on PATH
-        return "ffmpeg"
-
-    async def _get_video_info(self, video_path: str) -> dict:
-        """Get video metadata (resolution, fps, duration, codec)."""
-        cmd = [
-            self._ffmpeg.replace("ffmpeg", "ffprobe"),
-            "-v", "quiet",
-            "-print_format", "json",
-            "-show_format", "-show_streams",
-            video_path,
-        ]
-
+        """Find FFmpeg executable on the system (resolved once per process)."""
         try:
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await proc.communicate()
+            return media_tools.find_ffmpeg()
+        except RuntimeError:
+            # Fallback: hope it's on PATH
+            return "ffmpeg"
 
-            import json
-            data = json.loads(stdout.decode())
+    @staticmethod
+    async def _run_ffmpeg(cmd: list[str]) -> tuple[int, bytes]:
+        """
+        Run an FFmpeg command, returning (returncode, stderr).
 
-            video_stream = next(
-                (s for s in data.get("streams", []) if s["codec_type"] == "video"),
-                {},
-            )
+        If the awaiting task is cancelled the process is killed and reaped
+        before the cancellation propagates, so it can't keep writing into a
+        directory the caller is about to remove.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, stderr = await proc.communicate()
+        except asyncio.CancelledError:
+            if proc.returncode is None:
+                proc.kill()
+            # A second cancel (compose_interview stops its jobs after gather()
+            # already has) must not interrupt the reap
+            reaped = asyncio.ensure_future(proc.wait())
+            while not reaped.done():
+                try:
+                    await asyncio.shield(reaped)
+                except asyncio.CancelledError:
+                    pass
+            raise
+        return proc.returncode, stderr
 
-            return {
-                "width": int(video_stream.get("width", 0)),
-                "height": int(video_stream.get("height", 0)),
-                "fps": eval(video_stream.get("r_frame_rate", "30/1")),
-                "duration": float(data.get("format", {}).get("duration", 0)),
-                "codec": video_stream.get("codec_name", "unknown"),
-            }
+    async def _get_video_info(self, video_path: str) -> dict:
+        """Get video metadata (resolution, fps, duration, codec), cached per file version."""
+        try:
+            return await media_tools.get_video_info_async(video_path)
         except Exception as e:
             logger.error(f"Failed to get video info for {video_path}: {e}")
             return {"width": 0, "height": 0, "fps": 30, "duration": 0, "codec": "unknown"}
 
+    @staticmethod
+    def _matches_target(
+        info: dict,
+        width: int = DEFAULT_WIDTH,
+        height: int = DEFAULT_HEIGHT,
+        fps: int = DEFAULT_FPS,
+    ) -> bool:
+        """True if a probed clip can be stream-copied into the concat list."""
+        return (
+            info.get("width") == width
+            and info.get("height") == height
+            and abs(info.get("fps", 0) - fps) < 0.01
+            and info.get("codec") == _TARGET_VIDEO_CODEC
+            and info.get("pix_fmt") == _TARGET_PIX_FMT
+            and info.get("audio_codec") == _TARGET_AUDIO_CODEC
+            and info.get("sample_rate") == _TARGET_SAMPLE_RATE
+            and info.get("channels") == _TARGET_CHANNELS
+        )
+
     async def normalize_clip(
         self,
         input_path: str,
@@ -115,13 +147,38 @@ class InterviewCompositor:
         width: int = DEFAULT_WIDTH,
         height: int = DEFAULT_HEIGHT,
         fps: int = DEFAULT_FPS,
+        info: Optional[dict] = None,
     ) -> str:
         """
         Normalize a video clip to target resolution, fps, and codec.
 
         Handles phone videos with varying specs by scaling + padding
-        to maintain aspect ratio within the target frame.
+        to maintain aspect ratio within the target frame. Clips that
+        already match the target are stream-copied (pass a pre-probed
+        `info` dict to skip the probe).
         """
+        if info is None:
+            info = await self._get_video_info(input_path)
+
+        if self._matches_target(info, width, height, fps):
+            cmd = [
+                self._ffmpeg,
+                "-i", input_path,
+                "-map", "0:v:0",
+                "-map", "0:a:0",
+                "-c", "copy",
+                "-y",
+                output_path,
+            ]
+            returncode, stderr = await self._run_ffmpeg(cmd)
+            if returncode == 0:
+                logger.info(f"Stream-copied clip: {input_path} -> {output_path}")
+                return output_path
+            logger.warning(
+                f"Stream copy failed for {input_path}, re-encoding: "
+                f"{stderr.decode()[-200:]}"
+            )
+
         # Scale to fit within target dimensions, pad to fill
         filter_complex = (
             f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
@@ -144,14 +201,9 @@ class InterviewCompositor:
             output_path,
         ]
 
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        _, stderr = await proc.communicate()
+        returncode, stderr = await self._run_ffmpeg(cmd)
 
-        if proc.returncode != 0:
+        if returncode != 0:
             raise RuntimeError(
                 f"FFmpeg normalize failed for {input_path}: {stderr.decode()[-500:]}"
             )
@@ -194,19 +246,51 @@ class InterviewCompositor:
             output_path,
         ]
 
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        _, stderr = await proc.communicate()
+        returncode, stderr = await self._run_ffmpeg(cmd)
 
-        if proc.returncode != 0:
+        if returncode != 0:
             raise RuntimeError(f"Title card creation failed: {stderr.decode()[-500:]}")
 
         logger.info(f"Created title card: {output_path}")
         return output_path
 
+    async def get_title_card(
+        self,
+        text: str,
+        duration: float = TITLE_CARD_DURATION,
+        width: int = DEFAULT_WIDTH,
+        height: int = DEFAULT_HEIGHT,
+    ) -> str:
+        """
+        Return a cached title card for `text`, rendering it on first use.
+
+        Cards are keyed on everything that affects the render, so
+        "Question 1" is encoded once and reused across interviews.
+        """
+        key_src = "|".join(str(v) for v in (
+            text, duration, width, height, DEFAULT_FPS,
+            TITLE_FONT_SIZE, TITLE_BG_COLOR, TITLE_TEXT_COLOR,
+            DEFAULT_CODEC, DEFAULT_CRF, DEFAULT_AUDIO_BITRATE,
+        ))
+        key = hashlib.sha256(key_src.encode("utf-8")).hexdigest()[:16]
+        card_path = self.title_cache_dir / f"card_{key}.mp4"
+
+        lock = self._title_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if card_path.exists() and card_path.stat().st_size > 0:
+                logger.debug(f"Title card cache hit: {text!r}")
+                return str(card_path)
+
+            self.title_cache_dir.mkdir(parents=True, exist_ok=True)
+            # Render to a temp name then rename, so a crash never leaves
+            # a truncated card in the cache
+            tmp_path = card_path.with_suffix(".partial.mp4")
+            await self.create_title_card(
+                text, str(tmp_path), duration=duration, width=width, height=height
+            )
+            os.replace(tmp_path, card_path)
+            return str(card_path)
+
     async def compose_interview(
         self,
         questions_dir: str,
@@ -251,42 +335,52 @@ class InterviewCompositor:
 
         # Create temp directory for normalized clips
         temp_dir = tempfile.mkdtemp(prefix="interview_")
-        normalized_clips = []
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def _normalize(src: Path, dst: str) -> str:
+            async with semaphore:
+                info = await self._get_video_info(str(src))
+                return await self.normalize_clip(str(src), dst, info=info)
+
+        async def _card(text: str, duration: float) -> str:
+            async with semaphore:
+                return await self.get_title_card(text, duration=duration)
 
         try:
+            # Build every job in final playback order, then run them in parallel
+            jobs = []
+
             # Optional intro title card
             if include_title_cards and title:
                 intro_text = title
                 if expert_name:
                     intro_text += f"\\nwith {expert_name}"
-                intro_path = os.path.join(temp_dir, "intro_card.mp4")
-                await self.create_title_card(
-                    intro_text, intro_path, duration=3.0
-                )
-                normalized_clips.append(intro_path)
+                jobs.append(_card(intro_text, 3.0))
 
             # Process each Q&A pair
             for i in range(pairs):
-                q_file = q_files[i]
-                a_file = a_files[i]
-
                 # Optional Q&A label title card
                 if include_title_cards:
-                    label_path = os.path.join(temp_dir, f"label_{i+1}.mp4")
-                    await self.create_title_card(
-                        f"Question {i+1}", label_path, duration=1.5
-                    )
-                    normalized_clips.append(label_path)
-
-                # Normalize question clip
-                norm_q = os.path.join(temp_dir, f"norm_q{i+1}.mp4")
-                await self.normalize_clip(str(q_file), norm_q)
-                normalized_clips.append(norm_q)
-
-                # Normalize answer clip
-                norm_a = os.path.join(temp_dir, f"norm_a{i+1}.mp4")
-                await self.normalize_clip(str(a_file), norm_a)
-                normalized_clips.append(norm_a)
+                    jobs.append(_card(f"Question {i+1}", 1.5))
+
+                jobs.append(_normalize(
+                    q_files[i], os.path.join(temp_dir, f"norm_q{i+1}.mp4")
+                ))
+                jobs.append(_normalize(
+                    a_files[i], os.path.join(temp_dir, f"norm_a{i+1}.mp4")
+                ))
+
+            tasks = [asyncio.ensure_future(job) for job in jobs]
+            try:
+                normalized_clips = list(await asyncio.gather(*tasks))
+            except BaseException:
+                # gather() leaves the other jobs running when one fails: stop
+                # them and wait for their ffmpeg processes to exit before the
+                # temp dir is removed underneath them
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
 
             # Create concat list file
             concat_list = os.path.join(temp_dir, "concat_list.txt")
@@ -322,7 +416,6 @@ class InterviewCompositor:
 
         finally:
             # Clean up temp files
-            import shutil
             try:
                 shutil.rmtree(temp_dir, ignore_errors=True)
             except Exception:
@@ -344,14 +437,9 @@ class InterviewCompositor:
             output_path,
         ]
 
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        _, stderr = await proc.communicate()
+        returncode, stderr = await self._run_ffmpeg(cmd)
 
-        if proc.returncode != 0:
+        if returncode != 0:
             raise RuntimeError(f"Concat failed: {stderr.decode()[-500:]}")
 
         logger.info(f"Concatenated {output_path}")
@@ -388,14 +476,9 @@ class InterviewCompositor:
             output_path,
         ]
 
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        _, stderr = await proc.communicate()
+        returncode, stderr = await self._run_ffmpeg(cmd)
 
-        if proc.returncode != 0:
+        if returncode != 0:
             raise RuntimeError(f"Concat with music failed: {stderr.decode()[-500:]}")
 
         logger.info(f"Concatenated with music: {output_path}")
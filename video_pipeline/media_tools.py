@@ -0,0 +1,444 @@
+"""
+Media Tools - Shared FFmpeg/ffprobe discovery and media probing.
+
+Every pipeline that shells out to FFmpeg (postprocessor, video creator,
+interview compositor, motion comic) used to search for the binary itself and
+spawn ffprobe for every duration lookup. This module does both once:
+
+1. find_ffmpeg() / find_ffprobe() resolve the binaries once per process
+2. probe() caches ffprobe results keyed on (path, mtime, size)
+3. get_duration() reads WAV / MP3 / MP4 / MOV headers in-process and only
+   falls back to ffprobe for other containers
+
+Usage:
+    from video_pipeline.media_tools import find_ffmpeg, get_duration
+
+    ffmpeg = find_ffmpeg()
+    seconds = get_duration("clip.mp4")
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import shutil
+import struct
+import subprocess
+import threading
+import wave
+from collections import OrderedDict
+from fractions import Fraction
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Candidate install locations, checked after PATH
+FFMPEG_SEARCH_PATHS = [
+    # Winget installations
+    os.path.expanduser(r"~\AppData\Local\Microsoft\WinGet\Packages\Gyan.FFmpeg_Microsoft.Winget.Source_8wekyb3d8bbwe\ffmpeg-8.0.1-full_build\bin\ffmpeg.exe"),
+    os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\WinGet\Packages\Gyan.FFmpeg_Microsoft.Winget.Source_8wekyb3d8bbwe\ffmpeg-7.1.1-full_build\bin\ffmpeg.exe"),
+    r"C:\ffmpeg\bin\ffmpeg.exe",
+    r"C:\Program Files\ffmpeg\bin\ffmpeg.exe",
+    r"C:\Program Files (x86)\ffmpeg\bin\ffmpeg.exe",
+    os.path.expanduser(r"~\ffmpeg\bin\ffmpeg.exe"),
+    # CapCut includes FFmpeg
+    os.path.expanduser(r"~\AppData\Local\CapCut\Apps\7.7.0.3143\ffmpeg.exe"),
+    "/usr/bin/ffmpeg",
+    "/usr/local/bin/ffmpeg",
+    "/opt/homebrew/bin/ffmpeg",
+]
+
+# Max cached probe results (one entry per distinct file version)
+PROBE_CACHE_SIZE = 512
+
+_lock = threading.Lock()
+_ffmpeg_path: Optional[str] = None
+_ffprobe_path: Optional[str] = None
+_ffprobe_resolved = False
+_probe_cache: "OrderedDict[tuple, dict]" = OrderedDict()
+
+
+# ------------------------------------------------------------------
+# Binary discovery
+# ------------------------------------------------------------------
+
+def _runs(path: str) -> bool:
+    """True if `path -version` exits cleanly."""
+    try:
+        result = subprocess.run(
+            [path, "-version"],
+            capture_output=True,
+            timeout=5,
+        )
+        return result.returncode == 0
+    except Exception:
+        return False
+
+
+def _sibling(ffmpeg: str, name: str) -> str:
+    """Path of another FFmpeg tool in the same directory as `ffmpeg`."""
+    if "ffmpeg.exe" in ffmpeg:
+        return ffmpeg.replace("ffmpeg.exe", f"{name}.exe")
+    return ffmpeg.replace("ffmpeg", name)
+
+
+def find_ffmpeg() -> str:
+    """
+    Return a working FFmpeg executable, resolved once per process.
+
+    Checks PATH, common install locations, then the imageio-ffmpeg
+    bundled binary.
+    """
+    global _ffmpeg_path
+
+    if _ffmpeg_path:
+        return _ffmpeg_path
+
+    with _lock:
+        if _ffmpeg_path:
+            return _ffmpeg_path
+
+        candidates = []
+        on_path = shutil.which("ffmpeg")
+        if on_path:
+            candidates.append(on_path)
+        candidates.extend(p for p in FFMPEG_SEARCH_PATHS if os.path.isfile(p))
+
+        for path in candidates:
+            if _runs(path):
+                _ffmpeg_path = path
+                logger.info(f"Found FFmpeg at: {path}")
+                return path
+
+        # imageio-ffmpeg ships a static binary (no ffprobe)
+        try:
+            import imageio_ffmpeg
+            bundled = imageio_ffmpeg.get_ffmpeg_exe()
+            if bundled and _runs(bundled):
+                _ffmpeg_path = bundled
+                logger.info(f"Using imageio-ffmpeg bundled FFmpeg: {bundled}")
+                return bundled
+        except Exception:
+            pass
+
+    raise RuntimeError(
+        "FFmpeg not found. Please install FFmpeg:\n"
+        "1. Download from: https://ffmpeg.org/download.html\n"
+        "2. Or use winget: winget install FFmpeg\n"
+        "3. Or use choco: choco install ffmpeg"
+    )
+
+
+def find_ffprobe() -> Optional[str]:
+    """Return a working ffprobe next to FFmpeg (or on PATH), else None."""
+    global _ffprobe_path, _ffprobe_resolved
+
+    if _ffprobe_resolved:
+        return _ffprobe_path
+
+    ffmpeg = find_ffmpeg()
+    with _lock:
+        if not _ffprobe_resolved:
+            for path in (_sibling(ffmpeg, "ffprobe"), shutil.which("ffprobe")):
+                if path and path != ffmpeg and _runs(path):
+                    _ffprobe_path = path
+                    break
+            _ffprobe_resolved = True
+            if not _ffprobe_path:
+                logger.info("ffprobe not found - probing via ffmpeg -i")
+    return _ffprobe_path
+
+
+# ------------------------------------------------------------------
+# In-process duration parsing
+# ------------------------------------------------------------------
+
+_MP3_BITRATES = {
+    # (mpeg1?, layer) -> kbps table indexed by header bits
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+def _wav_duration(path: str) -> Optional[float]:
+    with wave.open(path, "rb") as w:
+        rate = w.getframerate()
+        return w.getnframes() / rate if rate else None
+
+
+def _mp3_duration(path: str) -> Optional[float]:
+    """Duration from the Xing/Info/VBRI header, or CBR size estimate."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(10)
+        offset = 0
+        if head[:3] == b"ID3":
+            # Syncsafe tag size
+            tag_size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+            offset = 10 + tag_size
+        f.seek(offset)
+        buf = f.read(64 * 1024)
+
+    # Find first valid frame sync
+    for i in range(len(buf) - 4):
+        if buf[i] != 0xFF or (buf[i + 1] & 0xE0) != 0xE0:
+            continue
+        b1, b2, b3 = buf[i + 1], buf[i + 2], buf[i + 3]
+        version_bits = (b1 >> 3) & 0x03
+        layer_bits = (b1 >> 1) & 0x03
+        bitrate_idx = (b2 >> 4) & 0x0F
+        sr_idx = (b2 >> 2) & 0x03
+        if version_bits == 1 or layer_bits != 1 or bitrate_idx in (0, 15) or sr_idx == 3:
+            continue  # only Layer III, skip reserved/free-format values
+
+        mpeg1 = version_bits == 3
+        sample_rate = _MP3_SAMPLE_RATES[version_bits][sr_idx]
+        bitrate = _MP3_BITRATES[(mpeg1, 3)][bitrate_idx] * 1000
+        samples_per_frame = 1152 if mpeg1 else 576
+        mono = (b3 >> 6) == 3
+
+        # Xing/Info header sits after the side info
+        side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+        xing_at = i + 4 + side_info
+        tag = buf[xing_at:xing_at + 4]
+        if tag in (b"Xing", b"Info"):
+            flags = struct.unpack(">I", buf[xing_at + 4:xing_at + 8])[0]
+            if flags & 0x01:
+                frames = struct.unpack(">I", buf[xing_at + 8:xing_at + 12])[0]
+                return frames * samples_per_frame / sample_rate
+
+        vbri_at = i + 4 + 32
+        if buf[vbri_at:vbri_at + 4] == b"VBRI":
+            frames = struct.unpack(">I", buf[vbri_at + 14:vbri_at + 18])[0]
+            return frames * samples_per_frame / sample_rate
+
+        # Constant bitrate: audio bytes / byte rate
+        return (size - offset - i) * 8 / bitrate
+
+    return None
+
+
+def _mp4_duration(path: str) -> Optional[float]:
+    """Duration from the moov/mvhd box of an MP4/MOV file."""
+    size = os.path.getsize(path)
+
+    def _boxes(f, start: int, end: int):
+        pos = start
+        while pos + 8 <= end:
+            f.seek(pos)
+            header = f.read(8)
+            if len(header) < 8:
+                return
+            box_size, box_type = struct.unpack(">I4s", header)
+            header_len = 8
+            if box_size == 1:
+                box_size = struct.unpack(">Q", f.read(8))[0]
+                header_len = 16
+            elif box_size == 0:
+                box_size = end - pos
+            if box_size < header_len:
+                return
+            yield box_type, pos + header_len, pos + box_size
+            pos += box_size
+
+    with open(path, "rb") as f:
+        for box_type, body, box_end in _boxes(f, 0, size):
+            if box_type != b"moov":
+                continue
+            for child, child_body, _ in _boxes(f, body, box_end):
+                if child != b"mvhd":
+                    continue
+                f.seek(child_body)
+                version = f.read(4)[0]
+                if version == 1:
+                    f.seek(16, 1)
+                    timescale, duration = struct.unpack(">IQ", f.read(12))
+                else:
+                    f.seek(8, 1)
+                    timescale, duration = struct.unpack(">II", f.read(8))
+                return duration / timescale if timescale else None
+    return None
+
+
+_HEADER_PARSERS = {
+    ".wav": _wav_duration,
+    ".mp3": _mp3_duration,
+    ".mp4": _mp4_duration,
+    ".m4a": _mp4_duration,
+    ".mov": _mp4_duration,
+}
+
+
+# ------------------------------------------------------------------
+# Cached probing
+# ------------------------------------------------------------------
+
+def _cache_key(path: str) -> tuple:
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def _cache_get(key: tuple) -> Optional[dict]:
+    with _lock:
+        hit = _probe_cache.get(key)
+        if hit is not None:
+            _probe_cache.move_to_end(key)
+        return hit
+
+
+def _cache_put(key: tuple, value: dict):
+    with _lock:
+        _probe_cache[key] = value
+        _probe_cache.move_to_end(key)
+        while len(_probe_cache) > PROBE_CACHE_SIZE:
+            _probe_cache.popitem(last=False)
+
+
+def _run_probe(path: str) -> dict:
+    """Spawn ffprobe (or ffmpeg -i) and return raw format/stream data."""
+    ffprobe = find_ffprobe()
+    if ffprobe:
+        result = subprocess.run(
+            [
+                ffprobe,
+                "-v", "quiet",
+                "-print_format", "json",
+                "-show_format", "-show_streams",
+                path,
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"ffprobe failed: {result.stderr}")
+        return json.loads(result.stdout or "{}")
+
+    # No ffprobe: scrape the banner ffmpeg -i prints to stderr
+    result = subprocess.run(
+        [find_ffmpeg(), "-hide_banner", "-i", path],
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    output = result.stderr
+    data: dict = {"format": {}, "streams": []}
+    match = re.search(r"Duration:\s*(\d+):(\d+):(\d+)\.(\d+)", output)
+    if match:
+        h, m, s, frac = match.groups()
+        data["format"]["duration"] = str(
+            int(h) * 3600 + int(m) * 60 + int(s) + int(frac) / (10 ** len(frac))
+        )
+    video = re.search(r"Video: (\w+)(.*)", output)
+    if video:
+        # pix_fmt/colour details can hold commas, e.g. "yuv420p(tv, bt709)"
+        line = re.sub(r"\([^)]*\)", "", video.group(2))
+        pix_fmt = re.search(r", (\w+)", line)
+        size = re.search(r"(\d{2,5})x(\d{2,5})", line)
+        fps = re.search(r"(\d+(?:\.\d+)?) fps", line)
+        data["streams"].append({
+            "codec_type": "video",
+            "codec_name": video.group(1),
+            "pix_fmt": pix_fmt.group(1) if pix_fmt else "unknown",
+            "width": int(size.group(1)) if size else 0,
+            "height": int(size.group(2)) if size else 0,
+            "r_frame_rate": fps.group(1) if fps else "30",
+        })
+    audio = re.search(r"Audio: (\w+).*?(\d+) Hz, (mono|stereo)", output)
+    if audio:
+        data["streams"].append({
+            "codec_type": "audio",
+            "codec_name": audio.group(1),
+            "sample_rate": audio.group(2),
+            "channels": 1 if audio.group(3) == "mono" else 2,
+        })
+    if not data["format"]:
+        raise RuntimeError(f"Could not probe: {path}")
+    return data
+
+
+def probe(path: str) -> dict:
+    """
+    Return ffprobe-style {"format": ..., "streams": [...]} for a file.
+
+    Results are cached on (path, mtime, size), so repeated lookups of an
+    unchanged file never spawn a process.
+    """
+    key = _cache_key(path)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    data = _run_probe(path)
+    _cache_put(key, data)
+    return data
+
+
+def get_duration(path: str) -> float:
+    """
+    Return media duration in seconds.
+
+    Parses WAV/MP3/MP4/MOV headers in-process; anything else (or a header
+    that fails to parse) goes through the cached probe().
+    """
+    key = _cache_key(path)
+    cached = _cache_get(key)
+    if cached is not None and "duration" in cached.get("format", {}):
+        return float(cached["format"]["duration"])
+
+    parser = _HEADER_PARSERS.get(os.path.splitext(path)[1].lower())
+    if parser:
+        try:
+            duration = parser(path)
+            if duration:
+                return duration
+        except Exception as e:
+            logger.debug(f"Header parse failed for {path}, probing: {e}")
+
+    return float(probe(path).get("format", {}).get("duration", 0))
+
+
+def parse_rate(rate: str) -> float:
+    """Parse an ffprobe frame rate such as '30000/1001'."""
+    try:
+        return float(Fraction(rate))
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def get_video_info(path: str) -> dict:
+    """Resolution, fps, duration and codec details of the first A/V streams."""
+    data = probe(path)
+    streams = data.get("streams", [])
+    video_stream = next(
+        (s for s in streams if s.get("codec_type") == "video"),
+        {},
+    )
+    audio_stream = next(
+        (s for s in streams if s.get("codec_type") == "audio"),
+        {},
+    )
+
+    return {
+        "width": int(video_stream.get("width", 0)),
+        "height": int(video_stream.get("height", 0)),
+        "fps": parse_rate(str(video_stream.get("r_frame_rate", "30/1"))),
+        "duration": float(data.get("format", {}).get("duration", 0)),
+        "codec": video_stream.get("codec_name", "unknown"),
+        "pix_fmt": video_stream.get("pix_fmt", "unknown"),
+        "audio_codec": audio_stream.get("codec_name"),
+        "sample_rate": int(audio_stream.get("sample_rate", 0) or 0),
+        "channels": int(audio_stream.get("channels", 0) or 0),
+    }
+
+
+async def get_duration_async(path: str) -> float:
+    """get_duration() off the event loop."""
+    return await asyncio.to_thread(get_duration, path)
+
+
+async def get_video_info_async(path: str) -> dict:
+    """get_video_info() off the event loop."""
+    return await asyncio.to_thread(get_video_info, path)
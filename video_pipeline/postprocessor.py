@@ -12,11 +12,12 @@ Requires FFmpeg to be installed.
 import asyncio
 import logging
 import os
-import subprocess
 import tempfile
 from pathlib import Path
 from typing import Optional
 
+from video_pipeline import media_tools
+
 logger = logging.getLogger(__name__)
 
 # Fade settings (from FRONTMAN)
@@ -35,72 +36,59 @@ class VideoPostProcessor:
         self._ffmpeg_path: Optional[str] = None
 
     def _find_ffmpeg(self) -> str:
-        """Find FFmpeg executable."""
+        """Find FFmpeg executable (resolved once per process)."""
         if self._ffmpeg_path:
             return self._ffmpeg_path
+        self._ffmpeg_path = media_tools.find_ffmpeg()
+        return self._ffmpeg_path
 
-        # Common FFmpeg locations on Windows
-        search_paths = [
-            "ffmpeg",
-            # Winget installation
-            os.path.expanduser(r"~\AppData\Local\Microsoft\WinGet\Packages\Gyan.FFmpeg_Microsoft.Winget.Source_8wekyb3d8bbwe\ffmpeg-8.0.1-full_build\bin\ffmpeg.exe"),
-            r"C:\ffmpeg\bin\ffmpeg.exe",
-            r"C:\Program Files\ffmpeg\bin\ffmpeg.exe",
-            r"C:\Program Files (x86)\ffmpeg\bin\ffmpeg.exe",
-            os.path.expanduser(r"~\ffmpeg\bin\ffmpeg.exe"),
-            # CapCut includes FFmpeg
-            os.path.expanduser(r"~\AppData\Local\CapCut\Apps\7.7.0.3143\ffmpeg.exe"),
-            "/usr/bin/ffmpeg",
-            "/usr/local/bin/ffmpeg",
-        ]
+    def _get_video_duration(self, video_path: str) -> float:
+        """Get video duration (header parse, cached ffprobe fallback)."""
+        return media_tools.get_duration(video_path)
 
-        for path in search_paths:
-            try:
-                result = subprocess.run(
-                    [path, "-version"],
-                    capture_output=True,
-                    timeout=5,
-                )
-                if result.returncode == 0:
-                    self._ffmpeg_path = path
-                    logger.info(f"Found FFmpeg at: {path}")
-                    return path
-            except Exception:
-                continue
-
-        raise RuntimeError(
-            "FFmpeg not found. Please install FFmpeg:\n"
-            "1. Download from: https://ffmpeg.org/download.html\n"
-            "2. Or use winget: winget install FFmpeg\n"
-            "3. Or use choco: choco install ffmpeg"
-        )
+    async def pad_audio_file(
+        self,
+        input_path: str,
+        output_path: str,
+        silence_seconds: float = SILENCE_PADDING_SECONDS,
+    ) -> bool:
+        """
+        Append silence to an MP3 on disk, writing the result to output_path.
 
-    def _get_video_duration(self, video_path: str) -> float:
-        """Get video duration using ffprobe."""
+        Returns:
+            True if padding succeeded (output_path written), False otherwise
+        """
         ffmpeg = self._find_ffmpeg()
-        # ffprobe is in the same directory as ffmpeg
-        if "ffmpeg.exe" in ffmpeg:
-            ffprobe = ffmpeg.replace("ffmpeg.exe", "ffprobe.exe")
-        else:
-            ffprobe = ffmpeg.replace("ffmpeg", "ffprobe")
-
-        result = subprocess.run(
-            [
-                ffprobe,
-                "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                video_path,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
 
-        if result.returncode != 0:
-            raise RuntimeError(f"ffprobe failed: {result.stderr}")
+        # Generate silence and concatenate
+        # Using anullsrc to generate silence, then concat
+        cmd = [
+            ffmpeg,
+            "-y",
+            "-i", input_path,
+            "-f", "lavfi",
+            "-t", str(silence_seconds),
+            "-i", "anullsrc=r=44100:cl=stereo",
+            "-filter_complex", "[0:a][1:a]concat=n=2:v=0:a=1[out]",
+            "-map", "[out]",
+            "-codec:a", "libmp3lame",
+            "-q:a", "2",
+            output_path,
+        ]
+
+        logger.info(f"Adding {silence_seconds}s silence padding to audio...")
+
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate()
 
-        return float(result.stdout.strip())
+        if proc.returncode != 0:
+            logger.error(f"FFmpeg silence padding failed: {stderr.decode()}")
+            return False
+        return True
 
     async def add_silence_to_audio(
         self,
@@ -118,8 +106,6 @@ class VideoPostProcessor:
         Returns:
             Audio bytes with silence appended
         """
-        ffmpeg = self._find_ffmpeg()
-
         # Write input to temp file
         with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
             f.write(audio_data)
@@ -128,33 +114,7 @@ class VideoPostProcessor:
         output_path = input_path.replace(".mp3", "_padded.mp3")
 
         try:
-            # Generate silence and concatenate
-            # Using anullsrc to generate silence, then concat
-            cmd = [
-                ffmpeg,
-                "-y",
-                "-i", input_path,
-                "-f", "lavfi",
-                "-t", str(silence_seconds),
-                "-i", "anullsrc=r=44100:cl=stereo",
-                "-filter_complex", "[0:a][1:a]concat=n=2:v=0:a=1[out]",
-                "-map", "[out]",
-                "-codec:a", "libmp3lame",
-                "-q:a", "2",
-                output_path,
-            ]
-
-            logger.info(f"Adding {silence_seconds}s silence padding to audio...")
-
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await proc.communicate()
-
-            if proc.returncode != 0:
-                logger.error(f"FFmpeg silence padding failed: {stderr.decode()}")
+            if not await self.pad_audio_file(input_path, output_path, silence_seconds):
                 # Return original if padding fails
                 return audio_data
 
@@ -199,7 +159,7 @@ class VideoPostProcessor:
             Path to processed video
         """
         ffmpeg = self._find_ffmpeg()
-        duration = self._get_video_duration(video_path)
+        duration = await media_tools.get_duration_async(video_path)
 
         if not output_path:
             output_path = video_path.replace(".mp4", "_processed.mp4")
@@ -7,18 +7,24 @@ Flow:
 3. Add silence padding (prevents Hedra cutting off at last word)
 4. Generate lip-sync video via Hedra
 5. Post-process with FFmpeg (fades, music mixing)
+
+Audio and video are streamed to disk in chunks (never held whole in memory),
+all downloads share one pooled HTTP client, and music selection/level
+analysis runs while Hedra is generating.
 """
 
 import asyncio
 import logging
 import os
-import subprocess
+import re
+import shutil
 import tempfile
 from pathlib import Path
 from typing import Callable, Optional
 
 import httpx
 
+from video_pipeline import media_tools
 from video_pipeline.music_library import MusicLibrary, get_music_for_script
 
 logger = logging.getLogger(__name__)
@@ -29,6 +35,92 @@ CHARACTER_IMAGES = {
     "podcast": "https://playaverse.org/david-flip-podcast.png",  # Podcast style
 }
 
+# Streaming download settings
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+DOWNLOAD_MAX_ATTEMPTS = 4
+
+# Music beds are gain-matched towards this mean level before mixing
+MUSIC_REFERENCE_DB = -20.0
+MUSIC_GAIN_RANGE = (0.5, 2.0)  # clamp on the level correction factor
+
+
+async def stream_download(
+    client: httpx.AsyncClient,
+    url: str,
+    dest_path: str,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    max_attempts: int = DOWNLOAD_MAX_ATTEMPTS,
+) -> int:
+    """
+    Download url to dest_path in chunks, resuming after dropped connections.
+
+    Data is written to `<dest_path>.part` and renamed on completion. If the
+    connection drops, the next attempt sends a Range request for the
+    remaining bytes (falls back to a full restart if the server ignores it).
+    Any failure that ends the download removes the `.part` file.
+
+    Returns:
+        Total bytes on disk
+    """
+    part_path = dest_path + ".part"
+    last_error: Optional[Exception] = None
+
+    try:
+        for attempt in range(1, max_attempts + 1):
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+            try:
+                async with client.stream("GET", url, headers=headers) as response:
+                    if response.status_code == 416:
+                        if not offset:
+                            raise RuntimeError(
+                                "Failed to download video: 416 on a request without Range"
+                            )
+                        total = _content_range_total(response)
+                        if total is None or total == offset:
+                            # Range not satisfiable - we already have everything
+                            break
+                        # The .part doesn't match the remote file; start over
+                        logger.warning(
+                            f"Partial download is {offset} bytes but the file is {total}; restarting"
+                        )
+                        os.unlink(part_path)
+                        continue
+                    if not response.is_success:
+                        raise RuntimeError(f"Failed to download video: {response.status_code}")
+
+                    mode = "ab" if offset and response.status_code == 206 else "wb"
+                    with open(part_path, mode) as f:
+                        async for chunk in response.aiter_bytes(chunk_size):
+                            f.write(chunk)
+                break
+            except (httpx.TransportError, httpx.TimeoutException) as e:
+                last_error = e
+                logger.warning(
+                    f"Download interrupted (attempt {attempt}/{max_attempts}): {e}"
+                )
+                if attempt == max_attempts:
+                    raise RuntimeError(f"Download failed after {max_attempts} attempts: {last_error}")
+                await asyncio.sleep(min(2 ** attempt, 10))
+        else:
+            raise RuntimeError(f"Download failed after {max_attempts} attempts: {url}")
+
+        os.replace(part_path, dest_path)
+    except BaseException:
+        try:
+            os.unlink(part_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return os.path.getsize(dest_path)
+
+
+def _content_range_total(response: httpx.Response) -> Optional[int]:
+    """Total size from a `Content-Range: bytes */<total>` header, if given."""
+    match = re.match(r"bytes \S+/(\d+)$", response.headers.get("content-range", ""))
+    return int(match.group(1)) if match else None
+
 
 class VideoCreator:
     """Orchestrates video creation: TTS -> Lip-sync -> Post-process."""
@@ -41,6 +133,23 @@ class VideoCreator:
         self.hedra = HedraTool()
         self._postprocessor = None
         self._ffmpeg_path: Optional[str] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared pooled HTTP client for TTS and downloads."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(300, connect=30),
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+                follow_redirects=True,
+            )
+        return self._client
+
+    async def close(self):
+        """Close the shared HTTP client."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
 
     def _get_postprocessor(self):
         """Lazy-load postprocessor (requires FFmpeg)."""
@@ -54,32 +163,83 @@ class VideoCreator:
         return self._postprocessor if self._postprocessor else None
 
     def _get_ffmpeg(self) -> str:
-        """Find FFmpeg executable."""
-        if self._ffmpeg_path:
-            return self._ffmpeg_path
-
-        paths = [
-            "ffmpeg",
-            r"C:\ffmpeg\bin\ffmpeg.exe",
-            r"C:\Program Files\ffmpeg\bin\ffmpeg.exe",
-            "/usr/bin/ffmpeg",
-            "/usr/local/bin/ffmpeg",
-        ]
-
-        for path in paths:
+        """Find FFmpeg executable (resolved once per process)."""
+        if not self._ffmpeg_path:
+            self._ffmpeg_path = media_tools.find_ffmpeg()
+        return self._ffmpeg_path
+
+    async def _analyze_music_level(self, music_path: str) -> Optional[float]:
+        """Mean volume (dB) of the first minute of a track, via volumedetect."""
+        try:
+            ffmpeg = self._get_ffmpeg()
+        except RuntimeError:
+            return None
+
+        proc = await asyncio.create_subprocess_exec(
+            ffmpeg, "-hide_banner", "-t", "60", "-i", music_path,
+            "-af", "volumedetect", "-f", "null", "-",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await proc.communicate()
+        match = re.search(r"mean_volume:\s*(-?[\d.]+) dB", stderr.decode(errors="replace"))
+        return float(match.group(1)) if match else None
+
+    async def _prepare_music(
+        self,
+        script: str,
+        music_path: Optional[str],
+        music_volume: float,
+        auto_music: bool,
+    ) -> tuple[Optional[str], float]:
+        """
+        Select a music track (if auto) and level-match its volume.
+
+        Only auto-selected tracks are level-matched; an explicit
+        music_path/music_volume from the caller is used as given.
+        """
+        # Auto-select background music based on script mood
+        if auto_music and not music_path:
             try:
-                result = subprocess.run(
-                    [path, "-version"],
-                    capture_output=True,
-                    timeout=5,
-                )
-                if result.returncode == 0:
-                    self._ffmpeg_path = path
-                    return path
-            except:
-                continue
+                track, volume = await asyncio.to_thread(get_music_for_script, script)
+                if track:
+                    music_path = track
+                    music_volume = volume
+                    logger.info(f"Auto-selected music: {track} (volume: {volume})")
+                    mean_db = await self._analyze_music_level(track)
+                    if mean_db is not None:
+                        low, high = MUSIC_GAIN_RANGE
+                        gain = 10 ** ((MUSIC_REFERENCE_DB - mean_db) / 20)
+                        gain = max(low, min(high, gain))
+                        music_volume = round(music_volume * gain, 3)
+                        logger.info(
+                            f"Music level {mean_db:.1f} dB -> volume {music_volume}"
+                        )
+                else:
+                    logger.info("No music tracks available in library")
+            except Exception as e:
+                logger.warning(f"Music auto-selection failed: {e}")
 
-        raise RuntimeError("FFmpeg not found. Please install FFmpeg.")
+        return music_path, music_volume
+
+    async def _extract_thumbnail(self, video_path: str, thumb_path: str) -> Optional[str]:
+        """Grab a JPEG thumbnail one second into the video."""
+        try:
+            ffmpeg = self._get_ffmpeg()
+        except RuntimeError:
+            return None
+
+        proc = await asyncio.create_subprocess_exec(
+            ffmpeg, "-y", "-ss", "1", "-i", video_path,
+            "-frames:v", "1", "-q:v", "3", thumb_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            logger.warning(f"Thumbnail extraction failed: {stderr.decode()[-200:]}")
+            return None
+        return thumb_path
 
     async def create_video(
         self,
@@ -114,7 +274,7 @@ class VideoCreator:
             on_progress: Callback for progress updates
 
         Returns:
-            dict with video_path, video_url, audio_path, generation_id
+            dict with video_path, video_url, audio_path, generation_id, thumbnail_path
         """
         logger.info("=" * 50)
         logger.info("VIDEO CREATION STARTING")
@@ -126,32 +286,30 @@ class VideoCreator:
             character_image_url = CHARACTER_IMAGES.get(character_style, CHARACTER_IMAGES["direct"])
         logger.info(f"Character style: {character_style}, Image: {character_image_url}")
 
-        # Auto-select background music based on script mood
-        if auto_music and not music_path:
-            try:
-                track, volume = get_music_for_script(script)
-                if track:
-                    music_path = track
-                    music_volume = volume
-                    logger.info(f"Auto-selected music: {track} (volume: {volume})")
-                else:
-                    logger.info("No music tracks available in library")
-            except Exception as e:
-                logger.warning(f"Music auto-selection failed: {e}")
-
         results = {}
+        client = self._get_client()
+
+        # Music selection + level analysis don't depend on the video, so run
+        # them in the background while TTS and Hedra do their thing
+        music_task = asyncio.create_task(
+            self._prepare_music(script, music_path, music_volume, auto_music)
+        )
 
         try:
-            # Stage 1: Generate audio
+            # Stage 1: Generate audio (streamed straight to disk)
             logger.info("Stage 1/4: Generating audio with ElevenLabs...")
             if on_progress:
                 on_progress("generating_audio", {"script_length": len(script)})
 
-            audio_data = await self.elevenlabs.text_to_speech(
+            audio_fd, audio_path = tempfile.mkstemp(suffix=".mp3", prefix="david_audio_")
+            os.close(audio_fd)
+            audio_size = await self.elevenlabs.text_to_speech_file(
                 text=script,
+                output_path=audio_path,
                 voice_id=voice_id,
+                client=client,
             )
-            logger.info(f"Audio generated: {len(audio_data)} bytes")
+            logger.info(f"Audio generated: {audio_size} bytes")
 
             # Stage 1.5: Add silence padding (prevents Hedra cutting off)
             if add_silence_padding:
@@ -160,27 +318,24 @@ class VideoCreator:
                     logger.info("Adding silence padding to audio...")
                     if on_progress:
                         on_progress("padding_audio", {})
-                    audio_data = await postprocessor.add_silence_to_audio(audio_data)
+                    padded_path = audio_path.replace(".mp3", "_padded.mp3")
+                    if await postprocessor.pad_audio_file(audio_path, padded_path):
+                        os.replace(padded_path, audio_path)
+                        audio_size = os.path.getsize(audio_path)
                 else:
                     logger.warning("Postprocessor unavailable - skipping silence padding")
 
-            # Save audio to temp file
-            audio_file = tempfile.NamedTemporaryFile(
-                suffix=".mp3", delete=False, prefix="david_audio_"
-            )
-            audio_file.write(audio_data)
-            audio_file.close()
-            results["audio_path"] = audio_file.name
-            logger.info(f"Audio saved: {audio_file.name} ({len(audio_data)} bytes)")
+            results["audio_path"] = audio_path
+            logger.info(f"Audio saved: {audio_path} ({audio_size} bytes)")
 
             # Stage 2: Generate lip-sync video
             logger.info("Stage 2/4: Generating lip-sync video with Hedra...")
             if on_progress:
-                on_progress("generating_video", {"audio_size": len(audio_data)})
+                on_progress("generating_video", {"audio_size": audio_size})
 
             hedra_result = await self.hedra.create_talking_head_video(
                 character_image_url=character_image_url,
-                audio_data=audio_data,
+                audio_path=audio_path,
                 aspect_ratio=aspect_ratio,
                 on_progress=on_progress,
             )
@@ -189,45 +344,43 @@ class VideoCreator:
             results["generation_id"] = hedra_result["generation_id"]
             logger.info(f"Hedra video URL obtained")
 
-            # Stage 3: Download video
+            # Stage 3: Download video (chunked, resumable)
             logger.info("Stage 3/4: Downloading video from Hedra...")
             if on_progress:
                 on_progress("downloading", {"url": hedra_result["video_url"]})
 
-            async with httpx.AsyncClient(timeout=300) as client:
-                response = await client.get(hedra_result["video_url"])
-                if not response.is_success:
-                    raise RuntimeError(f"Failed to download video: {response.status_code}")
-                video_data = response.content
+            raw_fd, raw_video_path = tempfile.mkstemp(suffix=".mp4", prefix="david_raw_")
+            os.close(raw_fd)
+            video_size = await stream_download(
+                client, hedra_result["video_url"], raw_video_path
+            )
+            logger.info(f"Raw video saved: {raw_video_path} ({video_size} bytes)")
+
+            music_path, music_volume = await music_task
 
-            # Save raw video
-            raw_video_file = tempfile.NamedTemporaryFile(
-                suffix=".mp4", delete=False, prefix="david_raw_"
+            # Thumbnail runs alongside post-processing (both read the raw video)
+            thumb_path = raw_video_path.replace(".mp4", "_thumb.jpg")
+            if output_path:
+                thumb_path = str(Path(output_path).with_suffix(".jpg"))
+            thumb_task = asyncio.create_task(
+                self._extract_thumbnail(raw_video_path, thumb_path)
             )
-            raw_video_path = raw_video_file.name
-            raw_video_file.close()
-            with open(raw_video_path, "wb") as f:
-                f.write(video_data)
-            logger.info(f"Raw video saved: {raw_video_path} ({len(video_data)} bytes)")
 
             # Stage 4: Post-process (fades, music)
             video_path = raw_video_path
-            if apply_fades or music_path:
-                postprocessor = self._get_postprocessor()
-                if postprocessor:
-                    logger.info("Stage 4/4: Post-processing (fades, music)...")
-                    if on_progress:
-                        on_progress("postprocessing", {"fades": apply_fades, "music": bool(music_path)})
+            postprocessor = self._get_postprocessor() if (apply_fades or music_path) else None
+            if postprocessor:
+                logger.info("Stage 4/4: Post-processing (fades, music)...")
+                if on_progress:
+                    on_progress("postprocessing", {"fades": apply_fades, "music": bool(music_path)})
 
-                    if output_path:
-                        final_path = output_path
-                    else:
-                        final_file = tempfile.NamedTemporaryFile(
-                            suffix=".mp4", delete=False, prefix="david_video_"
-                        )
-                        final_path = final_file.name
-                        final_file.close()
+                if output_path:
+                    final_path = output_path
+                else:
+                    final_fd, final_path = tempfile.mkstemp(suffix=".mp4", prefix="david_video_")
+                    os.close(final_fd)
 
+                try:
                     video_path = await postprocessor.process_video(
                         video_path=raw_video_path,
                         output_path=final_path,
@@ -236,23 +389,24 @@ class VideoCreator:
                         music_path=music_path,
                         music_volume=music_volume,
                     )
-
-                    # Cleanup raw video
-                    try:
-                        os.unlink(raw_video_path)
-                    except Exception:
-                        pass
-                else:
-                    logger.warning("FFmpeg not available - skipping post-processing")
-                    if output_path:
-                        import shutil
-                        shutil.move(raw_video_path, output_path)
-                        video_path = output_path
-            else:
-                if output_path:
-                    import shutil
-                    shutil.move(raw_video_path, output_path)
-                    video_path = output_path
+                except BaseException:
+                    thumb_task.cancel()
+                    await asyncio.gather(thumb_task, return_exceptions=True)
+                    raise
+            elif apply_fades or music_path:
+                logger.warning("FFmpeg not available - skipping post-processing")
+
+            results["thumbnail_path"] = await thumb_task
+
+            if video_path != raw_video_path:
+                # Cleanup raw video
+                try:
+                    os.unlink(raw_video_path)
+                except Exception:
+                    pass
+            elif output_path:
+                shutil.move(raw_video_path, output_path)
+                video_path = output_path
 
             results["video_path"] = video_path
             logger.info(f"Final video: {video_path}")
@@ -272,6 +426,10 @@ class VideoCreator:
                 on_progress("failed", {"error": str(e)})
             raise
 
+        finally:
+            if not music_task.done():
+                music_task.cancel()
+
     def draft_video(
         self,
         script: str,
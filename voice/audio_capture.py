@@ -108,11 +108,17 @@ class AudioCapture:
         # Convert to WAV bytes
         return self._to_wav_bytes(audio_data)
 
-    def start_recording(self, device_id: Optional[int] = None):
+    def start_recording(self, device_id: Optional[int] = None, on_chunk: Optional[Callable] = None):
         """
         Start continuous recording (for push-to-talk).
 
         Call stop_recording() to get the audio data.
+
+        Args:
+            device_id: Specific device ID (uses default if None)
+            on_chunk: Optional callback receiving each int16 chunk as it is
+                captured (e.g. STTStream.feed). Runs on the audio thread -
+                keep it non-blocking.
         """
         sd = self._get_sounddevice()
 
@@ -128,8 +134,11 @@ class AudioCapture:
             if status:
                 logger.warning(f"Audio callback status: {status}")
             if self._recording:
+                chunk = indata.copy()
                 with self._lock:
-                    self._frames.append(indata.copy())
+                    self._frames.append(chunk)
+                if on_chunk:
+                    on_chunk(chunk)
 
         self._stream = sd.InputStream(
             samplerate=self.sample_rate,
@@ -149,6 +158,18 @@ class AudioCapture:
         Returns:
             WAV audio data as bytes
         """
+        audio_data = self.stop_recording_pcm()
+        if audio_data is None:
+            return b""
+        return self._to_wav_bytes(audio_data)
+
+    def stop_recording_pcm(self):
+        """
+        Stop recording and return the raw samples (no WAV encoding).
+
+        Returns:
+            int16 numpy array (samples x channels), or None if nothing was captured
+        """
         with self._lock:
             self._recording = False
 
@@ -161,14 +182,14 @@ class AudioCapture:
         with self._lock:
             if not self._frames:
                 logger.warning("No audio frames captured")
-                return b""
+                return None
 
             import numpy as np
             audio_data = np.concatenate(self._frames)
             self._frames = []
 
         logger.info(f"Recording stopped: {len(audio_data)} samples")
-        return self._to_wav_bytes(audio_data)
+        return audio_data
 
     def is_recording(self) -> bool:
         """Check if currently recording."""
@@ -201,6 +222,7 @@ class PushToTalk:
         self.capture = capture or AudioCapture()
         self.key = key
         self._on_audio: Optional[Callable[[bytes], None]] = None
+        self._on_start: Optional[Callable[[], Optional[Callable]]] = None
 
     def _get_keyboard(self):
         """Lazy import keyboard library."""
@@ -214,20 +236,28 @@ class PushToTalk:
                 "Note: On Linux, may need to run as root"
             )
 
-    def start(self, on_audio: Callable[[bytes], None]):
+    def start(
+        self,
+        on_audio: Callable[[bytes], None],
+        on_start: Optional[Callable[[], Optional[Callable]]] = None,
+    ):
         """
         Start listening for push-to-talk.
 
         Args:
             on_audio: Callback function that receives WAV audio bytes
+            on_start: Optional callback run when the key goes down; may return
+                a per-chunk callback to stream audio while recording
         """
         keyboard = self._get_keyboard()
         self._on_audio = on_audio
+        self._on_start = on_start
 
         def on_press(event):
             if event.name == self.key and not self.capture.is_recording():
                 logger.info(f"[{self.key}] pressed - start recording")
-                self.capture.start_recording()
+                on_chunk = self._on_start() if self._on_start else None
+                self.capture.start_recording(on_chunk=on_chunk)
 
         def on_release(event):
             if event.name == self.key and self.capture.is_recording():
@@ -20,7 +20,7 @@ import anthropic
 import httpx
 import pygame
 from personality.deva import get_deva_prompt, DEVA_VOICE
-from voice.memory import DevaMemory, GroupMemory
+from voice.memory import DevaMemory, GroupMemory, gather_context
 
 # Initialize pygame mixer once
 pygame.mixer.init()
@@ -174,14 +174,9 @@ def main():
             if engine == "general":
                 engine = None
 
-            personal_context = memory.get_context(user_input)
-            group_context = group_memory.get_context(user_input, engine=engine)
-
-            memory_context = ""
-            if personal_context:
-                memory_context += personal_context + "\n\n"
-            if group_context:
-                memory_context += group_context + "\n\n"
+            memory_context = gather_context(
+                memory, group_memory, query=user_input, engine=engine
+            ).combined()
 
             system_prompt = base_system_prompt
             if memory_context:
@@ -12,6 +12,7 @@ import sys
 import tempfile
 import time
 import re
+from typing import Optional
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -19,13 +20,13 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import anthropic
-import httpx
 import numpy as np
 import pygame
 from personality.deva import get_deva_prompt, DEVA_VOICE
-from voice.memory import DevaMemory, GroupMemory, GameMemory
+from voice.memory import DevaMemory, GroupMemory, GameMemory, gather_context
 from voice.wall_mode import WallCollector, CONTEXT_LIMITS
 from voice.gemini_client import GeminiClient, GeminiResponse
+from voice.speech_pipeline import ElevenLabsStreamTTS, SoundDeviceSink, SpeechPipeline
 from voice.tools.tool_executor import ToolExecutor, ToolExecutorConfig, ConsoleLogWatcher
 
 # Initialize pygame mixer
@@ -61,6 +62,20 @@ class VoiceAssistant:
         self.voice_id = DEVA_VOICE["voice_id"]
         self.api_key = os.environ.get("ELEVENLABS_API_KEY")
         self.tts_model = DEVA_VOICE.get("model", "eleven_flash_v2_5")
+        # Sentence-pipelined TTS: plays PCM from memory while later
+        # sentences are still being generated
+        self.speech = SpeechPipeline(
+            ElevenLabsStreamTTS(
+                self.voice_id,
+                model=self.tts_model,
+                voice_settings={
+                    "stability": DEVA_VOICE.get("stability", 0.5),
+                    "similarity_boost": DEVA_VOICE.get("similarity_boost", 0.75),
+                },
+                api_key=self.api_key,
+            ),
+            SoundDeviceSink(),
+        )
 
         # Claude client
         self.client = anthropic.Anthropic()
@@ -240,45 +255,11 @@ class VoiceAssistant:
         return text.strip() if text else ""
 
     def speak(self, text: str):
-        """Generate and play speech via ElevenLabs."""
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.voice_id}/stream"
-        headers = {
-            "Accept": "audio/mpeg",
-            "Content-Type": "application/json",
-            "xi-api-key": self.api_key,
-        }
-        data = {
-            "text": text,
-            "model_id": self.tts_model,
-            "voice_settings": {
-                "stability": DEVA_VOICE.get("stability", 0.5),
-                "similarity_boost": DEVA_VOICE.get("similarity_boost", 0.75),
-            }
-        }
-
-        temp_path = tempfile.mktemp(suffix='.mp3')
+        """Generate and play speech via ElevenLabs (streamed PCM, no temp file)."""
         try:
-            with httpx.Client(timeout=30) as client:
-                with client.stream("POST", url, headers=headers, json=data) as response:
-                    if response.status_code != 200:
-                        print(f"TTS Error: {response.status_code}")
-                        return
-                    with open(temp_path, 'wb') as f:
-                        for chunk in response.iter_bytes():
-                            f.write(chunk)
-
-            pygame.mixer.music.load(temp_path)
-            pygame.mixer.music.play()
-
-            while pygame.mixer.music.get_busy():
-                time.sleep(0.05)
-
-            pygame.mixer.music.unload()
-        finally:
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
+            self.speech.speak(text)
+        except RuntimeError as e:
+            print(e)
 
     def _setup_log_watcher(self):
         """Set up log file watching for Unity editor and production builds."""
@@ -466,12 +447,13 @@ Keep spoken output to 1-2 sentences. Just the result, not the process.
 
         return has_problem and has_solution and len(response) > 50
 
-    def think(self, user_input: str) -> str:
-        """Get DEVA's response from Claude with memory context."""
-        # Check if this needs tools (code editing, commands)
-        if self._needs_tools(user_input):
-            return self.think_with_tools(user_input)
+    def _prepare_turn(self, user_input: str) -> tuple[str, int, str]:
+        """
+        Record the user message and build the system prompt for this turn.
 
+        Returns:
+            (system_prompt, max_response_tokens, detected_engine)
+        """
         from datetime import datetime
         ts = datetime.now().strftime("%Y-%m-%d %H:%M")
         self.messages.append({"role": "user", "content": f"[{ts}] {user_input}"})
@@ -483,37 +465,20 @@ Keep spoken output to 1-2 sentences. Just the result, not the process.
             engine = None
 
         # Build context from all memory systems
-        personal_context = self.memory.get_context(user_input)
-        group_context = self.group_memory.get_context(user_input, engine=engine)
-        game_context = self.game_memory.get_context(self.active_game) if self.active_game else ""
-
-        memory_context = ""
-        if game_context:
-            memory_context += game_context + "\n\n"
-        if personal_context:
-            memory_context += personal_context + "\n\n"
-        if group_context:
-            memory_context += group_context + "\n\n"
+        memory_context = gather_context(
+            self.memory,
+            self.group_memory,
+            self.game_memory,
+            query=user_input,
+            engine=engine,
+            active_game=self.active_game,
+        ).combined()
 
         # Build system prompt with memory and engine context
         system_prompt = self.base_system_prompt
         if memory_context:
             system_prompt = f"{memory_context}\n\n{self.base_system_prompt}"
 
-        # WALL MODE: If wall context is loaded, use Gemini for analysis
-        if self.wall_context and self.gemini:
-            # Use Gemini for wall mode (800K context vs Claude's 200K)
-            try:
-                gemini_response = self.gemini.analyze(self.wall_context, user_input)
-                deva_response = gemini_response.text
-                self.messages.append({"role": "assistant", "content": deva_response})
-                self._save_conversation()
-                return deva_response
-            except Exception as e:
-                # Fall back to Claude without wall context
-                print(f"[Gemini error: {e}, falling back to Claude]")
-                self.wall_context = None  # Clear broken wall context
-
         # Add engine-specific context when active
         if self.active_engine:
             engine_context = {
@@ -532,14 +497,28 @@ Keep spoken output to 1-2 sentences. Just the result, not the process.
         else:
             max_response_tokens = 4096
 
-        response = self.client.messages.create(
-            model="claude-opus-4-20250514",
-            max_tokens=max_response_tokens,
-            system=system_prompt,
-            messages=self.messages,
-        )
+        return system_prompt, max_response_tokens, detected_engine
 
-        deva_response = response.content[0].text
+    def _think_wall(self, user_input: str) -> Optional[str]:
+        """WALL MODE: answer with Gemini if wall context is loaded, else None."""
+        if not (self.wall_context and self.gemini):
+            return None
+
+        # Use Gemini for wall mode (800K context vs Claude's 200K)
+        try:
+            gemini_response = self.gemini.analyze(self.wall_context, user_input)
+            deva_response = gemini_response.text
+            self.messages.append({"role": "assistant", "content": deva_response})
+            self._save_conversation()
+            return deva_response
+        except Exception as e:
+            # Fall back to Claude without wall context
+            print(f"[Gemini error: {e}, falling back to Claude]")
+            self.wall_context = None  # Clear broken wall context
+            return None
+
+    def _finish_turn(self, user_input: str, deva_response: str, detected_engine: str):
+        """Record DEVA's reply and save it to memory if it solved something."""
         self.messages.append({"role": "assistant", "content": deva_response})
         self._save_conversation()
 
@@ -566,8 +545,66 @@ Keep spoken output to 1-2 sentences. Just the result, not the process.
                     prevention=None
                 )
 
+    def think(self, user_input: str) -> str:
+        """Get DEVA's response from Claude with memory context."""
+        # Check if this needs tools (code editing, commands)
+        if self._needs_tools(user_input):
+            return self.think_with_tools(user_input)
+
+        system_prompt, max_response_tokens, detected_engine = self._prepare_turn(user_input)
+
+        wall_response = self._think_wall(user_input)
+        if wall_response is not None:
+            return wall_response
+
+        response = self.client.messages.create(
+            model="claude-opus-4-20250514",
+            max_tokens=max_response_tokens,
+            system=system_prompt,
+            messages=self.messages,
+        )
+
+        deva_response = response.content[0].text
+        self._finish_turn(user_input, deva_response, detected_engine)
         return deva_response
 
+    def can_stream(self, user_input: str) -> bool:
+        """True if this turn can use the speak-while-thinking pipeline."""
+        return not self._needs_tools(user_input) and not (self.wall_context and self.gemini)
+
+    def think_and_speak(self, user_input: str, on_sentence=None):
+        """
+        Stream Claude's reply and speak it sentence by sentence.
+
+        Returns:
+            (full_response, PipelineStats)
+        """
+        system_prompt, max_response_tokens, detected_engine = self._prepare_turn(user_input)
+        chunks: list[str] = []
+
+        def _tokens():
+            with self.client.messages.stream(
+                model="claude-opus-4-20250514",
+                max_tokens=max_response_tokens,
+                system=system_prompt,
+                messages=self.messages,
+            ) as stream:
+                for text in stream.text_stream:
+                    chunks.append(text)
+                    yield text
+
+        try:
+            stats = self.speech.run(_tokens(), on_sentence=on_sentence)
+        finally:
+            deva_response = "".join(chunks)
+            if deva_response:
+                self._finish_turn(user_input, deva_response, detected_engine)
+            else:
+                # Nothing came back - drop the dangling user message
+                self.messages.pop()
+
+        return deva_response, stats
+
 
 def main():
     print("=" * 50)
@@ -1036,6 +1073,18 @@ def main():
                 assistant.speak(response)
                 continue
 
+            # Think + speak, pipelined: sentences are spoken as they stream in
+            if assistant.can_stream(user_text):
+                print("DEVA: ", end="", flush=True)
+                response, stats = assistant.think_and_speak(
+                    user_text,
+                    on_sentence=lambda s: print(s, end=" ", flush=True),
+                )
+                print()
+                first_audio = stats.time_to_first_audio or 0.0
+                print(f"[STT:{stt_time:.1f}s FirstAudio:{first_audio:.1f}s Total:{stats.total_time:.1f}s]\n")
+                continue
+
             # Think
             t2 = time.time()
             assistant._last_full_response = None
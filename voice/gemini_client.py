@@ -261,7 +261,8 @@ class WallAnalyzer:
         question: str,
         subsystem: Optional[str] = None,
         query_filter: Optional[str] = None,
-        force_refresh: bool = False
+        force_refresh: bool = False,
+        focus: bool = True
     ) -> str:
         """
         Ask a question about the codebase.
@@ -269,18 +270,22 @@ class WallAnalyzer:
         Args:
             question: Question to answer
             subsystem: Filter to specific subsystem (voice, networking, etc.)
-            query_filter: Keyword filter for relevant files
+            query_filter: Rank files against this text instead of the question
             force_refresh: Force re-collection even if cached
+            focus: Rank files against the question (most relevant first; over
+                   the token budget, relevant files are kept ahead of the rest)
 
         Returns:
             Analysis response text
         """
-        # Collect context (with caching)
-        cache_key = (subsystem, query_filter)
+        # Collect context (with caching). Re-collecting per question is cheap:
+        # the snapshot index only re-reads changed files.
+        query = query_filter or (question if focus else None)
+        cache_key = (subsystem, query)
 
         if force_refresh or self.last_result is None or self.last_result[0] != cache_key:
             print(f"[Wall] Collecting {'subsystem=' + subsystem if subsystem else 'full project'}...")
-            result = self.collector.collect(subsystem=subsystem, query=query_filter)
+            result = self.collector.collect(subsystem=subsystem, query=query)
             self.last_result = (cache_key, result)
             print(f"[Wall] Loaded {result.total_files} files, {result.total_tokens:,} tokens")
         else:
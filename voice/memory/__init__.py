@@ -1,5 +1,17 @@
 """DEVA Memory System - Persistent knowledge and conversation history."""
 
-from .memory_manager import DevaMemory, GroupMemory, GameMemory
+from .memory_manager import (
+    DevaMemory,
+    GroupMemory,
+    GameMemory,
+    MemoryContext,
+    gather_context,
+)
 
-__all__ = ["DevaMemory", "GroupMemory", "GameMemory"]
+__all__ = [
+    "DevaMemory",
+    "GroupMemory",
+    "GameMemory",
+    "MemoryContext",
+    "gather_context",
+]
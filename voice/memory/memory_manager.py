@@ -4,15 +4,175 @@ DEVA Memory Manager - Persistent memory for voice assistant.
 Two memory systems:
 1. DevaMemory - Individual user's context, preferences, conversation history
 2. GroupMemory - Shared knowledge across all DEVA users (Unity/Unreal/Godot solutions)
+
+Each store keeps one long-lived WAL-mode connection. gather_context() runs the
+per-turn lookups of all three stores and builds the prompt block.
 """
 
 import json
+import math
 import os
+import re
 import sqlite3
 import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Tuple, List
 
+# How long a writer waits on a locked database before giving up
+BUSY_TIMEOUT_SECONDS = 5.0
+
+
+class _SharedConnection:
+    """
+    One long-lived connection per store, shared across threads.
+
+    WAL mode lets the other stores (and other processes) read while one
+    writes; the lock serializes use of this connection. Used like the
+    sqlite3 connection context manager: commit on success, rollback on error.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def __call__(self):
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._open()
+            conn = self._conn
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# === Search ===
+
+# FTS column weights for bm25 (higher = that column matters more)
+SOLUTION_WEIGHTS = (10.0, 4.0, 1.0, 2.0)    # problem, solution, category, tags
+KNOWLEDGE_WEIGHTS = (5.0, 2.0, 1.0)         # topic, content, category
+
+# How many FTS hits to rerank in Python per result returned
+SEARCH_CANDIDATES_PER_RESULT = 10
+
+# Score added for a substring hit on an identifier (e.g. "PlayerController")
+IDENTIFIER_HIT_WEIGHT = 5.0
+
+_SEARCH_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "can", "do", "does",
+    "doesn", "don", "for", "from", "get", "gets", "getting", "has", "have", "how",
+    "i", "if", "in", "into", "is", "it", "its", "me", "my", "not", "of", "on",
+    "or", "so", "that", "the", "then", "there", "this", "to", "up", "was",
+    "what", "when", "where", "which", "why", "with", "would", "you", "your",
+    "keeps", "still", "just", "any", "some", "after", "before", "near",
+}
+
+_SEARCH_TERM_RE = re.compile(r"[A-Za-z0-9_]+")
+
+
+def _search_stem(term: str) -> str:
+    """Light suffix strip; the FTS prefix query ("fall"*) covers the variants."""
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(term) > len(suffix) + 3 and term.endswith(suffix):
+            return term[: -len(suffix)]
+    return term
+
+
+def _is_identifier(word: str) -> bool:
+    """camelCase / PascalCase / snake_case / mixed digits - looks like code."""
+    return (
+        "_" in word.strip("_")
+        or bool(re.search(r"[a-z][A-Z]", word))
+        or (any(c.isdigit() for c in word) and any(c.isalpha() for c in word))
+    )
+
+
+def search_terms(query: str) -> List[str]:
+    """Distinct, stemmed, non-stopword terms of a free-form question."""
+    terms = []
+    for word in _SEARCH_TERM_RE.findall(query):
+        term = word.lower()
+        if len(term) < 2 or term in _SEARCH_STOPWORDS:
+            continue
+        term = _search_stem(term)
+        if term not in terms:
+            terms.append(term)
+    return terms
+
+
+def build_fts_query(query: str, operator: str = "OR") -> Optional[str]:
+    """
+    Turn a free-form question into an FTS5 query of stemmed prefix terms:
+    "player falls through floor" -> "player"* OR "fall"* OR "through"* OR "floor"*
+    bm25 then weights documents by how many (and how rare) terms they hit.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return None
+    return f" {operator} ".join(f'"{t}"*' for t in terms)
+
+
+def _ranked_fts_rows(conn: sqlite3.Connection, sql: str, query: str, args: tuple, limit: int, want: int) -> list:
+    """
+    Run a ranked FTS select (first placeholder = MATCH, last = LIMIT).
+
+    All-terms (AND) first: small match set, cheap to rank, best precision.
+    Only if that finds fewer than `want` rows do we rank the much larger
+    any-term (OR) set, keeping AND hits first.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    rows = []
+    if len(terms) > 1:
+        rows = conn.execute(sql, (build_fts_query(query, "AND"), *args, limit)).fetchall()
+        if len(rows) >= want:
+            return rows
+    seen = {r[0] for r in rows}
+    more = conn.execute(sql, (build_fts_query(query, "OR"), *args, limit)).fetchall()
+    return rows + [r for r in more if r[0] not in seen]
+
+
+def identifier_terms(query: str) -> List[str]:
+    """Identifier-style words worth a substring (trigram) lookup."""
+    found = []
+    for word in _SEARCH_TERM_RE.findall(query):
+        if len(word) >= 4 and _is_identifier(word) and word.lower() not in found:
+            found.append(word.lower())
+    return found
+
+
+def _touch_last_used(conn: sqlite3.Connection, table: str, ids: List[int]):
+    """Bump last_used for exactly the returned rows, in one statement."""
+    if ids:
+        placeholders = ",".join("?" * len(ids))
+        conn.execute(
+            f"UPDATE {table} SET last_used = CURRENT_TIMESTAMP WHERE id IN ({placeholders})",
+            ids,
+        )
+
 
 class DevaMemory:
     """
@@ -29,11 +189,20 @@ class DevaMemory:
             )
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         self.db_path = db_path
+        self._db = _SharedConnection(db_path)
         self._init_db()
 
+    def _connect(self):
+        """Shared WAL connection (use as a context manager)."""
+        return self._db()
+
+    def close(self):
+        """Close the shared connection (reopened lazily on next use)."""
+        self._db.close()
+
     def _init_db(self):
         """Initialize database tables."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.executescript("""
                 -- User profile
                 CREATE TABLE IF NOT EXISTS user_profile (
@@ -81,19 +250,26 @@ class DevaMemory:
                     VALUES('delete', old.id, old.topic, old.content, old.category);
                 END;
 
-                CREATE TRIGGER IF NOT EXISTS knowledge_au AFTER UPDATE ON knowledge BEGIN
+                -- Only re-index when indexed text changes (not on last_used bumps)
+                DROP TRIGGER IF EXISTS knowledge_au;
+                CREATE TRIGGER knowledge_au AFTER UPDATE OF topic, content, category ON knowledge BEGIN
                     INSERT INTO knowledge_fts(knowledge_fts, rowid, topic, content, category)
                     VALUES('delete', old.id, old.topic, old.content, old.category);
                     INSERT INTO knowledge_fts(rowid, topic, content, category)
                     VALUES (new.id, new.topic, new.content, new.category);
                 END;
             """)
+            # Column-weighted bm25 as the FTS rank (topic > content > category)
+            conn.execute(
+                "INSERT INTO knowledge_fts(knowledge_fts, rank) VALUES('rank', ?)",
+                (f"bm25({', '.join(map(str, KNOWLEDGE_WEIGHTS))})",),
+            )
 
     # === User Profile ===
 
     def set_user(self, key: str, value: str):
         """Set a user profile value (name, project, preferences)."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 INSERT OR REPLACE INTO user_profile (key, value, updated_at)
                 VALUES (?, ?, CURRENT_TIMESTAMP)
@@ -101,7 +277,7 @@ class DevaMemory:
 
     def get_user(self, key: str) -> Optional[str]:
         """Get a user profile value."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             row = conn.execute(
                 "SELECT value FROM user_profile WHERE key = ?", (key,)
             ).fetchone()
@@ -109,7 +285,7 @@ class DevaMemory:
 
     def get_user_context(self) -> str:
         """Get full user context for prompts."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute("SELECT key, value FROM user_profile").fetchall()
 
         if not rows:
@@ -124,7 +300,7 @@ class DevaMemory:
 
     def save_conversation(self, summary: str, topics: list = None, mood: str = None):
         """Save a conversation summary."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 INSERT INTO conversations (summary, topics, mood)
                 VALUES (?, ?, ?)
@@ -132,7 +308,7 @@ class DevaMemory:
 
     def get_recent_conversations(self, limit: int = 5) -> list:
         """Get recent conversation summaries."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute("""
                 SELECT summary, topics, mood, timestamp
                 FROM conversations
@@ -166,36 +342,32 @@ class DevaMemory:
 
     def learn(self, topic: str, content: str, category: str = "general", source: str = "conversation"):
         """Store new knowledge."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 INSERT INTO knowledge (category, topic, content, source)
                 VALUES (?, ?, ?, ?)
             """, (category, topic, content, source))
 
     def recall(self, query: str, limit: int = 3) -> list:
-        """Search knowledge store."""
-        with sqlite3.connect(self.db_path) as conn:
-            # Escape special FTS characters
-            safe_query = query.replace('"', '""')
+        """Search knowledge store (weighted OR terms, best bm25 first)."""
+        if not search_terms(query):
+            return []
 
-            rows = conn.execute("""
-                SELECT k.topic, k.content, k.category, k.confidence
-                FROM knowledge k
-                JOIN knowledge_fts fts ON k.id = fts.rowid
+        with self._connect() as conn:
+            rows = _ranked_fts_rows(conn, """
+                SELECT k.id, k.topic, k.content, k.category, k.confidence
+                FROM knowledge_fts
+                JOIN knowledge k ON k.id = knowledge_fts.rowid
                 WHERE knowledge_fts MATCH ?
-                ORDER BY rank
+                ORDER BY knowledge_fts.rank
                 LIMIT ?
-            """, (f'"{safe_query}"', limit)).fetchall()
+            """, query, (), limit, limit)[:limit]
 
-            # Update last_used for recalled items
-            if rows:
-                conn.execute("""
-                    UPDATE knowledge SET last_used = CURRENT_TIMESTAMP
-                    WHERE topic IN (SELECT topic FROM knowledge_fts WHERE knowledge_fts MATCH ?)
-                """, (f'"{safe_query}"',))
+            # Update last_used for exactly the recalled items
+            _touch_last_used(conn, "knowledge", [r[0] for r in rows])
 
         return [
-            {"topic": r[0], "content": r[1], "category": r[2], "confidence": r[3]}
+            {"topic": r[1], "content": r[2], "category": r[3], "confidence": r[4]}
             for r in rows
         ]
 
@@ -235,7 +407,7 @@ class DevaMemory:
 
     def get_stats(self) -> dict:
         """Get memory statistics."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             user_count = conn.execute("SELECT COUNT(*) FROM user_profile").fetchone()[0]
             convo_count = conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
             knowledge_count = conn.execute("SELECT COUNT(*) FROM knowledge").fetchone()[0]
@@ -272,11 +444,20 @@ class GroupMemory:
             )
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         self.db_path = db_path
+        self._db = _SharedConnection(db_path)
         self._init_db()
 
+    def _connect(self):
+        """Shared WAL connection (use as a context manager)."""
+        return self._db()
+
+    def close(self):
+        """Close the shared connection (reopened lazily on next use)."""
+        self._db.close()
+
     def _init_db(self):
         """Initialize group knowledge tables."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.executescript("""
                 -- Shared solutions from all DEVA users
                 CREATE TABLE IF NOT EXISTS solutions (
@@ -313,7 +494,9 @@ class GroupMemory:
                     VALUES('delete', old.id, old.problem, old.solution, old.category, old.tags);
                 END;
 
-                CREATE TRIGGER IF NOT EXISTS solutions_au AFTER UPDATE ON solutions BEGIN
+                -- Only re-index when indexed text changes (not on last_used/upvotes)
+                DROP TRIGGER IF EXISTS solutions_au;
+                CREATE TRIGGER solutions_au AFTER UPDATE OF problem, solution, category, tags ON solutions BEGIN
                     INSERT INTO solutions_fts(solutions_fts, rowid, problem, solution, category, tags)
                     VALUES('delete', old.id, old.problem, old.solution, old.category, old.tags);
                     INSERT INTO solutions_fts(rowid, problem, solution, category, tags)
@@ -328,6 +511,56 @@ class GroupMemory:
                 );
             """)
 
+            # Column-weighted bm25 as the FTS rank (problem > solution > tags > category)
+            conn.execute(
+                "INSERT INTO solutions_fts(solutions_fts, rank) VALUES('rank', ?)",
+                (f"bm25({', '.join(map(str, SOLUTION_WEIGHTS))})",),
+            )
+
+            self._has_ident_index = self._init_ident_index(conn)
+
+    def _init_ident_index(self, conn: sqlite3.Connection) -> bool:
+        """
+        Trigram index for identifier lookups ("PlayerController" inside
+        "m_playerController.Move()"). Needs SQLite 3.34+; search works
+        without it, just without substring matches.
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'solutions_ident'"
+        ).fetchone()
+        try:
+            conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS solutions_ident USING fts5(
+                    problem, solution, code_snippet, tags,
+                    content='solutions',
+                    content_rowid='id',
+                    tokenize='trigram'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS solutions_ident_ai AFTER INSERT ON solutions BEGIN
+                    INSERT INTO solutions_ident(rowid, problem, solution, code_snippet, tags)
+                    VALUES (new.id, new.problem, new.solution, new.code_snippet, new.tags);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS solutions_ident_ad AFTER DELETE ON solutions BEGIN
+                    INSERT INTO solutions_ident(solutions_ident, rowid, problem, solution, code_snippet, tags)
+                    VALUES('delete', old.id, old.problem, old.solution, old.code_snippet, old.tags);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS solutions_ident_au AFTER UPDATE OF problem, solution, code_snippet, tags ON solutions BEGIN
+                    INSERT INTO solutions_ident(solutions_ident, rowid, problem, solution, code_snippet, tags)
+                    VALUES('delete', old.id, old.problem, old.solution, old.code_snippet, old.tags);
+                    INSERT INTO solutions_ident(rowid, problem, solution, code_snippet, tags)
+                    VALUES (new.id, new.problem, new.solution, new.code_snippet, new.tags);
+                END;
+            """)
+        except sqlite3.OperationalError:
+            return False
+        if not exists:
+            # Existing knowledge base: index what's already there
+            conn.execute("INSERT INTO solutions_ident(solutions_ident) VALUES('rebuild')")
+        return True
+
     def _hash_solution(self, problem: str, solution: str) -> str:
         """Generate hash for deduplication."""
         content = f"{problem.lower().strip()}:{solution.lower().strip()}"
@@ -350,7 +583,7 @@ class GroupMemory:
         """
         solution_hash = self._hash_solution(problem, solution)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             try:
                 conn.execute("""
                     INSERT INTO solutions
@@ -375,54 +608,77 @@ class GroupMemory:
         """
         Search for solutions matching a query.
 
+        Terms are OR-ed and ranked by column-weighted bm25, identifier-style
+        terms also hit the trigram index, then upvotes/verified nudge the
+        order. Only the returned rows get last_used bumped.
+
         Args:
             query: Search terms
             engine: Filter by engine (unity, unreal, godot) or None for all
             limit: Max results
         """
-        with sqlite3.connect(self.db_path) as conn:
-            safe_query = query.replace('"', '""')
+        has_terms = bool(search_terms(query))
+        idents = identifier_terms(query) if self._has_ident_index else []
+        if not has_terms and not idents:
+            return []
 
-            if engine:
-                rows = conn.execute("""
-                    SELECT s.problem, s.solution, s.code_snippet, s.engine,
-                           s.category, s.tags, s.upvotes, s.verified
-                    FROM solutions s
-                    JOIN solutions_fts fts ON s.id = fts.rowid
-                    WHERE solutions_fts MATCH ? AND s.engine = ?
-                    ORDER BY s.upvotes DESC, rank
+        engine_sql = " AND s.engine = ?" if engine else ""
+        engine_args = (engine.lower(),) if engine else ()
+        candidates = limit * SEARCH_CANDIDATES_PER_RESULT
+        columns = """s.id, s.problem, s.solution, s.code_snippet, s.engine,
+                     s.category, s.tags, s.upvotes, s.verified"""
+
+        with self._connect() as conn:
+            found = {}  # id -> (row, relevance)
+
+            if has_terms:
+                rows = _ranked_fts_rows(conn, f"""
+                    SELECT {columns}, solutions_fts.rank
+                    FROM solutions_fts
+                    JOIN solutions s ON s.id = solutions_fts.rowid
+                    WHERE solutions_fts MATCH ?{engine_sql}
+                    ORDER BY solutions_fts.rank
                     LIMIT ?
-                """, (f'"{safe_query}"', engine.lower(), limit)).fetchall()
-            else:
-                rows = conn.execute("""
-                    SELECT s.problem, s.solution, s.code_snippet, s.engine,
-                           s.category, s.tags, s.upvotes, s.verified
-                    FROM solutions s
-                    JOIN solutions_fts fts ON s.id = fts.rowid
-                    WHERE solutions_fts MATCH ?
-                    ORDER BY s.upvotes DESC, rank
+                """, query, engine_args, candidates, limit)
+                for r in rows:
+                    found[r[0]] = (r[:-1], -r[-1])  # bm25 is negative, lower = better
+
+            for ident in idents:
+                safe = ident.replace('"', '""')
+                rows = conn.execute(f"""
+                    SELECT {columns}
+                    FROM solutions_ident
+                    JOIN solutions s ON s.id = solutions_ident.rowid
+                    WHERE solutions_ident MATCH ?{engine_sql}
                     LIMIT ?
-                """, (f'"{safe_query}"', limit)).fetchall()
+                """, (f'"{safe}"', *engine_args, candidates)).fetchall()
+                for r in rows:
+                    row, relevance = found.get(r[0], (r, 0.0))
+                    found[r[0]] = (row, relevance + IDENTIFIER_HIT_WEIGHT)
 
-            # Update last_used for retrieved solutions
-            if rows:
-                conn.execute("""
-                    UPDATE solutions SET last_used = CURRENT_TIMESTAMP
-                    WHERE id IN (
-                        SELECT rowid FROM solutions_fts WHERE solutions_fts MATCH ?
-                    )
-                """, (f'"{safe_query}"',))
+            def _score(item):
+                row, relevance = item
+                boost = 1.0 + 0.1 * math.log1p(row[7] or 0)
+                if row[8]:
+                    boost *= 1.2
+                return relevance * boost
+
+            ranked = sorted(found.values(), key=_score, reverse=True)[:limit]
+            rows = [row for row, _ in ranked]
+
+            # Update last_used for exactly the retrieved solutions
+            _touch_last_used(conn, "solutions", [r[0] for r in rows])
 
         return [
             {
-                "problem": r[0],
-                "solution": r[1],
-                "code_snippet": r[2],
-                "engine": r[3],
-                "category": r[4],
-                "tags": json.loads(r[5]) if r[5] else [],
-                "upvotes": r[6],
-                "verified": bool(r[7])
+                "problem": r[1],
+                "solution": r[2],
+                "code_snippet": r[3],
+                "engine": r[4],
+                "category": r[5],
+                "tags": json.loads(r[6]) if r[6] else [],
+                "upvotes": r[7],
+                "verified": bool(r[8])
             }
             for r in rows
         ]
@@ -445,7 +701,7 @@ class GroupMemory:
     def upvote(self, problem: str, solution: str) -> bool:
         """Upvote a solution (when it works for another user)."""
         solution_hash = self._hash_solution(problem, solution)
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("""
                 UPDATE solutions SET upvotes = upvotes + 1
                 WHERE solution_hash = ?
@@ -454,7 +710,7 @@ class GroupMemory:
 
     def get_stats(self) -> dict:
         """Get group knowledge statistics."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             total = conn.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
             by_engine = conn.execute("""
                 SELECT engine, COUNT(*) FROM solutions GROUP BY engine
@@ -476,7 +732,7 @@ class GroupMemory:
                 os.path.dirname(self.db_path), "group_knowledge_export.json"
             )
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute("""
                 SELECT solution_hash, engine, category, problem, solution,
                        code_snippet, tags, upvotes, verified, contributor_id, created_at
@@ -545,11 +801,20 @@ class GameMemory:
             )
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         self.db_path = db_path
+        self._db = _SharedConnection(db_path)
         self._init_db()
 
+    def _connect(self):
+        """Shared WAL connection (use as a context manager)."""
+        return self._db()
+
+    def close(self):
+        """Close the shared connection (reopened lazily on next use)."""
+        self._db.close()
+
     def _init_db(self):
         """Initialize game memory tables."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.executescript("""
                 -- Registered games
                 CREATE TABLE IF NOT EXISTS games (
@@ -634,7 +899,7 @@ class GameMemory:
 
     def register_game(self, name: str, engine: str, project_path: str = None, description: str = None) -> int:
         """Register a new game project."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             try:
                 cursor = conn.execute("""
                     INSERT INTO games (name, engine, project_path, description)
@@ -648,7 +913,7 @@ class GameMemory:
 
     def get_game(self, name: str) -> Optional[dict]:
         """Get game by name."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             row = conn.execute("""
                 SELECT id, name, engine, project_path, description, last_accessed
                 FROM games WHERE LOWER(name) = LOWER(?)
@@ -669,7 +934,7 @@ class GameMemory:
 
     def list_games(self, engine: str = None) -> List[dict]:
         """List all registered games, optionally filtered by engine."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             if engine:
                 rows = conn.execute("""
                     SELECT id, name, engine, description FROM games
@@ -692,7 +957,7 @@ class GameMemory:
         if not game:
             return False
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 INSERT INTO game_architecture (game_id, system_name, description, key_files, patterns, notes)
                 VALUES (?, ?, ?, ?, ?, ?)
@@ -705,7 +970,7 @@ class GameMemory:
         if not game:
             return []
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute("""
                 SELECT system_name, description, key_files, patterns, notes
                 FROM game_architecture WHERE game_id = ?
@@ -728,7 +993,7 @@ class GameMemory:
         if not game:
             return False
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 INSERT OR REPLACE INTO game_files (game_id, file_path, purpose, key_classes, dependencies, notes)
                 VALUES (?, ?, ?, ?, ?, ?)
@@ -741,7 +1006,7 @@ class GameMemory:
         if not game:
             return []
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute("""
                 SELECT file_path, purpose, key_classes, dependencies, notes
                 FROM game_files WHERE game_id = ?
@@ -764,7 +1029,7 @@ class GameMemory:
         if not game:
             return False
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 INSERT INTO game_bugs (game_id, bug_description, solution, affected_files, root_cause, prevention)
                 VALUES (?, ?, ?, ?, ?, ?)
@@ -777,7 +1042,7 @@ class GameMemory:
         if not game:
             return []
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute("""
                 SELECT bug_description, solution, affected_files, root_cause, prevention, created_at
                 FROM game_bugs WHERE game_id = ? ORDER BY created_at DESC
@@ -800,7 +1065,7 @@ class GameMemory:
         if not game:
             return False
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 INSERT INTO game_decisions (game_id, category, decision, reasoning)
                 VALUES (?, ?, ?, ?)
@@ -813,7 +1078,7 @@ class GameMemory:
         if not game:
             return []
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             if category:
                 rows = conn.execute("""
                     SELECT category, decision, reasoning FROM game_decisions
@@ -834,7 +1099,7 @@ class GameMemory:
         if not game:
             return False
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 INSERT INTO game_notes (game_id, topic, content)
                 VALUES (?, ?, ?)
@@ -847,7 +1112,7 @@ class GameMemory:
         if not game:
             return []
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute("""
                 SELECT topic, content, created_at FROM game_notes WHERE game_id = ?
             """, (game["id"],)).fetchall()
@@ -892,7 +1157,7 @@ class GameMemory:
 
     def get_stats(self) -> dict:
         """Get game memory statistics."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             games = conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
             systems = conn.execute("SELECT COUNT(*) FROM game_architecture").fetchone()[0]
             files = conn.execute("SELECT COUNT(*) FROM game_files").fetchone()[0]
@@ -990,3 +1255,56 @@ class GameMemory:
     def __repr__(self):
         stats = self.get_stats()
         return f"GameMemory(games={stats['games']}, systems={stats['systems']}, bugs={stats['bugs']})"
+
+
+# === Combined Context Fetch ===
+
+@dataclass
+class MemoryContext:
+    """Result of one combined memory lookup."""
+    personal: str = ""
+    group: str = ""
+    game: str = ""
+    elapsed: float = 0.0
+    timings: dict = field(default_factory=dict)     # lookup -> seconds
+
+    def combined(self) -> str:
+        """Prompt block: game first, then personal, then community knowledge."""
+        memory_context = ""
+        for part in (self.game, self.personal, self.group):
+            if part:
+                memory_context += part + "\n\n"
+        return memory_context
+
+
+def gather_context(
+    memory: Optional[DevaMemory],
+    group_memory: Optional[GroupMemory] = None,
+    game_memory: Optional[GameMemory] = None,
+    query: str = "",
+    engine: Optional[str] = None,
+    active_game: Optional[str] = None,
+) -> MemoryContext:
+    """
+    Fetch personal, group and game context for one turn.
+
+    The lookups run one after another: on the shared connections each takes
+    a few milliseconds, and running them on a thread pool measured no faster
+    (see voice/test_memory_context.py).
+    """
+    start = time.perf_counter()
+    result = MemoryContext()
+    lookups = []
+    if memory is not None:
+        lookups.append(("personal", memory.get_context, (query,), {}))
+    if group_memory is not None and query:
+        lookups.append(("group", group_memory.get_context, (query,), {"engine": engine}))
+    if game_memory is not None and active_game:
+        lookups.append(("game", game_memory.get_context, (active_game,), {}))
+
+    for name, fn, args, kwargs in lookups:
+        t0 = time.perf_counter()
+        setattr(result, name, fn(*args, **kwargs))
+        result.timings[name] = time.perf_counter() - t0
+    result.elapsed = time.perf_counter() - start
+    return result
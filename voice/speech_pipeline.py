@@ -0,0 +1,373 @@
+"""
+Speech Pipeline - Speak while thinking.
+
+Instead of waiting for the full LLM reply, then the full TTS download, then
+playing, the pipeline overlaps all three:
+
+    LLM tokens -> sentence splitter -> TTS (per sentence) -> audio queue -> speaker
+
+Sentence 1 is being played while sentence 2 is being synthesized and
+sentence 3 is still being generated. Audio is requested from ElevenLabs as
+raw PCM so chunks can be played straight from memory with no MP3 decode or
+temp file.
+
+Usage:
+    pipeline = SpeechPipeline(ElevenLabsStreamTTS(voice_id), SoundDeviceSink())
+    stats = pipeline.run(token_iterator)
+    print(stats.time_to_first_audio)
+"""
+
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+# PCM format requested from ElevenLabs (16-bit mono)
+PCM_SAMPLE_RATE = 22050
+PCM_FORMAT = f"pcm_{PCM_SAMPLE_RATE}"
+
+# Don't send fragments shorter than this to TTS (e.g. "Hi." or "Ok.") -
+# they are merged into the next sentence instead. The first sentence is
+# allowed to be shorter so audio starts as early as possible.
+MIN_SENTENCE_CHARS = 40
+MIN_FIRST_SENTENCE_CHARS = 12
+
+# Bounded audio buffer (~10s of 22kHz PCM in 4KB chunks)
+AUDIO_QUEUE_CHUNKS = 128
+
+_SENTENCE_END = re.compile(r'[.!?…]+["\')\]]*\s+|\n{2,}|\n(?=\s*[-*\d])')
+
+
+class TextToSpeechStream(Protocol):
+    """Anything that turns one sentence into a stream of PCM chunks."""
+
+    sample_rate: int
+
+    def stream(self, text: str) -> Iterator[bytes]:
+        ...
+
+
+class AudioSink(Protocol):
+    """Anything that accepts 16-bit mono PCM chunks."""
+
+    def start(self, sample_rate: int):
+        ...
+
+    def write(self, pcm: bytes):
+        ...
+
+    def close(self):
+        ...
+
+
+# ------------------------------------------------------------------
+# Sentence splitting
+# ------------------------------------------------------------------
+
+class SentenceSplitter:
+    """Incrementally splits a token stream into speakable sentences."""
+
+    def __init__(
+        self,
+        min_chars: int = MIN_SENTENCE_CHARS,
+        min_first_chars: int = MIN_FIRST_SENTENCE_CHARS,
+    ):
+        self.min_chars = min_chars
+        self.min_first_chars = min_first_chars
+        self._buffer = ""
+        self._emitted = 0
+
+    def feed(self, delta: str) -> list[str]:
+        """Add text, return any sentences that are now complete."""
+        self._buffer += delta
+        sentences = []
+        search_from = 0
+
+        while True:
+            match = _SENTENCE_END.search(self._buffer, search_from)
+            if not match:
+                break
+            candidate = self._buffer[:match.end()].strip()
+            minimum = self.min_first_chars if self._emitted == 0 else self.min_chars
+            if len(candidate) < minimum:
+                # Too short to be worth a TTS round-trip - keep accumulating
+                search_from = match.end()
+                continue
+            sentences.append(candidate)
+            self._emitted += 1
+            self._buffer = self._buffer[match.end():]
+            search_from = 0
+
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Return whatever is left once the token stream ends."""
+        rest = self._buffer.strip()
+        self._buffer = ""
+        if rest:
+            self._emitted += 1
+            return rest
+        return None
+
+
+def split_sentences(tokens: Iterable[str]) -> Iterator[str]:
+    """Convenience generator: tokens in, sentences out."""
+    splitter = SentenceSplitter()
+    for delta in tokens:
+        yield from splitter.feed(delta)
+    rest = splitter.flush()
+    if rest:
+        yield rest
+
+
+# ------------------------------------------------------------------
+# TTS + sinks
+# ------------------------------------------------------------------
+
+class ElevenLabsStreamTTS:
+    """ElevenLabs streaming endpoint returning raw PCM, on one pooled client."""
+
+    def __init__(
+        self,
+        voice_id: str,
+        model: str = "eleven_flash_v2_5",
+        voice_settings: Optional[dict] = None,
+        api_key: Optional[str] = None,
+        sample_rate: int = PCM_SAMPLE_RATE,
+    ):
+        import httpx
+
+        self.voice_id = voice_id
+        self.model = model
+        self.voice_settings = voice_settings or {"stability": 0.5, "similarity_boost": 0.75}
+        self.sample_rate = sample_rate
+        self._api_key = api_key or os.environ.get("ELEVENLABS_API_KEY")
+        # Keep-alive connection reused across sentences and turns
+        self._client = httpx.Client(timeout=30)
+
+    def stream(self, text: str) -> Iterator[bytes]:
+        url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.voice_id}/stream"
+        params = {
+            "output_format": f"pcm_{self.sample_rate}",
+            "optimize_streaming_latency": 3,
+        }
+        headers = {
+            "Content-Type": "application/json",
+            "xi-api-key": self._api_key,
+        }
+        data = {
+            "text": text,
+            "model_id": self.model,
+            "voice_settings": self.voice_settings,
+        }
+
+        with self._client.stream("POST", url, params=params, headers=headers, json=data) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"TTS Error: {response.status_code}")
+            for chunk in response.iter_bytes(chunk_size=4096):
+                if chunk:
+                    yield chunk
+
+    def close(self):
+        self._client.close()
+
+
+class SoundDeviceSink:
+    """Plays PCM chunks through sounddevice as they arrive."""
+
+    def __init__(self, device_id: Optional[int] = None):
+        self.device_id = device_id
+        self._stream = None
+        self._carry = b""
+
+    def start(self, sample_rate: int):
+        import sounddevice as sd
+
+        if self._stream is None:
+            self._stream = sd.RawOutputStream(
+                samplerate=sample_rate,
+                channels=1,
+                dtype="int16",
+                device=self.device_id,
+            )
+            self._stream.start()
+
+    def write(self, pcm: bytes):
+        # HTTP chunks can split a 16-bit sample in half
+        pcm = self._carry + pcm
+        usable = len(pcm) - (len(pcm) % 2)
+        self._carry = pcm[usable:]
+        if usable:
+            self._stream.write(pcm[:usable])
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+        self._carry = b""
+
+
+class NullSink:
+    """Discards audio but records when it arrived (for benchmarks)."""
+
+    def __init__(self, realtime: bool = False):
+        self.realtime = realtime
+        self.sample_rate = PCM_SAMPLE_RATE
+        self.bytes_written = 0
+        self.first_write_at: Optional[float] = None
+
+    def start(self, sample_rate: int):
+        self.sample_rate = sample_rate
+
+    def write(self, pcm: bytes):
+        if self.first_write_at is None:
+            self.first_write_at = time.perf_counter()
+        self.bytes_written += len(pcm)
+        if self.realtime:
+            # Simulate a speaker consuming audio at playback speed
+            time.sleep(len(pcm) / 2 / self.sample_rate)
+
+    def close(self):
+        pass
+
+
+# ------------------------------------------------------------------
+# Pipeline
+# ------------------------------------------------------------------
+
+@dataclass
+class PipelineStats:
+    """Latency breakdown for one spoken reply (seconds from run() start)."""
+
+    time_to_first_token: Optional[float] = None
+    time_to_first_sentence: Optional[float] = None
+    time_to_first_audio: Optional[float] = None
+    total_time: float = 0.0
+    sentences: list[str] = field(default_factory=list)
+    audio_bytes: int = 0
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.sentences)
+
+
+_DONE = object()
+
+
+class SpeechPipeline:
+    """
+    Runs LLM -> TTS -> playback as three overlapping stages.
+
+    The calling thread consumes tokens; a TTS worker synthesizes sentences
+    in order; a playback worker drains the in-memory audio queue into the
+    sink. run() returns once the last chunk has been played.
+    """
+
+    def __init__(self, tts: TextToSpeechStream, sink: AudioSink):
+        self.tts = tts
+        self.sink = sink
+
+    def run(
+        self,
+        tokens: Iterable[str],
+        on_sentence: Optional[Callable[[str], None]] = None,
+    ) -> PipelineStats:
+        """
+        Speak a token stream. `on_sentence` is called (on this thread) for
+        each sentence as it is handed to TTS, e.g. to echo it to the console.
+        """
+        stats = PipelineStats()
+        start = time.perf_counter()
+        sentence_q: "queue.Queue" = queue.Queue()
+        audio_q: "queue.Queue" = queue.Queue(maxsize=AUDIO_QUEUE_CHUNKS)
+        errors: list[BaseException] = []
+        cancelled = threading.Event()
+
+        def _tts_worker():
+            try:
+                while True:
+                    sentence = sentence_q.get()
+                    if sentence is _DONE or cancelled.is_set():
+                        break
+                    for chunk in self.tts.stream(sentence):
+                        if cancelled.is_set():
+                            break
+                        audio_q.put(chunk)
+            except BaseException as e:
+                errors.append(e)
+                # Stop the LLM stream too - nothing more can be spoken
+                cancelled.set()
+            finally:
+                audio_q.put(_DONE)
+
+        def _playback_worker():
+            started = False
+            try:
+                while True:
+                    chunk = audio_q.get()
+                    if chunk is _DONE:
+                        break
+                    if not started:
+                        self.sink.start(self.tts.sample_rate)
+                        started = True
+                        stats.time_to_first_audio = time.perf_counter() - start
+                    self.sink.write(chunk)
+                    stats.audio_bytes += len(chunk)
+            except BaseException as e:
+                errors.append(e)
+                cancelled.set()
+                # Keep draining so the TTS worker never blocks on a full queue
+                while audio_q.get() is not _DONE:
+                    pass
+            finally:
+                self.sink.close()
+
+        tts_thread = threading.Thread(target=_tts_worker, daemon=True)
+        play_thread = threading.Thread(target=_playback_worker, daemon=True)
+        tts_thread.start()
+        play_thread.start()
+
+        splitter = SentenceSplitter()
+
+        def _emit(sentence: str):
+            if stats.time_to_first_sentence is None:
+                stats.time_to_first_sentence = time.perf_counter() - start
+            stats.sentences.append(sentence)
+            sentence_q.put(sentence)
+            if on_sentence:
+                on_sentence(sentence)
+
+        try:
+            for delta in tokens:
+                if stats.time_to_first_token is None:
+                    stats.time_to_first_token = time.perf_counter() - start
+                for sentence in splitter.feed(delta):
+                    _emit(sentence)
+                if cancelled.is_set():
+                    break
+            rest = splitter.flush()
+            if rest and not cancelled.is_set():
+                _emit(rest)
+        except BaseException:
+            cancelled.set()
+            raise
+        finally:
+            sentence_q.put(_DONE)
+            tts_thread.join()
+            play_thread.join()
+            stats.total_time = time.perf_counter() - start
+
+        if errors:
+            raise errors[0]
+        return stats
+
+    def speak(self, text: str) -> PipelineStats:
+        """Speak already-complete text (still sentence-pipelined)."""
+        return self.run([text])
@@ -2,13 +2,17 @@
 Speech-to-Text using local Whisper (GPU accelerated).
 
 Uses faster-whisper for efficient transcription on NVIDIA GPUs.
+Models are cached per (size, device, compute_type) so every SpeechToText in
+a process shares one loaded model; audio can be passed as an in-memory
+array, skipping the temp-file round-trip. For a model that stays warm
+across processes see voice/stt_worker.py.
 """
 
+import io
 import logging
-import os
-import tempfile
-from pathlib import Path
-from typing import Optional
+import threading
+import wave
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -16,42 +20,60 @@ logger = logging.getLogger(__name__)
 # Larger = more accurate but slower
 DEFAULT_MODEL = "base"  # Good balance of speed/accuracy for real-time
 
+# Whisper models expect 16kHz mono
+SAMPLE_RATE = 16000
+
+# (model_size, device, compute_type) -> loaded WhisperModel
+_MODEL_CACHE: Dict[Tuple[str, str, str], object] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def default_compute_type(device: str) -> str:
+    """float16 on GPU for speed, int8 on CPU (quantized - ~4x less memory, faster)."""
+    return "float16" if device == "cuda" else "int8"
+
 
 class SpeechToText:
     """Local Whisper-based speech-to-text."""
 
-    def __init__(self, model_size: str = DEFAULT_MODEL, device: str = "cuda"):
+    def __init__(self, model_size: str = DEFAULT_MODEL, device: str = "cuda", compute_type: Optional[str] = None):
         """
         Initialize Whisper model.
 
         Args:
             model_size: Whisper model size (tiny, base, small, medium, large-v2, large-v3)
             device: "cuda" for GPU, "cpu" for CPU
+            compute_type: CTranslate2 compute type (default: float16 on GPU, int8 on CPU)
         """
         self.model_size = model_size
         self.device = device
+        self.compute_type = compute_type or default_compute_type(device)
         self._model = None
 
     def _load_model(self):
-        """Lazy-load the Whisper model."""
+        """Lazy-load the Whisper model (shared with other instances in this process)."""
         if self._model is not None:
             return self._model
 
+        key = (self.model_size, self.device, self.compute_type)
         try:
-            from faster_whisper import WhisperModel
-
-            logger.info(f"Loading Whisper model '{self.model_size}' on {self.device}...")
-
-            # Use float16 on GPU for speed, int8 on CPU for memory
-            compute_type = "float16" if self.device == "cuda" else "int8"
-
-            self._model = WhisperModel(
-                self.model_size,
-                device=self.device,
-                compute_type=compute_type,
-            )
-
-            logger.info(f"Whisper model loaded successfully")
+            with _MODEL_CACHE_LOCK:
+                model = _MODEL_CACHE.get(key)
+                if model is None:
+                    from faster_whisper import WhisperModel
+
+                    logger.info(
+                        f"Loading Whisper model '{self.model_size}' on {self.device} ({self.compute_type})..."
+                    )
+                    model = WhisperModel(
+                        self.model_size,
+                        device=self.device,
+                        compute_type=self.compute_type,
+                    )
+                    _MODEL_CACHE[key] = model
+                    logger.info(f"Whisper model loaded successfully")
+
+            self._model = model
             return self._model
 
         except ImportError:
@@ -64,6 +86,28 @@ class SpeechToText:
             logger.error(f"Failed to load Whisper model: {e}")
             raise
 
+    def warm_up(self):
+        """Load the model and run one tiny decode so the first real call is fast."""
+        import numpy as np
+
+        self.transcribe_array(np.zeros(SAMPLE_RATE // 2, dtype=np.float32))
+
+    def _transcribe_input(self, audio, language: str) -> str:
+        model = self._load_model()
+
+        segments, info = model.transcribe(
+            audio,
+            language=language,
+            beam_size=5,
+            vad_filter=True,  # Filter out silence
+        )
+
+        # Combine all segments into single text
+        text = " ".join([segment.text.strip() for segment in segments])
+
+        logger.debug(f"Transcribed: {text[:100]}...")
+        return text.strip()
+
     def transcribe(self, audio_path: str, language: str = "en") -> str:
         """
         Transcribe audio file to text.
@@ -75,57 +119,112 @@ class SpeechToText:
         Returns:
             Transcribed text
         """
-        model = self._load_model()
-
         logger.debug(f"Transcribing: {audio_path}")
+        return self._transcribe_input(audio_path, language)
 
+    def transcribe_array(self, audio, language: str = "en") -> str:
+        """
+        Transcribe in-memory audio.
+
+        Args:
+            audio: 16kHz mono numpy array (float32 in [-1, 1] or int16 PCM)
+            language: Language code
+
+        Returns:
+            Transcribed text
+        """
+        return self._transcribe_input(_as_float32(audio), language)
+
+    def transcribe_segments(self, audio, language: str = "en") -> List[dict]:
+        """
+        Transcribe in-memory audio, keeping Whisper's segment timestamps.
+
+        Args:
+            audio: 16kHz mono numpy array (float32 in [-1, 1] or int16 PCM)
+            language: Language code
+
+        Returns:
+            [{"start": seconds, "end": seconds, "text": str}, ...] relative
+            to the start of `audio`
+        """
+        model = self._load_model()
         segments, info = model.transcribe(
-            audio_path,
+            _as_float32(audio),
             language=language,
             beam_size=5,
-            vad_filter=True,  # Filter out silence
+            vad_filter=True,
         )
-
-        # Combine all segments into single text
-        text = " ".join([segment.text.strip() for segment in segments])
-
-        logger.debug(f"Transcribed: {text[:100]}...")
-        return text.strip()
+        return [
+            {"start": segment.start, "end": segment.end, "text": segment.text.strip()}
+            for segment in segments
+            if segment.text.strip()
+        ]
 
     def transcribe_bytes(self, audio_data: bytes, language: str = "en") -> str:
         """
         Transcribe audio bytes to text.
 
         Args:
-            audio_data: Raw audio data (WAV format)
+            audio_data: Encoded audio (16-bit PCM WAV decoded in memory; other
+                formats are handed to faster-whisper as a file object)
             language: Language code
 
         Returns:
             Transcribed text
         """
-        # Write to temp file (faster-whisper needs a file path)
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            f.write(audio_data)
-            temp_path = f.name
-
         try:
-            return self.transcribe(temp_path, language)
-        finally:
-            # Cleanup temp file
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
+            audio = wav_to_array(audio_data)
+        except (wave.Error, ValueError, EOFError):
+            # Not 16-bit PCM WAV - let faster-whisper decode it from memory
+            return self._transcribe_input(io.BytesIO(audio_data), language)
+        return self.transcribe_array(audio, language)
 
     def get_model_info(self) -> dict:
         """Get information about the loaded model."""
         return {
             "model_size": self.model_size,
             "device": self.device,
+            "compute_type": self.compute_type,
             "loaded": self._model is not None,
         }
 
 
+def _as_float32(audio):
+    """numpy array -> flat float32 (int16 PCM scaled to [-1, 1])."""
+    import numpy as np
+
+    audio = np.asarray(audio).reshape(-1)
+    if audio.dtype == np.int16:
+        return audio.astype(np.float32) / 32768.0
+    if audio.dtype != np.float32:
+        return audio.astype(np.float32)
+    return audio
+
+
+def wav_to_array(audio_data: bytes):
+    """
+    Decode 16-bit PCM WAV bytes in memory to a 16kHz mono float32 array
+    (no temp file). Stereo is averaged; other rates are linearly resampled.
+    """
+    import numpy as np
+
+    with wave.open(io.BytesIO(audio_data), "rb") as wf:
+        channels = wf.getnchannels()
+        rate = wf.getframerate()
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"Expected 16-bit PCM WAV, got {wf.getsampwidth() * 8}-bit")
+        frames = wf.readframes(wf.getnframes())
+
+    audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    if rate != SAMPLE_RATE and len(audio):
+        duration = len(audio) / rate
+        target = np.linspace(0, duration, int(duration * SAMPLE_RATE), endpoint=False)
+        audio = np.interp(target, np.arange(len(audio)) / rate, audio).astype(np.float32)
+    return audio
+
+
 # Convenience function for quick transcription
 _default_stt: Optional[SpeechToText] = None
 
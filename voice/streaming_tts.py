@@ -4,11 +4,8 @@ Streaming Text-to-Speech - Start playing immediately while generating.
 Uses ElevenLabs streaming API for near-instant voice response.
 """
 
-import io
 import logging
 import os
-import queue
-import threading
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -20,60 +17,40 @@ class StreamingTTS:
     def __init__(self, voice_id: Optional[str] = None):
         self.voice_id = voice_id or os.environ.get("ELEVENLABS_VOICE_ID")
         self._api_key = os.environ.get("ELEVENLABS_API_KEY")
-        self._audio_queue = queue.Queue()
         self._playing = False
 
     def speak(self, text: str, model: str = "eleven_turbo_v2_5"):
         """
         Speak text with streaming - audio starts almost immediately.
 
+        Requests raw PCM and plays each chunk from memory as it arrives
+        (no MP3 decode, no buffering of the whole reply). Longer text is
+        split into sentences so the first one plays while the rest are
+        still being synthesized.
+
         Args:
             text: Text for DEVA to speak
             model: ElevenLabs model (eleven_turbo_v2_5 recommended for speed)
         """
-        import httpx
-        import sounddevice as sd
-        import soundfile as sf
-
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.voice_id}/stream"
-
-        headers = {
-            "Accept": "audio/mpeg",
-            "Content-Type": "application/json",
-            "xi-api-key": self._api_key,
-        }
-
-        data = {
-            "text": text,
-            "model_id": model,
-            "voice_settings": {
-                "stability": 0.4,
-                "similarity_boost": 0.75,
-            }
-        }
-
-        # Collect all audio chunks first (simpler approach)
-        # True streaming with sounddevice is complex due to MP3 decoding
-        audio_chunks = []
+        from voice.speech_pipeline import ElevenLabsStreamTTS, SoundDeviceSink, SpeechPipeline
 
         logger.info(f"Streaming TTS: {text[:50]}...")
 
-        with httpx.stream("POST", url, headers=headers, json=data, timeout=60) as response:
-            if response.status_code != 200:
-                raise RuntimeError(f"ElevenLabs error: {response.status_code}")
-
-            for chunk in response.iter_bytes(chunk_size=1024):
-                if chunk:
-                    audio_chunks.append(chunk)
-
-        # Combine and play
-        audio_data = b"".join(audio_chunks)
-
-        # Play using soundfile + sounddevice
-        buffer = io.BytesIO(audio_data)
-        data_array, sample_rate = sf.read(buffer)
-        sd.play(data_array, sample_rate)
-        sd.wait()
+        tts = ElevenLabsStreamTTS(
+            self.voice_id,
+            model=model,
+            voice_settings={
+                "stability": 0.4,
+                "similarity_boost": 0.75,
+            },
+            api_key=self._api_key,
+        )
+        self._playing = True
+        try:
+            return SpeechPipeline(tts, SoundDeviceSink()).speak(text)
+        finally:
+            self._playing = False
+            tts.close()
 
 
 class LocalTTS:
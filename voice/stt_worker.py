@@ -0,0 +1,617 @@
+"""
+STT Worker - Long-lived local speech-to-text service.
+
+Loading a Whisper model takes seconds; transcribing a short utterance takes
+a fraction of that. The worker keeps one model loaded in its own process
+and accepts raw PCM over a local socket, so there is no model load, no WAV
+encode and no temp file on the hot path.
+
+Streaming mode: the client sends microphone chunks as they are captured.
+An energy-based VAD cuts the audio at pauses and each finished phrase is
+transcribed immediately, so most of the transcript is ready by the time
+the user lets go of the push-to-talk key.
+
+Run the worker:
+    python -m voice.stt_worker --model base --device cpu --compute-type int8
+
+Use it:
+    client = STTClient()                      # spawns the worker if needed
+    text = client.transcribe(pcm_int16)       # numpy array or raw bytes
+
+    stream = client.stream(on_partial=print)
+    stream.feed(chunk)  ...                   # from the audio callback
+    text = stream.finish()
+
+    stream = client.stream(timestamps=True)   # media files: timed segments
+    ...                                       # stream.segments fills in per phrase
+
+The socket carries pickled messages, so it is only opened with a secret
+key: a client that spawns the worker generates a random key for the run
+and hands it down in DEVA_STT_AUTHKEY (hex). Set that variable yourself
+to share one worker between several processes.
+"""
+
+import argparse
+import logging
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice.speech_to_text import DEFAULT_MODEL, SAMPLE_RATE, SpeechToText
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 47117
+# Hex-encoded connection key; there is deliberately no fixed default
+AUTHKEY_ENV = "DEVA_STT_AUTHKEY"
+
+# How long to wait for a freshly spawned worker to load its model
+WORKER_START_TIMEOUT = 90.0
+
+# VAD settings (30ms frames at 16kHz)
+VAD_FRAME_SAMPLES = 480
+VAD_MIN_THRESHOLD = 0.008       # RMS floor for "speech" (float32 audio)
+VAD_NOISE_MULTIPLIER = 3.0      # speech = louder than 3x the noise floor
+VAD_END_SILENCE_MS = 450        # pause that ends a phrase
+VAD_PAD_MS = 150                # audio kept either side of speech
+VAD_MAX_PHRASE_S = 20.0         # force a cut on very long phrases
+
+
+def pcm_to_float32(data, dtype: str = "int16") -> np.ndarray:
+    """Raw PCM (bytes or array) -> mono float32 in [-1, 1]."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        audio = np.frombuffer(data, dtype=dtype)
+    else:
+        audio = np.asarray(data)
+    audio = audio.reshape(-1)
+    if audio.dtype == np.int16:
+        return audio.astype(np.float32) / 32768.0
+    return audio.astype(np.float32, copy=False)
+
+
+def _encode_pcm(pcm) -> Tuple[bytes, str]:
+    """numpy/bytes -> (raw bytes, dtype name) for the wire."""
+    if isinstance(pcm, (bytes, bytearray, memoryview)):
+        return bytes(pcm), "int16"
+    arr = np.ascontiguousarray(np.asarray(pcm).reshape(-1))
+    if arr.dtype not in (np.int16, np.float32):
+        arr = arr.astype(np.float32)
+    return arr.tobytes(), arr.dtype.name
+
+
+# ----------------------------------------------------------------------
+# Voice activity detection
+# ----------------------------------------------------------------------
+
+class VADSegmenter:
+    """
+    Splits a live float32 stream into phrases at pauses.
+
+    Energy-based with an adaptive noise floor - cheap enough to run on every
+    chunk and good enough for push-to-talk, where the mic is already gated.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._pending = np.zeros(0, dtype=np.float32)  # < 1 frame carry-over
+        self._consumed = 0  # samples moved into _buffer so far (its end, as a stream offset)
+        self._noise_floor = VAD_MIN_THRESHOLD / VAD_NOISE_MULTIPLIER
+        self._speech_frames = 0
+        self._silent_frames = 0
+        self._end_frames = int(VAD_END_SILENCE_MS / 1000 * sample_rate / VAD_FRAME_SAMPLES)
+        self._pad_samples = int(VAD_PAD_MS / 1000 * sample_rate)
+        self._max_samples = int(VAD_MAX_PHRASE_S * sample_rate)
+
+    def _is_speech(self, frame: np.ndarray) -> bool:
+        rms = float(np.sqrt(np.mean(frame * frame)))
+        threshold = max(VAD_MIN_THRESHOLD, self._noise_floor * VAD_NOISE_MULTIPLIER)
+        speech = rms > threshold
+        if not speech:
+            # Track the noise floor slowly so a loud room doesn't read as speech
+            self._noise_floor = 0.95 * self._noise_floor + 0.05 * rms
+        return speech
+
+    def push(self, audio: np.ndarray) -> List[np.ndarray]:
+        """Add audio; return any phrases that have just ended."""
+        return [phrase for _, phrase in self.push_timed(audio)]
+
+    def push_timed(self, audio: np.ndarray) -> List[Tuple[float, np.ndarray]]:
+        """push(), with each phrase's start (seconds from the start of the stream)."""
+        audio = np.concatenate([self._pending, audio])
+        usable = len(audio) - len(audio) % VAD_FRAME_SAMPLES
+        self._pending = audio[usable:]
+        phrases = []
+
+        for start in range(0, usable, VAD_FRAME_SAMPLES):
+            frame = audio[start:start + VAD_FRAME_SAMPLES]
+            self._buffer = np.concatenate([self._buffer, frame])
+            self._consumed += len(frame)
+
+            if self._is_speech(frame):
+                self._speech_frames += 1
+                self._silent_frames = 0
+            else:
+                self._silent_frames += 1
+                if not self._speech_frames:
+                    # Leading silence: keep only the pre-roll padding
+                    self._buffer = self._buffer[-self._pad_samples:]
+
+            ended = self._speech_frames and self._silent_frames >= self._end_frames
+            if ended or len(self._buffer) >= self._max_samples:
+                trailing = max(0, self._silent_frames * VAD_FRAME_SAMPLES - self._pad_samples)
+                cut = len(self._buffer) - trailing
+                start = (self._consumed - len(self._buffer)) / self.sample_rate
+                phrases.append((start, self._buffer[:cut]))
+                self._buffer = self._buffer[cut:][-self._pad_samples:]
+                self._speech_frames = 0
+                self._silent_frames = 0
+
+        return phrases
+
+    def flush(self) -> Optional[np.ndarray]:
+        """Whatever speech is left once the stream ends."""
+        timed = self.flush_timed()
+        return timed[1] if timed else None
+
+    def flush_timed(self) -> Optional[Tuple[float, np.ndarray]]:
+        """flush(), with the phrase's start (seconds from the start of the stream)."""
+        start = (self._consumed - len(self._buffer)) / self.sample_rate
+        rest = np.concatenate([self._buffer, self._pending])
+        self._consumed += len(self._pending)
+        had_speech = self._speech_frames > 0
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._speech_frames = 0
+        self._silent_frames = 0
+        return (start, rest) if had_speech and len(rest) else None
+
+
+# ----------------------------------------------------------------------
+# Worker (server side)
+# ----------------------------------------------------------------------
+
+_process_authkey: Optional[bytes] = None
+
+
+def env_authkey() -> Optional[bytes]:
+    """Key from DEVA_STT_AUTHKEY, if one is set."""
+    value = os.environ.get(AUTHKEY_ENV)
+    return bytes.fromhex(value) if value else None
+
+
+def default_authkey() -> bytes:
+    """Key from the environment, else one random key per process."""
+    global _process_authkey
+    key = env_authkey()
+    if key:
+        return key
+    if _process_authkey is None:
+        _process_authkey = secrets.token_bytes(32)
+    return _process_authkey
+
+
+class STTWorker:
+    """Serves transcription requests from one warm model."""
+
+    def __init__(
+        self,
+        model_size: str = DEFAULT_MODEL,
+        device: str = "cpu",
+        compute_type: Optional[str] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        authkey: Optional[bytes] = None,
+    ):
+        self.authkey = authkey or env_authkey()
+        if not self.authkey:
+            raise RuntimeError(f"STT worker needs a connection key ({AUTHKEY_ENV}); not starting without one")
+        self.stt = SpeechToText(model_size=model_size, device=device, compute_type=compute_type)
+        self.address = (host, port)
+        self._model_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _transcribe(self, audio: np.ndarray, language: str) -> str:
+        # One model, one decode at a time; connections queue here
+        with self._model_lock:
+            return self.stt.transcribe_array(audio, language=language)
+
+    def _transcribe_segments(self, audio: np.ndarray, language: str, offset: float) -> List[dict]:
+        with self._model_lock:
+            segments = self.stt.transcribe_segments(audio, language=language)
+        return [
+            {"start": round(offset + s["start"], 3), "end": round(offset + s["end"], 3), "text": s["text"]}
+            for s in segments
+        ]
+
+    def _handle_stream(self, conn, language: str, timestamps: bool = False):
+        """
+        Phrase-by-phrase transcription while chunks keep arriving.
+
+        With timestamps, each partial also carries the phrase's Whisper
+        segments, timed from the start of the stream (for media files
+        rather than push-to-talk).
+        """
+        vad = VADSegmenter()
+        texts: List[str] = []
+        started = time.perf_counter()
+
+        def _emit(start: float, phrase: np.ndarray):
+            if timestamps:
+                segments = self._transcribe_segments(phrase, language, start)
+                text = " ".join(s["text"] for s in segments)
+            else:
+                segments, text = None, self._transcribe(phrase, language)
+            if text:
+                texts.append(text)
+                message = {"type": "partial", "text": text, "index": len(texts) - 1}
+                if timestamps:
+                    message["segments"] = segments
+                conn.send(message)
+            elif timestamps:
+                # Nothing said (music, noise) - still show the client we're alive
+                conn.send({"type": "progress"})
+
+        while True:
+            header = conn.recv()
+            kind = header.get("type")
+            if kind == "chunk":
+                audio = pcm_to_float32(conn.recv_bytes(), header.get("dtype", "int16"))
+                for start, phrase in vad.push_timed(audio):
+                    _emit(start, phrase)
+            elif kind == "end":
+                end_received = time.perf_counter()
+                rest = vad.flush_timed()
+                if rest is not None:
+                    _emit(*rest)
+                conn.send({
+                    "type": "final",
+                    "text": " ".join(texts),
+                    "phrases": len(texts),
+                    "finish_latency": time.perf_counter() - end_received,
+                    "elapsed": time.perf_counter() - started,
+                })
+                return
+            else:
+                conn.send({"type": "error", "error": f"unexpected message in stream: {kind}"})
+                return
+
+    def _handle(self, conn):
+        try:
+            while not self._stop.is_set():
+                try:
+                    header = conn.recv()
+                except EOFError:
+                    return
+                kind = header.get("type")
+                try:
+                    if kind == "ping":
+                        conn.send({"type": "pong", "model": self.stt.get_model_info()})
+                    elif kind == "transcribe":
+                        audio = pcm_to_float32(conn.recv_bytes(), header.get("dtype", "int16"))
+                        start = time.perf_counter()
+                        text = self._transcribe(audio, header.get("language", "en"))
+                        conn.send({"type": "result", "text": text,
+                                   "elapsed": time.perf_counter() - start})
+                    elif kind == "stream":
+                        self._handle_stream(conn, header.get("language", "en"), header.get("timestamps", False))
+                    elif kind == "shutdown":
+                        conn.send({"type": "bye"})
+                        self._stop.set()
+                        # Unblock accept() so serve_forever can exit
+                        try:
+                            Client(self.address, authkey=self.authkey).close()
+                        except OSError:
+                            pass
+                        return
+                    else:
+                        conn.send({"type": "error", "error": f"unknown request: {kind}"})
+                except (EOFError, OSError):
+                    return
+                except Exception as e:
+                    logger.error(f"STT worker request failed: {e}")
+                    conn.send({"type": "error", "error": str(e)})
+        finally:
+            conn.close()
+
+    def serve_forever(self):
+        """Load the model, then accept clients until shutdown."""
+        t0 = time.perf_counter()
+        self.stt.warm_up()
+        logger.info(f"STT worker: model ready in {time.perf_counter() - t0:.1f}s")
+
+        with Listener(self.address, authkey=self.authkey) as listener:
+            print(f"[STT worker] listening on {self.address[0]}:{self.address[1]}", flush=True)
+            while not self._stop.is_set():
+                try:
+                    conn = listener.accept()
+                except AuthenticationError:
+                    logger.warning("STT worker: rejected a connection with the wrong key")
+                    continue
+                except OSError:
+                    continue
+                if self._stop.is_set():
+                    conn.close()
+                    break
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+
+# ----------------------------------------------------------------------
+# Client
+# ----------------------------------------------------------------------
+
+class STTStream:
+    """
+    One streaming utterance. feed() is non-blocking (safe from audio callbacks)
+    unless max_pending is set, in which case it waits while that many chunks
+    are queued - for sources faster than real time, like an ffmpeg decode.
+
+    With stall_timeout, feed() and finish() give up once the worker has
+    neither taken a chunk nor sent a message for that long.
+    """
+
+    def __init__(
+        self,
+        conn,
+        language: str,
+        on_partial: Optional[Callable[[str], None]] = None,
+        timestamps: bool = False,
+        on_segment: Optional[Callable[[dict], None]] = None,
+        max_pending: int = 0,
+        stall_timeout: Optional[float] = None,
+    ):
+        self._conn = conn
+        self._chunks: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._on_partial = on_partial
+        self._on_segment = on_segment
+        self.partials: List[str] = []
+        self.segments: List[dict] = []  # with timestamps: {"start", "end", "text"}
+        self.final: Optional[dict] = None
+        self._error: Optional[str] = None
+        self._stall_timeout = stall_timeout
+        self._progress = time.monotonic()  # last chunk sent to / message from the worker
+
+        conn.send({"type": "stream", "language": language, "timestamps": timestamps})
+        self._sender = threading.Thread(target=self._send_loop, daemon=True)
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._sender.start()
+        self._reader.start()
+
+    def feed(self, pcm):
+        """Queue a chunk of int16/float32 PCM (16kHz mono)."""
+        if not self._chunks.maxsize:
+            self._chunks.put(pcm)
+            return
+        self._put(pcm)
+
+    def _stalled(self) -> bool:
+        return bool(self._stall_timeout) and time.monotonic() - self._progress > self._stall_timeout
+
+    def _put(self, item):
+        """Queue onto a bounded queue, raising instead of waiting on a dead or stuck worker."""
+        while True:
+            try:
+                self._chunks.put(item, timeout=1.0)
+                return
+            except queue.Full:
+                if self._error or not self._sender.is_alive():
+                    raise RuntimeError(f"STT stream failed: {self._error or 'connection closed'}")
+                if self._stalled():
+                    raise RuntimeError(f"STT worker stalled (nothing for {self._stall_timeout:.0f}s)")
+
+    def _send_loop(self):
+        try:
+            while True:
+                pcm = self._chunks.get()
+                if pcm is None:
+                    self._conn.send({"type": "end"})
+                    return
+                data, dtype = _encode_pcm(pcm)
+                self._conn.send({"type": "chunk", "dtype": dtype})
+                self._conn.send_bytes(data)
+                self._progress = time.monotonic()
+        except (OSError, EOFError) as e:
+            self._error = str(e)
+
+    def _read_loop(self):
+        try:
+            while True:
+                msg = self._conn.recv()
+                self._progress = time.monotonic()
+                if msg["type"] == "partial":
+                    self.partials.append(msg["text"])
+                    if self._on_partial:
+                        self._on_partial(msg["text"])
+                    for segment in msg.get("segments", ()):
+                        self.segments.append(segment)
+                        if self._on_segment:
+                            self._on_segment(segment)
+                elif msg["type"] == "final":
+                    self.final = msg
+                    return
+                elif msg["type"] == "error":
+                    self._error = msg["error"]
+                    return
+        except (OSError, EOFError) as e:
+            self._error = self._error or str(e)
+
+    def finish(self, timeout: Optional[float] = 30.0) -> str:
+        """Signal end of speech and wait for the full transcript (timeout None: no limit)."""
+        reason = "timed out"
+        try:
+            if self._chunks.maxsize:
+                self._put(None)
+            else:
+                self._chunks.put(None)
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while self._reader.is_alive():
+                if deadline is not None and time.monotonic() > deadline:
+                    break
+                if self._stalled():
+                    reason = f"worker stalled (nothing for {self._stall_timeout:.0f}s)"
+                    break
+                self._reader.join(0.5)
+        finally:
+            self._conn.close()
+        if self.final is None:
+            raise RuntimeError(f"STT stream failed: {self._error or reason}")
+        return self.final["text"]
+
+
+class STTClient:
+    """Talks to a running STTWorker, spawning one if none is listening."""
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        authkey: Optional[bytes] = None,
+        autostart: bool = True,
+        model_size: str = DEFAULT_MODEL,
+        device: str = "cpu",
+        compute_type: Optional[str] = None,
+    ):
+        self.address = (host, port)
+        self.authkey = authkey or default_authkey()
+        self.autostart = autostart
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self._conn = None
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+
+    def _spawn_worker(self):
+        cmd = [
+            sys.executable, "-m", "voice.stt_worker",
+            "--host", self.address[0], "--port", str(self.address[1]),
+            "--model", self.model_size, "--device", self.device,
+        ]
+        if self.compute_type:
+            cmd += ["--compute-type", self.compute_type]
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        logger.info(f"Starting STT worker: {' '.join(cmd)}")
+        env = {**os.environ, AUTHKEY_ENV: self.authkey.hex()}
+        self._process = subprocess.Popen(cmd, cwd=project_root, env=env)
+
+    def _connect(self):
+        try:
+            return Client(self.address, authkey=self.authkey)
+        except AuthenticationError:
+            raise RuntimeError(
+                f"Something on {self.address[0]}:{self.address[1]} does not share our STT key "
+                f"(another process's worker? set {AUTHKEY_ENV} to share one)"
+            ) from None
+
+    def _open(self):
+        """New authenticated connection, starting the worker on first use."""
+        try:
+            return self._connect()
+        except ConnectionRefusedError:
+            if not self.autostart:
+                raise
+        if self._process is None or self._process.poll() is not None:
+            self._spawn_worker()
+        deadline = time.monotonic() + WORKER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"STT worker exited with code {self._process.returncode}")
+            try:
+                return self._connect()
+            except ConnectionRefusedError:
+                time.sleep(0.2)
+        raise RuntimeError("STT worker did not start in time")
+
+    def _request(self, header: dict, payload: Optional[bytes] = None) -> dict:
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._conn is None:
+                        self._conn = self._open()
+                    self._conn.send(header)
+                    if payload is not None:
+                        self._conn.send_bytes(payload)
+                    reply = self._conn.recv()
+                    break
+                except (OSError, EOFError):
+                    # Worker restarted - reconnect once
+                    self._conn = None
+                    if attempt:
+                        raise
+        if reply.get("type") == "error":
+            raise RuntimeError(f"STT worker error: {reply['error']}")
+        return reply
+
+    def ping(self) -> dict:
+        return self._request({"type": "ping"})
+
+    def transcribe(self, pcm, language: str = "en") -> str:
+        """Transcribe a whole utterance (int16/float32 numpy array or int16 bytes)."""
+        data, dtype = _encode_pcm(pcm)
+        return self._request({"type": "transcribe", "language": language, "dtype": dtype}, data)["text"]
+
+    def stream(
+        self,
+        language: str = "en",
+        on_partial: Optional[Callable[[str], None]] = None,
+        timestamps: bool = False,
+        on_segment: Optional[Callable[[dict], None]] = None,
+        max_pending: int = 0,
+        stall_timeout: Optional[float] = None,
+    ) -> STTStream:
+        """Start a streaming utterance (or timestamped media stream) on its own connection."""
+        return STTStream(self._open(), language, on_partial, timestamps, on_segment,
+                         max_pending, stall_timeout)
+
+    def shutdown(self):
+        """Stop the worker process."""
+        try:
+            self._request({"type": "shutdown"})
+        except (OSError, EOFError, RuntimeError):
+            pass
+        self.close()
+        if self._process is not None:
+            self._process.wait(timeout=10)
+            self._process = None
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DEVA speech-to-text worker")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Whisper model size")
+    parser.add_argument("--device", default="cpu", help="cpu or cuda")
+    parser.add_argument("--compute-type", default=None,
+                        help="int8 (CPU default), float16 (CUDA default), int8_float16, ...")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    STTWorker(
+        model_size=args.model,
+        device=args.device,
+        compute_type=args.compute_type,
+        host=args.host,
+        port=args.port,
+    ).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Context-fetch latency benchmark for DEVA's memory stores.
+
+Builds throwaway DevaMemory / GroupMemory (50k solutions) / GameMemory
+databases, then times the per-turn memory lookup three ways:
+
+  reconnect   - a fresh connection for every call (the old behaviour)
+  sequential  - gather_context(): shared WAL connections, lookups one
+                after another
+  threaded    - the same three lookups on a 3-thread pool, kept here to
+                show it doesn't beat sequential (why gather_context
+                doesn't use one)
+
+Run: python voice/test_memory_context.py [num_solutions]
+"""
+
+import hashlib
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice.memory import DevaMemory, GameMemory, GroupMemory, gather_context
+
+NUM_SOLUTIONS = 50_000
+NUM_QUERIES = 300
+GAME = "Amphitheatre"
+
+SUBJECTS = [
+    "player", "rigidbody", "collider", "camera", "animator", "navmesh", "shader",
+    "prefab", "canvas", "button", "photon", "rpc", "lobby", "seat", "microphone",
+    "audio source", "light probe", "terrain", "particle system", "timeline",
+]
+SYMPTOMS = [
+    "falls through the floor", "jitters when moving", "does not sync over network",
+    "is null after scene load", "ignores input", "renders black", "stutters on spawn",
+    "plays twice", "leaks memory", "resets on respawn", "is offset from parent",
+]
+FIXES = [
+    "Enable interpolation and move physics code into FixedUpdate.",
+    "Cache the reference in Awake and re-acquire it in OnEnable.",
+    "Mark the object DontDestroyOnLoad and guard against duplicates.",
+    "Call PhotonNetwork.Instantiate instead of Instantiate on the master client.",
+    "Bake the lighting again after changing the static flags.",
+    "Set the collision detection mode to Continuous Dynamic.",
+]
+ENGINES = ["unity", "unity", "unity", "unreal", "godot"]
+
+
+def build_stores(root: str, num_solutions: int):
+    memory = DevaMemory(os.path.join(root, "deva_memory.db"))
+    group = GroupMemory(os.path.join(root, "deva_group_knowledge.db"))
+    games = GameMemory(os.path.join(root, "deva_games.db"))
+
+    memory.set_user("name", "Jono")
+    memory.set_user("project", GAME)
+    for i in range(20):
+        memory.save_conversation(f"Debugged {random.choice(SUBJECTS)} issue #{i}", ["unity"])
+        memory.learn(f"{random.choice(SUBJECTS)} tip {i}", random.choice(FIXES), "unity")
+
+    rng = random.Random(7)
+    rows = []
+    for i in range(num_solutions):
+        subject, symptom = rng.choice(SUBJECTS), rng.choice(SYMPTOMS)
+        problem = f"{subject.title()} {symptom} (case {i})"
+        solution = rng.choice(FIXES)
+        rows.append((
+            hashlib.sha256(f"{problem}:{solution}:{i}".encode()).hexdigest()[:16],
+            rng.choice(ENGINES), "gameplay", problem, solution, None,
+            json.dumps(subject.split()), rng.randint(0, 20),
+        ))
+    with group._connect() as conn:
+        conn.executemany("""
+            INSERT INTO solutions
+            (solution_hash, engine, category, problem, solution, code_snippet, tags, upvotes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+    games.register_game(GAME, "unity", description="Multiplayer concert venue")
+    for subject in SUBJECTS[:8]:
+        games.add_system(GAME, subject.title(), f"Handles {subject} behaviour")
+    for i in range(10):
+        games.add_bug(GAME, f"{rng.choice(SUBJECTS)} {rng.choice(SYMPTOMS)}", rng.choice(FIXES))
+        games.add_decision(GAME, "convention", f"Convention {i}")
+
+    return memory, group, games
+
+
+def queries(n: int):
+    rng = random.Random(11)
+    return [f"{rng.choice(SUBJECTS)} {rng.choice(SYMPTOMS)}" for _ in range(n)]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def time_turns(fn, qs):
+    samples = []
+    for q in qs:
+        start = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    num_solutions = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_SOLUTIONS
+
+    print("=" * 60)
+    print(f"Memory context fetch - {num_solutions:,} group solutions")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as root:
+        t0 = time.perf_counter()
+        memory, group, games = build_stores(root, num_solutions)
+        print(f"Built stores in {time.perf_counter() - t0:.1f}s\n")
+
+        stores = (memory, group, games)
+        qs = queries(NUM_QUERIES)
+
+        def reconnect(q):
+            for store in stores:
+                store.close()
+            memory.get_context(q)
+            group.get_context(q, engine="unity")
+            games.get_context(GAME)
+
+        def sequential(q):
+            gather_context(memory, group, games, query=q, engine="unity", active_game=GAME)
+
+        pool = ThreadPoolExecutor(max_workers=3)
+
+        def threaded(q):
+            futures = [
+                pool.submit(memory.get_context, q),
+                pool.submit(group.get_context, q, engine="unity"),
+                pool.submit(games.get_context, GAME),
+            ]
+            for future in futures:
+                future.result()
+
+        # Same answers as the individual lookups
+        for q in qs[:20]:
+            ctx = gather_context(memory, group, games, query=q, engine="unity", active_game=GAME)
+            assert ctx.personal == memory.get_context(q)
+            assert ctx.group == group.get_context(q, engine="unity")
+            assert ctx.game == games.get_context(GAME)
+            assert set(ctx.timings) == {"personal", "group", "game"}
+
+        results = {}
+        for name, fn in (("reconnect", reconnect), ("sequential", sequential), ("threaded", threaded)):
+            fn(qs[0])  # warm up
+            results[name] = time_turns(fn, qs)
+
+        print(f"{'mode':<12}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for name, samples in results.items():
+            print(f"{name:<12}{statistics.median(samples):>10.2f}"
+                  f"{percentile(samples, 99):>10.2f}{max(samples):>10.2f}")
+
+        pool.shutdown()
+        for store in stores:
+            store.close()
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Recall/latency benchmark for GroupMemory.search.
+
+Plants known solutions in a 50k-solution knowledge base and asks for them
+the way a developer would (multi-word questions, class names), comparing:
+
+  legacy  - whole query as one quoted phrase, ordered by upvotes
+  search  - GroupMemory.search(): weighted OR terms + trigram identifiers
+
+Run: python voice/test_memory_search.py [num_solutions]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice.test_memory_context import NUM_SOLUTIONS, build_stores, percentile
+
+LIMIT = 3
+
+# (problem, solution, code_snippet, [developer questions that should find it])
+PLANTED = [
+    ("Vehicle wheels sink into terrain when WheelCollider suspension distance is zero",
+     "Give the WheelCollider a suspension distance of at least 0.2 and raise the spring.",
+     "wheel.suspensionDistance = 0.2f;",
+     ["car wheels sinking into the terrain", "WheelCollider suspension"]),
+    ("Cinemachine FreeLook camera snaps back behind player after teleport",
+     "Call OnTargetObjectWarped on the FreeLook after moving the target.",
+     "freeLook.OnTargetObjectWarped(target, delta);",
+     ["freelook camera snapping after teleporting", "OnTargetObjectWarped"]),
+    ("Photon RPC arrives before the PhotonView is instantiated on late joiners",
+     "Buffer the RPC with RpcTarget.AllBuffered or send state in OnPhotonInstantiate.",
+     "photonView.RPC(\"SetSeat\", RpcTarget.AllBuffered, seatId);",
+     ["late joiners miss rpc photon view", "RpcTarget.AllBuffered seat"]),
+    ("Seated avatar slides off the bench when another player sits next to it",
+     "Parent the avatar to the seat anchor and disable its CharacterController while seated.",
+     "characterController.enabled = false; transform.SetParent(seatAnchor);",
+     ["avatar sliding off bench when someone sits", "SeatAnchor CharacterController disabled"]),
+    ("TextMeshPro text renders as boxes on Android builds",
+     "Include the missing glyphs in a fallback font asset and rebuild the atlas.",
+     None,
+     ["textmeshpro shows boxes on android", "fallback font asset glyphs"]),
+    ("NavMeshAgent stops at off-mesh link and never traverses it",
+     "Enable autoTraverseOffMeshLink or drive the traversal with CompleteOffMeshLink.",
+     "agent.autoTraverseOffMeshLink = true;",
+     ["navmesh agent stuck at off mesh link", "CompleteOffMeshLink"]),
+    ("Unreal Niagara particles disappear when the camera looks away",
+     "Set fixed bounds on the Niagara system so it isn't culled.",
+     None,
+     ["niagara particles vanish when camera turns", "niagara fixed bounds culling"]),
+    ("Godot signal connected twice after scene reload causes double damage",
+     "Check is_connected before connect or connect with CONNECT_ONE_SHOT where appropriate.",
+     "if not body_entered.is_connected(_on_hit): body_entered.connect(_on_hit)",
+     ["signal firing twice after reloading scene godot", "is_connected body_entered"]),
+]
+
+
+def legacy_search(group, query, limit=LIMIT):
+    """The previous implementation's query, for comparison (no last_used bump)."""
+    safe_query = query.replace('"', '""')
+    with group._connect() as conn:
+        rows = conn.execute("""
+            SELECT s.problem
+            FROM solutions s
+            JOIN solutions_fts fts ON s.id = fts.rowid
+            WHERE solutions_fts MATCH ?
+            ORDER BY s.upvotes DESC, rank
+            LIMIT ?
+        """, (f'"{safe_query}"', limit)).fetchall()
+    return [r[0] for r in rows]
+
+
+def main():
+    num_solutions = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_SOLUTIONS
+
+    print("=" * 60)
+    print(f"GroupMemory.search - recall@{LIMIT} over {num_solutions:,} solutions")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as root:
+        memory, group, games = build_stores(root, num_solutions)
+        for problem, solution, code, _ in PLANTED:
+            group.contribute("unity", "gameplay", problem, solution, code_snippet=code)
+
+        cases = [(problem, q) for problem, _, _, qs in PLANTED for q in qs]
+        engines = {
+            "legacy": lambda q: legacy_search(group, q),
+            "search": lambda q: [r["problem"] for r in group.search(q, limit=LIMIT)],
+        }
+
+        print(f"{'engine':<10}{'recall':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        recalls = {}
+        for name, fn in engines.items():
+            hits, samples = 0, []
+            for _ in range(5):
+                for problem, q in cases:
+                    start = time.perf_counter()
+                    results = fn(q)
+                    samples.append((time.perf_counter() - start) * 1000)
+                    hits += problem in results
+            recalls[name] = hits / (5 * len(cases))
+            print(f"{name:<10}{recalls[name]:>10.0%}{statistics.median(samples):>10.2f}"
+                  f"{percentile(samples, 99):>10.2f}")
+
+        # last_used is bumped for the returned rows only
+        with group._connect() as conn:
+            conn.execute("UPDATE solutions SET last_used = NULL")
+        returned = group.search("player falls through the floor", limit=LIMIT)
+        with group._connect() as conn:
+            touched = conn.execute(
+                "SELECT COUNT(*) FROM solutions WHERE last_used IS NOT NULL"
+            ).fetchone()[0]
+        print(f"\nlast_used bumped on {touched} row(s) for {len(returned)} result(s)")
+        assert touched == len(returned)
+        assert recalls["search"] > recalls["legacy"]
+
+        for store in (memory, group, games):
+            store.close()
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
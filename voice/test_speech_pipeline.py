@@ -0,0 +1,131 @@
+"""
+Time-to-first-audio harness for the speak-while-thinking pipeline.
+
+Uses a fake LLM (tokens with realistic delays), a fake TTS (first-byte
+latency + realtime-ish synthesis) and a null audio sink, so it runs offline
+with no API keys or sound card. Also checks that a TTS failure stops the
+LLM stream instead of letting it run to the end.
+
+Run: python voice/test_speech_pipeline.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice.speech_pipeline import NullSink, PCM_SAMPLE_RATE, SpeechPipeline
+
+REPLY = (
+    "Your collider is disabled in Awake and never re-enabled. "
+    "Move the enable call into OnEnable so it runs every time the object is activated. "
+    "Also check the layer collision matrix, because the Player layer is set to ignore Props. "
+    "That combination is why the crate falls straight through the floor."
+)
+
+LLM_FIRST_TOKEN = 0.6     # seconds until the model starts streaming
+LLM_TOKEN_INTERVAL = 0.02  # seconds per token (~50 tok/s)
+TTS_FIRST_BYTE = 0.35     # ElevenLabs flash first-byte latency
+TTS_REALTIME_FACTOR = 0.15  # synthesis time per second of audio
+CHARS_PER_SECOND = 15     # speaking rate
+
+
+def fake_llm(text: str = REPLY):
+    """Yield word tokens like a streaming chat completion."""
+    time.sleep(LLM_FIRST_TOKEN)
+    for word in text.split(" "):
+        time.sleep(LLM_TOKEN_INTERVAL)
+        yield word + " "
+
+
+class FakeTTS:
+    """Returns silent PCM at a plausible speed for the text length."""
+
+    sample_rate = PCM_SAMPLE_RATE
+
+    def stream(self, text: str):
+        audio_seconds = len(text) / CHARS_PER_SECOND
+        total_bytes = int(audio_seconds * self.sample_rate) * 2
+        chunk = 4096
+        time.sleep(TTS_FIRST_BYTE)
+        for _ in range(0, total_bytes, chunk):
+            time.sleep(chunk / 2 / self.sample_rate * TTS_REALTIME_FACTOR)
+            yield b"\x00" * chunk
+
+
+def run_sequential() -> float:
+    """Old behaviour: full reply, then full TTS download, then play."""
+    start = time.perf_counter()
+    text = "".join(fake_llm())
+    audio = b"".join(FakeTTS().stream(text))
+    sink = NullSink()
+    sink.start(PCM_SAMPLE_RATE)
+    sink.write(audio)
+    return sink.first_write_at - start
+
+
+def run_pipelined():
+    """New behaviour: sentences go to TTS as soon as they complete."""
+    sink = NullSink(realtime=True)
+    return SpeechPipeline(FakeTTS(), sink).run(fake_llm())
+
+
+class FailingTTS(FakeTTS):
+    """Fails on the second sentence, like a dropped ElevenLabs connection."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def stream(self, text: str):
+        self.calls += 1
+        if self.calls == 2:
+            raise ConnectionError("TTS connection reset")
+        yield from super().stream(text)
+
+
+def check_tts_failure():
+    """A TTS error cancels the run: the LLM stops and the error is raised."""
+    consumed = []
+
+    def llm():
+        for token in fake_llm(REPLY * 5):
+            consumed.append(token)
+            yield token
+
+    try:
+        SpeechPipeline(FailingTTS(), NullSink()).run(llm())
+    except ConnectionError:
+        pass
+    else:
+        raise AssertionError("TTS error was not raised")
+    total = len((REPLY * 5).split(" "))
+    assert len(consumed) < total // 2, f"LLM kept streaming after TTS failed ({len(consumed)}/{total})"
+    print(f"TTS failure: raised, LLM stopped after {len(consumed)}/{total} tokens")
+
+
+def main():
+    print("=" * 50)
+    print("Speech pipeline - time to first audio")
+    print("=" * 50)
+
+    seq_ttfa = run_sequential()
+    print(f"Sequential:  first audio after {seq_ttfa:.2f}s")
+
+    stats = run_pipelined()
+    print(f"Pipelined:   first audio after {stats.time_to_first_audio:.2f}s")
+    print(f"  first token    {stats.time_to_first_token:.2f}s")
+    print(f"  first sentence {stats.time_to_first_sentence:.2f}s")
+    print(f"  sentences      {len(stats.sentences)}")
+    print(f"  total (played) {stats.total_time:.2f}s")
+    print(f"Speed-up to first audio: {seq_ttfa / stats.time_to_first_audio:.1f}x")
+
+    assert stats.text.split() == REPLY.split(), "pipeline dropped or reordered text"
+    assert stats.time_to_first_audio < seq_ttfa, "pipeline should start speaking sooner"
+
+    check_tts_failure()
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
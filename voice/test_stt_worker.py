@@ -0,0 +1,153 @@
+"""
+Latency benchmark for the warm STT worker.
+
+Runs prerecorded 16-bit WAV fixtures through:
+
+  cold     - new SpeechToText per utterance: model load + temp-free decode
+  warm     - shared in-process model, in-memory array
+  worker   - whole utterance sent to the worker as raw PCM after "release"
+  stream   - chunks fed in real time while "speaking"; latency is measured
+             from the last chunk (key release) to the final transcript
+
+Fixtures: WAV paths or directories on the command line, default
+data/stt_fixtures/. Record some with voice.audio_capture.record_audio().
+
+Run: python voice/test_stt_worker.py [--model base] [--device cpu] [fixtures...]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice import speech_to_text
+from voice.speech_to_text import SAMPLE_RATE, SpeechToText, wav_to_array
+from voice.stt_worker import STTClient, VADSegmenter
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent.parent / "data" / "stt_fixtures"
+CHUNK_SAMPLES = 1024  # same block size as AudioCapture
+
+
+def find_fixtures(args):
+    paths = []
+    for arg in args or [DEFAULT_FIXTURES]:
+        p = Path(arg)
+        paths.extend(sorted(p.glob("*.wav")) if p.is_dir() else [p])
+    return [p for p in paths if p.exists()]
+
+
+def check_vad():
+    """Three tone bursts separated by pauses -> three phrases."""
+    t = np.arange(int(0.6 * SAMPLE_RATE)) / SAMPLE_RATE
+    burst = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    pause = np.zeros(int(0.7 * SAMPLE_RATE), dtype=np.float32)
+    audio = np.concatenate([pause, burst, pause, burst, pause, burst])
+
+    vad = VADSegmenter()
+    phrases = []
+    for start in range(0, len(audio), CHUNK_SAMPLES):
+        phrases.extend(vad.push(audio[start:start + CHUNK_SAMPLES]))
+    rest = vad.flush()
+    if rest is not None:
+        phrases.append(rest)
+
+    assert len(phrases) == 3, f"expected 3 phrases, got {len(phrases)}"
+    for phrase in phrases:
+        assert 0.6 <= len(phrase) / SAMPLE_RATE <= 1.2, len(phrase) / SAMPLE_RATE
+    print(f"VAD: {len(phrases)} phrases from 3 bursts")
+
+
+def stream_utterance(client, pcm):
+    """Feed int16 PCM at real-time pace; return (text, seconds after release)."""
+    stream = client.stream()
+    chunk_seconds = CHUNK_SAMPLES / SAMPLE_RATE
+    start = time.perf_counter()
+    for i, offset in enumerate(range(0, len(pcm), CHUNK_SAMPLES)):
+        stream.feed(pcm[offset:offset + CHUNK_SAMPLES])
+        delay = start + (i + 1) * chunk_seconds - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    released = time.perf_counter()
+    text = stream.finish()
+    return text, time.perf_counter() - released
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STT worker benchmark")
+    parser.add_argument("fixtures", nargs="*")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--compute-type", default=None)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("STT worker latency")
+    print("=" * 60)
+
+    check_vad()
+
+    fixtures = find_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"\nNo WAV fixtures found (looked in {DEFAULT_FIXTURES}) - skipping model timings")
+        print("\nOK")
+        return
+
+    clips = []
+    for path in fixtures:
+        wav = path.read_bytes()
+        audio = wav_to_array(wav)
+        clips.append((path.name, wav, (audio * 32767).astype(np.int16)))
+    total_audio = sum(len(pcm) for _, _, pcm in clips) / SAMPLE_RATE
+    print(f"{len(clips)} fixture(s), {total_audio:.1f}s of audio\n")
+
+    results = {"cold": [], "warm": [], "worker": [], "stream": []}
+    texts = {}
+
+    for name, wav, _ in clips[:3]:
+        speech_to_text._MODEL_CACHE.clear()
+        start = time.perf_counter()
+        SpeechToText(args.model, args.device, args.compute_type).transcribe_bytes(wav)
+        results["cold"].append(time.perf_counter() - start)
+
+    stt = SpeechToText(args.model, args.device, args.compute_type)
+    stt.warm_up()
+    for name, _, pcm in clips:
+        start = time.perf_counter()
+        texts[name] = stt.transcribe_array(pcm)
+        results["warm"].append(time.perf_counter() - start)
+
+    client = STTClient(model_size=args.model, device=args.device, compute_type=args.compute_type)
+    try:
+        t0 = time.perf_counter()
+        client.ping()
+        print(f"Worker ready in {time.perf_counter() - t0:.1f}s")
+
+        for name, _, pcm in clips:
+            start = time.perf_counter()
+            text = client.transcribe(pcm)
+            results["worker"].append(time.perf_counter() - start)
+            assert text == texts[name], (name, text, texts[name])
+
+        for name, _, pcm in clips:
+            text, latency = stream_utterance(client, pcm)
+            results["stream"].append(latency)
+            print(f"  {name}: {text[:70]}")
+    finally:
+        client.shutdown()
+
+    print(f"\n{'mode':<10}{'p50 ms':>10}{'max ms':>10}   (stream = after key release)")
+    for mode, samples in results.items():
+        ms = [s * 1000 for s in samples]
+        print(f"{mode:<10}{statistics.median(ms):>10.0f}{max(ms):>10.0f}")
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
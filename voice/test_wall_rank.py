@@ -0,0 +1,117 @@
+"""
+Relevance ranking test for Wall Mode (voice/wall_rank.py).
+
+Builds a small Unity project on disk (a few files that matter for a
+question, plus filler scripts) and checks through WallCollector.collect:
+
+  - under the token budget, a ranked question still gets the whole
+    project, most relevant files first and the rest in priority order,
+  - over the budget, the highest-scoring files are kept and the rest of
+    the budget is filled with the other files in priority order,
+  - pack() on its own: nothing dropped under budget, best files kept over.
+
+Run: python voice/test_wall_rank.py
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import snapshot_index
+from voice import wall_rank
+from voice.wall_mode import WallCollector
+
+QUERY = "player falls through floor when sitting in a seat"
+
+RELEVANT = {
+    "Assets/Scripts/SeatController.cs": (
+        "public class SeatController : MonoBehaviour {\n"
+        "    public Transform seatAnchor;\n"
+        "    void Sit(PlayerMovement player) { player.transform.SetParent(seatAnchor); }\n"
+        "    // the seat disables the player collider, so the player falls through the floor\n"
+        "}\n"
+    ),
+    "Assets/Scripts/PlayerMovement.cs": (
+        "public class PlayerMovement : MonoBehaviour {\n"
+        "    CharacterController controller;\n"
+        "    void Update() { if (!controller.isGrounded) Fall(); }\n"
+        "    void Fall() { /* floor check: player falls when grounded is false */ }\n"
+        "}\n"
+    ),
+}
+
+
+def filler(i: int) -> str:
+    body = "\n".join(f"    void Step{j}() {{ counter += {j}; }}" for j in range(60))
+    return f"public class Widget{i:02} : MonoBehaviour {{\n    int counter;\n{body}\n}}\n"
+
+
+def build_project(root: Path):
+    for rel, content in RELEVANT.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(content, encoding="utf-8")
+    for i in range(20):
+        rel = root / "Assets" / "Scripts" / "Widgets" / f"Widget{i:02}.cs"
+        rel.parent.mkdir(parents=True, exist_ok=True)
+        rel.write_text(filler(i), encoding="utf-8")
+    # Non-priority code (outside Scripts/Game/Core...) sorts after the rest
+    (root / "Assets" / "Misc").mkdir(parents=True)
+    (root / "Assets" / "Misc" / "Vendor.cs").write_text(filler(99), encoding="utf-8")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "Arena"
+        build_project(root)
+        snapshot_index.DEFAULT_DB_PATH = Path(tmp) / "snapshot.db"
+        collector = WallCollector(str(root), engine="unity")
+
+        everything = collector.collect()
+        all_paths = {f.relative_path for f in everything.files}
+        total = everything.total_tokens
+        assert len(all_paths) == len(RELEVANT) + 21
+
+        # Under budget: the whole project, relevant files first
+        ranked = collector.collect(query=QUERY, max_tokens=total)
+        paths = [f.relative_path for f in ranked.files]
+        assert set(paths) == all_paths, all_paths - set(paths)
+        assert ranked.total_tokens == total
+        assert set(paths[:2]) == set(RELEVANT), paths[:4]
+        unscored = [f.relative_path for f in ranked.files if not f.score]
+        assert unscored == sorted(p for p in unscored if "/Misc/" not in p) + \
+            ["Assets/Misc/Vendor.cs"], unscored
+        print(f"Under budget: all {len(paths)} files ({total:,} tokens) sent, "
+              f"{len(paths) - len(unscored)} ranked first")
+
+        # Over budget: best matches kept, the rest of the budget in priority order
+        budget = total // 3
+        tight = collector.collect(query=QUERY, max_tokens=budget)
+        paths = [f.relative_path for f in tight.files]
+        assert set(RELEVANT) <= set(paths), paths
+        assert tight.total_tokens <= budget
+        rest = [f.relative_path for f in tight.files if not f.score]
+        assert rest and rest == unscored[:len(rest)], rest
+        left_out = [p for p in all_paths if p not in paths]
+        assert left_out and all(f"{p} (token budget)" in tight.excluded_paths for p in left_out)
+        print(f"Over budget ({budget:,} tokens): {len(paths)} files kept, relevant ones included; "
+              f"{len(left_out)} dropped")
+
+        # pack() directly
+        index = collector._snapshot_index()
+        entries = sorted(index.entries.values(), key=lambda e: e.relative_path)
+        scores = wall_rank.rank(index, entries, QUERY)
+        chosen, dropped = wall_rank.pack(entries, scores, sum(e.tokens for e in entries))
+        assert not dropped and len(chosen) == len(entries)
+        best = max(scores, key=scores.get)
+        chosen, dropped = wall_rank.pack(entries, scores, max(e.tokens for e in entries) + 1)
+        assert chosen[0].relative_path == best and dropped
+        print(f"pack(): nothing dropped under budget; top match ({best}) kept over budget")
+
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Snapshot equivalence test for the wall collectors (core/snapshot_index.py).
+
+Builds small trees on disk - including a file that can be listed and
+stat()ed but not read (a unix socket named like source) - and checks that
+collecting through the snapshot index gives the same output as the old
+read-everything collectors (copied below as the baseline):
+
+  - reconcile.collect_repo_context: byte-identical context cold, warm,
+    from the persisted index in a fresh process, and after edits; the
+    unreadable file stays in the tree with its error in place,
+  - WallCollector.collect: same files, and read errors keep their place
+    among the excluded paths (walk order).
+
+Run: python voice/test_wall_snapshot.py
+"""
+
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from claude_memory import reconcile
+from core import snapshot_index
+from voice.wall_mode import WallCollector
+
+
+def baseline_repo_context(root: Path) -> str:
+    """collect_repo_context as it was before the snapshot index (git info omitted)."""
+    lines = ["## File Tree"]
+    file_list = []
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in reconcile.SKIP_DIRS]
+
+        rel_dir = Path(dirpath).relative_to(root)
+
+        for filename in sorted(filenames):
+            file_path = Path(dirpath) / filename
+            if file_path.suffix.lower() not in reconcile.CODE_EXTENSIONS:
+                continue
+            rel_path = str(rel_dir / filename).replace("\\", "/")
+            size = file_path.stat().st_size
+            file_list.append((rel_path, file_path, size))
+            lines.append(f"  {rel_path} ({size:,} bytes)")
+
+    lines.append(f"\nTotal: {len(file_list)} files")
+    lines.append("")
+    lines.append("=" * 80)
+    lines.append("## File Contents")
+    lines.append("=" * 80)
+
+    total_chars = 0
+    max_total = 700_000
+
+    for rel_path, file_path, size in file_list:
+        if total_chars > max_total:
+            lines.append(f"\n[TRUNCATED — reached {max_total:,} char budget]")
+            break
+
+        try:
+            content = file_path.read_text(encoding="utf-8", errors="ignore")
+            if len(content) > reconcile.MAX_FILE_CHARS:
+                content = content[:reconcile.MAX_FILE_CHARS] + "\n... [TRUNCATED]"
+
+            lines.append("")
+            lines.append("-" * 60)
+            lines.append(f"FILE: {rel_path}")
+            lines.append("-" * 60)
+            lines.append(content)
+
+            total_chars += len(content)
+        except Exception as e:
+            lines.append(f"\n[ERROR reading {rel_path}: {e}]")
+
+    return "\n".join(lines)
+
+
+def baseline_excluded(collector: WallCollector) -> list[str]:
+    """WallCollector.collect's excluded paths before the snapshot index (no budget)."""
+    excluded = []
+    search_path = collector.assets_dir if collector.assets_dir.exists() else collector.project_path
+    for root, dirs, filenames in os.walk(search_path):
+        root_path = Path(root)
+        if collector._should_exclude(root_path):
+            excluded.append(str(root_path))
+            dirs.clear()
+            continue
+        for filename in filenames:
+            file_path = root_path / filename
+            if not any(filename.endswith(ext) for ext in collector.code_extensions):
+                continue
+            if collector._should_exclude(file_path):
+                excluded.append(str(file_path))
+                continue
+            try:
+                file_path.read_text(encoding="utf-8", errors="ignore")
+            except Exception as e:
+                excluded.append(f"{file_path} (read error: {e})")
+    return excluded
+
+
+def unreadable(path: Path) -> socket.socket:
+    """A directory entry that stat() sees but open() can't read, even as root."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sock = socket.socket(socket.AF_UNIX)
+    sock.bind(str(path))
+    return sock
+
+
+def repo_context(root: Path) -> str:
+    """collect_repo_context from the file tree on (no git repo here, so no git section)."""
+    text = reconcile.collect_repo_context(root)
+    return text[text.index("## File Tree"):]
+
+
+def fresh_process():
+    """Forget the in-memory indexes; the next collect loads from the SQLite snapshot."""
+    snapshot_index._INDEXES.clear()
+
+
+def check_reconcile(tmp: Path):
+    root = tmp / "repo"
+    files = {
+        "main.py": "print('hello')\n",
+        "core/a_router.py": "def route():\n    return 1\n",
+        "core/c_store.py": "x = 1\r\ny = 2\r\n",            # newline translation
+        "core/d_big.py": "# filler\n" * 1200,                  # over MAX_FILE_CHARS
+        "docs/notes.md": "caf\xe9 notes\n",
+        "web/app.js": "console.log(1);\n",
+        "data/skipped.py": "never listed\n",                   # SKIP_DIRS
+    }
+    for rel, content in files.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(content, encoding="utf-8", newline="")
+    (root / "docs" / "latin1.md").write_bytes(b"r\xe9sum\xe9\n")  # invalid UTF-8
+    sock = unreadable(root / "core" / "b_socket.py")
+    try:
+        expected = baseline_repo_context(root)
+        assert "[ERROR reading core/b_socket.py:" in expected
+        assert expected.index("core/a_router.py") < expected.index("b_socket.py") \
+            < expected.index("core/c_store.py")
+
+        assert repo_context(root) == expected, "cold collect differs from baseline"
+        assert repo_context(root) == expected, "warm collect differs from baseline"
+        fresh_process()
+        assert repo_context(root) == expected, "collect from the persisted index differs"
+        print("collect_repo_context: identical to baseline cold, warm and from disk, "
+              "unreadable file in place")
+
+        (root / "core" / "a_router.py").write_text("def route():\n    return 2  # edited\n")
+        (root / "core" / "e_new.py").write_text("NEW = True\n")
+        (root / "web" / "app.js").unlink()
+        assert repo_context(root) == baseline_repo_context(root), "collect after edits differs"
+        print("collect_repo_context: identical to baseline after an edit, an add and a delete")
+    finally:
+        sock.close()
+
+
+def check_wall_collector(tmp: Path):
+    root = tmp / "Arena"
+    scripts = root / "Assets" / "Scripts"
+    scripts.mkdir(parents=True)
+    (scripts / "Alpha.cs").write_text("public class Alpha {}\n")
+    (scripts / "Gamma.cs").write_text("public class Gamma {}\n")
+    (root / "Assets" / "Plugins").mkdir()
+    (root / "Assets" / "Plugins" / "Vendor.cs").write_text("public class Vendor {}\n")
+    # Walked before Plugins/, so its error must come before that exclusion
+    sock = unreadable(root / "Assets" / "Beta.cs")
+    try:
+        collector = WallCollector(str(root), engine="unity")
+        expected = baseline_excluded(collector)
+        assert "Beta.cs (read error:" in expected[0] and len(expected) == 2, expected
+        for attempt in ("cold", "warm"):
+            result = collector.collect()
+            assert [f.relative_path for f in result.files] == \
+                ["Assets/Scripts/Alpha.cs", "Assets/Scripts/Gamma.cs"], result.files
+            assert result.excluded_paths == expected, (attempt, result.excluded_paths, expected)
+        print(f"WallCollector.collect: files and excluded paths match baseline "
+              f"({len(expected)} excluded, read error in walk order)")
+    finally:
+        sock.close()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        snapshot_index.DEFAULT_DB_PATH = tmp / "snapshot.db"
+        check_reconcile(tmp)
+        check_wall_collector(tmp)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,7 @@ from typing import Optional
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from voice.speech_to_text import SpeechToText
+from voice.stt_worker import STTClient, STTStream
 from voice.audio_capture import AudioCapture, PushToTalk
 from voice.audio_playback import AudioPlayback
 from personality.deva import get_deva_prompt, DEVA_VOICE
@@ -39,6 +40,7 @@ class VoiceAssistant:
         push_to_talk_key: str = "space",
         whisper_model: str = "base",
         whisper_device: str = "cuda",
+        use_stt_worker: bool = False,
     ):
         """
         Initialize DEVA voice assistant.
@@ -47,11 +49,15 @@ class VoiceAssistant:
             push_to_talk_key: Key to hold for recording (default: space)
             whisper_model: Whisper model size (tiny, base, small, medium, large-v3)
             whisper_device: "cuda" for GPU, "cpu" for CPU
+            use_stt_worker: Stream audio to the warm STT worker process while
+                the key is held, instead of transcribing after release
         """
         self.push_to_talk_key = push_to_talk_key
 
         # Components (lazy loaded)
         self._stt: Optional[SpeechToText] = None
+        self._stt_client: Optional[STTClient] = None
+        self._stt_stream: Optional[STTStream] = None
         self._capture: Optional[AudioCapture] = None
         self._playback: Optional[AudioPlayback] = None
         self._ptt: Optional[PushToTalk] = None
@@ -61,6 +67,7 @@ class VoiceAssistant:
         # Settings
         self._whisper_model = whisper_model
         self._whisper_device = whisper_device
+        self._use_stt_worker = use_stt_worker
 
         # Conversation history
         self._messages = []
@@ -79,6 +86,15 @@ class VoiceAssistant:
             )
         return self._stt
 
+    def _get_stt_client(self) -> STTClient:
+        """Lazy connect to (or spawn) the STT worker."""
+        if self._stt_client is None:
+            self._stt_client = STTClient(
+                model_size=self._whisper_model,
+                device=self._whisper_device,
+            )
+        return self._stt_client
+
     def _get_capture(self) -> AudioCapture:
         """Lazy load audio capture."""
         if self._capture is None:
@@ -173,7 +189,7 @@ class VoiceAssistant:
         # Play it
         playback.play_mp3(audio_data, blocking=True)
 
-    async def _process_audio(self, audio_data: bytes):
+    async def _process_audio(self, audio_data: bytes, user_text: Optional[str] = None):
         """Process recorded audio: transcribe → think → speak."""
         if self._processing:
             logger.warning("Already processing, skipping")
@@ -181,9 +197,10 @@ class VoiceAssistant:
 
         self._processing = True
         try:
-            # 1. Transcribe
-            print("\n🎤 Transcribing...")
-            user_text = await self._transcribe(audio_data)
+            # 1. Transcribe (already done if it was streamed to the worker)
+            if user_text is None:
+                print("\n🎤 Transcribing...")
+                user_text = await self._transcribe(audio_data)
 
             if not user_text.strip():
                 print("   (no speech detected)")
@@ -207,10 +224,30 @@ class VoiceAssistant:
             self._processing = False
             print(f"\n[Hold {self.push_to_talk_key.upper()} to speak]")
 
+    def _on_record_start(self):
+        """Push-to-talk pressed: open a worker stream and feed it mic chunks."""
+        if not self._use_stt_worker or self._processing:
+            return None
+        try:
+            self._stt_stream = self._get_stt_client().stream()
+        except Exception as e:
+            logger.warning(f"STT worker unavailable, transcribing after release: {e}")
+            self._stt_stream = None
+            return None
+        return self._stt_stream.feed
+
     def _on_audio_callback(self, audio_data: bytes):
         """Callback when push-to-talk recording completes."""
+        user_text = None
+        stream, self._stt_stream = self._stt_stream, None
+        if stream is not None:
+            try:
+                user_text = stream.finish()
+            except Exception as e:
+                logger.warning(f"STT stream failed, falling back to local model: {e}")
+
         # Run async processing in the event loop
-        asyncio.run(self._process_audio(audio_data))
+        asyncio.run(self._process_audio(audio_data, user_text))
 
     def start(self):
         """Start the voice assistant (blocking)."""
@@ -223,9 +260,12 @@ class VoiceAssistant:
         print("Press [ESC] to quit")
         print()
 
-        # Pre-load Whisper model
+        # Pre-load Whisper model (in the worker process if enabled)
         print("Loading speech recognition...")
-        self._get_stt()
+        if self._use_stt_worker:
+            self._get_stt_client().ping()
+        else:
+            self._get_stt()
         print("Ready!\n")
 
         # Set up push-to-talk
@@ -233,7 +273,7 @@ class VoiceAssistant:
         self._ptt = PushToTalk(capture, key=self.push_to_talk_key)
 
         self._running = True
-        self._ptt.start(self._on_audio_callback)
+        self._ptt.start(self._on_audio_callback, on_start=self._on_record_start)
 
         # Wait for ESC to quit
         try:
@@ -282,6 +322,10 @@ def main():
         "--cpu", action="store_true",
         help="Use CPU instead of GPU for Whisper"
     )
+    parser.add_argument(
+        "--stt-worker", action="store_true",
+        help="Stream audio to a warm STT worker process (python -m voice.stt_worker)"
+    )
 
     args = parser.parse_args()
 
@@ -296,6 +340,7 @@ def main():
         push_to_talk_key=args.key,
         whisper_model=args.model,
         whisper_device="cpu" if args.cpu else "cuda",
+        use_stt_worker=args.stt_worker,
     )
 
     assistant.start()
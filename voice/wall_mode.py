@@ -13,11 +13,17 @@ Usage:
 
 import os
 import re
+import sys
 import fnmatch
 from pathlib import Path
 from typing import Optional, List, Dict, Set
 from dataclasses import dataclass, field
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice import wall_rank
+from core.snapshot_index import SnapshotEntry, SnapshotIndex, get_index, patterns_digest
+
 
 # Approximate tokens per character (conservative estimate for code)
 CHARS_PER_TOKEN = 3.5
@@ -49,6 +55,7 @@ class FileInfo:
     chars: int
     tokens: int  # Estimated
     subsystems: List[str] = field(default_factory=list)
+    score: float = 0.0  # Query relevance (0 when not ranked)
 
 
 @dataclass
@@ -72,7 +79,7 @@ class WallCollector:
     - Smart filtering (excludes packages, third-party code)
     - Subsystem detection (voice, networking, UI, physics, etc.)
     - Token budgeting (fits within context limits)
-    - Query-based relevance filtering
+    - Query relevance ranking (BM25 + import graph, packed by value per token)
     """
 
     # Paths to exclude (packages, third-party, generated)
@@ -182,6 +189,28 @@ class WallCollector:
                 return True
         return False
 
+    def _snapshot_index(self) -> SnapshotIndex:
+        """Shared incremental index for this project (persists across calls)."""
+        return get_index(
+            self.project_path,
+            f"wall_mode:{self.engine}",
+            tagger=lambda rel, content: self._detect_subsystems(content, Path(rel).name),
+            tag_version=patterns_digest(self.SUBSYSTEM_PATTERNS),
+        )
+
+    @staticmethod
+    def _file_info(entry: SnapshotEntry, score: float = 0.0) -> FileInfo:
+        return FileInfo(
+            path=entry.path,
+            relative_path=entry.relative_path,
+            content=entry.content,
+            lines=entry.lines,
+            chars=entry.chars,
+            tokens=entry.tokens,
+            subsystems=entry.subsystems,
+            score=score,
+        )
+
     def _is_priority(self, path: Path) -> bool:
         """Check if path is high priority (project-specific code)."""
         path_str = str(path).replace("\\", "/")
@@ -235,7 +264,8 @@ class WallCollector:
 
         Args:
             subsystem: Filter to specific subsystem (voice, networking, etc.)
-            query: Filter by relevance to query string
+            query: Rank files by relevance to this query (most relevant first;
+                   over budget, relevant files are kept ahead of the rest)
             max_tokens: Maximum tokens to collect
             include_scenes: Include scene/prefab files
 
@@ -251,8 +281,11 @@ class WallCollector:
         if include_scenes:
             extensions.extend(self.scene_extensions)
 
-        # Walk the assets directory
+        # Walk the assets directory (stat only - contents come from the snapshot)
         search_path = self.assets_dir if self.assets_dir.exists() else self.project_path
+        candidates: List[Path] = []
+        # Where each candidate sits among excluded_paths, so read errors keep walk order
+        slots: List[int] = []
 
         for root, dirs, filenames in os.walk(search_path):
             root_path = Path(root)
@@ -275,54 +308,57 @@ class WallCollector:
                     excluded_paths.append(str(file_path))
                     continue
 
-                try:
-                    content = file_path.read_text(encoding="utf-8", errors="ignore")
-                except Exception as e:
-                    excluded_paths.append(f"{file_path} (read error: {e})")
-                    continue
+                candidates.append(file_path)
+                slots.append(len(excluded_paths))
 
-                # Detect subsystems
-                file_subsystems = self._detect_subsystems(content, filename)
-                subsystems_found.update(file_subsystems)
+        # Only new/changed files are read and re-tagged
+        index = self._snapshot_index()
+        entries = index.refresh(candidates)
+        failed = index.last_refresh.failed
+        for slot, file_path in reversed(list(zip(slots, candidates))):
+            if str(file_path) in failed:
+                excluded_paths.insert(slot, f"{file_path} (read error: {failed[str(file_path)]})")
 
-                # Filter by subsystem if specified
-                if subsystem and subsystem.lower() not in [s.lower() for s in file_subsystems]:
-                    continue
+        candidates_in_scope: List[SnapshotEntry] = []
+        for entry in entries:
+            subsystems_found.update(entry.subsystems)
 
-                # Filter by query if specified
-                if query and not self._matches_query(content, filename, query):
+            # Filter by subsystem if specified
+            if subsystem and subsystem.lower() not in [s.lower() for s in entry.subsystems]:
+                continue
+            candidates_in_scope.append(entry)
+
+        # Rank against the query (BM25 + import-graph proximity); over budget,
+        # relevant files are packed first by value per token
+        scores = wall_rank.rank(index, candidates_in_scope, query) if query else {}
+
+        if scores:
+            # Priority order (project code first), for whatever is not ranked
+            candidates_in_scope.sort(
+                key=lambda e: (not self._is_priority(Path(e.path)), e.relative_path))
+            chosen, dropped = wall_rank.pack(candidates_in_scope, scores, max_tokens)
+            budget_files = [self._file_info(e, scores.get(e.relative_path, 0.0)) for e in chosen]
+            excluded_paths.extend(f"{e.relative_path} (token budget)" for e in dropped)
+        else:
+            for entry in candidates_in_scope:
+                # Filter by query if specified (no ranked matches, fall back to keywords)
+                if query and not self._matches_query(entry.content, Path(entry.path).name, query):
                     continue
+                files.append(self._file_info(entry))
 
-                # Calculate metrics
-                lines = content.count("\n") + 1
-                chars = len(content)
-                tokens = self._estimate_tokens(content)
-
-                relative_path = str(file_path.relative_to(self.project_path))
-
-                files.append(FileInfo(
-                    path=str(file_path),
-                    relative_path=relative_path,
-                    content=content,
-                    lines=lines,
-                    chars=chars,
-                    tokens=tokens,
-                    subsystems=file_subsystems
-                ))
-
-        # Sort by priority (project code first) then by path
-        files.sort(key=lambda f: (not self._is_priority(Path(f.path)), f.relative_path))
+            # Sort by priority (project code first) then by path
+            files.sort(key=lambda f: (not self._is_priority(Path(f.path)), f.relative_path))
 
-        # Apply token budget
-        budget_files: List[FileInfo] = []
-        current_tokens = 0
+            # Apply token budget
+            budget_files: List[FileInfo] = []
+            current_tokens = 0
 
-        for file_info in files:
-            if current_tokens + file_info.tokens <= max_tokens:
-                budget_files.append(file_info)
-                current_tokens += file_info.tokens
-            else:
-                excluded_paths.append(f"{file_info.relative_path} (token budget)")
+            for file_info in files:
+                if current_tokens + file_info.tokens <= max_tokens:
+                    budget_files.append(file_info)
+                    current_tokens += file_info.tokens
+                else:
+                    excluded_paths.append(f"{file_info.relative_path} (token budget)")
 
         # Calculate totals
         total_lines = sum(f.lines for f in budget_files)
@@ -380,7 +416,8 @@ class WallCollector:
 
         for i, file_info in enumerate(files, 1):
             subsys_str = f" [{', '.join(file_info.subsystems)}]" if file_info.subsystems else ""
-            lines.append(f"{i:3}. {file_info.relative_path}{subsys_str}")
+            score_str = f" (relevance {file_info.score:.1f})" if file_info.score else ""
+            lines.append(f"{i:3}. {file_info.relative_path}{subsys_str}{score_str}")
 
         lines.append("")
 
@@ -389,14 +426,14 @@ class WallCollector:
         lines.append("FILE CONTENTS")
         lines.append("=" * 80)
 
+        # Per-file segments are cached in the snapshot index
+        index = self._snapshot_index()
         for file_info in files:
-            lines.append("")
-            lines.append("-" * 80)
-            lines.append(f"FILE: {file_info.relative_path}")
-            lines.append(f"LINES: {file_info.lines} | SUBSYSTEMS: {', '.join(file_info.subsystems) or 'none'}")
-            lines.append("-" * 80)
-            lines.append("")
-            lines.append(file_info.content)
+            entry = index.entries.get(file_info.relative_path)
+            if entry is not None:
+                lines.append(index.segment(entry, "wall_mode", self._render_file))
+            else:
+                lines.append(self._render_file(file_info))
 
         lines.append("")
         lines.append("=" * 80)
@@ -405,6 +442,19 @@ class WallCollector:
 
         return "\n".join(lines)
 
+    @staticmethod
+    def _render_file(file_info) -> str:
+        """Context block for one file (FileInfo or SnapshotEntry)."""
+        return "\n".join([
+            "",
+            "-" * 80,
+            f"FILE: {file_info.relative_path}",
+            f"LINES: {file_info.lines} | SUBSYSTEMS: {', '.join(file_info.subsystems) or 'none'}",
+            "-" * 80,
+            "",
+            file_info.content,
+        ])
+
     def get_subsystem_summary(self) -> Dict[str, int]:
         """Get a summary of files per subsystem."""
         result = self.collect(max_tokens=CONTEXT_LIMITS["llama4_scout"])
@@ -31,6 +31,9 @@ _PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(_PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(_PROJECT_ROOT))
 
+from voice import wall_rank
+from core.snapshot_index import SnapshotEntry, SnapshotIndex, get_index, patterns_digest
+
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
@@ -93,12 +96,36 @@ def _detect_subsystems(relative_path: str, content: str) -> List[str]:
     return found
 
 
+def _snapshot_index() -> SnapshotIndex:
+    """Process-wide incremental index of the TDP tree."""
+    return get_index(
+        PROJECT_ROOT,
+        "wall_python",
+        tagger=_detect_subsystems,
+        tag_version=patterns_digest(SUBSYSTEM_PATTERNS),
+    )
+
+
+def _render_file(entry: SnapshotEntry, rel_path: Optional[str] = None) -> str:
+    """Context block for one file."""
+    return "\n".join([
+        "",
+        "-" * 80,
+        f"FILE: {rel_path or entry.relative_path}",
+        f"SUBSYSTEMS: {', '.join(entry.subsystems) or 'none'}",
+        "-" * 80,
+        "",
+        entry.content,
+    ])
+
+
 def collect_project(
     subsystem: Optional[str] = None,
     files_filter: Optional[List[str]] = None,
     include_templates: bool = True,
     include_config: bool = True,
     max_tokens: int = 800_000,
+    query: Optional[str] = None,
 ) -> str:
     """
     Collect the TDP Python codebase into a formatted context string.
@@ -109,6 +136,9 @@ def collect_project(
         include_templates: Include .html dashboard templates
         include_config: Include .yaml/.yml config files
         max_tokens: Token budget (default 800K — Gemini Flash safe limit)
+        query: Rank files by relevance to this question (BM25 + import graph):
+               most relevant first, and over budget relevant files are kept
+               ahead of the rest
 
     Returns:
         Formatted context string ready for Gemini.
@@ -119,8 +149,10 @@ def collect_project(
     if include_templates:
         extensions.extend(TEMPLATE_EXTENSIONS)
 
-    collected = []  # (relative_path, content, subsystems, tokens)
+    collected = []  # (relative_path, entry)
     total_tokens = 0
+    scores = {}
+    index = _snapshot_index()
 
     # If explicit files requested, only collect those
     if files_filter:
@@ -130,16 +162,12 @@ def collect_project(
                 # Try without leading slash
                 full_path = PROJECT_ROOT / rel_path.lstrip("/\\")
             if full_path.exists():
-                try:
-                    content = full_path.read_text(encoding="utf-8", errors="ignore")
-                    tokens = int(len(content) / CHARS_PER_TOKEN)
-                    subsystems = _detect_subsystems(rel_path, content)
-                    collected.append((rel_path, content, subsystems, tokens))
-                    total_tokens += tokens
-                except Exception:
-                    pass
+                for entry in index.refresh([full_path], complete=False):
+                    collected.append((rel_path, entry))
+                    total_tokens += entry.tokens
     else:
-        # Walk the project
+        # Walk the project (stat only - unchanged files come from the snapshot)
+        candidates = []
         for root, dirs, filenames in os.walk(PROJECT_ROOT):
             # Prune excluded directories
             dirs[:] = [d for d in dirs if not _should_exclude_dir(d)]
@@ -149,32 +177,32 @@ def collect_project(
                     continue
                 if not any(filename.endswith(ext) for ext in extensions):
                     continue
-
-                file_path = Path(root) / filename
-                rel_path = str(file_path.relative_to(PROJECT_ROOT)).replace("\\", "/")
-
-                try:
-                    content = file_path.read_text(encoding="utf-8", errors="ignore")
-                except Exception:
-                    continue
-
-                subsystems = _detect_subsystems(rel_path, content)
-
-                # Filter by subsystem if requested
-                if subsystem and subsystem.lower() not in [s.lower() for s in subsystems]:
+                candidates.append(Path(root) / filename)
+
+        entries = [
+            e for e in index.refresh(candidates)
+            if not subsystem or subsystem.lower() in [s.lower() for s in e.subsystems]
+        ]
+
+        # Rank against the question; over budget, relevant files go first
+        scores = wall_rank.rank(index, entries, query) if query else {}
+        if scores:
+            entries.sort(key=lambda e: (e.relative_path != "main.py", e.relative_path))
+            chosen, _ = wall_rank.pack(entries, scores, max_tokens)
+            collected = [(e.relative_path, e) for e in chosen]
+            total_tokens = sum(e.tokens for e in chosen)
+        else:
+            for entry in entries:
+                # Check token budget (skip oversize files, keep filling)
+                if total_tokens + entry.tokens > max_tokens:
                     continue
 
-                tokens = int(len(content) / CHARS_PER_TOKEN)
-
-                # Check token budget
-                if total_tokens + tokens > max_tokens:
-                    break
+                collected.append((entry.relative_path, entry))
+                total_tokens += entry.tokens
 
-                collected.append((rel_path, content, subsystems, tokens))
-                total_tokens += tokens
-
-    # Sort: main.py first, then alphabetical
-    collected.sort(key=lambda x: (x[0] != "main.py", x[0]))
+    # Sort: most relevant first when ranked, else main.py first then alphabetical
+    if not scores:
+        collected.sort(key=lambda x: (x[0] != "main.py", x[0]))
 
     # Format
     lines = []
@@ -186,6 +214,8 @@ def collect_project(
         lines.append(f"Subsystem filter: {subsystem}")
     if files_filter:
         lines.append(f"Files filter: {', '.join(files_filter)}")
+    if scores:
+        lines.append(f"Ranked by: {query}")
     lines.append(f"Files: {len(collected)}")
     lines.append(f"Estimated tokens: {total_tokens:,}")
     lines.append("")
@@ -194,23 +224,20 @@ def collect_project(
     lines.append("-" * 80)
     lines.append("FILE INDEX")
     lines.append("-" * 80)
-    for i, (rel_path, _, subsystems, tokens) in enumerate(collected, 1):
-        sub_str = f" [{', '.join(subsystems)}]" if subsystems else ""
-        lines.append(f"{i:3}. {rel_path} ({tokens:,} tok){sub_str}")
+    for i, (rel_path, entry) in enumerate(collected, 1):
+        sub_str = f" [{', '.join(entry.subsystems)}]" if entry.subsystems else ""
+        lines.append(f"{i:3}. {rel_path} ({entry.tokens:,} tok){sub_str}")
     lines.append("")
 
-    # File contents
+    # File contents (cached per-file segments)
     lines.append("=" * 80)
     lines.append("FILE CONTENTS")
     lines.append("=" * 80)
-    for rel_path, content, subsystems, _ in collected:
-        lines.append("")
-        lines.append("-" * 80)
-        lines.append(f"FILE: {rel_path}")
-        lines.append(f"SUBSYSTEMS: {', '.join(subsystems) or 'none'}")
-        lines.append("-" * 80)
-        lines.append("")
-        lines.append(content)
+    for rel_path, entry in collected:
+        if rel_path == entry.relative_path:
+            lines.append(index.segment(entry, "wall_python", _render_file))
+        else:
+            lines.append(_render_file(entry, rel_path))
 
     lines.append("")
     lines.append("=" * 80)
@@ -229,6 +256,7 @@ def wall_analyze(
     subsystem: Optional[str] = None,
     files: Optional[List[str]] = None,
     max_output_tokens: int = 8000,
+    focus: bool = True,
 ) -> str:
     """
     Load the TDP codebase into Gemini and ask a question.
@@ -238,6 +266,8 @@ def wall_analyze(
         subsystem: Optional subsystem filter (e.g. "agents", "core", "dashboard")
         files: Optional explicit file list (e.g. ["main.py", "agents/operations_agent.py"])
         max_output_tokens: Max response tokens from Gemini
+        focus: Rank files against the question (most relevant first; over the
+               token budget, relevant files are kept ahead of the rest)
 
     Returns:
         Gemini's analysis text
@@ -247,7 +277,11 @@ def wall_analyze(
     from voice.gemini_client import GeminiClient
 
     # Collect context
-    context = collect_project(subsystem=subsystem, files_filter=files)
+    context = collect_project(
+        subsystem=subsystem,
+        files_filter=files,
+        query=question if focus else None,
+    )
 
     # Count tokens for user info
     est_tokens = int(len(context) / CHARS_PER_TOKEN)
@@ -298,6 +332,11 @@ def main():
         "--files", "-f",
         help="Comma-separated list of specific files to analyze (e.g. main.py,agents/operations_agent.py)",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Keep path order instead of ranking files against the question",
+    )
     parser.add_argument(
         "--tokens", "-t",
         type=int,
@@ -314,6 +353,7 @@ def main():
         subsystem=args.subsystem,
         files=files_list,
         max_output_tokens=args.tokens,
+        focus=not args.full,
     )
 
     print("\n" + "=" * 80)
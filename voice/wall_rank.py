@@ -0,0 +1,342 @@
+"""
+Wall Rank - Relevance-ranked context packing for Wall Mode.
+
+Path-order truncation drops whatever sorts last once the token budget runs
+out, however relevant it is. Instead, when there is a question:
+
+1. Score every file with BM25 against the query, using a per-file term
+   index (identifiers split on camelCase/snake_case, path terms boosted)
+   cached in the snapshot index per content hash.
+2. Spread score along the import graph: files that import, or are
+   imported by, a matching file get a decayed share of its score - the
+   bug is often in the neighbour, not the file that mentions the keyword.
+3. If everything fits the token budget, everything is sent (relevant files
+   first). Otherwise pack the relevant files by value per token (greedy
+   knapsack: a dense 2K-token file that matches beats a 40K-token one that
+   mentions the word once), then fill what is left of the budget with the
+   other files in the caller's priority order.
+
+Usage:
+    scores = rank(index, entries, "player falls through floor")
+    chosen, dropped = pack(entries, scores, max_tokens=200_000)
+"""
+
+import math
+import re
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from core.snapshot_index import SnapshotEntry, SnapshotIndex
+
+# BM25 parameters (standard defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Path/file name terms count this many times (a question naming
+# "seat" should favour SeatController.cs over a file that says seat once)
+PATH_TERM_WEIGHT = 3
+
+# Import-graph proximity: share of a matching file's score given to
+# neighbours, decaying per hop
+PROXIMITY_WEIGHT = 0.5
+PROXIMITY_DECAY = 0.5
+PROXIMITY_MAX_HOPS = 2
+
+# When over budget, files scoring below this fraction of the best match
+# don't get packed as relevant - a single hit on a common word ("correct",
+# "update") isn't relevance
+MIN_RELATIVE_SCORE = 0.2
+
+# Floor for value-per-token so tiny stub files don't crowd out the rest
+MIN_PACK_TOKENS = 200
+
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9]*")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "can", "do", "does",
+    "doesn", "for", "from", "how", "i", "if", "in", "into", "is", "it", "its",
+    "me", "my", "of", "on", "or", "so", "that", "the", "there", "this", "to",
+    "up", "was", "what", "when", "where", "which", "who", "why", "with", "you",
+    "your", "any", "all", "get", "got", "not", "no", "should", "would", "could",
+    "about", "explain", "tell", "show", "check", "work", "works", "working",
+}
+
+# Symbol definitions / imports used for the import graph
+_DEFINES_RE = re.compile(r"\b(?:class|struct|interface|enum)\s+([A-Za-z_]\w*)")
+_PY_IMPORT_RE = re.compile(r"^\s*(?:from\s+([\w.]+)\s+import|import\s+([\w., ]+))", re.MULTILINE)
+_INCLUDE_RE = re.compile(r'^\s*#include\s+"([^"]+)"', re.MULTILINE)
+_TYPE_LINKED_EXTENSIONS = (".cs", ".cpp", ".h", ".hpp")
+
+
+def _stem(word: str) -> str:
+    """Very light suffix stripping so 'falls'/'falling' meet 'fall'."""
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Split code/prose into lowercase stemmed terms (identifiers split too)."""
+    terms = []
+    for word in _WORD_RE.findall(text):
+        lower = word.lower()
+        parts = _CAMEL_RE.findall(word) if not word.islower() else lower.split("_")
+        if len(parts) > 1 and len(lower) > 2:
+            terms.append(_stem(lower))
+        for part in parts:
+            part = part.lower()
+            if len(part) > 1 and part not in _STOPWORDS:
+                terms.append(_stem(part))
+    return terms
+
+
+def query_terms(query: str) -> List[str]:
+    """Distinct query terms, in order."""
+    seen = []
+    for term in tokenize(query):
+        if term not in seen:
+            seen.append(term)
+    return seen
+
+
+@dataclass
+class FileFeatures:
+    """Cached per-file term index + import-graph info."""
+    terms: Counter
+    length: int
+    identifiers: Set[str] = field(default_factory=set)
+    defines: Set[str] = field(default_factory=set)
+    imports: Set[str] = field(default_factory=set)
+
+
+def _module_name(relative_path: str) -> Optional[str]:
+    if not relative_path.endswith(".py"):
+        return None
+    module = relative_path[:-3].replace("/", ".")
+    if module.endswith(".__init__"):
+        module = module[: -len(".__init__")]
+    return module
+
+
+def _build_features(entry: SnapshotEntry) -> FileFeatures:
+    content = entry.content
+    terms = Counter(tokenize(content))
+    for term in tokenize(entry.relative_path.replace("/", " ").replace(".", " ")):
+        terms[term] += PATH_TERM_WEIGHT
+
+    imports: Set[str] = set()
+    if entry.relative_path.endswith(".py"):
+        for from_mod, plain in _PY_IMPORT_RE.findall(content):
+            if from_mod:
+                imports.add(from_mod)
+            else:
+                for name in plain.split(","):
+                    name = name.strip().split(" ")[0]
+                    if name:
+                        imports.add(name)
+    else:
+        for include in _INCLUDE_RE.findall(content):
+            imports.add(include.replace("\\", "/").rsplit("/", 1)[-1])
+
+    return FileFeatures(
+        terms=terms,
+        length=sum(terms.values()),
+        identifiers=set(_WORD_RE.findall(content)),
+        defines=set(_DEFINES_RE.findall(content)),
+        imports=imports,
+    )
+
+
+def features(index: SnapshotIndex, entry: SnapshotEntry) -> FileFeatures:
+    """Term index for a file, cached in the snapshot index per content hash."""
+    return index.derive(entry, "rank:features", _build_features)
+
+
+def _import_graph(
+    entries: Sequence[SnapshotEntry],
+    feats: Dict[str, FileFeatures],
+) -> Dict[str, Set[str]]:
+    """Undirected file graph from Python imports, #includes and type references."""
+    by_module: Dict[str, str] = {}
+    by_basename: Dict[str, str] = {}
+    by_symbol: Dict[str, List[str]] = {}
+
+    for entry in entries:
+        rel = entry.relative_path
+        module = _module_name(rel)
+        if module:
+            by_module[module] = rel
+        by_basename.setdefault(rel.rsplit("/", 1)[-1], rel)
+        for symbol in feats[rel].defines:
+            by_symbol.setdefault(symbol, []).append(rel)
+
+    graph: Dict[str, Set[str]] = {e.relative_path: set() for e in entries}
+
+    def _link(a: str, b: str):
+        if a != b:
+            graph[a].add(b)
+            graph[b].add(a)
+
+    for entry in entries:
+        rel = entry.relative_path
+        feat = feats[rel]
+        for imported in feat.imports:
+            target = by_module.get(imported) or by_basename.get(imported)
+            if target is None and "." in imported:
+                # "from voice.wall_mode import X" may name a package attribute
+                target = by_module.get(imported.rsplit(".", 1)[0])
+            if target:
+                _link(rel, target)
+        if rel.endswith(_TYPE_LINKED_EXTENSIONS):
+            # C#/C++: no file-level imports, so link via referenced type names
+            for ident in feat.identifiers & by_symbol.keys():
+                for target in by_symbol[ident]:
+                    _link(rel, target)
+
+    return graph
+
+
+def bm25_scores(
+    terms: List[str],
+    entries: Sequence[SnapshotEntry],
+    feats: Dict[str, FileFeatures],
+) -> Dict[str, float]:
+    """Okapi BM25 score per file (only files with a non-zero score)."""
+    if not terms or not entries:
+        return {}
+
+    n_docs = len(entries)
+    avg_len = sum(f.length for f in feats.values()) / n_docs or 1.0
+    doc_freq = {t: sum(1 for f in feats.values() if t in f.terms) for t in terms}
+
+    scores: Dict[str, float] = {}
+    for entry in entries:
+        feat = feats[entry.relative_path]
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * feat.length / avg_len)
+        score = 0.0
+        for term in terms:
+            tf = feat.terms.get(term, 0)
+            if not tf:
+                continue
+            df = doc_freq[term]
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        if score > 0:
+            scores[entry.relative_path] = score
+    return scores
+
+
+def rank(
+    index: SnapshotIndex,
+    entries: Sequence[SnapshotEntry],
+    query: str,
+) -> Dict[str, float]:
+    """
+    Relevance score per file for a query: BM25 plus import-graph proximity.
+    Files with no lexical match and no matching neighbour are absent.
+    """
+    terms = query_terms(query)
+    feats = {e.relative_path: features(index, e) for e in entries}
+    scores = bm25_scores(terms, entries, feats)
+    if not scores:
+        return {}
+
+    # A file named outright ("main.py", "audit_log") goes to the top
+    top = max(scores.values())
+    lowered = query.lower()
+    for entry in entries:
+        name = entry.relative_path.rsplit("/", 1)[-1].lower()
+        stem = name.rsplit(".", 1)[0]
+        if name in lowered or (len(stem) > 3 and re.search(rf"\b{re.escape(stem)}\b", lowered)):
+            scores[entry.relative_path] = scores.get(entry.relative_path, 0.0) + top
+
+    graph = _import_graph(entries, feats)
+    proximity: Dict[str, float] = {}
+    for seed, seed_score in scores.items():
+        # BFS out to PROXIMITY_MAX_HOPS, keep the best share per neighbour
+        seen = {seed}
+        frontier = deque([(seed, 0)])
+        while frontier:
+            node, hops = frontier.popleft()
+            if hops == PROXIMITY_MAX_HOPS:
+                continue
+            for neighbour in graph.get(node, ()):
+                if neighbour in seen:
+                    continue
+                seen.add(neighbour)
+                share = seed_score * PROXIMITY_WEIGHT * (PROXIMITY_DECAY ** hops)
+                if share > proximity.get(neighbour, 0.0):
+                    proximity[neighbour] = share
+                frontier.append((neighbour, hops + 1))
+
+    ranked = dict(scores)
+    for rel, share in proximity.items():
+        ranked[rel] = ranked.get(rel, 0.0) + share
+    return ranked
+
+
+def pack(
+    entries: Sequence[SnapshotEntry],
+    scores: Dict[str, float],
+    max_tokens: int,
+) -> Tuple[List[SnapshotEntry], List[SnapshotEntry]]:
+    """
+    Choose the files to send. `entries` are in the caller's priority order.
+
+    Everything fits: nothing is dropped. Over budget: files scoring at least
+    MIN_RELATIVE_SCORE of the best are packed by value per token, then the
+    rest of the budget is filled with the remaining files in priority order.
+
+    Returns (chosen, dropped); chosen lists scored files most relevant first,
+    then the others in priority order.
+    """
+    def _order(chosen: List[SnapshotEntry]) -> List[SnapshotEntry]:
+        position = {id(e): i for i, e in enumerate(entries)}
+        return sorted(chosen, key=lambda e: (
+            -scores.get(e.relative_path, 0.0), position[id(e)]))
+
+    if sum(e.tokens for e in entries) <= max_tokens:
+        return _order(list(entries)), []
+
+    floor = max(scores.values(), default=0.0) * MIN_RELATIVE_SCORE
+    relevant = [
+        e for e in entries
+        if scores.get(e.relative_path, 0.0) > 0 and scores[e.relative_path] >= floor
+    ]
+    relevant.sort(
+        key=lambda e: (-scores[e.relative_path] / max(e.tokens, MIN_PACK_TOKENS), e.relative_path)
+    )
+
+    chosen: List[SnapshotEntry] = []
+    used = 0
+    for entry in relevant:
+        if used + entry.tokens <= max_tokens:
+            chosen.append(entry)
+            used += entry.tokens
+
+    # Classic greedy fix-up: one very relevant file can be worth more than
+    # everything the density order picked
+    if len(chosen) < len(relevant):
+        best = max(
+            (e for e in relevant if e.tokens <= max_tokens),
+            key=lambda e: scores[e.relative_path],
+            default=None,
+        )
+        if best is not None and all(e is not best for e in chosen) and \
+                scores[best.relative_path] > sum(scores[e.relative_path] for e in chosen):
+            chosen = [best]
+            used = best.tokens
+
+    # Whatever budget is left goes to the other files, as without a question
+    picked = {id(e) for e in chosen}
+    for entry in entries:
+        if id(entry) not in picked and used + entry.tokens <= max_tokens:
+            chosen.append(entry)
+            picked.add(id(entry))
+            used += entry.tokens
+
+    dropped = [e for e in entries if id(e) not in picked]
+    return _order(chosen), dropped